@@ -246,3 +246,84 @@ ALTER TABLE "user_challenges" ADD CONSTRAINT "user_challenges_challenge_id_fkey"
 -- AddForeignKey
 ALTER TABLE "user_challenges" ADD CONSTRAINT "user_challenges_portfolio_id_fkey" FOREIGN KEY ("portfolio_id") REFERENCES "portfolios"("id") ON DELETE CASCADE ON UPDATE CASCADE;
 
+
+-- CreateEnum
+CREATE TYPE "bar_interval" AS ENUM ('1m', '5m', '1d');
+
+-- CreateTable (list-partitioned by bar interval; the intraday partitions are range-partitioned
+-- by bucket_start so retention drops whole partitions instead of deleting rows)
+CREATE TABLE "price_bars" (
+    "symbol" VARCHAR(20) NOT NULL,
+    "interval" "bar_interval" NOT NULL,
+    "bucket_start" TIMESTAMP(3) NOT NULL,
+    "open" DECIMAL(15,4) NOT NULL,
+    "high" DECIMAL(15,4) NOT NULL,
+    "low" DECIMAL(15,4) NOT NULL,
+    "close" DECIMAL(15,4) NOT NULL,
+    "volume" BIGINT,
+
+    CONSTRAINT "price_bars_pkey" PRIMARY KEY ("symbol","interval","bucket_start")
+) PARTITION BY LIST ("interval");
+
+-- CreatePartitions (priceHistoryService.ensurePartitions creates the dated 1m/5m partitions ahead
+-- of time, e.g. "price_bars_1m_p20250101"; the default partitions catch bars written before that)
+CREATE TABLE "price_bars_1m" PARTITION OF "price_bars" FOR VALUES IN ('1m') PARTITION BY RANGE ("bucket_start");
+CREATE TABLE "price_bars_1m_default" PARTITION OF "price_bars_1m" DEFAULT;
+CREATE TABLE "price_bars_5m" PARTITION OF "price_bars" FOR VALUES IN ('5m') PARTITION BY RANGE ("bucket_start");
+CREATE TABLE "price_bars_5m_default" PARTITION OF "price_bars_5m" DEFAULT;
+CREATE TABLE "price_bars_1d" PARTITION OF "price_bars" FOR VALUES IN ('1d');
+
+-- CreateEnum
+CREATE TYPE "order_type" AS ENUM ('LIMIT', 'STOP', 'STOP_LIMIT');
+
+-- CreateEnum
+CREATE TYPE "order_status" AS ENUM ('OPEN', 'FILLED', 'CANCELLED', 'REJECTED');
+
+-- CreateTable
+CREATE TABLE "orders" (
+    "id" TEXT NOT NULL,
+    "portfolio_id" TEXT NOT NULL,
+    "symbol" VARCHAR(20) NOT NULL,
+    "asset_type" "asset_type" NOT NULL,
+    "trade_type" "trade_type" NOT NULL,
+    "order_type" "order_type" NOT NULL,
+    "quantity" DECIMAL(18,8) NOT NULL,
+    "limit_price" DECIMAL(15,4),
+    "stop_price" DECIMAL(15,4),
+    "status" "order_status" NOT NULL DEFAULT 'OPEN',
+    "triggered_at" TIMESTAMP(3),
+    "filled_at" TIMESTAMP(3),
+    "trade_id" TEXT,
+    "reject_reason" VARCHAR(255),
+    "created_at" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "orders_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE INDEX "orders_portfolio_id_status_idx" ON "orders"("portfolio_id", "status");
+
+-- CreateIndex
+CREATE INDEX "orders_status_symbol_idx" ON "orders"("status", "symbol");
+
+-- AddForeignKey
+ALTER TABLE "orders" ADD CONSTRAINT "orders_portfolio_id_fkey" FOREIGN KEY ("portfolio_id") REFERENCES "portfolios"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- CreateTable
+CREATE TABLE "portfolio_value_snapshots" (
+    "portfolio_id" TEXT NOT NULL,
+    "date" DATE NOT NULL,
+    "total_value" DECIMAL(15,2) NOT NULL,
+
+    CONSTRAINT "portfolio_value_snapshots_pkey" PRIMARY KEY ("portfolio_id","date")
+);
+
+-- AddForeignKey
+ALTER TABLE "portfolio_value_snapshots" ADD CONSTRAINT "portfolio_value_snapshots_portfolio_id_fkey" FOREIGN KEY ("portfolio_id") REFERENCES "portfolios"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AlterTable (bumped by every trade statement; lets achievement counters skip trades a rebuild already counted)
+ALTER TABLE "portfolios" ADD COLUMN "trade_seq" BIGINT NOT NULL DEFAULT 0;
+
+-- CreateIndex (order matcher catch-up poll for orders placed on other instances)
+CREATE INDEX "orders_status_created_at_idx" ON "orders"("status", "created_at");
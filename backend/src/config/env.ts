@@ -23,6 +23,8 @@ const envSchema = z.object({
   // Server Configuration
   NODE_ENV: z.enum(['development', 'production', 'test']).default('development'),
   PORT: z.string().default('3001'),
+  PROCESS_ROLE: z.enum(['all', 'api', 'worker']).default('all'), // api: serve HTTP only; worker: run background jobs only
+  JOB_CONCURRENCY: z.string().default('4'), // Achievement checks run at once per worker process
 
   // Database Configuration
   DATABASE_URL: z.string(), // Required: PostgreSQL connection string
@@ -39,6 +41,13 @@ const envSchema = z.object({
   // External API Keys
   ALPHA_VANTAGE_API_KEY: z.string().optional(), // Primary market data source
   FINNHUB_API_KEY: z.string().optional(), // Fallback market data source
+  MARKET_DATA_PROVIDERS: z.string().default('alphavantage,finnhub'), // Provider fallback chain, in priority order
+  DISTRIBUTED_RATE_LIMIT: z.string().default('true'), // Share provider rate limits across instances through Redis
+
+  // Simulated Market Data Feed (offline load tests and benchmarks)
+  SIMULATED_FEED_LATENCY_MS: z.string().default('50'), // Artificial latency per upstream call
+  SIMULATED_FEED_REQUESTS_PER_MINUTE: z.string().default('6000'), // Simulated provider rate limit
+  SIMULATED_FEED_SEED: z.string().default('stocksim'), // Seed for deterministic random-walk prices
 
   // CORS Configuration
   FRONTEND_URL: z.string().default('http://localhost:3000'),
@@ -46,9 +55,15 @@ const envSchema = z.object({
   // Rate Limiting
   RATE_LIMIT_WINDOW_MS: z.string().default('900000'), // 15 minutes in milliseconds
   RATE_LIMIT_MAX_REQUESTS: z.string().default('100'), // Max requests per window
+  IDEMPOTENCY_TTL_SECONDS: z.string().default('86400'), // How long Idempotency-Key responses are replayed (24 hours)
 
   // Caching
   MARKET_DATA_CACHE_TTL: z.string().default('300'), // Cache duration in seconds (5 minutes default)
+  MARKET_DATA_STALE_TTL: z.string().default('3600'), // Max age in seconds a stale quote is served while refreshing
+  QUOTE_MEMORY_CACHE_MAX_ENTRIES: z.string().default('2000'), // In-process quote cache entry limit
+  QUOTE_MEMORY_CACHE_MAX_BYTES: z.string().default('4194304'), // In-process quote cache memory budget (4MB)
+  QUOTE_WARMER_MAX_SYMBOLS_PER_RUN: z.string().default('30'), // Provider refreshes per warmer run (runs every minute)
+  QUOTE_STREAM_INTERVAL_MS: z.string().default('15000'), // Refresh interval of streamed (SSE) quotes
 });
 
 /**
@@ -12,6 +12,9 @@ import logger from './logger';
 // Singleton Redis client instance
 let redisClient: Redis | null = null;
 
+// Dedicated connection for pub/sub (a subscribed connection can't run other commands)
+let subscriberClient: Redis | null = null;
+
 /**
  * Get Redis Client Instance
  *
@@ -52,13 +55,38 @@ export const getRedisClient = (): Redis => {
   return redisClient;
 };
 
+/**
+ * Get Redis Subscriber Connection
+ *
+ * Returns a singleton duplicate of the main client for SUBSCRIBE.
+ * Publishing goes through the main client.
+ *
+ * @returns {Redis} Singleton subscriber connection
+ */
+export const getRedisSubscriber = (): Redis => {
+  if (!subscriberClient) {
+    subscriberClient = getRedisClient().duplicate();
+
+    subscriberClient.on('error', (error) => {
+      logger.error('Redis subscriber connection error:', error);
+    });
+  }
+
+  return subscriberClient;
+};
+
 /**
  * Disconnect Redis
  *
- * Gracefully closes the Redis connection.
+ * Gracefully closes the Redis connections.
  * Should be called during application shutdown.
  */
 export const disconnectRedis = async (): Promise<void> => {
+  if (subscriberClient) {
+    await subscriberClient.quit();
+    subscriberClient = null;
+  }
+
   if (redisClient) {
     await redisClient.quit();
     redisClient = null;
@@ -103,6 +131,81 @@ export const cacheSet = async (
   }
 };
 
+/**
+ * Get Multiple Cached Values
+ *
+ * Retrieves many keys in a single MGET round trip.
+ *
+ * @param {string[]} keys - Cache keys
+ * @returns {Promise<(string | null)[]>} Values in the same order as keys (null if not found)
+ */
+export const cacheMGet = async (keys: string[]): Promise<(string | null)[]> => {
+  if (keys.length === 0) return [];
+  const client = getRedisClient();
+  return await client.mget(...keys);
+};
+
+/**
+ * Set Multiple Cached Values
+ *
+ * Stores many key-value pairs in a single pipelined round trip.
+ * Unlike MSET, each entry keeps its own TTL (SETEX per key).
+ *
+ * @param {Array<{ key: string; value: string; ttlSeconds?: number }>} entries - Values to cache
+ * @throws {Error} If any command in the pipeline fails
+ */
+export const cacheMSet = async (
+  entries: Array<{ key: string; value: string; ttlSeconds?: number }>
+): Promise<void> => {
+  if (entries.length === 0) return;
+
+  const client = getRedisClient();
+  const pipeline = client.pipeline();
+  for (const { key, value, ttlSeconds } of entries) {
+    if (ttlSeconds) {
+      pipeline.setex(key, ttlSeconds, value);
+    } else {
+      pipeline.set(key, value);
+    }
+  }
+
+  const results = await pipeline.exec();
+  const failed = results?.find(([error]) => error);
+  if (failed) {
+    throw failed[0];
+  }
+};
+
+/**
+ * Try to Acquire Locks
+ *
+ * SET key NX PX for each key in one pipelined round trip. Locks are not
+ * released; they expire after ttlMs, so they also rate-limit work across
+ * server instances (e.g., one quote refresh per symbol per window).
+ *
+ * @param {string[]} keys - Lock keys
+ * @param {number} ttlMs - Lock lifetime in milliseconds
+ * @param {string} [owner='1'] - Value stored in the lock (e.g., instance id)
+ * @returns {Promise<boolean[]>} Whether each lock was acquired, in key order
+ * @throws {Error} If the pipeline fails
+ */
+export const acquireLocks = async (keys: string[], ttlMs: number, owner: string = '1'): Promise<boolean[]> => {
+  if (keys.length === 0) return [];
+
+  const client = getRedisClient();
+  const pipeline = client.pipeline();
+  for (const key of keys) {
+    pipeline.set(key, owner, 'PX', ttlMs, 'NX');
+  }
+
+  const results = await pipeline.exec();
+  return keys.map((_key, index) => {
+    const [error, reply] = results?.[index] ?? [null, null];
+    if (error) throw error;
+    return reply === 'OK';
+  });
+};
+
 /**
  * Delete Cached Value
  *
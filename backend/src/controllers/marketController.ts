@@ -1,19 +1,22 @@
 import { Request, Response } from 'express';
 import marketDataService from '../services/marketDataService';
+import priceHistoryService, { BarIntervalName } from '../services/priceHistoryService';
+import quoteStreamService from '../services/quoteStreamService';
 import { successResponse } from '../utils/responseHelper';
 import asyncHandler from '../utils/asyncHandler';
 
 export class MarketController {
   /**
    * Search for stocks/crypto
-   * GET /api/market/search
+   * GET /api/market/search?q=&type=&typeahead=
    */
   search = asyncHandler(async (req: Request, res: Response) => {
-    const { q, type } = req.query;
+    const { q, type, typeahead } = req.query;
 
     const results = await marketDataService.search(
       q as string,
-      (type as 'stock' | 'crypto' | 'all') || 'all'
+      (type as 'stock' | 'crypto' | 'all') || 'all',
+      typeahead === 'true'
     );
 
     successResponse(res, results);
@@ -31,6 +34,37 @@ export class MarketController {
     successResponse(res, quote);
   });
 
+  /**
+   * Stream live quotes (Server-Sent Events)
+   * GET /api/market/stream?symbols=AAPL,MSFT
+   */
+  stream = asyncHandler(async (req: Request, res: Response) => {
+    const symbols = (req.query.symbols as string)
+      .split(',')
+      .map((symbol) => symbol.trim().toUpperCase())
+      .filter(Boolean);
+
+    await quoteStreamService.subscribe(req, res, symbols);
+  });
+
+  /**
+   * Get OHLCV price history for a symbol
+   * GET /api/market/historical/:symbol?interval=&from=&to=&points=
+   */
+  getHistorical = asyncHandler(async (req: Request, res: Response) => {
+    const { symbol } = req.params;
+    const { interval, from, to, points } = req.query;
+
+    const history = await priceHistoryService.getHistory(symbol.toUpperCase(), {
+      interval: (interval as BarIntervalName) || '1d',
+      from: from ? new Date(from as string) : undefined,
+      to: to ? new Date(to as string) : undefined,
+      points: points ? Math.min(parseInt(points as string), 2000) : undefined,
+    });
+
+    successResponse(res, history);
+  });
+
   /**
    * Get trending stocks/crypto
    * GET /api/market/trending
@@ -0,0 +1,51 @@
+import { Request, Response } from 'express';
+import { OrderStatus } from '@prisma/client';
+import orderService from '../services/orderService';
+import { successResponse } from '../utils/responseHelper';
+import asyncHandler from '../utils/asyncHandler';
+
+export class OrderController {
+  /**
+   * Place a limit, stop or stop-limit order
+   * POST /api/orders
+   */
+  placeOrder = asyncHandler(async (req: Request, res: Response) => {
+    const userId = req.user!.userId;
+
+    const order = await orderService.placeOrder(userId, req.body);
+
+    successResponse(res, order, 'Order placed successfully', 201);
+  });
+
+  /**
+   * Get the user's orders
+   * GET /api/orders
+   */
+  getOrders = asyncHandler(async (req: Request, res: Response) => {
+    const userId = req.user!.userId;
+    const { portfolioId, status, limit, offset } = req.query;
+
+    const result = await orderService.getOrders(userId, {
+      portfolioId: portfolioId as string | undefined,
+      status: status as OrderStatus | undefined,
+      limit: limit ? parseInt(limit as string) : undefined,
+      offset: offset ? parseInt(offset as string) : undefined,
+    });
+
+    successResponse(res, result);
+  });
+
+  /**
+   * Cancel an open order
+   * DELETE /api/orders/:id
+   */
+  cancelOrder = asyncHandler(async (req: Request, res: Response) => {
+    const userId = req.user!.userId;
+
+    const order = await orderService.cancelOrder(req.params.id, userId);
+
+    successResponse(res, order, 'Order cancelled successfully');
+  });
+}
+
+export default new OrderController();
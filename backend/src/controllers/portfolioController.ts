@@ -67,6 +67,20 @@ export class PortfolioController {
 
     successResponse(res, performance);
   });
+
+  /**
+   * Get portfolio value history (one closing value per trading day)
+   * GET /api/portfolios/:id/history?days=90
+   */
+  getPortfolioHistory = asyncHandler(async (req: Request, res: Response) => {
+    const userId = req.user!.userId;
+    const { id } = req.params;
+    const { days = '90' } = req.query;
+
+    const history = await portfolioService.getValueHistory(id, userId, parseInt(days as string));
+
+    successResponse(res, history);
+  });
 }
 
 export default new PortfolioController();
@@ -44,6 +44,19 @@ export class TradeController {
     successResponse(res, result, 'Sell order executed successfully', 201);
   });
 
+  /**
+   * Execute a basket of buy/sell orders
+   * POST /api/trades/basket
+   */
+  executeBasket = asyncHandler(async (req: Request, res: Response) => {
+    const userId = req.user!.userId;
+    const { portfolioId, legs } = req.body;
+
+    const result = await tradeService.executeBasket(portfolioId, userId, legs);
+
+    successResponse(res, result, 'Basket order executed successfully', 201);
+  });
+
   /**
    * Get trade history
    * GET /api/trades/history
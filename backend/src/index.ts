@@ -7,11 +7,21 @@ import { getRedisClient, disconnectRedis } from './config/redis';
 import { errorHandler, notFoundHandler } from './middleware/errorHandler';
 import { apiLimiter } from './middleware/rateLimiter';
 import routes from './routes';
+import marketDataService from './services/marketDataService';
+import priceHistoryService from './services/priceHistoryService';
+import quoteStreamService from './services/quoteStreamService';
+import quoteBus from './services/quoteBus';
+import orderService from './services/orderService';
 import { initializeScheduledJobs } from './jobs/scheduledJobs';
+import { startWorker, stopWorker } from './jobs/worker';
 
 const app: Application = express();
 const PORT = parseInt(env.PORT);
 
+// "api" serves HTTP, "worker" runs background jobs and schedules, "all" does both
+const SERVES_API = env.PROCESS_ROLE !== 'worker';
+const RUNS_WORKER = env.PROCESS_ROLE !== 'api';
+
 // Middleware
 app.use(cors({
   origin: env.FRONTEND_URL,
@@ -58,12 +68,56 @@ const startServer = async () => {
     getRedisClient();
     logger.info('✓ Redis connected');
 
-    // Initialize scheduled jobs
-    if (env.NODE_ENV === 'production') {
-      initializeScheduledJobs();
-      logger.info('✓ Scheduled jobs initialized');
-    } else {
-      logger.info('⚠ Scheduled jobs disabled in development mode');
+    // Aggregate quotes fetched here into price history bars, and share them
+    // with other instances (each quote is fetched and stored by one instance)
+    marketDataService.onQuotes((quotes, source) => {
+      if (source !== 'provider') return;
+      priceHistoryService.ingest(quotes);
+      quoteBus.publish(quotes);
+    });
+
+    // Apply quotes fetched by other instances to the in-process cache, and
+    // move the price history volume baseline past volume they already counted
+    quoteBus.onQuotes((quotes) => {
+      marketDataService.applyPeerQuotes(quotes);
+      priceHistoryService.observePeerQuotes(quotes);
+    });
+    await quoteBus.start();
+
+    // Time partitions for intraday price bars (also kept ready by the daily prune job)
+    await priceHistoryService.ensurePartitions();
+
+    if (SERVES_API) {
+      // Push fetched quotes (from any instance) to live stream subscribers
+      marketDataService.onQuotes((quotes) => quoteStreamService.publish(quotes));
+
+      // Fill resting orders whose trigger price a fetched quote crossed; orders
+      // placed or closed on other instances arrive over the bus (and the catch-up poll)
+      quoteBus.onOrderEvents((event) => {
+        orderService.applyPeerEvent(event).catch((error) => logger.warn('Peer order event failed:', error));
+      });
+      await orderService.loadOpenOrders();
+      orderService.startSync();
+      marketDataService.onQuotes((quotes) => orderService.onPrices(quotes));
+    }
+
+    if (RUNS_WORKER) {
+      // Achievement checks, revaluations and leaderboard updates queued by API processes
+      startWorker();
+
+      // Initialize scheduled jobs (every worker schedules them; each tick enqueues
+      // one keyed job, so the task runs once across workers)
+      if (env.NODE_ENV === 'production') {
+        initializeScheduledJobs();
+        logger.info('✓ Scheduled jobs initialized');
+      } else {
+        logger.info('⚠ Scheduled jobs disabled in development mode');
+      }
+    }
+
+    if (!SERVES_API) {
+      logger.info(`⚙ Worker running (environment: ${env.NODE_ENV})`);
+      return;
     }
 
     // Start listening
@@ -83,6 +137,11 @@ const shutdown = async () => {
   logger.info('Shutting down gracefully...');
 
   try {
+    await marketDataService.flushPendingWrites();
+    await priceHistoryService.flushPendingWrites();
+    if (RUNS_WORKER) {
+      await stopWorker();
+    }
     await disconnectDatabase();
     await disconnectRedis();
     logger.info('✓ All connections closed');
@@ -0,0 +1,113 @@
+/**
+ * Background Jobs
+ *
+ * Queues for work that follows a trade but shouldn't run in the request
+ * path. API processes enqueue; worker processes run the jobs (see
+ * `jobs/worker.ts` and PROCESS_ROLE in src/index.ts).
+ *
+ * QUEUES:
+ * - achievements: one check per user, ACHIEVEMENT_CHECK_DELAY_MS after their
+ *   first trade in a burst (later trades in the window join the same job)
+ * - revaluations: one mark-to-market per portfolio, run in batches
+ * - leaderboards: a single recalculation job; schedules from every instance
+ *   collapse into one run
+ * - scheduled: one job per cron task (revaluation, snapshots, quote warming,
+ *   cleanup), keyed by task name; each worker's cron enqueues it and it runs
+ *   once, however many workers there are
+ *
+ * Enqueueing needs Redis; if it is unavailable the job is skipped and logged
+ * (the next trade or scheduled run catches up).
+ */
+
+import { JobQueue, JobQueueStats } from '../utils/jobQueue';
+
+const ACHIEVEMENT_CHECK_DELAY_MS = 2000; // Trades by one user within this window share a check
+const REVALUATION_DELAY_MS = 5000;       // Revaluations requested within this window are batched
+const SCHEDULE_COALESCE_MS = 10000;      // Cron enqueues from all workers within this window run once
+
+export interface AchievementCheckJob {
+  userId: string;
+}
+
+export interface RevaluationJob {
+  portfolioId: string;
+}
+
+export interface LeaderboardJob {
+  requestedAt: string;
+}
+
+export type ScheduledTask =
+  | 'revalue-portfolios'
+  | 'snapshot-values'
+  | 'warm-quotes'
+  | 'cleanup-market-data'
+  | 'prune-price-bars';
+
+export interface ScheduledJob {
+  task: ScheduledTask;
+  requestedAt: string; // When the cron fired (snapshots are saved for this day)
+}
+
+export const achievementQueue = new JobQueue<AchievementCheckJob>('achievements');
+export const revaluationQueue = new JobQueue<RevaluationJob>('revaluations');
+export const leaderboardQueue = new JobQueue<LeaderboardJob>('leaderboards', {
+  maxAttempts: 3,
+  retryDelayMs: 60000,
+  leaseMs: 300000,
+});
+export const scheduledQueue = new JobQueue<ScheduledJob>('scheduled', {
+  maxAttempts: 3,
+  retryDelayMs: 60000,
+  leaseMs: 300000,
+});
+
+/**
+ * Queue an Achievement Check for a User
+ *
+ * @param {string} userId - User who traded
+ * @returns {Promise<boolean>} False if a check for the user was already waiting
+ */
+export const enqueueAchievementCheck = (userId: string): Promise<boolean> =>
+  achievementQueue.enqueue(userId, { userId }, { delayMs: ACHIEVEMENT_CHECK_DELAY_MS });
+
+/**
+ * Queue a Portfolio Revaluation
+ *
+ * @param {string} portfolioId - Portfolio to mark to market
+ * @returns {Promise<boolean>} False if a revaluation was already waiting
+ */
+export const enqueueRevaluation = (portfolioId: string): Promise<boolean> =>
+  revaluationQueue.enqueue(portfolioId, { portfolioId }, { delayMs: REVALUATION_DELAY_MS });
+
+/**
+ * Queue a Leaderboard Recalculation
+ *
+ * @returns {Promise<boolean>} False if a recalculation was already waiting
+ */
+export const enqueueLeaderboardUpdate = (): Promise<boolean> =>
+  leaderboardQueue.enqueue('all', { requestedAt: new Date().toISOString() });
+
+/**
+ * Queue a Scheduled Task
+ *
+ * The job id is the task name, and the job waits SCHEDULE_COALESCE_MS before
+ * it is due. Every worker's cron fires at about the same time, so their
+ * enqueues land while the first one is still waiting and collapse into it.
+ *
+ * @param {ScheduledTask} task - Task to run
+ * @returns {Promise<boolean>} False if the task was already waiting
+ */
+export const enqueueScheduledTask = (task: ScheduledTask): Promise<boolean> =>
+  scheduledQueue.enqueue(task, { task, requestedAt: new Date().toISOString() }, { delayMs: SCHEDULE_COALESCE_MS });
+
+/**
+ * Get Statistics for All Queues
+ *
+ * @returns {Promise<Record<string, JobQueueStats>>} Depths and counters per queue
+ */
+export const getJobQueueStats = async (): Promise<Record<string, JobQueueStats>> => {
+  const queues = [achievementQueue, revaluationQueue, leaderboardQueue, scheduledQueue];
+  const stats = await Promise.all(queues.map((queue) => queue.getStats()));
+  return Object.fromEntries(queues.map((queue, i) => [queue.name, stats[i]]));
+};
@@ -0,0 +1,111 @@
+/**
+ * Quote Warmer
+ *
+ * Background job that refreshes quotes for the "hot" symbol set before they
+ * expire, so user requests are served from cache instead of paying provider latency.
+ *
+ * HOT SET:
+ * - Symbols currently held in any portfolio (holdings.symbol)
+ * - Symbols on any watchlist (watchlists.symbol)
+ * - Curated trending list (TRENDING_SYMBOLS)
+ * - Most traded symbols on the platform (getPopularSymbols)
+ * - Symbols with resting limit/stop orders (the matcher needs their prices)
+ *
+ * RATE BUDGET:
+ * Each run refreshes at most QUOTE_WARMER_MAX_SYMBOLS_PER_RUN symbols, oldest first,
+ * and only those within REFRESH_AHEAD_RATIO of the soft TTL. With the default
+ * 1-minute schedule this uses half of Finnhub's 60 req/min, leaving headroom
+ * for interactive requests.
+ */
+
+import getPrismaClient from '../config/database';
+import { env } from '../config/env';
+import logger from '../config/logger';
+import marketDataService, { TRENDING_SYMBOLS } from '../services/marketDataService';
+
+const prisma = getPrismaClient();
+
+const CACHE_TTL_MS = parseInt(env.MARKET_DATA_CACHE_TTL) * 1000;
+const MAX_SYMBOLS_PER_RUN = parseInt(env.QUOTE_WARMER_MAX_SYMBOLS_PER_RUN);
+const REFRESH_AHEAD_RATIO = 0.8; // Refresh once a quote has used 80% of its soft TTL
+
+let isRunning = false;
+
+/**
+ * Build Hot Symbol Set
+ *
+ * @returns {Promise<string[]>} Deduplicated, uppercased symbols worth keeping warm
+ */
+export async function buildHotSymbolSet(): Promise<string[]> {
+  const [holdings, watchlists, orders, popular] = await Promise.all([
+    prisma.holding.findMany({
+      distinct: ['symbol'],
+      select: { symbol: true },
+    }),
+    prisma.watchlist.findMany({
+      distinct: ['symbol'],
+      select: { symbol: true },
+    }),
+    // Read from the database (not the matcher's index) so the warmer can run in a worker
+    prisma.order.findMany({
+      where: { status: 'OPEN' },
+      distinct: ['symbol'],
+      select: { symbol: true },
+    }),
+    marketDataService.getPopularSymbols(),
+  ]);
+
+  const symbols = new Set<string>();
+  holdings.forEach((h) => symbols.add(h.symbol.toUpperCase()));
+  watchlists.forEach((w) => symbols.add(w.symbol.toUpperCase()));
+  TRENDING_SYMBOLS.forEach((s) => symbols.add(s));
+  popular.forEach((s) => symbols.add(s.toUpperCase()));
+  orders.forEach((o) => symbols.add(o.symbol));
+
+  return [...symbols];
+}
+
+/**
+ * Warm Hot Quotes
+ *
+ * Refreshes the hot symbols that are missing from cache or close to expiry,
+ * oldest first, within the per-run rate budget. Skips if a previous run is still going.
+ *
+ * @returns {Promise<{ hotSymbols: number; due: number; refreshed: number }>} Run summary
+ */
+export async function warmHotQuotes(): Promise<{ hotSymbols: number; due: number; refreshed: number }> {
+  if (isRunning) {
+    logger.debug('Quote warmer still running, skipping this run');
+    return { hotSymbols: 0, due: 0, refreshed: 0 };
+  }
+
+  isRunning = true;
+
+  try {
+    const hotSymbols = await buildHotSymbolSet();
+    const ages = await marketDataService.getQuoteAges(hotSymbols);
+    const now = Date.now();
+
+    // Never-cached symbols sort first (age 0), then oldest fetch time
+    const due = hotSymbols
+      .map((symbol) => ({ symbol, fetchedAt: ages.get(symbol)?.getTime() ?? 0 }))
+      .filter(({ fetchedAt }) => now - fetchedAt >= CACHE_TTL_MS * REFRESH_AHEAD_RATIO)
+      .sort((a, b) => a.fetchedAt - b.fetchedAt)
+      .map(({ symbol }) => symbol);
+
+    const batch = due.slice(0, MAX_SYMBOLS_PER_RUN);
+    const refreshed = await marketDataService.refreshQuotes(batch);
+    const { coverage } = marketDataService.getCacheStats();
+
+    logger.info(
+      `Quote warmer: ${hotSymbols.length} hot, ${due.length} due, ` +
+      `${refreshed.size}/${batch.length} refreshed, warm read coverage ${(coverage.ratio * 100).toFixed(1)}%`
+    );
+
+    return { hotSymbols: hotSymbols.length, due: due.length, refreshed: refreshed.size };
+  } finally {
+    isRunning = false;
+  }
+}
+
+export default warmHotQuotes;
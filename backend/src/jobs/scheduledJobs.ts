@@ -1,5 +1,8 @@
 import cron from 'node-cron';
-import leaderboardService from '../services/leaderboardService';
+import priceHistoryService from '../services/priceHistoryService';
+import portfolioService from '../services/portfolioService';
+import { warmHotQuotes } from './quoteWarmer';
+import { enqueueLeaderboardUpdate, enqueueScheduledTask, ScheduledJob, ScheduledTask } from './backgroundJobs';
 import logger from '../config/logger';
 import getPrismaClient from '../config/database';
 
@@ -23,73 +26,141 @@ async function cleanupStaleMarketData() {
   logger.info(`Cleaned up ${result?.count ?? 0} stale market data cache entries`);
 }
 
+/**
+ * Check US market hours
+ * Returns true between 9 AM and 4 PM EST/EDT (inclusive of the 4 PM hour), Mon-Fri
+ */
+function isMarketHours(now: Date): boolean {
+  // Use Intl.DateTimeFormat to reliably extract hour and day in America/New_York timezone
+  const estFormatter = new Intl.DateTimeFormat('en-US', {
+    timeZone: 'America/New_York',
+    hour: 'numeric',
+    hour12: false,
+    weekday: 'short'
+  });
+  const parts = estFormatter.formatToParts(now);
+  const hour = parseInt(parts.find(p => p.type === 'hour')?.value || '0', 10);
+  // Map weekday string to JS day index (0=Sunday, 1=Monday, ..., 6=Saturday)
+  const weekdayStr = parts.find(p => p.type === 'weekday')?.value || '';
+  const weekdayMap: { [key: string]: number } = { Sun: 0, Mon: 1, Tue: 2, Wed: 3, Thu: 4, Fri: 5, Sat: 6 };
+  const dayOfWeek = weekdayMap[weekdayStr] ?? -1;
+  if (dayOfWeek === -1) {
+    logger.warn(`Unexpected weekday format: ${weekdayStr}`);
+    return false;
+  }
+
+  // Only run during market hours (9 AM - 4 PM EST/EDT, Mon-Fri)
+  const isWeekday = dayOfWeek >= 1 && dayOfWeek <= 5;
+  return isWeekday && hour >= 9 && hour <= 16;
+}
+
+/**
+ * Run a Scheduled Task
+ *
+ * Called by the worker that claimed the task's job (see jobs/worker.ts), so
+ * each task runs once per schedule however many workers enqueued it.
+ *
+ * @param {ScheduledJob} job - Task and the time its cron fired
+ */
+export async function runScheduledTask(job: ScheduledJob): Promise<void> {
+  switch (job.task) {
+    case 'revalue-portfolios':
+      await portfolioService.revalueAllPortfolios();
+      break;
+    case 'snapshot-values':
+      logger.info('Saving daily portfolio value snapshots...');
+      await portfolioService.snapshotPortfolioValues(new Date(job.requestedAt));
+      // Re-rank the period leaderboards against the new snapshots
+      await enqueueLeaderboardUpdate();
+      break;
+    case 'warm-quotes':
+      await warmHotQuotes();
+      break;
+    case 'cleanup-market-data':
+      logger.info('Running market data cache cleanup...');
+      await cleanupStaleMarketData();
+      logger.info('Market data cache cleanup completed');
+      break;
+    case 'prune-price-bars':
+      await priceHistoryService.pruneBars();
+      break;
+  }
+}
+
+/**
+ * Queue a Scheduled Task from a Cron Tick
+ */
+async function schedule(task: ScheduledTask): Promise<void> {
+  try {
+    await enqueueScheduledTask(task);
+  } catch (error) {
+    logger.error(`Failed to queue scheduled task ${task}:`, error);
+  }
+}
+
 /**
  * Initialize all scheduled jobs
+ *
+ * Every worker process runs these crons. Each tick only enqueues a job keyed
+ * by the task (or the leaderboard job), so the work itself runs once.
  */
 export const initializeScheduledJobs = () => {
   logger.info('Initializing scheduled jobs...');
 
   // Calculate leaderboards daily at midnight
+  // (queued, so workers on several instances run it once)
   cron.schedule('0 0 * * *', async () => {
-    logger.info('Running daily leaderboard calculation...');
+    logger.info('Queueing daily leaderboard calculation...');
     try {
-      await leaderboardService.calculateLeaderboards();
-      logger.info('Daily leaderboard calculation completed');
+      await enqueueLeaderboardUpdate();
     } catch (error) {
-      logger.error('Daily leaderboard calculation failed:', error);
+      logger.error('Failed to queue daily leaderboard calculation:', error);
     }
   });
 
-  // Calculate leaderboards every 2 hours (reduced frequency to minimize API calls)
+  // Resync the live leaderboards from the database and save a snapshot every 2 hours
+  // (rankings update on every revaluation in between)
   cron.schedule('0 */2 * * *', async () => {
     // Get current time in EST/EDT (America/New_York timezone)
     const now = new Date();
-    // Use Intl.DateTimeFormat to reliably extract hour and day in America/New_York timezone
-    const estFormatter = new Intl.DateTimeFormat('en-US', {
-      timeZone: 'America/New_York',
-      hour: 'numeric',
-      hour12: false,
-      weekday: 'short'
-    });
-    const parts = estFormatter.formatToParts(now);
-    const hour = parseInt(parts.find(p => p.type === 'hour')?.value || '0', 10);
-    // Map weekday string to JS day index (0=Sunday, 1=Monday, ..., 6=Saturday)
-    const weekdayStr = parts.find(p => p.type === 'weekday')?.value || '';
-    const weekdayMap: { [key: string]: number } = { Sun: 0, Mon: 1, Tue: 2, Wed: 3, Thu: 4, Fri: 5, Sat: 6 };
-    const dayOfWeek = weekdayMap[weekdayStr] ?? -1;
-    if (dayOfWeek === -1) {
-      logger.warn(`Unexpected weekday format: ${weekdayStr}`);
-      return;
-    }
 
-    // Only run during market hours (9 AM - 4 PM EST/EDT, Mon-Fri)
-    const isWeekday = dayOfWeek >= 1 && dayOfWeek <= 5;
-    const isMarketHours = hour >= 9 && hour <= 16;
-
-    if (isWeekday && isMarketHours) {
-      logger.info(`Running scheduled leaderboard update (EST time: ${now.toLocaleTimeString('en-US', { timeZone: 'America/New_York' })})...`);
+    if (isMarketHours(now)) {
+      logger.info(`Queueing scheduled leaderboard update (EST time: ${now.toLocaleTimeString('en-US', { timeZone: 'America/New_York' })})...`);
       try {
-        await leaderboardService.calculateLeaderboards();
-        logger.info('Scheduled leaderboard update completed');
+        await enqueueLeaderboardUpdate();
       } catch (error) {
-        logger.error('Scheduled leaderboard update failed:', error);
+        logger.error('Failed to queue scheduled leaderboard update:', error);
       }
     } else {
-      logger.debug(`Skipping leaderboard update - outside market hours (EST time: ${now.toLocaleTimeString('en-US', { timeZone: 'America/New_York' })}, ${isWeekday ? 'weekday' : 'weekend'})`);
+      logger.debug(`Skipping leaderboard update - outside market hours (EST time: ${now.toLocaleTimeString('en-US', { timeZone: 'America/New_York' })})`);
     }
   });
 
-  // Cleanup stale market data cache daily at 2 AM
-  cron.schedule('0 2 * * *', async () => {
-    logger.info('Running market data cache cleanup...');
-    try {
-      await cleanupStaleMarketData();
-      logger.info('Market data cache cleanup completed');
-    } catch (error) {
-      logger.error('Market data cache cleanup failed:', error);
+  // Refresh hot symbol quotes ahead of expiry every minute during market hours
+  cron.schedule('* * * * *', async () => {
+    if (isMarketHours(new Date())) {
+      await schedule('warm-quotes');
     }
   });
 
+  // Mark all portfolios to market every 15 minutes during market hours
+  // (trades only adjust totalValue by their own delta)
+  cron.schedule('*/15 * * * *', async () => {
+    if (isMarketHours(new Date())) {
+      await schedule('revalue-portfolios');
+    }
+  });
+
+  // Save each portfolio's closing value after the market closes (4:15 PM EST/EDT, Mon-Fri),
+  // then re-rank the period leaderboards against the new snapshots
+  cron.schedule('15 16 * * 1-5', () => schedule('snapshot-values'), { timezone: 'America/New_York' });
+
+  // Cleanup stale market data cache daily at 2 AM
+  cron.schedule('0 2 * * *', () => schedule('cleanup-market-data'));
+
+  // Prune expired intraday price bars daily at 2:30 AM
+  cron.schedule('30 2 * * *', () => schedule('prune-price-bars'));
+
   logger.info('Scheduled jobs initialized successfully');
 };
 
@@ -0,0 +1,77 @@
+/**
+ * Background Job Worker
+ *
+ * Runs the background job queues in this process. Started by src/index.ts
+ * when PROCESS_ROLE is `worker` or `all`.
+ *
+ * CONCURRENCY (per worker process):
+ * - achievements: JOB_CONCURRENCY checks at once, one user per job
+ * - revaluations: one batch of up to REVALUATION_BATCH_SIZE portfolios at a time
+ *   (one holdings query, one quote batch and one UPDATE per batch)
+ * - leaderboards: one recalculation at a time
+ * - scheduled: two cron tasks at a time, so a long revaluation or snapshot
+ *   doesn't hold up quote warming
+ */
+
+import { env } from '../config/env';
+import logger from '../config/logger';
+import achievementService from '../services/achievementService';
+import portfolioService from '../services/portfolioService';
+import leaderboardService from '../services/leaderboardService';
+import { achievementQueue, leaderboardQueue, revaluationQueue, scheduledQueue } from './backgroundJobs';
+import { runScheduledTask } from './scheduledJobs';
+
+const REVALUATION_BATCH_SIZE = 200;
+
+/**
+ * Start Processing Background Jobs
+ */
+export const startWorker = (): void => {
+  achievementQueue.process(
+    async ([job]) => {
+      await achievementService.checkAndAwardAchievements(job.data.userId);
+    },
+    { concurrency: parseInt(env.JOB_CONCURRENCY), batchSize: 1 }
+  );
+
+  revaluationQueue.process(
+    async (jobs) => {
+      await portfolioService.revaluePortfolios(jobs.map((job) => job.data.portfolioId));
+    },
+    { concurrency: 1, batchSize: REVALUATION_BATCH_SIZE }
+  );
+
+  leaderboardQueue.process(
+    async () => {
+      await leaderboardService.calculateLeaderboards();
+    },
+    { concurrency: 1, batchSize: 1, pollIntervalMs: 5000 }
+  );
+
+  scheduledQueue.process(
+    async ([job]) => {
+      await runScheduledTask(job.data);
+    },
+    { concurrency: 2, batchSize: 1, pollIntervalMs: 1000 }
+  );
+
+  logger.info('✓ Background job worker started');
+};
+
+/**
+ * Stop Processing Background Jobs
+ *
+ * Stops claiming new jobs and waits for running ones to finish.
+ *
+ * @returns {Promise<void>}
+ */
+export const stopWorker = async (): Promise<void> => {
+  await Promise.all([
+    achievementQueue.stop(),
+    revaluationQueue.stop(),
+    leaderboardQueue.stop(),
+    scheduledQueue.stop(),
+  ]);
+};
+
+export default startWorker;
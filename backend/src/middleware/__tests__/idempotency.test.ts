@@ -0,0 +1,142 @@
+import { EventEmitter } from 'events';
+import { Request, Response } from 'express';
+import { idempotency } from '../idempotency';
+
+jest.mock('../../config/env', () => ({
+  env: { IDEMPOTENCY_TTL_SECONDS: '86400' },
+}));
+
+jest.mock('../../config/logger', () => ({
+  __esModule: true,
+  default: { info: jest.fn(), warn: jest.fn(), error: jest.fn(), debug: jest.fn() },
+}));
+
+// In-memory stand-in for the SET NX / GET / DEL calls the middleware makes
+const mockStore = new Map<string, string>();
+const mockClient = {
+  set: jest.fn(async (key: string, value: string, ...options: (string | number)[]) => {
+    if (options.includes('NX') && mockStore.has(key)) return null;
+    mockStore.set(key, value);
+    return 'OK';
+  }),
+  get: jest.fn(async (key: string) => mockStore.get(key) ?? null),
+  del: jest.fn(async (key: string) => Number(mockStore.delete(key))),
+};
+
+jest.mock('../../config/redis', () => ({
+  getRedisClient: () => mockClient,
+}));
+
+const request = (key: string | undefined, body: object = { symbol: 'AAPL', quantity: 10 }) =>
+  ({
+    method: 'POST',
+    baseUrl: '/api/trades',
+    path: '/buy',
+    body,
+    user: { userId: 'user-1', email: 'user@example.com' },
+    get: (header: string) => (header === 'Idempotency-Key' ? key : undefined),
+  }) as unknown as Request;
+
+// Minimal response: records what was sent and emits 'finish' after json()
+class FakeResponse extends EventEmitter {
+  statusCode = 200;
+  headers: Record<string, string> = {};
+  body: unknown;
+
+  status(code: number): this {
+    this.statusCode = code;
+    return this;
+  }
+
+  set(name: string, value: string): this {
+    this.headers[name] = value;
+    return this;
+  }
+
+  json(body: unknown): this {
+    this.body = body;
+    setImmediate(() => this.emit('finish'));
+    return this;
+  }
+}
+
+// Runs the middleware; `handler` plays the route when the middleware calls next()
+const run = async (req: Request, handler?: (res: FakeResponse) => void) => {
+  const res = new FakeResponse();
+  const next = jest.fn(() => handler?.(res));
+  await idempotency(req, res as unknown as Response, next);
+  await new Promise((resolve) => setImmediate(resolve)); // let 'finish' record the result
+  return { res, next };
+};
+
+const created = (res: FakeResponse) => res.status(201).json({ tradeId: 't-1' });
+
+describe('idempotency middleware', () => {
+  beforeEach(() => {
+    mockStore.clear();
+    jest.clearAllMocks();
+  });
+
+  it('passes requests without the header straight through', async () => {
+    const { next } = await run(request(undefined));
+
+    expect(next).toHaveBeenCalledTimes(1);
+    expect(mockClient.set).not.toHaveBeenCalled();
+  });
+
+  it('rejects keys that are empty or too long', async () => {
+    const { res, next } = await run(request('x'.repeat(256)));
+
+    expect(res.statusCode).toBe(400);
+    expect(next).not.toHaveBeenCalled();
+  });
+
+  it('replays the stored response for a retry without running the handler', async () => {
+    await run(request('key-1'), created);
+    const stored = JSON.parse(mockStore.get('idempotency:user-1:POST:/api/trades/buy:key-1')!);
+    expect(stored).toMatchObject({ state: 'done', status: 201, body: { tradeId: 't-1' } });
+
+    const retry = await run(request('key-1'), created);
+
+    expect(retry.next).not.toHaveBeenCalled();
+    expect(retry.res.statusCode).toBe(201);
+    expect(retry.res.body).toEqual({ tradeId: 't-1' });
+    expect(retry.res.headers['Idempotent-Replayed']).toBe('true');
+  });
+
+  it('rejects a key reused with a different request body', async () => {
+    await run(request('key-1'), created);
+
+    const { res, next } = await run(request('key-1', { symbol: 'AAPL', quantity: 20 }), created);
+
+    expect(res.statusCode).toBe(422);
+    expect(next).not.toHaveBeenCalled();
+  });
+
+  it('answers 409 while the first request is still running', async () => {
+    await run(request('key-1')); // claims the key, never responds
+
+    const { res, next } = await run(request('key-1'), created);
+
+    expect(res.statusCode).toBe(409);
+    expect(next).not.toHaveBeenCalled();
+  });
+
+  it('releases the key when the response may succeed on retry', async () => {
+    await run(request('key-1'), (res) => res.status(503).json({ error: 'Unavailable' }));
+    expect(mockStore.size).toBe(0);
+
+    const retry = await run(request('key-1'), created);
+
+    expect(retry.next).toHaveBeenCalledTimes(1);
+    expect(retry.res.statusCode).toBe(201);
+  });
+
+  it('processes the request normally when Redis is unavailable', async () => {
+    mockClient.set.mockRejectedValueOnce(new Error('ECONNREFUSED'));
+
+    const { next } = await run(request('key-1'), created);
+
+    expect(next).toHaveBeenCalledTimes(1);
+  });
+});
@@ -0,0 +1,117 @@
+/**
+ * Idempotency Middleware
+ *
+ * Makes POST endpoints safe to retry: a request carrying an `Idempotency-Key`
+ * header is executed once, and retries with the same key get the stored
+ * response back without running the handler again.
+ *
+ * PROCESS:
+ * 1. Claim the key in Redis (`SET NX`) with a short in-flight TTL
+ * 2. If the key is new, run the handler and store its status and body
+ *    for IDEMPOTENCY_TTL_SECONDS
+ * 3. If the key has a stored response, replay it (`Idempotent-Replayed: true`)
+ * 4. If the key is still in flight, answer 409 so the client retries later
+ *
+ * RULES:
+ * - Keys are scoped per user and endpoint
+ * - Reusing a key with a different request body is rejected (422)
+ * - Responses that may succeed on retry (5xx, 409, 429) aren't stored; the
+ *   key is released instead
+ * - Requests without the header are not affected
+ * - If Redis is unavailable, requests run normally (no deduplication)
+ */
+import { Request, Response, NextFunction } from 'express';
+import { createHash } from 'crypto';
+import { env } from '../config/env';
+import logger from '../config/logger';
+import { getRedisClient } from '../config/redis';
+
+const HEADER = 'Idempotency-Key';
+const MAX_KEY_LENGTH = 255;
+const IN_FLIGHT_TTL_MS = 30000; // Released sooner when the request finishes
+const RESULT_TTL_SECONDS = parseInt(env.IDEMPOTENCY_TTL_SECONDS);
+
+interface IdempotencyRecord {
+  state: 'in_flight' | 'done';
+  fingerprint: string;
+  status?: number;
+  body?: unknown;
+}
+
+const isReplayable = (status: number): boolean => status < 500 && status !== 409 && status !== 429;
+
+export const idempotency = async (req: Request, res: Response, next: NextFunction): Promise<void> => {
+  const key = req.get(HEADER);
+  if (key === undefined) {
+    next();
+    return;
+  }
+
+  if (key.length === 0 || key.length > MAX_KEY_LENGTH) {
+    res.status(400).json({ error: `${HEADER} must be 1-${MAX_KEY_LENGTH} characters` });
+    return;
+  }
+
+  const userId = req.user?.userId ?? 'anonymous';
+  const redisKey = `idempotency:${userId}:${req.method}:${req.baseUrl}${req.path}:${key}`;
+  const fingerprint = createHash('sha256').update(JSON.stringify(req.body ?? {})).digest('hex');
+
+  let existing: IdempotencyRecord | null = null;
+  try {
+    const client = getRedisClient();
+    const claim: IdempotencyRecord = { state: 'in_flight', fingerprint };
+    const claimed = await client.set(redisKey, JSON.stringify(claim), 'PX', IN_FLIGHT_TTL_MS, 'NX');
+
+    if (!claimed) {
+      const stored = await client.get(redisKey);
+      existing = stored ? JSON.parse(stored) : null;
+      if (!existing) {
+        // Released between SET and GET; the client can retry right away
+        res.status(409).json({ error: 'A request with this Idempotency-Key is in progress' });
+        return;
+      }
+    }
+  } catch (error) {
+    logger.warn('Idempotency store unavailable, processing request without deduplication:', error);
+    next();
+    return;
+  }
+
+  if (existing) {
+    if (existing.fingerprint !== fingerprint) {
+      res.status(422).json({ error: `${HEADER} was already used with a different request` });
+    } else if (existing.state === 'in_flight') {
+      res.status(409).json({ error: 'A request with this Idempotency-Key is in progress' });
+    } else {
+      res.set('Idempotent-Replayed', 'true');
+      res.status(existing.status!).json(existing.body);
+    }
+    return;
+  }
+
+  // Capture the response body so it can be replayed
+  let responseBody: unknown;
+  const json = res.json.bind(res);
+  res.json = (body: unknown) => {
+    responseBody = body;
+    return json(body);
+  };
+
+  res.on('finish', () => {
+    const client = getRedisClient();
+    const done: Promise<unknown> = isReplayable(res.statusCode)
+      ? client.set(
+          redisKey,
+          JSON.stringify({ state: 'done', fingerprint, status: res.statusCode, body: responseBody }),
+          'EX',
+          RESULT_TTL_SECONDS
+        )
+      : client.del(redisKey);
+
+    done.catch((error) => logger.warn(`Failed to record idempotent response for ${redisKey}:`, error));
+  });
+
+  next();
+};
+
+export default idempotency;
@@ -2,10 +2,17 @@ import { Router } from 'express';
 import authRoutes from './authRoutes';
 import portfolioRoutes from './portfolioRoutes';
 import tradeRoutes from './tradeRoutes';
+import orderRoutes from './orderRoutes';
 import marketRoutes from './marketRoutes';
 import leaderboardRoutes from './leaderboardRoutes';
 import achievementRoutes from './achievementRoutes';
 import watchlistRoutes from './watchlistRoutes';
+import marketDataService from '../services/marketDataService';
+import priceHistoryService from '../services/priceHistoryService';
+import quoteStreamService from '../services/quoteStreamService';
+import quoteBus from '../services/quoteBus';
+import orderService from '../services/orderService';
+import { getJobQueueStats } from '../jobs/backgroundJobs';
 
 const router = Router();
 
@@ -13,17 +20,24 @@ const router = Router();
 router.use('/auth', authRoutes);
 router.use('/portfolios', portfolioRoutes);
 router.use('/trades', tradeRoutes);
+router.use('/orders', orderRoutes);
 router.use('/market', marketRoutes);
 router.use('/leaderboards', leaderboardRoutes);
 router.use('/achievements', achievementRoutes);
 router.use('/watchlist', watchlistRoutes);
 
 // Health check
-router.get('/health', (_req, res) => {
+router.get('/health', async (_req, res) => {
   res.status(200).json({
     status: 'healthy',
     timestamp: new Date().toISOString(),
     uptime: process.uptime(),
+    cache: marketDataService.getCacheStats(),
+    history: priceHistoryService.getStats(),
+    stream: quoteStreamService.getStats(),
+    bus: quoteBus.getStats(),
+    orders: orderService.getStats(),
+    jobs: await getJobQueueStats(),
   });
 });
 
@@ -1,13 +1,15 @@
 import { Router } from 'express';
 import marketController from '../controllers/marketController';
 import { validate } from '../middleware/validation';
-import { getQuoteSchema, searchMarketSchema } from '../types';
+import { getPriceHistorySchema, getQuoteSchema, searchMarketSchema, streamQuotesSchema } from '../types';
 
 const router = Router();
 
 // Market data routes (public)
 router.get('/search', validate(searchMarketSchema), marketController.search);
 router.get('/quote/:symbol', validate(getQuoteSchema), marketController.getQuote);
+router.get('/historical/:symbol', validate(getPriceHistorySchema), marketController.getHistorical);
+router.get('/stream', validate(streamQuotesSchema), marketController.stream);
 router.get('/trending', marketController.getTrending);
 router.get('/popular', marketController.getPopular);
 
@@ -0,0 +1,18 @@
+import { Router } from 'express';
+import orderController from '../controllers/orderController';
+import { authenticateToken } from '../middleware/auth';
+import { validate } from '../middleware/validation';
+import { tradeLimiter } from '../middleware/rateLimiter';
+import { idempotency } from '../middleware/idempotency';
+import { cancelOrderSchema, getOrdersSchema, placeOrderSchema } from '../types';
+
+const router = Router();
+
+// All order routes require authentication
+router.use(authenticateToken);
+
+router.get('/', validate(getOrdersSchema), orderController.getOrders);
+router.post('/', idempotency, tradeLimiter, validate(placeOrderSchema), orderController.placeOrder);
+router.delete('/:id', validate(cancelOrderSchema), orderController.cancelOrder);
+
+export default router;
@@ -2,7 +2,7 @@ import { Router } from 'express';
 import portfolioController from '../controllers/portfolioController';
 import { authenticateToken } from '../middleware/auth';
 import { validate } from '../middleware/validation';
-import { createPortfolioSchema } from '../types';
+import { createPortfolioSchema, getPortfolioHistorySchema } from '../types';
 
 const router = Router();
 
@@ -14,5 +14,6 @@ router.post('/', validate(createPortfolioSchema), portfolioController.createPort
 router.get('/:id', portfolioController.getPortfolioById);
 router.get('/:id/value', portfolioController.getPortfolioValue);
 router.get('/:id/performance', portfolioController.getPortfolioPerformance);
+router.get('/:id/history', validate(getPortfolioHistorySchema), portfolioController.getPortfolioHistory);
 
 export default router;
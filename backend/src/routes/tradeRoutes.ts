@@ -3,15 +3,18 @@ import tradeController from '../controllers/tradeController';
 import { authenticateToken } from '../middleware/auth';
 import { validate } from '../middleware/validation';
 import { tradeLimiter } from '../middleware/rateLimiter';
-import { executeTradeSchema, validateTradeSchema } from '../types';
+import { idempotency } from '../middleware/idempotency';
+import { executeBasketSchema, executeTradeSchema, validateTradeSchema } from '../types';
 
 const router = Router();
 
 // All trade routes require authentication
 router.use(authenticateToken);
 
-router.post('/buy', tradeLimiter, validate(executeTradeSchema), tradeController.executeBuy);
-router.post('/sell', tradeLimiter, validate(executeTradeSchema), tradeController.executeSell);
+// Order submissions accept an Idempotency-Key header; replays skip the rate limit
+router.post('/buy', idempotency, tradeLimiter, validate(executeTradeSchema), tradeController.executeBuy);
+router.post('/sell', idempotency, tradeLimiter, validate(executeTradeSchema), tradeController.executeSell);
+router.post('/basket', idempotency, tradeLimiter, validate(executeBasketSchema), tradeController.executeBasket);
 router.get('/history', tradeController.getTradeHistory);
 router.post('/validate', validate(validateTradeSchema), tradeController.validateTrade);
 
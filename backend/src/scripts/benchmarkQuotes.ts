@@ -0,0 +1,109 @@
+/**
+ * Quote Path Benchmark Script
+ * Exercises the full quote cache hierarchy (L0 → Redis → database → provider)
+ * against the simulated feed, so no external API keys or network access are needed.
+ *
+ * Requires the database and Redis to be running. Writes BENCHxxxx symbols
+ * to market_data_cache (and Redis); remove them afterwards if needed.
+ *
+ * USAGE:
+ *   npm run bench:quotes -- [symbols=200] [concurrency=50] [rounds=5]
+ */
+
+import { disconnectDatabase } from '../config/database';
+import { disconnectRedis } from '../config/redis';
+import logger from '../config/logger';
+import { MarketDataService } from '../services/marketDataService';
+import { SimulatedProvider } from '../services/providers';
+
+/**
+ * Latency percentile (ms) of a sorted sample
+ */
+function percentile(sorted: number[], p: number): number {
+  if (sorted.length === 0) return 0;
+  return sorted[Math.min(sorted.length - 1, Math.floor((p / 100) * sorted.length))];
+}
+
+/**
+ * Run reads with bounded concurrency and report latency
+ */
+async function measure(
+  label: string,
+  total: number,
+  concurrency: number,
+  read: (index: number) => Promise<unknown>
+): Promise<void> {
+  const latencies: number[] = [];
+  let next = 0;
+  let failures = 0;
+  const startedAt = Date.now();
+
+  const workers = Array.from({ length: concurrency }, async () => {
+    while (next < total) {
+      const index = next++;
+      const t0 = process.hrtime.bigint();
+      try {
+        await read(index);
+      } catch {
+        failures++;
+      }
+      latencies.push(Number(process.hrtime.bigint() - t0) / 1e6);
+    }
+  });
+  await Promise.all(workers);
+
+  const elapsedMs = Date.now() - startedAt;
+  latencies.sort((a, b) => a - b);
+  logger.info(
+    `${label}: ${total} reads in ${elapsedMs}ms (${Math.round((total / Math.max(elapsedMs, 1)) * 1000)}/s), ` +
+    `p50 ${percentile(latencies, 50).toFixed(2)}ms, p95 ${percentile(latencies, 95).toFixed(2)}ms, ` +
+    `p99 ${percentile(latencies, 99).toFixed(2)}ms, failures ${failures}`
+  );
+}
+
+/**
+ * Benchmark the quote path
+ */
+export async function benchmarkQuotes(symbolCount = 200, concurrency = 50, rounds = 5): Promise<void> {
+  const service = new MarketDataService([new SimulatedProvider()]);
+  const symbols = Array.from({ length: symbolCount }, (_, i) => `BENCH${String(i).padStart(4, '0')}`);
+
+  logger.info(`=== Quote Benchmark: ${symbolCount} symbols, concurrency ${concurrency}, ${rounds} rounds ===`);
+
+  try {
+    // Cold: every symbol misses all caches (provider + write-through), unless a previous run cached it
+    await measure('getQuote cold', symbolCount, concurrency, (i) => service.getQuote(symbols[i]));
+
+    // Warm: served from the in-process cache
+    await measure('getQuote warm', symbolCount * rounds, concurrency, (i) =>
+      service.getQuote(symbols[i % symbolCount])
+    );
+
+    // Batch: 20-symbol pages (watchlist/portfolio sized)
+    await measure('getQuoteBatch x20', Math.ceil(symbolCount / 20) * rounds, concurrency, (i) => {
+      const offset = (i * 20) % symbolCount;
+      return service.getQuoteBatch(symbols.slice(offset, offset + 20));
+    });
+
+    logger.info('Cache stats:', service.getCacheStats());
+  } finally {
+    await disconnectDatabase();
+    await disconnectRedis();
+  }
+}
+
+// Run if executed directly
+if (require.main === module) {
+  const [symbolCount, concurrency, rounds] = process.argv.slice(2).map((arg) => parseInt(arg));
+
+  benchmarkQuotes(symbolCount || undefined, concurrency || undefined, rounds || undefined)
+    .then(() => {
+      process.exit(0);
+    })
+    .catch((error) => {
+      logger.error('Fatal error:', error);
+      process.exit(1);
+    });
+}
+
+export default benchmarkQuotes;
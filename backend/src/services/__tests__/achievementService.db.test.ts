@@ -0,0 +1,136 @@
+import { randomUUID } from 'crypto';
+import type { PrismaClient } from '@prisma/client';
+import type { AchievementService, TradeEvent } from '../achievementService';
+import { disconnectRedis, getRedisClient } from '../../config/redis';
+
+jest.mock('../../config/logger', () => ({
+  __esModule: true,
+  default: { info: jest.fn(), warn: jest.fn(), error: jest.fn(), debug: jest.fn() },
+}));
+
+jest.mock('../leaderboardService', () => ({
+  __esModule: true,
+  default: { getPeriodReturns: jest.fn(async () => []) },
+}));
+
+// Rebuilds counters from a real Postgres (migration.sql applied) into a real Redis;
+// skipped unless both DATABASE_TEST_URL and REDIS_TEST_URL are set
+const DATABASE_TEST_URL = process.env.DATABASE_TEST_URL;
+const REDIS_TEST_URL = process.env.REDIS_TEST_URL;
+const describeWithStores = DATABASE_TEST_URL && REDIS_TEST_URL ? describe : describe.skip;
+
+describeWithStores('AchievementService counters (Postgres + Redis)', () => {
+  let prisma: PrismaClient;
+  let achievementService: AchievementService;
+  let userId: string;
+  let portfolioId: string;
+
+  beforeAll(() => {
+    // The services create their Prisma client on import, so load them after pointing it at the test stores
+    process.env.DATABASE_URL = DATABASE_TEST_URL;
+    process.env.REDIS_URL = REDIS_TEST_URL;
+    prisma = require('../../config/database').getPrismaClient();
+    achievementService = require('../achievementService').default;
+  });
+
+  beforeEach(async () => {
+    const suffix = randomUUID().slice(0, 8);
+    const user = await prisma.user.create({
+      data: {
+        username: `achiever-${suffix}`,
+        email: `achiever-${suffix}@example.com`,
+        passwordHash: 'x',
+        portfolios: { create: { name: 'Test', cashBalance: 100000 } },
+      },
+      include: { portfolios: true },
+    });
+    userId = user.id;
+    portfolioId = user.portfolios[0].id;
+  });
+
+  afterEach(async () => {
+    jest.restoreAllMocks();
+    const keys = await getRedisClient().keys(`achievements:${userId}:*`);
+    if (keys.length > 0) await getRedisClient().del(...keys);
+    await prisma.user.delete({ where: { id: userId } }); // cascades to portfolio, holdings, trades
+  });
+
+  afterAll(async () => {
+    await disconnectRedis();
+    await require('../../config/database').disconnectDatabase();
+  });
+
+  // Commits a buy the way the trade paths do (trade_seq bumped in the same
+  // transaction) and returns the event they would record
+  const buy = (symbol: string, quantity: number): Promise<TradeEvent> =>
+    prisma.$transaction(async (tx): Promise<TradeEvent> => {
+      const { tradeSeq } = await tx.portfolio.update({
+        where: { id: portfolioId },
+        data: { tradeSeq: { increment: 1 } },
+      });
+      const existing = await tx.holding.findUnique({ where: { portfolioId_symbol: { portfolioId, symbol } } });
+      await tx.holding.upsert({
+        where: { portfolioId_symbol: { portfolioId, symbol } },
+        create: { portfolioId, symbol, assetType: 'STOCK', quantity, averageCost: 100 },
+        update: { quantity: { increment: quantity } },
+      });
+      const trade = await tx.trade.create({
+        data: { portfolioId, symbol, assetType: 'STOCK', tradeType: 'BUY', quantity, price: 100, totalValue: 100 * quantity },
+      });
+
+      return {
+        portfolioId,
+        symbol,
+        executedAt: trade.executedAt,
+        position: existing ? 'changed' : 'opened',
+        seq: Number(tradeSeq),
+      };
+    });
+
+  it('rebuilds missing counters from the database', async () => {
+    const first = await buy('AAPL', 2);
+    await buy('MSFT', 1);
+    await buy('AAPL', 1);
+
+    await expect(achievementService.getStats(userId)).resolves.toEqual({
+      tradeCount: 3,
+      dailyTrades: 3,
+      uniqueHoldings: 2,
+      oldestOpenPositionAt: first.executedAt,
+    });
+    expect(await getRedisClient().hget(`achievements:${userId}:stats`, 'trades')).toBe('3');
+  });
+
+  it('applies trades recorded after a rebuild', async () => {
+    await achievementService.getStats(userId); // builds empty counters
+
+    const event = await buy('AAPL', 1);
+    await achievementService.recordTrades(userId, [event]);
+
+    await expect(achievementService.getStats(userId)).resolves.toMatchObject({ tradeCount: 1, uniqueHoldings: 1 });
+  });
+
+  it('skips a trade committed before the rebuild but recorded after it', async () => {
+    const event = await buy('AAPL', 1);
+    await expect(achievementService.getStats(userId)).resolves.toMatchObject({ tradeCount: 1 });
+
+    await achievementService.recordTrades(userId, [event]);
+
+    await expect(achievementService.getStats(userId)).resolves.toMatchObject({ tradeCount: 1, uniqueHoldings: 1 });
+  });
+
+  it('does not store a rebuild that a trade was recorded during', async () => {
+    const service = achievementService as any;
+    const loadStatsSnapshot = service.loadStatsSnapshot.bind(service);
+    jest.spyOn(service, 'loadStatsSnapshot').mockImplementationOnce(async (id: unknown) => {
+      const snapshot = await loadStatsSnapshot(id);
+      await achievementService.recordTrades(userId, [await buy('AAPL', 1)]);
+      return snapshot;
+    });
+
+    await expect(achievementService.getStats(userId)).resolves.toMatchObject({ tradeCount: 0 });
+    expect(await getRedisClient().exists(`achievements:${userId}:stats`)).toBe(0);
+
+    await expect(achievementService.getStats(userId)).resolves.toMatchObject({ tradeCount: 1 });
+  });
+});
@@ -0,0 +1,106 @@
+import { randomUUID } from 'crypto';
+import type { PrismaClient } from '@prisma/client';
+import type { LeaderboardService } from '../leaderboardService';
+import { addDays, startOfDay, toDateString } from '../../utils/dates';
+
+jest.mock('../../config/logger', () => ({
+  __esModule: true,
+  default: { info: jest.fn(), warn: jest.fn(), error: jest.fn(), debug: jest.fn() },
+}));
+
+jest.mock('../../jobs/backgroundJobs', () => ({
+  enqueueLeaderboardUpdate: jest.fn(async () => true),
+}));
+
+// Runs the snapshot ranking SQL against a real Postgres with migration.sql applied;
+// skipped unless DATABASE_TEST_URL is set. Other suites may add portfolios to the
+// same database, so ranks are compared relative to each other.
+const DATABASE_TEST_URL = process.env.DATABASE_TEST_URL;
+const describeWithDatabase = DATABASE_TEST_URL ? describe : describe.skip;
+
+describeWithDatabase('LeaderboardService snapshots (Postgres)', () => {
+  let prisma: PrismaClient;
+  let leaderboardService: LeaderboardService;
+  const userIds: string[] = [];
+  const portfolios: Record<'up' | 'tied' | 'recovering' | 'inactive', string> = {} as any;
+  const today = startOfDay(new Date());
+
+  // What the scheduled job stores for today (saveSnapshots is private)
+  const saveSnapshots = (): Promise<unknown> => (leaderboardService as any).saveSnapshots(today);
+
+  const createPortfolio = async (totalValue: number, isActive = true): Promise<string> => {
+    const suffix = randomUUID().slice(0, 8);
+    const user = await prisma.user.create({
+      data: {
+        username: `ranked-${suffix}`,
+        email: `ranked-${suffix}@example.com`,
+        passwordHash: 'x',
+        startingBalance: 10000,
+        portfolios: { create: { name: 'Test', cashBalance: totalValue, totalValue, isActive } },
+      },
+      include: { portfolios: true },
+    });
+    userIds.push(user.id);
+    return user.portfolios[0].id;
+  };
+
+  const snapshot = async () =>
+    prisma.leaderboard.findMany({
+      where: { portfolioId: { in: Object.values(portfolios) }, snapshotDate: today },
+    });
+
+  beforeAll(async () => {
+    // The services create their Prisma client on import, so load them after pointing it at the test database
+    process.env.DATABASE_URL = DATABASE_TEST_URL;
+    prisma = require('../../config/database').getPrismaClient();
+    leaderboardService = require('../leaderboardService').default;
+
+    portfolios.up = await createPortfolio(11000);
+    portfolios.tied = await createPortfolio(11000);
+    portfolios.recovering = await createPortfolio(9000);
+    portfolios.inactive = await createPortfolio(50000, false);
+
+    // A week ago the recovering portfolio was worth 8000
+    await prisma.$executeRaw`
+      INSERT INTO "portfolio_value_snapshots" ("portfolio_id", "date", "total_value")
+      VALUES (${portfolios.recovering}, ${toDateString(addDays(today, -7))}::date, 8000)
+    `;
+  });
+
+  afterAll(async () => {
+    await prisma.user.deleteMany({ where: { id: { in: userIds } } }); // cascades to portfolios, snapshots and rankings
+    await require('../../config/database').disconnectDatabase();
+  });
+
+  it('ranks every period in SQL against its base value', async () => {
+    await saveSnapshots();
+    const rows = await snapshot();
+    const entry = (period: string, portfolioId: string) =>
+      rows.find((row) => row.period === period && row.portfolioId === portfolioId)!;
+
+    // All time: measured from the starting balance
+    expect(Number(entry('ALL_TIME', portfolios.up).returnPercentage)).toBe(10);
+    expect(Number(entry('ALL_TIME', portfolios.recovering).returnPercentage)).toBe(-10);
+    expect(entry('ALL_TIME', portfolios.up).rank).toBeLessThan(entry('ALL_TIME', portfolios.recovering).rank);
+
+    // Weekly: the recovering portfolio is measured from its snapshot a week ago
+    expect(Number(entry('WEEKLY', portfolios.recovering).returnPercentage)).toBe(12.5);
+    expect(entry('WEEKLY', portfolios.recovering).rank).toBeLessThan(entry('WEEKLY', portfolios.up).rank);
+
+    // Equal returns share a rank
+    expect(entry('ALL_TIME', portfolios.tied).rank).toBe(entry('ALL_TIME', portfolios.up).rank);
+  });
+
+  it('leaves inactive portfolios out', async () => {
+    await saveSnapshots();
+    expect((await snapshot()).filter((row) => row.portfolioId === portfolios.inactive)).toEqual([]);
+  });
+
+  it("replaces today's rows when run again", async () => {
+    await saveSnapshots();
+    await saveSnapshots();
+
+    const rows = await snapshot();
+    expect(rows).toHaveLength(3 * 4); // three active portfolios, four periods
+  });
+});
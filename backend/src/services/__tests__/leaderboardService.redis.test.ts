@@ -0,0 +1,124 @@
+import getPrismaClient from '../../config/database';
+import { disconnectRedis, getRedisClient } from '../../config/redis';
+import { enqueueLeaderboardUpdate } from '../../jobs/backgroundJobs';
+import leaderboardService from '../leaderboardService';
+
+jest.mock('../../config/logger', () => ({
+  __esModule: true,
+  default: { info: jest.fn(), warn: jest.fn(), error: jest.fn(), debug: jest.fn() },
+}));
+
+jest.mock('../../jobs/backgroundJobs', () => ({
+  enqueueLeaderboardUpdate: jest.fn(async () => true),
+}));
+
+// Portfolio lookups the live reads make; the boards themselves live in Redis
+const PORTFOLIOS = [
+  { id: 'p1', userId: 'u1', name: 'Growth', totalValue: 11000 },
+  { id: 'p2', userId: 'u1', name: 'Value', totalValue: 9000 },
+  { id: 'p3', userId: 'u2', name: 'Momentum', totalValue: 12000 },
+];
+
+jest.mock('../../config/database', () => {
+  const client = {
+    portfolio: { findMany: jest.fn() },
+    leaderboard: { findMany: jest.fn(async () => []), findFirst: jest.fn(async () => null), count: jest.fn(async () => 0) },
+  };
+  return { __esModule: true, default: () => client, getPrismaClient: () => client };
+});
+
+const prisma = getPrismaClient() as unknown as {
+  portfolio: { findMany: jest.Mock };
+  leaderboard: { findMany: jest.Mock };
+};
+
+// Runs the scoring script against a real Redis; skipped unless REDIS_TEST_URL is set
+const REDIS_TEST_URL = process.env.REDIS_TEST_URL;
+const describeWithRedis = REDIS_TEST_URL ? describe : describe.skip;
+
+const PERIODS = ['DAILY', 'WEEKLY', 'MONTHLY', 'ALL_TIME'];
+
+describeWithRedis('LeaderboardService live boards (Redis)', () => {
+  beforeAll(() => {
+    process.env.REDIS_URL = REDIS_TEST_URL;
+  });
+
+  beforeEach(async () => {
+    jest.clearAllMocks();
+    prisma.portfolio.findMany.mockImplementation(async ({ where }: { where: { id?: { in: string[] }; userId?: string } }) =>
+      PORTFOLIOS.filter((p) => (where.id ? where.id.in.includes(p.id) : p.userId === where.userId)).map((p) => ({
+        id: p.id,
+        name: p.name,
+        totalValue: { toNumber: () => p.totalValue },
+        user: { username: p.userId },
+      }))
+    );
+
+    await getRedisClient().set('leaderboard:built', new Date().toISOString());
+    await leaderboardService.updateScores(
+      PORTFOLIOS.map((p) => ({ portfolioId: p.id, totalValue: p.totalValue, startingBalance: 10000, isActive: true }))
+    );
+  });
+
+  afterEach(async () => {
+    const keys = PERIODS.flatMap((period) => [`leaderboard:${period}`, `leaderboard:${period}:base`]);
+    await getRedisClient().del('leaderboard:built', ...keys);
+  });
+
+  afterAll(async () => {
+    await disconnectRedis();
+  });
+
+  const ranking = async (period: 'DAILY' | 'ALL_TIME') =>
+    (await leaderboardService.getLeaderboard(period, 10, 0)).map((entry) => [entry.id, entry.rank, entry.returnPercentage]);
+
+  it('ranks portfolios by return against the starting balance', async () => {
+    expect(await ranking('ALL_TIME')).toEqual([
+      ['p3', 1, 20],
+      ['p1', 2, 10],
+      ['p2', 3, -10],
+    ]);
+  });
+
+  it("scores period boards against the period's base value", async () => {
+    await getRedisClient().hset('leaderboard:DAILY:base', 'p3', 12000, 'p2', 8000);
+    await leaderboardService.updateScores([
+      { portfolioId: 'p2', totalValue: 9000, startingBalance: 10000, isActive: true },
+      { portfolioId: 'p3', totalValue: 12000, startingBalance: 10000, isActive: true },
+    ]);
+
+    expect(await ranking('DAILY')).toEqual([
+      ['p2', 1, 12.5],
+      ['p1', 2, 10],
+      ['p3', 3, 0],
+    ]);
+  });
+
+  it('drops inactive portfolios from every board', async () => {
+    await getRedisClient().hset('leaderboard:DAILY:base', 'p3', 12000);
+    await leaderboardService.updateScores([{ portfolioId: 'p3', totalValue: 12000, startingBalance: 10000, isActive: false }]);
+
+    expect((await ranking('ALL_TIME')).map(([id]) => id)).toEqual(['p1', 'p2']);
+    expect(await getRedisClient().hexists('leaderboard:DAILY:base', 'p3')).toBe(0);
+  });
+
+  it("reports a user's best-ranked portfolio", async () => {
+    await expect(leaderboardService.getUserPosition('u1', 'ALL_TIME')).resolves.toEqual({
+      rank: 2,
+      returnPercentage: 10,
+      totalParticipants: 3,
+      percentile: (2 / 3) * 100,
+    });
+    await expect(leaderboardService.getUserRanks('u2')).resolves.toEqual(
+      PERIODS.map((period) => ({ period, rank: 1, returnPercentage: 20 }))
+    );
+  });
+
+  it('serves the database snapshot and queues a rebuild until the boards are built', async () => {
+    await getRedisClient().del('leaderboard:built');
+
+    await expect(leaderboardService.getLeaderboard('ALL_TIME', 10, 0)).resolves.toEqual([]);
+    expect(prisma.leaderboard.findMany).toHaveBeenCalled();
+    expect(enqueueLeaderboardUpdate).toHaveBeenCalled();
+  });
+});
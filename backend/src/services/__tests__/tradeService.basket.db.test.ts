@@ -0,0 +1,180 @@
+import { randomUUID } from 'crypto';
+import type { PrismaClient } from '@prisma/client';
+import type { TradeService } from '../tradeService';
+
+jest.mock('../../config/logger', () => ({
+  __esModule: true,
+  default: { info: jest.fn(), warn: jest.fn(), error: jest.fn(), debug: jest.fn() },
+}));
+
+// Fixed prices instead of provider calls
+const mockPrices = new Map<string, number>();
+jest.mock('../marketDataService', () => ({
+  __esModule: true,
+  default: {
+    getQuote: jest.fn(async (symbol: string) => ({ symbol, currentPrice: mockPrices.get(symbol) })),
+    getQuoteBatch: jest.fn(async (symbols: string[]) => {
+      const quotes = new Map<string, { symbol: string; currentPrice: number }>();
+      for (const symbol of symbols) {
+        const price = mockPrices.get(symbol);
+        if (price !== undefined) quotes.set(symbol, { symbol, currentPrice: price });
+      }
+      return quotes;
+    }),
+  },
+}));
+
+jest.mock('../portfolioService', () => ({
+  __esModule: true,
+  default: { scheduleRevaluation: jest.fn() },
+}));
+
+const mockRecordTrades = jest.fn(async (userId: string, events: unknown[]) => undefined);
+jest.mock('../achievementService', () => ({
+  __esModule: true,
+  default: { recordTrades: (userId: string, events: unknown[]) => mockRecordTrades(userId, events) },
+}));
+
+jest.mock('../../jobs/backgroundJobs', () => ({
+  enqueueAchievementCheck: jest.fn(async () => true),
+}));
+
+// Runs executeBasket against a real Postgres with migration.sql applied;
+// skipped unless DATABASE_TEST_URL is set
+const DATABASE_TEST_URL = process.env.DATABASE_TEST_URL;
+const describeWithDatabase = DATABASE_TEST_URL ? describe : describe.skip;
+
+describeWithDatabase('TradeService baskets (Postgres)', () => {
+  let prisma: PrismaClient;
+  let tradeService: TradeService;
+  let userId: string;
+  let portfolioId: string;
+
+  beforeAll(() => {
+    // The services create their Prisma client on import, so load them after pointing it at the test database
+    process.env.DATABASE_URL = DATABASE_TEST_URL;
+    prisma = require('../../config/database').getPrismaClient();
+    tradeService = require('../tradeService').default;
+  });
+
+  beforeEach(async () => {
+    mockPrices.clear();
+    mockPrices.set('AAPL', 100);
+    mockPrices.set('MSFT', 300);
+    jest.clearAllMocks();
+
+    const suffix = randomUUID().slice(0, 8);
+    const user = await prisma.user.create({
+      data: { username: `basket-${suffix}`, email: `basket-${suffix}@example.com`, passwordHash: 'x' },
+    });
+    const portfolio = await prisma.portfolio.create({
+      data: {
+        userId: user.id,
+        name: 'Test',
+        cashBalance: 1000,
+        totalValue: 2000,
+        holdings: { create: { symbol: 'AAPL', assetType: 'STOCK', quantity: 10, averageCost: 100 } },
+      },
+    });
+    userId = user.id;
+    portfolioId = portfolio.id;
+  });
+
+  afterEach(async () => {
+    await prisma.user.delete({ where: { id: userId } }); // cascades to portfolio, holdings, trades
+  });
+
+  afterAll(async () => {
+    await require('../../config/database').disconnectDatabase();
+  });
+
+  const portfolio = () =>
+    prisma.portfolio.findUniqueOrThrow({
+      where: { id: portfolioId },
+      include: { holdings: { orderBy: { symbol: 'asc' } }, trades: true },
+    });
+
+  const holdings = async () =>
+    (await portfolio()).holdings.map((h) => [h.symbol, Number(h.quantity)]);
+
+  it('applies every leg in one trade statement, selling to fund buys', async () => {
+    const result = await tradeService.executeBasket(portfolioId, userId, [
+      { symbol: 'aapl', assetType: 'STOCK', tradeType: 'SELL', quantity: 10 },
+      { symbol: 'MSFT', assetType: 'STOCK', tradeType: 'BUY', quantity: 6 },
+    ]);
+
+    expect(result.trades.map((t) => [t.symbol, t.tradeType, t.totalValue])).toEqual([
+      ['AAPL', 'SELL', 1000],
+      ['MSFT', 'BUY', 1800],
+    ]);
+    expect(result.portfolio).toEqual({ cashBalance: 200, totalValue: 2000 });
+
+    const after = await portfolio();
+    expect(await holdings()).toEqual([['MSFT', 6]]);
+    expect(after.trades).toHaveLength(2);
+    expect(Number(after.tradeSeq)).toBe(1);
+
+    expect(mockRecordTrades).toHaveBeenCalledWith(userId, [
+      expect.objectContaining({ symbol: 'AAPL', position: 'closed', seq: 1 }),
+      expect.objectContaining({ symbol: 'MSFT', position: 'opened', seq: 1 }),
+    ]);
+  });
+
+  it('rejects the whole basket when cash does not cover it', async () => {
+    await expect(
+      tradeService.executeBasket(portfolioId, userId, [
+        { symbol: 'AAPL', assetType: 'STOCK', tradeType: 'SELL', quantity: 1 },
+        { symbol: 'MSFT', assetType: 'STOCK', tradeType: 'BUY', quantity: 4 },
+      ])
+    ).rejects.toMatchObject({ message: 'Insufficient funds', statusCode: 400 });
+
+    const after = await portfolio();
+    expect(Number(after.cashBalance)).toBe(1000);
+    expect(await holdings()).toEqual([['AAPL', 10]]);
+    expect(after.trades).toEqual([]);
+  });
+
+  it('rejects sells the holdings do not cover', async () => {
+    await expect(
+      tradeService.executeBasket(portfolioId, userId, [{ symbol: 'MSFT', assetType: 'STOCK', tradeType: 'SELL', quantity: 1 }])
+    ).rejects.toMatchObject({ message: 'No holdings found for MSFT', statusCode: 400 });
+
+    await expect(
+      tradeService.executeBasket(portfolioId, userId, [{ symbol: 'AAPL', assetType: 'STOCK', tradeType: 'SELL', quantity: 11 }])
+    ).rejects.toMatchObject({ message: 'Insufficient holdings for AAPL. Available: 10', statusCode: 400 });
+  });
+
+  it('rejects repeated symbols and unpriced legs before trading', async () => {
+    await expect(
+      tradeService.executeBasket(portfolioId, userId, [
+        { symbol: 'AAPL', assetType: 'STOCK', tradeType: 'SELL', quantity: 1 },
+        { symbol: 'aapl', assetType: 'STOCK', tradeType: 'BUY', quantity: 1 },
+      ])
+    ).rejects.toMatchObject({ message: 'Duplicate symbol in basket: AAPL', statusCode: 400 });
+
+    await expect(
+      tradeService.executeBasket(portfolioId, userId, [{ symbol: 'NVDA', assetType: 'STOCK', tradeType: 'BUY', quantity: 1 }])
+    ).rejects.toMatchObject({ statusCode: 503 });
+  });
+
+  it('runs alongside single-trade sells of the same holding without deadlocking', async () => {
+    // Baskets and single sells both lock the portfolio row before the holding
+    const baskets = Array.from({ length: 5 }, () =>
+      tradeService.executeBasket(portfolioId, userId, [
+        { symbol: 'AAPL', assetType: 'STOCK', tradeType: 'SELL', quantity: 1 },
+        { symbol: 'MSFT', assetType: 'STOCK', tradeType: 'BUY', quantity: 1 },
+      ])
+    );
+    const sells = Array.from({ length: 5 }, () =>
+      tradeService.executeTrade(portfolioId, userId, 'AAPL', 'STOCK', 'SELL', 1)
+    );
+
+    const results = await Promise.allSettled([...baskets, ...sells]);
+    expect(results.filter((r) => r.status === 'rejected')).toEqual([]);
+
+    const after = await portfolio();
+    expect(Number(after.cashBalance)).toBe(500);
+    expect(await holdings()).toEqual([['MSFT', 5]]);
+    expect(Number(after.tradeSeq)).toBe(10);
+  });
+});
@@ -0,0 +1,169 @@
+import { randomUUID } from 'crypto';
+import type { PrismaClient } from '@prisma/client';
+import type { TradeService } from '../tradeService';
+
+jest.mock('../../config/logger', () => ({
+  __esModule: true,
+  default: { info: jest.fn(), warn: jest.fn(), error: jest.fn(), debug: jest.fn() },
+}));
+
+// Fixed prices instead of provider calls
+const mockPrices = new Map<string, number>();
+jest.mock('../marketDataService', () => ({
+  __esModule: true,
+  default: {
+    getQuote: jest.fn(async (symbol: string) => ({ symbol, currentPrice: mockPrices.get(symbol) })),
+  },
+}));
+
+jest.mock('../portfolioService', () => ({
+  __esModule: true,
+  default: { scheduleRevaluation: jest.fn() },
+}));
+
+const mockRecordTrades = jest.fn(async (userId: string, events: unknown[]) => undefined);
+jest.mock('../achievementService', () => ({
+  __esModule: true,
+  default: { recordTrades: (userId: string, events: unknown[]) => mockRecordTrades(userId, events) },
+}));
+
+jest.mock('../../jobs/backgroundJobs', () => ({
+  enqueueAchievementCheck: jest.fn(async () => true),
+}));
+
+// Runs applyBuy/applySell against a real Postgres with migration.sql applied;
+// skipped unless DATABASE_TEST_URL is set
+const DATABASE_TEST_URL = process.env.DATABASE_TEST_URL;
+const describeWithDatabase = DATABASE_TEST_URL ? describe : describe.skip;
+
+describeWithDatabase('TradeService single trades (Postgres)', () => {
+  let prisma: PrismaClient;
+  let tradeService: TradeService;
+  let userId: string;
+  let portfolioId: string;
+
+  beforeAll(() => {
+    // The services create their Prisma client on import, so load them after pointing it at the test database
+    process.env.DATABASE_URL = DATABASE_TEST_URL;
+    prisma = require('../../config/database').getPrismaClient();
+    tradeService = require('../tradeService').default;
+  });
+
+  beforeEach(async () => {
+    mockPrices.clear();
+    mockPrices.set('AAPL', 100);
+    mockPrices.set('MSFT', 300);
+    jest.clearAllMocks();
+
+    const suffix = randomUUID().slice(0, 8);
+    const user = await prisma.user.create({
+      data: { username: `trader-${suffix}`, email: `trader-${suffix}@example.com`, passwordHash: 'x' },
+    });
+    const portfolio = await prisma.portfolio.create({
+      data: { userId: user.id, name: 'Test', cashBalance: 1000, totalValue: 1000 },
+    });
+    userId = user.id;
+    portfolioId = portfolio.id;
+  });
+
+  afterEach(async () => {
+    await prisma.user.delete({ where: { id: userId } }); // cascades to portfolio, holdings, trades
+  });
+
+  afterAll(async () => {
+    await require('../../config/database').disconnectDatabase();
+  });
+
+  const portfolio = () =>
+    prisma.portfolio.findUniqueOrThrow({ where: { id: portfolioId }, include: { holdings: true, trades: true } });
+
+  it('buys: debits cash, creates the holding and records the trade', async () => {
+    const result = await tradeService.executeTrade(portfolioId, userId, 'AAPL', 'STOCK', 'BUY', 3);
+
+    expect(result.trade).toMatchObject({ symbol: 'AAPL', tradeType: 'BUY', quantity: 3, price: 100, totalValue: 300 });
+    expect(result.portfolio).toEqual({ cashBalance: 700, totalValue: 1000 });
+
+    const after = await portfolio();
+    expect(Number(after.cashBalance)).toBe(700);
+    expect(after.holdings.map((h) => [h.symbol, Number(h.quantity), Number(h.averageCost)])).toEqual([['AAPL', 3, 100]]);
+    expect(after.trades).toHaveLength(1);
+    expect(Number(after.tradeSeq)).toBe(1);
+  });
+
+  it('averages the cost of repeated buys', async () => {
+    await tradeService.executeTrade(portfolioId, userId, 'AAPL', 'STOCK', 'BUY', 2);
+    mockPrices.set('AAPL', 130);
+    await tradeService.executeTrade(portfolioId, userId, 'AAPL', 'STOCK', 'BUY', 1);
+
+    const [holding] = (await portfolio()).holdings;
+    expect(Number(holding.quantity)).toBe(3);
+    expect(Number(holding.averageCost)).toBe(110);
+  });
+
+  it('sells: credits cash and deletes a holding sold in full', async () => {
+    await tradeService.executeTrade(portfolioId, userId, 'AAPL', 'STOCK', 'BUY', 4);
+    mockPrices.set('AAPL', 120);
+
+    const partial = await tradeService.executeTrade(portfolioId, userId, 'AAPL', 'STOCK', 'SELL', 1);
+    expect(partial.portfolio.cashBalance).toBe(720);
+    expect(Number((await portfolio()).holdings[0].quantity)).toBe(3);
+
+    await tradeService.executeTrade(portfolioId, userId, 'AAPL', 'STOCK', 'SELL', 3);
+    const after = await portfolio();
+    expect(Number(after.cashBalance)).toBe(1080);
+    expect(after.holdings).toEqual([]);
+    expect(Number(after.tradeSeq)).toBe(3);
+  });
+
+  it('reports position changes to the achievement counters', async () => {
+    await tradeService.executeTrade(portfolioId, userId, 'AAPL', 'STOCK', 'BUY', 2);
+    await tradeService.executeTrade(portfolioId, userId, 'AAPL', 'STOCK', 'SELL', 2);
+
+    expect(mockRecordTrades.mock.calls.map(([, events]) => events)).toEqual([
+      [expect.objectContaining({ portfolioId, symbol: 'AAPL', position: 'opened', seq: 1 })],
+      [expect.objectContaining({ portfolioId, symbol: 'AAPL', position: 'closed', seq: 2 })],
+    ]);
+  });
+
+  it('rejects a buy the cash does not cover without changing anything', async () => {
+    await expect(tradeService.executeTrade(portfolioId, userId, 'AAPL', 'STOCK', 'BUY', 11)).rejects.toMatchObject({
+      message: 'Insufficient funds',
+      statusCode: 400,
+    });
+
+    const after = await portfolio();
+    expect(Number(after.cashBalance)).toBe(1000);
+    expect(after.holdings).toEqual([]);
+    expect(after.trades).toEqual([]);
+  });
+
+  it('rejects selling more than is held', async () => {
+    await tradeService.executeTrade(portfolioId, userId, 'AAPL', 'STOCK', 'BUY', 5);
+
+    await expect(tradeService.executeTrade(portfolioId, userId, 'AAPL', 'STOCK', 'SELL', 6)).rejects.toMatchObject({
+      message: 'Insufficient holdings. Available: 5',
+      statusCode: 400,
+    });
+    await expect(tradeService.executeTrade(portfolioId, userId, 'MSFT', 'STOCK', 'SELL', 1)).rejects.toMatchObject({
+      message: 'No holdings found for this symbol',
+    });
+  });
+
+  it("rejects trades in another user's portfolio", async () => {
+    await expect(
+      tradeService.executeTrade(portfolioId, randomUUID(), 'AAPL', 'STOCK', 'BUY', 1)
+    ).rejects.toMatchObject({ message: 'Portfolio not found', statusCode: 404 });
+  });
+
+  it('never overdraws cash under concurrent buys', async () => {
+    const results = await Promise.allSettled(
+      Array.from({ length: 20 }, () => tradeService.executeTrade(portfolioId, userId, 'AAPL', 'STOCK', 'BUY', 1))
+    );
+
+    expect(results.filter((r) => r.status === 'fulfilled')).toHaveLength(10);
+    const after = await portfolio();
+    expect(Number(after.cashBalance)).toBe(0);
+    expect(Number(after.holdings[0].quantity)).toBe(10);
+    expect(after.trades).toHaveLength(10);
+  });
+});
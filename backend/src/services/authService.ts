@@ -32,6 +32,7 @@ import { AppError } from '../middleware/errorHandler';
 import { generateAccessToken, generateRefreshToken } from '../middleware/auth';
 import { AuthResponse, UserResponse } from '../types';
 import logger from '../config/logger';
+import leaderboardService from './leaderboardService';
 
 const prisma = getPrismaClient();
 
@@ -84,7 +85,7 @@ export class AuthService {
       });
 
       // Create default portfolio
-      await prisma.portfolio.create({
+      const portfolio = await prisma.portfolio.create({
         data: {
           userId: user.id,
           name: 'Main Portfolio',
@@ -96,6 +97,17 @@ export class AuthService {
 
       logger.info(`New user registered: ${user.email}`);
 
+      leaderboardService
+        .updateScores([
+          {
+            portfolioId: portfolio.id,
+            totalValue: user.startingBalance.toNumber(),
+            startingBalance: user.startingBalance.toNumber(),
+            isActive: true,
+          },
+        ])
+        .catch((error) => logger.warn(`Failed to add portfolio ${portfolio.id} to leaderboards:`, error));
+
       return this.generateAuthResponse(user);
     } catch (error) {
       if (error instanceof AppError) {
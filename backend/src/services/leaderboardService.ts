@@ -1,10 +1,115 @@
-import { LeaderboardPeriod } from '@prisma/client';
+/**
+ * Leaderboard Service
+ *
+ * Live rankings in Redis sorted sets, updated whenever a portfolio is marked
+ * to market, with daily snapshots persisted to the `leaderboards` table.
+ *
+ * BOARDS (`leaderboard:<period>`, every active portfolio):
+ * - ALL_TIME: return against the user's starting balance
+ * - DAILY / WEEKLY / MONTHLY: return since the portfolio's value snapshot from
+ *   1 / 7 / 30 days ago (see PortfolioService.snapshotPortfolioValues), or
+ *   against the starting balance if the portfolio is newer than that
+ * - `leaderboard:<period>:base` holds each portfolio's base value for the period,
+ *   so a new value can be re-scored without touching the database
+ *
+ * PROCESS:
+ * 1. PortfolioService.revaluePortfolios (trades, scheduled revaluations) calls
+ *    updateScores with the new values: one script call re-scores every board
+ * 2. Reads use ZREVRANGE (pages) and ZREVRANK/ZSCORE (a user's position), O(log n)
+ * 3. calculateLeaderboards (scheduled) ranks every period in SQL into the
+ *    `leaderboards` table (today's snapshot, kept for history), then resyncs
+ *    the boards and base values from the database in cursor pages
+ *
+ * If the boards haven't been built yet, or Redis is unavailable, reads fall
+ * back to today's snapshot in the database.
+ */
+
+import { createHash } from 'crypto';
+import { LeaderboardPeriod, Prisma } from '@prisma/client';
 import getPrismaClient from '../config/database';
+import { getRedisClient } from '../config/redis';
 import { AppError } from '../middleware/errorHandler';
 import logger from '../config/logger';
+import { enqueueLeaderboardUpdate } from '../jobs/backgroundJobs';
+import { addDays, startOfDay, toDateString } from '../utils/dates';
 
 const prisma = getPrismaClient();
 
+const PERIODS: LeaderboardPeriod[] = ['DAILY', 'WEEKLY', 'MONTHLY', 'ALL_TIME'];
+const LOOKBACK_DAYS: Partial<Record<LeaderboardPeriod, number>> = { DAILY: 1, WEEKLY: 7, MONTHLY: 30 };
+const BUILT_KEY = 'leaderboard:built';  // Set once the boards were built from the database
+const REBUILD_PAGE_SIZE = 1000;         // Portfolios read per query when rebuilding
+
+// KEYS = board, base hash for each period
+// ARGV = portfolio id, value, starting balance, active (1/0) for each portfolio
+const SCORE_SCRIPT = `
+for i = 1, #ARGV, 4 do
+  local id = ARGV[i]
+  local value = tonumber(ARGV[i + 1])
+  local start = tonumber(ARGV[i + 2])
+  for k = 1, #KEYS, 2 do
+    if ARGV[i + 3] == '1' then
+      local base = tonumber(redis.call('HGET', KEYS[k + 1], id)) or start
+      if base > 0 then
+        redis.call('ZADD', KEYS[k], (value - base) / base * 100, id)
+      end
+    else
+      redis.call('ZREM', KEYS[k], id)
+      redis.call('HDEL', KEYS[k + 1], id)
+    end
+  end
+end
+return #ARGV / 4
+`;
+const SCORE_SCRIPT_SHA = createHash('sha1').update(SCORE_SCRIPT).digest('hex');
+
+/**
+ * Portfolio value to rank (from a revaluation or a new portfolio)
+ */
+export interface PortfolioValuation {
+  portfolioId: string;
+  totalValue: number;
+  startingBalance: number;
+  isActive: boolean;
+}
+
+export interface PeriodReturn {
+  portfolioId: string;
+  returnPercentage: number;
+  hasBaseline: boolean; // False if the portfolio is newer than the period (measured from its start)
+}
+
+interface RankedPortfolio {
+  portfolioId: string;
+  rank: number;
+  returnPercentage: number;
+}
+
+const boardKey = (period: LeaderboardPeriod): string => `leaderboard:${period}`;
+const baseKey = (period: LeaderboardPeriod): string => `leaderboard:${period}:base`;
+
+const returnPercentage = (value: number, base: number): number => ((value - base) / base) * 100;
+
+/**
+ * Base Value of a Period (portfolio alias `p`)
+ *
+ * The portfolio's latest value snapshot on or before the period's start: one
+ * primary key lookup on (portfolio_id, date). NULL if there is none.
+ */
+const snapshotBaseSql = (period: LeaderboardPeriod, today: Date): Prisma.Sql => {
+  const days = LOOKBACK_DAYS[period];
+  if (!days) {
+    return Prisma.sql`NULL::decimal`;
+  }
+
+  return Prisma.sql`(
+    SELECT s."total_value" FROM "portfolio_value_snapshots" s
+    WHERE s."portfolio_id" = p."id" AND s."date" <= ${toDateString(addDays(today, -days))}::date
+    ORDER BY s."date" DESC
+    LIMIT 1
+  )`;
+};
+
 export class LeaderboardService {
   /**
    * Get leaderboard for a specific period
@@ -14,235 +119,432 @@ export class LeaderboardService {
     limit: number = 100,
     offset: number = 0
   ) {
-    const today = new Date();
-    today.setHours(0, 0, 0, 0);
+    let page: RankedPortfolio[];
+    try {
+      const ranked = await this.getLiveRange(period, offset, limit);
+      if (!ranked) {
+        return await this.getSnapshotLeaderboard(period, limit, offset);
+      }
+      page = ranked;
+    } catch (error) {
+      logger.warn('Live leaderboard unavailable, serving the database snapshot:', error);
+      return await this.getSnapshotLeaderboard(period, limit, offset);
+    }
 
-    const leaderboard = await prisma.leaderboard.findMany({
-      where: {
-        period,
-        snapshotDate: today,
-      },
-      include: {
-        user: {
-          select: {
-            username: true,
-            email: true,
-          },
-        },
-        portfolio: {
-          select: {
-            name: true,
-            totalValue: true,
-            cashBalance: true,
-          },
-        },
+    const portfolios = await prisma.portfolio.findMany({
+      where: { id: { in: page.map((entry) => entry.portfolioId) } },
+      select: {
+        id: true,
+        name: true,
+        totalValue: true,
+        user: { select: { username: true } },
       },
-      orderBy: {
-        rank: 'asc',
-      },
-      take: limit,
-      skip: offset,
     });
-
-    return leaderboard.map((entry) => ({
-      id: entry.id,
-      rank: entry.rank,
-      username: entry.user.username,
-      portfolioName: entry.portfolio.name,
-      returnPercentage: entry.returnPercentage.toNumber(),
-      totalValue: entry.portfolio.totalValue?.toNumber() || 0,
-      period: entry.period,
-      snapshotDate: entry.snapshotDate,
-    }));
+    const byId = new Map(portfolios.map((portfolio) => [portfolio.id, portfolio]));
+    const today = startOfDay(new Date());
+
+    return page
+      .filter((entry) => byId.has(entry.portfolioId))
+      .map((entry) => {
+        const portfolio = byId.get(entry.portfolioId)!;
+        return {
+          id: entry.portfolioId,
+          rank: entry.rank,
+          username: portfolio.user.username,
+          portfolioName: portfolio.name,
+          returnPercentage: entry.returnPercentage,
+          totalValue: portfolio.totalValue?.toNumber() || 0,
+          period,
+          snapshotDate: today,
+        };
+      });
   }
 
   /**
    * Get user's rank across all periods
    */
   async getUserRanks(userId: string) {
-    const today = new Date();
-    today.setHours(0, 0, 0, 0);
+    let positions: Map<LeaderboardPeriod, RankedPortfolio & { total: number }> | null;
+    try {
+      positions = await this.getLivePositions(userId, PERIODS);
+    } catch (error) {
+      logger.warn('Live leaderboard unavailable, serving the database snapshot:', error);
+      positions = null;
+    }
 
-    const ranks = await prisma.leaderboard.findMany({
-      where: {
-        userId,
-        snapshotDate: today,
-      },
-      orderBy: {
-        period: 'asc',
-      },
-    });
+    if (!positions) {
+      return await this.getSnapshotUserRanks(userId);
+    }
 
-    return ranks.map((rank) => ({
-      period: rank.period,
-      rank: rank.rank,
-      returnPercentage: rank.returnPercentage.toNumber(),
+    return PERIODS.filter((period) => positions!.has(period)).map((period) => ({
+      period,
+      rank: positions!.get(period)!.rank,
+      returnPercentage: positions!.get(period)!.returnPercentage,
     }));
   }
 
   /**
-   * Calculate and update leaderboards for all periods
+   * Update Live Rankings
+   *
+   * Called with fresh portfolio values (revaluations, new portfolios). One
+   * script call re-scores the batch on every board against the stored base
+   * values.
+   *
+   * @param {PortfolioValuation[]} valuations - Portfolios whose value changed
+   */
+  async updateScores(valuations: PortfolioValuation[]): Promise<void> {
+    if (valuations.length === 0) return;
+
+    const client = getRedisClient();
+    const keys = PERIODS.flatMap((period) => [boardKey(period), baseKey(period)]);
+    const args = valuations.flatMap((valuation) => [
+      valuation.portfolioId,
+      valuation.totalValue,
+      valuation.startingBalance,
+      valuation.isActive ? 1 : 0,
+    ]);
+
+    try {
+      await client.evalsha(SCORE_SCRIPT_SHA, keys.length, ...keys, ...args);
+    } catch (error: any) {
+      if (!String(error?.message).includes('NOSCRIPT')) throw error;
+      await client.eval(SCORE_SCRIPT, keys.length, ...keys, ...args);
+    }
+  }
+
+  /**
+   * Get a User's Portfolio Returns for a Period
+   *
+   * One query; each portfolio's base value is a primary key lookup in
+   * `portfolio_value_snapshots`.
+   *
+   * @param {string} userId - User ID
+   * @param {LeaderboardPeriod} period - Return period
+   * @returns {Promise<PeriodReturn[]>} Return per active portfolio
+   */
+  async getPeriodReturns(userId: string, period: LeaderboardPeriod): Promise<PeriodReturn[]> {
+    const rows = await prisma.$queryRaw<
+      { id: string; value: Prisma.Decimal; starting_balance: Prisma.Decimal; base: Prisma.Decimal | null }[]
+    >`
+      SELECT p."id", COALESCE(p."total_value", p."cash_balance") AS "value", u."starting_balance",
+        ${snapshotBaseSql(period, startOfDay(new Date()))} AS "base"
+      FROM "portfolios" p
+      JOIN "users" u ON u."id" = p."user_id"
+      WHERE p."user_id" = ${userId} AND p."is_active"
+    `;
+
+    return rows.map((row) => ({
+      portfolioId: row.id,
+      returnPercentage: returnPercentage(Number(row.value), Number(row.base ?? row.starting_balance)),
+      hasBaseline: row.base !== null,
+    }));
+  }
+
+  /**
+   * Save Today's Snapshot and Rebuild the Live Boards
    * This should be run as a background job
+   *
+   * The snapshot is computed in Postgres (see saveSnapshots) and the Redis
+   * boards and base values are rebuilt one page of portfolios at a time (so
+   * drift, missed updates and the new day's base values are picked up).
+   * Memory use doesn't grow with the number of portfolios.
    */
   async calculateLeaderboards() {
     logger.info('Starting leaderboard calculation...');
 
-    const today = new Date();
-    today.setHours(0, 0, 0, 0);
+    const today = startOfDay(new Date());
 
     try {
-      // Get all active portfolios with their performance
-      const portfolios = await prisma.portfolio.findMany({
-        where: {
-          isActive: true,
-        },
-        include: {
-          user: true,
-          trades: {
-            orderBy: {
-              executedAt: 'asc',
-            },
-          },
-        },
-      });
-
-      // Calculate returns for each portfolio
-      const portfolioReturns = await Promise.all(
-        portfolios.map(async (portfolio) => {
-          const initialValue = portfolio.user.startingBalance.toNumber();
-          const currentValue = portfolio.totalValue?.toNumber() || portfolio.cashBalance.toNumber();
-          const returnPercentage = ((currentValue - initialValue) / initialValue) * 100;
-
-          return {
-            userId: portfolio.userId,
-            portfolioId: portfolio.id,
-            returnPercentage,
-            currentValue,
-          };
-        })
+      const saved = await this.saveSnapshots(today);
+      logger.info(
+        `Leaderboard snapshot saved: ${PERIODS.map((period) => `${period}=${saved[period]}`).join(', ')}`
       );
 
-      // Sort by return percentage
-      const sortedReturns = [...portfolioReturns].sort(
-        (a, b) => b.returnPercentage - a.returnPercentage
-      );
+      const ranked = await this.rebuildLiveBoards();
+      logger.info(`Live leaderboards rebuilt: ${ranked} portfolios`);
 
-      // Create leaderboard entries for ALL_TIME
-      await this.createLeaderboardEntries(sortedReturns, 'ALL_TIME', today);
+      logger.info('Leaderboard calculation completed successfully');
+    } catch (error) {
+      logger.error('Leaderboard calculation failed:', error);
+      throw new AppError('Failed to calculate leaderboards', 500);
+    }
+  }
 
-      // Calculate daily returns (portfolios created/updated today)
-      const dailyReturns = portfolioReturns.filter((p) => {
-        const portfolio = portfolios.find((pf) => pf.id === p.portfolioId);
-        if (!portfolio) return false;
+  /**
+   * Get top performers for a period
+   */
+  async getTopPerformers(period: LeaderboardPeriod, limit: number = 10) {
+    return await this.getLeaderboard(period, limit, 0);
+  }
 
-        const createdToday = portfolio.createdAt >= today;
-        const hasTradesToday = portfolio.trades.some(
-          (trade) => trade.executedAt >= today
-        );
+  /**
+   * Get user's position on leaderboard
+   */
+  async getUserPosition(userId: string, period: LeaderboardPeriod) {
+    let positions: Map<LeaderboardPeriod, RankedPortfolio & { total: number }> | null;
+    try {
+      positions = await this.getLivePositions(userId, [period]);
+    } catch (error) {
+      logger.warn('Live leaderboard unavailable, serving the database snapshot:', error);
+      positions = null;
+    }
 
-        return createdToday || hasTradesToday;
-      });
+    if (!positions) {
+      return await this.getSnapshotUserPosition(userId, period);
+    }
 
-      if (dailyReturns.length > 0) {
-        const sortedDaily = [...dailyReturns].sort(
-          (a, b) => b.returnPercentage - a.returnPercentage
-        );
-        await this.createLeaderboardEntries(sortedDaily, 'DAILY', today);
-      }
+    const position = positions.get(period);
+    if (!position) {
+      return null;
+    }
 
-      // Calculate weekly returns (last 7 days)
-      const weekAgo = new Date(today);
-      weekAgo.setDate(weekAgo.getDate() - 7);
+    return {
+      rank: position.rank,
+      returnPercentage: position.returnPercentage,
+      totalParticipants: position.total,
+      percentile: ((position.total - position.rank + 1) / position.total) * 100,
+    };
+  }
+
+  /**
+   * Read One Page of a Live Board
+   *
+   * @returns {Promise<RankedPortfolio[] | null>} Ranked page, or null if the boards aren't built
+   * @private
+   */
+  private async getLiveRange(
+    period: LeaderboardPeriod,
+    offset: number,
+    limit: number
+  ): Promise<RankedPortfolio[] | null> {
+    const client = getRedisClient();
+
+    const [[, built], [rangeError, range]] = (await client
+      .pipeline()
+      .exists(BUILT_KEY)
+      .zrevrange(boardKey(period), offset, offset + limit - 1, 'WITHSCORES')
+      .exec()) as [Error | null, unknown][];
+    if (rangeError) throw rangeError;
+
+    if (!built) {
+      this.requestRebuild();
+      return null;
+    }
 
-      const weeklyReturns = portfolioReturns.filter((p) => {
-        const portfolio = portfolios.find((pf) => pf.id === p.portfolioId);
-        return portfolio && portfolio.createdAt >= weekAgo;
+    const members = range as string[];
+    const page: RankedPortfolio[] = [];
+    for (let i = 0; i < members.length; i += 2) {
+      page.push({
+        portfolioId: members[i],
+        rank: offset + i / 2 + 1,
+        returnPercentage: parseFloat(members[i + 1]),
       });
+    }
+    return page;
+  }
+
+  /**
+   * Best Live Position of a User's Portfolios on Each Board
+   *
+   * @returns {Promise<Map | null>} Period → position (periods the user isn't ranked in are
+   *   missing), or null if the boards aren't built
+   * @private
+   */
+  private async getLivePositions(
+    userId: string,
+    periods: LeaderboardPeriod[]
+  ): Promise<Map<LeaderboardPeriod, RankedPortfolio & { total: number }> | null> {
+    const portfolios = await prisma.portfolio.findMany({
+      where: { userId, isActive: true },
+      select: { id: true },
+    });
 
-      if (weeklyReturns.length > 0) {
-        const sortedWeekly = [...weeklyReturns].sort(
-          (a, b) => b.returnPercentage - a.returnPercentage
-        );
-        await this.createLeaderboardEntries(sortedWeekly, 'WEEKLY', today);
+    const client = getRedisClient();
+
+    const pipeline = client.pipeline().exists(BUILT_KEY);
+    for (const period of periods) {
+      const key = boardKey(period);
+      pipeline.zcard(key);
+      for (const { id } of portfolios) {
+        pipeline.zrevrank(key, id).zscore(key, id);
       }
+    }
 
-      // Calculate monthly returns (last 30 days)
-      const monthAgo = new Date(today);
-      monthAgo.setDate(monthAgo.getDate() - 30);
+    const results = (await pipeline.exec()) ?? [];
+    const failed = results.find(([error]) => error);
+    if (failed) throw failed[0];
 
-      const monthlyReturns = portfolioReturns.filter((p) => {
-        const portfolio = portfolios.find((pf) => pf.id === p.portfolioId);
-        return portfolio && portfolio.createdAt >= monthAgo;
-      });
+    const replies = results.map(([, reply]) => reply);
+    if (!replies[0]) {
+      this.requestRebuild();
+      return null;
+    }
 
-      if (monthlyReturns.length > 0) {
-        const sortedMonthly = [...monthlyReturns].sort(
-          (a, b) => b.returnPercentage - a.returnPercentage
-        );
-        await this.createLeaderboardEntries(sortedMonthly, 'MONTHLY', today);
+    const positions = new Map<LeaderboardPeriod, RankedPortfolio & { total: number }>();
+    let index = 1;
+    for (const period of periods) {
+      const total = Number(replies[index++]);
+      for (const { id } of portfolios) {
+        const rank = replies[index++] as number | null;
+        const score = replies[index++] as string | null;
+        if (rank === null || score === null) continue;
+
+        const current = positions.get(period);
+        if (!current || rank + 1 < current.rank) {
+          positions.set(period, { portfolioId: id, rank: rank + 1, returnPercentage: parseFloat(score), total });
+        }
       }
-
-      logger.info('Leaderboard calculation completed successfully');
-    } catch (error) {
-      logger.error('Leaderboard calculation failed:', error);
-      throw new AppError('Failed to calculate leaderboards', 500);
     }
+    return positions;
   }
 
   /**
-   * Create leaderboard entries for a period
+   * Rebuild All Boards from the Database
+   *
+   * Reads active portfolios in keyset pages with their base values and builds
+   * into temporary keys, swapped in with one MULTI, so readers never see a
+   * half-built board. Updates that land during the rebuild may be overwritten
+   * with the value read here; the next revaluation corrects them.
+   *
+   * @returns {Promise<number>} Portfolios ranked
+   * @private
    */
-  private async createLeaderboardEntries(
-    returns: Array<{
-      userId: string;
-      portfolioId: string;
-      returnPercentage: number;
-    }>,
-    period: LeaderboardPeriod,
-    snapshotDate: Date
-  ) {
-    // Delete existing entries for this period and date
-    await prisma.leaderboard.deleteMany({
-      where: {
-        period,
-        snapshotDate,
-      },
-    });
+  private async rebuildLiveBoards(): Promise<number> {
+    const client = getRedisClient();
+    const today = startOfDay(new Date());
+    const windowed = PERIODS.filter((period) => LOOKBACK_DAYS[period]);
+    const targets = [...PERIODS.map(boardKey), ...windowed.map(baseKey)];
+    const building = (key: string) => `${key}:building`;
+
+    await client.del(...targets.map(building));
+
+    const written = new Set<string>();
+    let ranked = 0;
+    let cursor = '';
+
+    for (;;) {
+      const rows = await prisma.$queryRaw<
+        ({ id: string; value: Prisma.Decimal; starting_balance: Prisma.Decimal } & Record<string, unknown>)[]
+      >`
+        SELECT p."id", COALESCE(p."total_value", p."cash_balance") AS "value", u."starting_balance",
+          ${Prisma.join(
+            windowed.map((period) => Prisma.sql`${snapshotBaseSql(period, today)} AS ${Prisma.raw(`"base_${period}"`)}`)
+          )}
+        FROM "portfolios" p
+        JOIN "users" u ON u."id" = p."user_id"
+        WHERE p."is_active" AND p."id" > ${cursor}
+        ORDER BY p."id"
+        LIMIT ${REBUILD_PAGE_SIZE}
+      `;
+      if (rows.length === 0) break;
+
+      const pipeline = client.pipeline();
+      for (const row of rows) {
+        const value = Number(row.value);
+        const startingBalance = Number(row.starting_balance);
+
+        for (const period of PERIODS) {
+          const snapshotBase = row[`base_${period}`] as Prisma.Decimal | null | undefined;
+          const base = snapshotBase != null ? Number(snapshotBase) : startingBalance;
+          if (base <= 0) continue;
+
+          pipeline.zadd(building(boardKey(period)), returnPercentage(value, base), row.id);
+          written.add(boardKey(period));
+          if (snapshotBase != null) {
+            pipeline.hset(building(baseKey(period)), row.id, base);
+            written.add(baseKey(period));
+          }
+        }
+      }
 
-    // Create new entries
-    const entries = returns.map((entry, index) => ({
-      userId: entry.userId,
-      portfolioId: entry.portfolioId,
-      period,
-      returnPercentage: entry.returnPercentage,
-      rank: index + 1,
-      snapshotDate,
-    }));
+      const results = await pipeline.exec();
+      const failed = results?.find(([error]) => error);
+      if (failed) throw failed[0];
 
-    await prisma.leaderboard.createMany({
-      data: entries,
-    });
+      ranked += rows.length;
+      cursor = rows[rows.length - 1].id;
+    }
+
+    const swap = client.multi();
+    for (const key of targets) {
+      if (written.has(key)) {
+        swap.rename(building(key), key);
+      } else {
+        swap.del(key);
+      }
+    }
+    swap.set(BUILT_KEY, new Date().toISOString());
+    await swap.exec();
 
-    logger.info(`Created ${entries.length} leaderboard entries for ${period}`);
+    return ranked;
   }
 
   /**
-   * Get top performers for a period
+   * Save Today's Rankings for Every Period
+   *
+   * Each period is one `INSERT ... SELECT` ranked with `RANK()` in
+   * Postgres, so no portfolio or trade rows are loaded into the app. All
+   * periods are replaced in one transaction: readers see yesterday's rows
+   * for today's date or the full new set, never a mix.
+   *
+   * @param {Date} snapshotDate - Snapshot day (local midnight)
+   * @returns {Promise<Record<LeaderboardPeriod, number>>} Rows written per period
+   * @private
    */
-  async getTopPerformers(period: LeaderboardPeriod, limit: number = 10) {
-    return await this.getLeaderboard(period, limit, 0);
+  private async saveSnapshots(snapshotDate: Date): Promise<Record<LeaderboardPeriod, number>> {
+    // Same date Prisma stores for snapshotDate (the UTC date of the instant)
+    const day = snapshotDate.toISOString().slice(0, 10);
+
+    const statements = PERIODS.flatMap((period) => [
+      prisma.leaderboard.deleteMany({ where: { period, snapshotDate } }),
+      prisma.$executeRaw`
+        INSERT INTO "leaderboards" ("id", "user_id", "portfolio_id", "period", "return_percentage", "rank", "snapshot_date")
+        SELECT gen_random_uuid()::text, r."user_id", r."id", ${period}::"leaderboard_period", r."return_percentage",
+          RANK() OVER (ORDER BY r."return_percentage" DESC), ${day}::date
+        FROM (
+          SELECT b."id", b."user_id", ROUND((b."value" - b."base") / b."base" * 100, 4) AS "return_percentage"
+          FROM (
+            SELECT p."id", p."user_id", COALESCE(p."total_value", p."cash_balance") AS "value",
+              COALESCE(${snapshotBaseSql(period, snapshotDate)}, u."starting_balance") AS "base"
+            FROM "portfolios" p
+            JOIN "users" u ON u."id" = p."user_id"
+            WHERE p."is_active"
+          ) b
+          WHERE b."base" > 0
+        ) r
+      `,
+    ]);
+
+    const results = await prisma.$transaction(statements);
+
+    const counts = {} as Record<LeaderboardPeriod, number>;
+    PERIODS.forEach((period, i) => {
+      counts[period] = results[i * 2 + 1] as number;
+    });
+    return counts;
   }
 
   /**
-   * Get user's position on leaderboard
+   * Queue a Rebuild of the Live Boards (async, don't wait)
+   *
+   * @private
    */
-  async getUserPosition(userId: string, period: LeaderboardPeriod) {
-    const today = new Date();
-    today.setHours(0, 0, 0, 0);
+  private requestRebuild(): void {
+    enqueueLeaderboardUpdate().catch((error) => {
+      logger.warn('Failed to queue leaderboard rebuild:', error);
+    });
+  }
 
-    const entry = await prisma.leaderboard.findFirst({
+  /**
+   * Today's Snapshot Page (fallback when the live boards are unavailable)
+   *
+   * @private
+   */
+  private async getSnapshotLeaderboard(period: LeaderboardPeriod, limit: number, offset: number) {
+    const today = startOfDay(new Date());
+
+    const leaderboard = await prisma.leaderboard.findMany({
       where: {
-        userId,
         period,
         snapshotDate: today,
       },
@@ -252,6 +554,67 @@ export class LeaderboardService {
             username: true,
           },
         },
+        portfolio: {
+          select: {
+            name: true,
+            totalValue: true,
+          },
+        },
+      },
+      orderBy: {
+        rank: 'asc',
+      },
+      take: limit,
+      skip: offset,
+    });
+
+    return leaderboard.map((entry) => ({
+      id: entry.id,
+      rank: entry.rank,
+      username: entry.user.username,
+      portfolioName: entry.portfolio.name,
+      returnPercentage: entry.returnPercentage.toNumber(),
+      totalValue: entry.portfolio.totalValue?.toNumber() || 0,
+      period: entry.period,
+      snapshotDate: entry.snapshotDate,
+    }));
+  }
+
+  /**
+   * @private
+   */
+  private async getSnapshotUserRanks(userId: string) {
+    const ranks = await prisma.leaderboard.findMany({
+      where: {
+        userId,
+        snapshotDate: startOfDay(new Date()),
+      },
+      orderBy: {
+        period: 'asc',
+      },
+    });
+
+    return ranks.map((rank) => ({
+      period: rank.period,
+      rank: rank.rank,
+      returnPercentage: rank.returnPercentage.toNumber(),
+    }));
+  }
+
+  /**
+   * @private
+   */
+  private async getSnapshotUserPosition(userId: string, period: LeaderboardPeriod) {
+    const today = startOfDay(new Date());
+
+    const entry = await prisma.leaderboard.findFirst({
+      where: {
+        userId,
+        period,
+        snapshotDate: today,
+      },
+      orderBy: {
+        rank: 'asc',
       },
     });
 
@@ -4,80 +4,224 @@
  * Handles fetching, caching, and serving stock market data from external APIs.
  *
  * KEY FEATURES:
+ * - In-Process Cache: Bounded LRU (Level 0) in front of the 3 shared tiers
  * - 3-Tier Caching: Redis (Level 1) → Database (Level 2) → External API (Level 3)
- * - Multi-API Support: Alpha Vantage (primary) with Finnhub fallback
+ * - Multi-API Support: pluggable providers (Alpha Vantage, Finnhub, or a simulated feed)
+ * - Adaptive Routing: providers tried fastest-first; failing or throttled providers are skipped (circuit breakers)
  * - Batch Operations: Fetch multiple symbols efficiently (90-97% faster)
  * - Rate Limiting: Intelligent request queuing to prevent API throttling
  * - Cache TTL: Configurable cache duration (default: 30 minutes)
+ * - Stale-While-Revalidate: Stale quotes served instantly until a hard TTL while refreshing in background
+ * - Quote Observers: every quote fetched from a provider is passed to onQuotes listeners (e.g., price history)
+ * - Multi-Instance: quotes fetched by other instances are applied to L0 (applyPeerQuotes), and background
+ *   refreshes take a per-symbol Redis lock so each symbol is refreshed by one instance per window
  *
  * PERFORMANCE:
+ * - In-process cache: < 0.1ms response time (no network round trip, no JSON.parse)
  * - Redis cache: < 10ms response time
  * - Database cache: < 50ms response time
  * - API fetch: 1-3 seconds (with rate limiting)
  * - Batch operations: Process 10-20 symbols in parallel
  *
  * API RATE LIMITS:
- * - Alpha Vantage: 5 requests/minute (12-second delay between requests)
- * - Finnhub: 60 requests/minute (1-second delay between requests)
+ * - Alpha Vantage: 5 requests/minute (token bucket, one request at a time)
+ * - Finnhub: 60 requests/minute (token bucket, burst of 5, up to 5 in flight)
+ * - Trade execution quotes are queued ahead of page reads and background refreshes
  */
 
-import axios from 'axios';
+import { randomUUID } from 'crypto';
+import { Prisma } from '@prisma/client';
 import getPrismaClient from '../config/database';
-import { cacheGet, cacheSet } from '../config/redis';
+import { acquireLocks, cacheGet, cacheMGet, cacheMSet, cacheSet } from '../config/redis';
 import { env } from '../config/env';
 import { AppError } from '../middleware/errorHandler';
 import { MarketQuote } from '../types';
 import logger from '../config/logger';
-import { alphaVantageQueue, finnhubQueue } from '../utils/requestQueue';
+import {
+  RequestDeadlineError,
+  RequestOptions,
+  RequestPriority,
+  RequestPriorityLane,
+  RequestQueueStats,
+} from '../utils/requestQueue';
+import { LRUCache, LRUCacheStats } from '../utils/lruCache';
+import { SingleFlight, SingleFlightStats } from '../utils/singleFlight';
+import { WriteBehindBuffer, WriteBehindBufferStats } from '../utils/writeBehindBuffer';
+import { DistributedTokenBucketStats } from '../utils/distributedTokenBucket';
+import { SymbolIndex, SymbolListing } from '../utils/symbolIndex';
+import symbolListing from '../data/symbols.json';
+import { createProviders, MarketDataProvider, ProviderHealthStats, rankProviders } from './providers';
 
 const prisma = getPrismaClient();
-const CACHE_TTL = parseInt(env.MARKET_DATA_CACHE_TTL); // Cache duration in seconds
+const CACHE_TTL = parseInt(env.MARKET_DATA_CACHE_TTL); // Soft TTL: quote is fresh (seconds)
+const STALE_TTL = Math.max(parseInt(env.MARKET_DATA_STALE_TTL), CACHE_TTL); // Hard TTL: quote may be served stale (seconds)
+
+const REFRESH_RETRY_MS = 30000; // Min interval between background refresh attempts per symbol
+const LIST_QUOTE_DEADLINE_MS = 10000; // Max wait for provider fetches on trending/popular lists
+const WRITE_BEHIND_FLUSH_MS = 1000;    // Max delay of buffered database writes from background refreshes
+const WRITE_BEHIND_MAX_BATCH = 200;    // Flush buffered database writes at this many quotes
+
+type QuoteFreshness = 'fresh' | 'stale' | 'expired';
+
+// 'provider': fetched by this instance; 'peer': fetched by another instance (quote bus)
+export type QuoteSource = 'provider' | 'peer';
+export type QuoteListener = (quotes: MarketQuote[], source: QuoteSource) => void;
+
+/**
+ * Quote Request Options
+ *
+ * priority: provider queue lane used if the request misses every cache
+ * (RequestPriority.TRADE for trade execution, READ for pages, BACKGROUND for warmers).
+ * TRADE requests are only served fresh quotes: a stale cached quote is refetched.
+ * deadlineMs: max time to wait for a provider request to start. If it can't start
+ * in time, READ and BACKGROUND requests get the last known price from the database
+ * instead (even past the hard TTL) and fail only if the symbol was never cached.
+ * TRADE requests fail with a 503 instead, so no trade executes at an old price.
+ */
+export interface QuoteOptions {
+  priority?: RequestPriorityLane;
+  deadlineMs?: number;
+}
+
+// Curated list of trending stocks
+export const TRENDING_SYMBOLS = [
+  'AAPL',      // Apple
+  'MSFT',      // Microsoft
+  'GOOGL',     // Google
+  'TSLA',      // Tesla
+  'NVDA',      // NVIDIA
+  'AMZN',      // Amazon
+  'META',      // Meta
+  'NFLX',      // Netflix
+  'AMD',       // AMD
+  'INTC',      // Intel
+];
+
+// Level 0: per-process LRU keyed like Redis ("quote:SYMBOL")
+// Entries expire at the quote's hard TTL, so L0 never outlives Redis
+const quoteMemoryCache = new LRUCache<MarketQuote>({
+  maxEntries: parseInt(env.QUOTE_MEMORY_CACHE_MAX_ENTRIES),
+  maxBytes: parseInt(env.QUOTE_MEMORY_CACHE_MAX_BYTES),
+  ttlMs: STALE_TTL * 1000,
+});
+
+// Coalesces concurrent cache misses per symbol into one database/API load
+const quoteFlight = new SingleFlight<MarketQuote>();
+
+// Same for TRADE requests, whose loads never return stale quotes
+const freshQuoteFlight = new SingleFlight<MarketQuote>();
+
+// Coalesces background revalidation of stale quotes per symbol
+const refreshFlight = new SingleFlight<MarketQuote>();
+
+// Typeahead index over the bundled symbol listing (ticker + company name),
+// extended with any other symbol that gets quoted
+const symbolIndex = new SymbolIndex(symbolListing as SymbolListing[]);
 
 export class MarketDataService {
+  private providers: MarketDataProvider[];
+
+  private staleServed = 0; // Reads answered with a stale quote while revalidating
+  private warmReads = 0;   // Quote reads served from a cache tier
+  private coldReads = 0;   // Quote reads that waited on a provider fetch
+  private refreshAttempts = new Map<string, number>(); // symbol → last background refresh attempt (ms)
+  private deadlineFallbacks = 0; // Reads answered with the last known price after a missed deadline
+  private quoteListeners: QuoteListener[] = [];
+
+  // Batches database writes from background refreshes into bulk upserts
+  private marketDataWriteBehind = new WriteBehindBuffer<MarketQuote>(
+    (quotes) => this.updateMarketDataCacheBatch(quotes),
+    { maxBatchSize: WRITE_BEHIND_MAX_BATCH, flushIntervalMs: WRITE_BEHIND_FLUSH_MS }
+  );
+
+  /**
+   * @param {MarketDataProvider[]} [providers] - Provider fallback chain (default: from MARKET_DATA_PROVIDERS)
+   */
+  constructor(providers: MarketDataProvider[] = createProviders()) {
+    this.providers = providers;
+  }
 
   /**
    * Get Quote for a Single Symbol
    *
-   * Implements 3-tier caching strategy:
-   * 1. Check Redis cache (fastest, < 10ms)
+   * Implements 3-tier caching strategy behind an in-process cache:
+   * 0. Check in-process LRU cache (< 0.1ms)
+   * 1. Check Redis cache (fastest shared tier, < 10ms)
    * 2. Check database cache (fast, < 50ms)
    * 3. Fetch from external API (slow, 1-3s with rate limiting)
    *
+   * Stale-while-revalidate: a cached quote older than the soft TTL
+   * (MARKET_DATA_CACHE_TTL) but younger than the hard TTL (MARKET_DATA_STALE_TTL)
+   * is returned immediately and a background refresh is scheduled.
+   * Only quotes past the hard TTL (or never cached) block on the provider.
+   * TRADE requests never get a stale quote: anything past the soft TTL is
+   * reloaded, so trades execute at a current price.
+   *
+   * Concurrent misses for the same symbol are coalesced, so only one caller
+   * queries the database and provider while the others await its result.
+   *
+   * With a deadline, a provider request that can't start in time falls back
+   * to the last known price instead of waiting in the provider queue
+   * (READ and BACKGROUND only; TRADE requests fail instead).
+   *
    * @param {string} symbol - Stock symbol (e.g., "AAPL", "TSLA")
+   * @param {QuoteOptions} [options] - Provider queue lane and deadline on cache miss
    * @returns {Promise<MarketQuote>} Quote data with current price, change, volume, etc.
    * @throws {AppError} If symbol not found or all APIs fail
+   * @throws {AppError} 503 if a TRADE request missed its deadline
+   * @throws {RequestDeadlineError} If the deadline passed and no price was ever cached
    */
-  async getQuote(symbol: string): Promise<MarketQuote> {
+  async getQuote(symbol: string, options: QuoteOptions = {}): Promise<MarketQuote> {
     const cacheKey = `quote:${symbol}`;
+    const allowStale = this.allowsStale(options);
 
-    // Try cache first
+    // Try in-process cache first
+    const memoryCached = quoteMemoryCache.get(cacheKey);
+    if (memoryCached && this.serveCachedQuote(symbol, memoryCached, allowStale)) {
+      this.warmReads++;
+      return memoryCached;
+    }
+
+    // Try Redis cache
     try {
       const cached = await cacheGet(cacheKey);
       if (cached) {
-        return JSON.parse(cached);
+        const quote: MarketQuote = JSON.parse(cached);
+        if (this.serveCachedQuote(symbol, quote, allowStale)) {
+          this.setMemoryQuote(cacheKey, quote);
+          this.warmReads++;
+          return quote;
+        }
       }
     } catch (error) {
       logger.warn('Cache read error:', error);
     }
 
-    // Try database cache
-    const dbCache = await prisma.marketDataCache.findUnique({
-      where: { symbol },
-    });
+    // Concurrent misses for the same symbol share one database/API load
+    const startedAt = Date.now();
+    const request = this.toRequestOptions(options, startedAt);
+    const flight = allowStale ? quoteFlight : freshQuoteFlight;
+    let quote: MarketQuote;
 
-    if (dbCache && this.isCacheValid(dbCache.lastUpdated)) {
-      const quote = this.formatQuote(dbCache);
-      await this.setCacheQuote(cacheKey, quote);
-      return quote;
-    }
+    try {
+      quote = await flight.do(symbol, () => this.loadQuote(symbol, request, allowStale));
+    } catch (error) {
+      if (!(error instanceof RequestDeadlineError)) throw error;
 
-    // Fetch from external API
-    const quote = await this.fetchQuoteFromAPI(symbol);
+      if (!allowStale) {
+        logger.warn(`Quote deadline missed for ${symbol} on a trade, no current price`);
+        throw new AppError(`Unable to get a current price for ${symbol}, please retry`, 503);
+      }
 
-    // Update caches
-    await this.updateMarketDataCache(symbol, quote);
-    await this.setCacheQuote(cacheKey, quote);
+      const lastKnown = (await this.getLastKnownQuotes([symbol])).get(symbol);
+      if (!lastKnown) throw error;
+
+      logger.warn(`Quote deadline missed for ${symbol}, serving last known price from ${new Date(lastKnown.lastUpdated).toISOString()}`);
+      this.deadlineFallbacks++;
+      return lastKnown;
+    }
 
+    this.recordLoadedReads([quote], startedAt);
     return quote;
   }
 
@@ -94,14 +238,23 @@ export class MarketDataService {
    *
    * PROCESS:
    * 1. Validate and deduplicate symbols (limit: 100 symbols per batch)
-   * 2. Check Redis cache for all symbols in parallel
-   * 3. Batch query database for uncached symbols
-   * 4. Fetch remaining symbols from API (parallel with rate limiting)
+   * 2. Check in-process cache, then Redis for the rest in one MGET round trip
+   * 3. Join loads already in flight for the same symbols (request coalescing)
+   * 4. Batch query database for the remaining uncached symbols
+   * 5. Fetch remaining symbols from API (parallel with rate limiting)
+   *
+   * Stale quotes (between soft and hard TTL) are returned as-is and
+   * refreshed in the background with a single batch refresh (except for
+   * TRADE requests, which reload them like misses).
+   * With a deadline, symbols whose provider requests couldn't start in time
+   * are filled with their last known price (except for TRADE requests, which
+   * leave them out of the result).
    *
    * @param {string[]} symbols - Array of stock symbols
+   * @param {QuoteOptions} [options] - Provider queue lane and deadline on cache miss
    * @returns {Promise<Map<string, MarketQuote>>} Map of symbol → quote data
    */
-  async getQuoteBatch(symbols: string[]): Promise<Map<string, MarketQuote>> {
+  async getQuoteBatch(symbols: string[], options: QuoteOptions = {}): Promise<Map<string, MarketQuote>> {
     if (symbols.length === 0) {
       return new Map();
     }
@@ -121,27 +274,50 @@ export class MarketDataService {
       logger.warn(`getQuoteBatch: Filtered ${symbols.length - validSymbols.length} invalid/duplicate symbols`);
     }
 
+    const allowStale = this.allowsStale(options);
     const results = new Map<string, MarketQuote>();
-    const uncachedSymbols: string[] = [];
     const symbolsToCheckDb: string[] = [];
+    const symbolsToCheckRedis: string[] = [];
+    const staleSymbols: string[] = [];
 
-    // Step 1: Check Redis cache for all symbols in parallel
-    const cacheCheckPromises = validSymbols.map(async (symbol) => {
-      const cacheKey = `quote:${symbol}`;
-      try {
-        const cached = await cacheGet(cacheKey);
-        return { symbol, cached, cacheKey };
-      } catch (error) {
-        logger.warn(`Redis cache error for ${symbol}:`, error);
-        return { symbol, cached: null, cacheKey };
+    // Step 0: Serve hot symbols from the in-process cache
+    for (const symbol of validSymbols) {
+      const memoryCached = quoteMemoryCache.get(`quote:${symbol}`);
+      const freshness = memoryCached ? this.getFreshness(memoryCached.lastUpdated, allowStale) : 'expired';
+
+      if (memoryCached && freshness !== 'expired') {
+        results.set(symbol, memoryCached);
+        if (freshness === 'stale') staleSymbols.push(symbol);
+      } else {
+        symbolsToCheckRedis.push(symbol);
       }
-    });
+    }
 
-    const cacheResults = await Promise.all(cacheCheckPromises);
-    for (const { symbol, cached } of cacheResults) {
+    // Step 1: Check Redis cache for remaining symbols with a single MGET
+    const cacheKeys = symbolsToCheckRedis.map((symbol) => `quote:${symbol}`);
+    let cachedValues: (string | null)[] = [];
+    try {
+      cachedValues = await cacheMGet(cacheKeys);
+    } catch (error) {
+      logger.warn('Redis batch cache read error:', error);
+    }
+
+    for (const [index, symbol] of symbolsToCheckRedis.entries()) {
+      const cacheKey = cacheKeys[index];
+      const cached = cachedValues[index];
       if (cached) {
         try {
-          results.set(symbol, JSON.parse(cached));
+          const quote: MarketQuote = JSON.parse(cached);
+          const freshness = this.getFreshness(quote.lastUpdated, allowStale);
+
+          if (freshness === 'expired') {
+            symbolsToCheckDb.push(symbol);
+            continue;
+          }
+
+          results.set(symbol, quote);
+          this.setMemoryQuote(cacheKey, quote);
+          if (freshness === 'stale') staleSymbols.push(symbol);
         } catch (parseError) {
           logger.warn(`Failed to parse cached data for ${symbol}, will refetch:`, parseError);
           symbolsToCheckDb.push(symbol);
@@ -152,121 +328,576 @@ export class MarketDataService {
       }
     }
 
-    // Step 2: Batch query database for symbols not in Redis
-    if (symbolsToCheckDb.length > 0) {
-      try {
-        // Single batch query instead of N individual queries
-        const dbCaches = await prisma.marketDataCache.findMany({
-          where: {
-            symbol: {
-              in: symbolsToCheckDb,
-            },
+    // Revalidate stale cache hits without blocking this request
+    this.staleServed += staleSymbols.length;
+    this.scheduleRefresh(staleSymbols);
+
+    this.warmReads += results.size;
+
+    // If all symbols were cached, return early
+    if (symbolsToCheckDb.length === 0) {
+      logger.info(`Batch request: All ${symbols.length} symbols served from cache`);
+      return results;
+    }
+
+    // Step 2: Load remaining symbols from database/API
+    // Symbols already being loaded by a concurrent request are joined, not refetched
+    const startedAt = Date.now();
+    const request = this.toRequestOptions(options, startedAt);
+    const flight = allowStale ? quoteFlight : freshQuoteFlight;
+    const loaded = await flight.doMany(
+      symbolsToCheckDb,
+      (symbolsToLoad) => this.loadQuoteBatch(symbolsToLoad, results.size, request, allowStale),
+      (symbol) => new AppError(`Unable to fetch quote for ${symbol} from any API`, 503)
+    );
+
+    for (const [symbol, quote] of loaded.entries()) {
+      results.set(symbol, quote);
+    }
+    this.recordLoadedReads([...loaded.values()], startedAt);
+
+    // Deadline missed for some symbols: fill them with the last known price
+    // (never for trades, which must execute at a current price)
+    const missing = symbolsToCheckDb.filter((symbol) => !results.has(symbol));
+    if (allowStale && request.deadline !== undefined && missing.length > 0) {
+      const lastKnown = await this.getLastKnownQuotes(missing);
+      for (const [symbol, quote] of lastKnown.entries()) {
+        results.set(symbol, quote);
+      }
+      this.deadlineFallbacks += lastKnown.size;
+      if (lastKnown.size > 0) {
+        logger.warn(`Batch request: ${lastKnown.size} symbols served last known price after deadline`);
+      }
+    }
+
+    return results;
+  }
+
+  /**
+   * Load Quote on Cache Miss
+   *
+   * Runs at most once per symbol at a time (see quoteFlight).
+   * Checks the database cache (serving stale rows while revalidating,
+   * if allowed), then fetches from external API and updates both caches.
+   *
+   * @param {string} symbol - Stock symbol
+   * @param {RequestOptions} [request] - Provider queue lane and deadline
+   * @param {boolean} [allowStale=true] - Serve a stale database row instead of fetching
+   * @returns {Promise<MarketQuote>} Quote data
+   * @throws {AppError} If symbol not found or all APIs fail
+   * @private
+   */
+  private async loadQuote(
+    symbol: string,
+    request: RequestOptions = {},
+    allowStale: boolean = true
+  ): Promise<MarketQuote> {
+    const cacheKey = `quote:${symbol}`;
+
+    // Try database cache
+    const dbCache = await prisma.marketDataCache.findUnique({
+      where: { symbol },
+    });
+
+    if (dbCache) {
+      const freshness = this.getFreshness(dbCache.lastUpdated, allowStale);
+
+      if (freshness !== 'expired') {
+        const quote = this.formatQuote(dbCache);
+        await this.setCacheQuote(cacheKey, quote);
+        if (freshness === 'stale') {
+          this.staleServed++;
+          this.scheduleRefresh([symbol]);
+        }
+        return quote;
+      }
+    }
+
+    // Fetch from external API
+    const quote = await this.fetchQuoteFromAPI(symbol, request);
+
+    // Update caches
+    await this.storeQuotes([quote]);
+
+    return quote;
+  }
+
+  /**
+   * Load Quotes for Multiple Symbols on Cache Miss
+   *
+   * Runs for symbols not already in flight (see quoteFlight).
+   * Batch queries the database cache, then fetches remaining symbols from API.
+   *
+   * @param {string[]} symbolsToCheckDb - Symbols missing from Redis
+   * @param {number} servedFromCache - Symbols of the request already served (for logging)
+   * @param {RequestOptions} [request] - Provider queue lane and deadline
+   * @param {boolean} [allowStale=true] - Serve stale database rows instead of fetching
+   * @returns {Promise<Map<string, MarketQuote>>} Map of symbol → quote data
+   * @private
+   */
+  private async loadQuoteBatch(
+    symbolsToCheckDb: string[],
+    servedFromCache: number,
+    request: RequestOptions = {},
+    allowStale: boolean = true
+  ): Promise<Map<string, MarketQuote>> {
+    const results = new Map<string, MarketQuote>();
+    const uncachedSymbols: string[] = [];
+    const staleSymbols: string[] = [];
+
+    // Batch query database for symbols not in Redis
+    try {
+      // Single batch query instead of N individual queries
+      const dbCaches = await prisma.marketDataCache.findMany({
+        where: {
+          symbol: {
+            in: symbolsToCheckDb,
           },
-        });
+        },
+      });
 
-        // Process database results
-        const dbCacheMap = new Map(dbCaches.map(cache => [cache.symbol, cache]));
-
-        const backfillPromises: Promise<void>[] = [];
-        for (const symbol of symbolsToCheckDb) {
-          const dbCache = dbCacheMap.get(symbol);
-
-          if (dbCache && this.isCacheValid(dbCache.lastUpdated)) {
-            const quote = this.formatQuote(dbCache);
-            results.set(symbol, quote);
-            // Backfill Redis cache in parallel
-            backfillPromises.push(this.setCacheQuote(`quote:${symbol}`, quote));
-          } else {
-            // Symbol not in cache or cache expired, needs API fetch
-            uncachedSymbols.push(symbol);
-          }
+      // Process database results
+      const dbCacheMap = new Map(dbCaches.map(cache => [cache.symbol, cache]));
+
+      const backfill: MarketQuote[] = [];
+      for (const symbol of symbolsToCheckDb) {
+        const dbCache = dbCacheMap.get(symbol);
+        const freshness = dbCache ? this.getFreshness(dbCache.lastUpdated, allowStale) : 'expired';
+
+        if (dbCache && freshness !== 'expired') {
+          const quote = this.formatQuote(dbCache);
+          results.set(symbol, quote);
+          if (freshness === 'stale') staleSymbols.push(symbol);
+          backfill.push(quote);
+        } else {
+          // Symbol not in cache or past hard TTL, needs API fetch
+          uncachedSymbols.push(symbol);
         }
-        await Promise.all(backfillPromises);
-      } catch (error) {
-        logger.error('Database batch query failed:', error);
-        // On error, treat all symbolsToCheckDb as uncached
-        uncachedSymbols.push(...symbolsToCheckDb);
       }
+      // Backfill Redis cache in one pipelined round trip
+      await this.setCacheQuotes(backfill);
+    } catch (error) {
+      logger.error('Database batch query failed:', error);
+      // On error, treat all symbolsToCheckDb as uncached
+      uncachedSymbols.push(...symbolsToCheckDb);
     }
 
-    // If all symbols were cached, return early
+    this.staleServed += staleSymbols.length;
+    this.scheduleRefresh(staleSymbols);
+
     if (uncachedSymbols.length === 0) {
-      logger.info(`Batch request: All ${symbols.length} symbols served from cache`);
       return results;
     }
 
-    logger.info(`Batch request: ${results.size} from cache, ${uncachedSymbols.length} need API fetch`);
+    logger.info(`Batch request: ${servedFromCache + results.size} from cache, ${uncachedSymbols.length} need API fetch`);
+
+    const fetched = await this.fetchAndStoreQuotes(uncachedSymbols, request);
+    for (const [symbol, quote] of fetched.entries()) {
+      results.set(symbol, quote);
+    }
+
+    return results;
+  }
+
+  /**
+   * Fetch Quotes from API and Update Caches
+   *
+   * Fetches symbols with the batch provider path, falling back to individual
+   * fetches if the batch fails. All fetched quotes are then written to the
+   * database and Redis caches as one batch (see storeQuotes).
+   * Symbols that fail are omitted from the result.
+   *
+   * @param {string[]} symbols - Symbols to fetch
+   * @param {RequestOptions} [request] - Provider queue lane and deadline
+   * @param {boolean} [writeBehind=false] - Buffer the database write instead of awaiting it
+   * @returns {Promise<Map<string, MarketQuote>>} Map of symbol → fresh quote
+   * @private
+   */
+  private async fetchAndStoreQuotes(
+    symbols: string[],
+    request: RequestOptions = {},
+    writeBehind: boolean = false
+  ): Promise<Map<string, MarketQuote>> {
+    let results = new Map<string, MarketQuote>();
 
     // Fetch uncached symbols from API (batch operation)
     try {
-      const batchQuotes = await this.fetchQuoteBatchFromAPI(uncachedSymbols);
-
-      // Update caches and add to results
-      for (const [symbol, quote] of batchQuotes.entries()) {
-        results.set(symbol, quote);
-        await this.updateMarketDataCache(symbol, quote);
-        await this.setCacheQuote(`quote:${symbol}`, quote);
-      }
+      results = await this.fetchQuoteBatchFromAPI(symbols, request);
     } catch (error) {
       logger.error('Batch API fetch failed:', error);
       // Fall back to individual fetches for uncached symbols
       logger.info('Falling back to individual fetches...');
-      for (const symbol of uncachedSymbols) {
+      for (const symbol of symbols) {
         try {
-          const quote = await this.fetchQuoteFromAPI(symbol);
-          results.set(symbol, quote);
-          await this.updateMarketDataCache(symbol, quote);
-          await this.setCacheQuote(`quote:${symbol}`, quote);
+          results.set(symbol, await this.fetchQuoteFromAPI(symbol, request));
         } catch (err) {
           logger.error(`Failed to fetch ${symbol}:`, err);
         }
       }
     }
 
+    await this.storeQuotes([...results.values()], writeBehind);
     return results;
   }
 
+  /**
+   * Store Fetched Quotes in All Cache Tiers
+   *
+   * Writes the in-process cache, Redis (one pipeline) and the database cache
+   * (one multi-row upsert) in parallel. With writeBehind, the database write
+   * is buffered and flushed in batches instead (see marketDataWriteBehind);
+   * the quotes are still visible immediately through L0 and Redis.
+   * Database errors are logged rather than thrown: the quotes were fetched
+   * successfully and are already cached. Quote listeners are notified first.
+   *
+   * @param {MarketQuote[]} quotes - Freshly fetched quotes
+   * @param {boolean} [writeBehind=false] - Buffer the database write
+   * @private
+   */
+  private async storeQuotes(quotes: MarketQuote[], writeBehind: boolean = false): Promise<void> {
+    if (quotes.length === 0) return;
+
+    this.notifyQuoteListeners(quotes, 'provider');
+
+    if (writeBehind) {
+      quotes.forEach((quote) => this.marketDataWriteBehind.add(quote.symbol, quote));
+      await this.setCacheQuotes(quotes);
+      return;
+    }
+
+    await Promise.all([
+      this.setCacheQuotes(quotes),
+      this.updateMarketDataCacheBatch(quotes).catch((error) => {
+        logger.error(`Bulk market data cache write failed for ${quotes.length} symbols:`, error);
+      }),
+    ]);
+  }
+
+  /**
+   * Subscribe to Fetched Quotes
+   *
+   * The listener is called synchronously with every batch of quotes fetched
+   * from a provider (cache hits are not repeated), and with quotes applied
+   * from other instances (source 'peer'). Listeners must not throw
+   * or block; errors are logged and ignored.
+   *
+   * @param {QuoteListener} listener - Called with each batch of fresh quotes and their source
+   * @returns {() => void} Unsubscribe function
+   */
+  onQuotes(listener: QuoteListener): () => void {
+    this.quoteListeners.push(listener);
+    return () => {
+      this.quoteListeners = this.quoteListeners.filter((l) => l !== listener);
+    };
+  }
+
+  /**
+   * Apply Quotes Fetched by Another Instance
+   *
+   * Another instance already wrote these quotes to Redis and the database;
+   * only the in-process cache is updated (when the quote is newer than the
+   * cached one) and listeners are notified with source 'peer'.
+   *
+   * @param {MarketQuote[]} quotes - Quotes received from the quote bus
+   */
+  applyPeerQuotes(quotes: MarketQuote[]): void {
+    const applied: MarketQuote[] = [];
+
+    for (const quote of quotes) {
+      const key = `quote:${quote.symbol}`;
+      const cached = quoteMemoryCache.peek(key);
+      if (cached && new Date(cached.lastUpdated).getTime() >= new Date(quote.lastUpdated).getTime()) {
+        continue;
+      }
+
+      this.setMemoryQuote(key, quote);
+      this.refreshAttempts.delete(quote.symbol);
+      applied.push(quote);
+    }
+
+    if (applied.length === 0) return;
+
+    this.indexSymbols(applied);
+    this.notifyQuoteListeners(applied, 'peer');
+  }
+
+  /**
+   * Notify Quote Listeners
+   *
+   * @param {MarketQuote[]} quotes - Fresh quotes
+   * @param {QuoteSource} source - Fetched here or by another instance
+   * @private
+   */
+  private notifyQuoteListeners(quotes: MarketQuote[], source: QuoteSource): void {
+    for (const listener of this.quoteListeners) {
+      try {
+        listener(quotes, source);
+      } catch (error) {
+        logger.error('Quote listener failed:', error);
+      }
+    }
+  }
+
+  /**
+   * Flush Buffered Database Writes
+   *
+   * Persists quotes still waiting in the write-behind buffer.
+   * Call during graceful shutdown, before disconnecting the database.
+   *
+   * @returns {Promise<void>}
+   */
+  async flushPendingWrites(): Promise<void> {
+    await this.marketDataWriteBehind.flush();
+  }
+
+  /**
+   * Refresh Quotes Ahead of Expiry
+   *
+   * Fetches fresh quotes from the providers and writes them through all cache
+   * tiers, regardless of current cache state. The database write is buffered
+   * (write-behind) so warmer runs don't wait on it. Used by the background warmer so
+   * hot symbols are refreshed before user requests find them expired.
+   * Symbols already being refreshed are joined rather than fetched twice;
+   * symbols another instance refreshed within REFRESH_RETRY_MS are skipped.
+   *
+   * @param {string[]} symbols - Symbols to refresh
+   * @returns {Promise<Map<string, MarketQuote>>} Map of symbol → fresh quote
+   */
+  async refreshQuotes(symbols: string[]): Promise<Map<string, MarketQuote>> {
+    const claimed = await this.claimRefresh(symbols);
+    if (claimed.length === 0) {
+      return new Map();
+    }
+
+    return refreshFlight.doMany(claimed, (symbolsToRefresh) =>
+      this.fetchAndStoreQuotes(symbolsToRefresh, { priority: RequestPriority.BACKGROUND }, true)
+    );
+  }
+
+  /**
+   * Get Quote Ages
+   *
+   * Looks up when each symbol was last fetched according to the database cache
+   * (which every provider fetch writes through), in a single query.
+   *
+   * @param {string[]} symbols - Symbols to look up
+   * @returns {Promise<Map<string, Date>>} Map of symbol → last fetch time (missing if never cached)
+   */
+  async getQuoteAges(symbols: string[]): Promise<Map<string, Date>> {
+    const rows = await prisma.marketDataCache.findMany({
+      where: { symbol: { in: symbols } },
+      select: { symbol: true, lastUpdated: true },
+    });
+
+    return new Map(rows.map((row) => [row.symbol, row.lastUpdated]));
+  }
+
+  /**
+   * Get Last Known Quotes
+   *
+   * Reads the most recent price stored in the database cache regardless of age.
+   * Used as a fallback when a READ or BACKGROUND provider request misses its deadline.
+   *
+   * @param {string[]} symbols - Symbols to look up
+   * @returns {Promise<Map<string, MarketQuote>>} Map of symbol → last known quote (missing if never cached)
+   * @private
+   */
+  private async getLastKnownQuotes(symbols: string[]): Promise<Map<string, MarketQuote>> {
+    try {
+      const rows = await prisma.marketDataCache.findMany({
+        where: { symbol: { in: symbols } },
+      });
+      return new Map(rows.map((row) => [row.symbol, this.formatQuote(row)]));
+    } catch (error) {
+      logger.error('Last known quote lookup failed:', error);
+      return new Map();
+    }
+  }
+
+  /**
+   * Whether a Read May Be Served a Stale Quote
+   *
+   * Trades must execute at a current price, so TRADE reads only accept
+   * quotes younger than the soft TTL.
+   *
+   * @param {QuoteOptions} options - Caller's lane
+   * @returns {boolean} false for TRADE priority
+   * @private
+   */
+  private allowsStale(options: QuoteOptions): boolean {
+    return options.priority !== RequestPriority.TRADE;
+  }
+
+  /**
+   * Convert Quote Options to Provider Request Options
+   *
+   * @param {QuoteOptions} options - Caller's lane and relative deadline
+   * @param {number} startedAt - When the read started (ms)
+   * @returns {RequestOptions} Lane and absolute deadline for the provider queues
+   * @private
+   */
+  private toRequestOptions(options: QuoteOptions, startedAt: number): RequestOptions {
+    return {
+      priority: options.priority,
+      deadline: options.deadlineMs !== undefined ? startedAt + options.deadlineMs : undefined,
+    };
+  }
+
+  /**
+   * Record Reads That Went Through the Loader
+   *
+   * A loaded quote fetched after the read started came from a provider (cold read);
+   * anything older was served from the database cache (warm read).
+   *
+   * @param {MarketQuote[]} quotes - Quotes returned by the loader
+   * @param {number} startedAt - When the read started (ms)
+   * @private
+   */
+  private recordLoadedReads(quotes: MarketQuote[], startedAt: number): void {
+    for (const quote of quotes) {
+      if (new Date(quote.lastUpdated).getTime() >= startedAt) {
+        this.coldReads++;
+      } else {
+        this.warmReads++;
+      }
+    }
+  }
+
+  /**
+   * Schedule Background Refresh
+   *
+   * Revalidates stale quotes without blocking the caller. Symbols already being
+   * refreshed are skipped (coalesced by refreshFlight), and symbols whose last
+   * refresh attempt failed are retried at most once per REFRESH_RETRY_MS so a
+   * failing provider isn't hit on every read. Across instances, only the
+   * instance that claims the symbol's refresh lock fetches it; the others get
+   * the result through the quote bus. Failures are only logged because
+   * the caller has already been served the stale quote.
+   *
+   * @param {string[]} symbols - Stale symbols to refresh
+   * @private
+   */
+  private scheduleRefresh(symbols: string[]): void {
+    const now = Date.now();
+    const due = symbols.filter(
+      (symbol) => now - (this.refreshAttempts.get(symbol) ?? 0) >= REFRESH_RETRY_MS
+    );
+    if (due.length === 0) return;
+
+    due.forEach((symbol) => this.refreshAttempts.set(symbol, now));
+
+    this.claimRefresh(due)
+      .then((claimed) =>
+        refreshFlight.doMany(claimed, (symbolsToRefresh) =>
+          this.fetchAndStoreQuotes(symbolsToRefresh, { priority: RequestPriority.BACKGROUND }, true)
+        )
+      )
+      .then((refreshed) => {
+        for (const symbol of refreshed.keys()) {
+          this.refreshAttempts.delete(symbol);
+        }
+        logger.debug(`Background refresh: ${refreshed.size}/${due.length} stale symbols revalidated`);
+      })
+      .catch((error) => {
+        logger.warn('Background refresh failed:', error);
+      });
+  }
+
+  /**
+   * Claim Background Refreshes Across Instances
+   *
+   * Takes a Redis lock per symbol that expires after REFRESH_RETRY_MS, so
+   * each symbol is refreshed by at most one instance per window. If Redis is
+   * unavailable every symbol is claimed (duplicate fetches beat no refresh).
+   *
+   * @param {string[]} symbols - Symbols to refresh
+   * @returns {Promise<string[]>} Symbols this instance should refresh
+   * @private
+   */
+  private async claimRefresh(symbols: string[]): Promise<string[]> {
+    if (symbols.length === 0) return [];
+
+    try {
+      const acquired = await acquireLocks(
+        symbols.map((symbol) => `lock:refresh:${symbol}`),
+        REFRESH_RETRY_MS
+      );
+      return symbols.filter((_symbol, index) => acquired[index]);
+    } catch (error) {
+      logger.warn('Refresh lock error, refreshing without lock:', error);
+      return symbols;
+    }
+  }
+
+  /**
+   * Decide Whether a Cached Quote Can Be Served
+   *
+   * Fresh quotes are served as-is. Stale quotes are served and revalidated
+   * in the background, unless stale serving isn't allowed. Expired quotes
+   * must be reloaded.
+   *
+   * @param {string} symbol - Stock symbol
+   * @param {MarketQuote} quote - Cached quote
+   * @param {boolean} [allowStale=true] - Whether a stale quote may be served
+   * @returns {boolean} true if the cached quote can be returned
+   * @private
+   */
+  private serveCachedQuote(symbol: string, quote: MarketQuote, allowStale: boolean = true): boolean {
+    const freshness = this.getFreshness(quote.lastUpdated, allowStale);
+
+    if (freshness === 'stale') {
+      this.staleServed++;
+      this.scheduleRefresh([symbol]);
+    }
+
+    return freshness !== 'expired';
+  }
+
   /**
    * Search for Stocks/Crypto
    *
-   * Searches for assets by symbol or name in the database cache.
-   * If not found in cache and query looks like a symbol, fetches from API.
+   * Ranked prefix, company name and fuzzy matching against the in-memory
+   * symbol index (no database query). Prices are attached when the symbol
+   * is already in the in-process cache.
+   * If nothing matches and the query looks like a ticker, fetches a quote
+   * (skipped for typeahead, so keystrokes never reach the database or providers).
    *
-   * @param {string} query - Search term (symbol or partial symbol)
+   * @param {string} query - Search term (ticker, ticker prefix or company name)
    * @param {'stock' | 'crypto' | 'all'} type - Asset type filter
+   * @param {boolean} [typeahead=false] - Index-only search for search-as-you-type
    * @returns {Promise<any[]>} Array of matching assets (max 10 results)
    */
-  async search(query: string, type: 'stock' | 'crypto' | 'all' = 'all'): Promise<any[]> {
-    // First, search in cache
-    const results = await prisma.marketDataCache.findMany({
-      where: {
-        symbol: {
-          contains: query.toUpperCase(),
-        },
-        ...(type !== 'all' && {
-          assetType: type.toUpperCase() as 'STOCK' | 'CRYPTO',
-        }),
-      },
-      take: 10,
+  async search(
+    query: string,
+    type: 'stock' | 'crypto' | 'all' = 'all',
+    typeahead: boolean = false
+  ): Promise<any[]> {
+    const matches = symbolIndex.search(query, {
+      limit: 10,
+      assetType: type !== 'all' ? (type.toUpperCase() as 'STOCK' | 'CRYPTO') : undefined,
     });
 
-    // If found in cache, return results
-    if (results.length > 0) {
-      return results.map((item) => ({
-        symbol: item.symbol,
-        assetType: item.assetType,
-        currentPrice: item.currentPrice?.toNumber(),
-        change24h: item.change24h?.toNumber(),
-      }));
+    if (matches.length > 0) {
+      return matches.map((match) => {
+        const cached = quoteMemoryCache.peek(`quote:${match.symbol}`);
+        return {
+          symbol: match.symbol,
+          name: match.name,
+          assetType: match.assetType,
+          currentPrice: cached?.currentPrice,
+          change24h: cached?.change24h,
+        };
+      });
     }
 
-    // If not found in cache and query looks like a symbol (3-5 uppercase chars), fetch from API
+    // If not in the index and query looks like a symbol (1-5 letters), fetch from API
     const symbolPattern = /^[A-Z]{1,5}$/i;
-    if (symbolPattern.test(query)) {
+    if (!typeahead && symbolPattern.test(query)) {
       try {
         const quote = await this.getQuote(query.toUpperCase());
         return [{
           symbol: quote.symbol,
+          name: symbolIndex.get(quote.symbol)?.name ?? quote.symbol,
           assetType: quote.assetType,
           currentPrice: quote.currentPrice,
           change24h: quote.change24h,
@@ -284,27 +915,19 @@ export class MarketDataService {
    * Get Trending Assets
    *
    * Returns a curated list of popular trending stocks (FAANG+ tech giants).
-   * Uses batch API for optimal performance.
+   * Uses batch API for optimal performance. Provider fetches run in the
+   * BACKGROUND lane with a deadline, so they never delay trade execution.
    *
    * @returns {Promise<any[]>} Array of 10 trending stock quotes
    */
   async getTrending(): Promise<any[]> {
-    // Curated list of trending stocks
-    const trendingStocks = [
-      'AAPL',      // Apple
-      'MSFT',      // Microsoft
-      'GOOGL',     // Google
-      'TSLA',      // Tesla
-      'NVDA',      // NVIDIA
-      'AMZN',      // Amazon
-      'META',      // Meta
-      'NFLX',      // Netflix
-      'AMD',       // AMD
-      'INTC',      // Intel
-    ];
+    const trendingStocks = TRENDING_SYMBOLS;
 
     // Fetch all trending stocks using batch API for speed
-    const quotesMap = await this.getQuoteBatch(trendingStocks);
+    const quotesMap = await this.getQuoteBatch(trendingStocks, {
+      priority: RequestPriority.BACKGROUND,
+      deadlineMs: LIST_QUOTE_DEADLINE_MS,
+    });
 
     // Convert Map to Array, maintaining order
     const quotes = trendingStocks
@@ -319,10 +942,34 @@ export class MarketDataService {
    *
    * Returns the top 10 most actively traded symbols by users.
    * Determined by counting total trades (buy + sell) per symbol.
+   * Provider fetches run in the BACKGROUND lane with a deadline (see getTrending).
    *
    * @returns {Promise<any[]>} Array of top 10 most traded stock quotes
    */
   async getPopular(): Promise<any[]> {
+    const symbols = await this.getPopularSymbols();
+
+    // Use batch API for better performance
+    const quotesMap = await this.getQuoteBatch(symbols, {
+      priority: RequestPriority.BACKGROUND,
+      deadlineMs: LIST_QUOTE_DEADLINE_MS,
+    });
+
+    // Convert Map to Array, maintaining order
+    const quotes = symbols
+      .map((symbol) => quotesMap.get(symbol))
+      .filter((quote): quote is MarketQuote => quote !== undefined);
+
+    return quotes;
+  }
+
+  /**
+   * Get Most Traded Symbols on Platform
+   *
+   * @param {number} [limit=10] - Number of symbols to return
+   * @returns {Promise<string[]>} Symbols ordered by total trade count
+   */
+  async getPopularSymbols(limit: number = 10): Promise<string[]> {
     const popular = await prisma.trade.groupBy({
       by: ['symbol'],
       _count: {
@@ -333,58 +980,44 @@ export class MarketDataService {
           symbol: 'desc',
         },
       },
-      take: 10,
+      take: limit,
     });
 
-    const symbols = popular.map((p) => p.symbol);
-
-    // Use batch API for better performance
-    const quotesMap = await this.getQuoteBatch(symbols);
-
-    // Convert Map to Array, maintaining order
-    const quotes = symbols
-      .map((symbol) => quotesMap.get(symbol))
-      .filter((quote): quote is MarketQuote => quote !== undefined);
-
-    return quotes;
+    return popular.map((p) => p.symbol);
   }
 
   /**
    * Fetch Quote from External API with Fallback Chain
    *
-   * Implements multi-provider fallback strategy for reliability:
-   * 1. Try Alpha Vantage (primary, more accurate but slower due to rate limits)
-   * 2. Fall back to Finnhub (secondary, faster but less detailed)
+   * Tries the available providers in order of expected response time
+   * (queue wait + rolling latency and error rate, see rankProviders).
+   * Providers with an open circuit breaker (repeated failures, or throttled
+   * until their quota resets) are skipped without paying their timeout.
    *
-   * Uses request queues to prevent API rate limit violations.
+   * Each provider routes requests through its own rate-limited queue.
    *
    * @param {string} symbol - Stock symbol to fetch
+   * @param {RequestOptions} [request] - Provider queue lane and deadline
    * @returns {Promise<MarketQuote>} Quote data from successful API
+   * @throws {RequestDeadlineError} If no provider could start before the deadline
    * @throws {AppError} 503 if all APIs fail
    * @private
    */
-  private async fetchQuoteFromAPI(symbol: string): Promise<MarketQuote> {
-    let quote: MarketQuote | null = null;
+  private async fetchQuoteFromAPI(symbol: string, request: RequestOptions = {}): Promise<MarketQuote> {
+    let deadlineError: RequestDeadlineError | null = null;
 
-    // Try Alpha Vantage first (Primary)
-    if (env.ALPHA_VANTAGE_API_KEY) {
+    for (const provider of rankProviders(this.providers)) {
       try {
-        quote = await alphaVantageQueue.add(() => this.fetchFromAlphaVantage(symbol));
+        const quote = await provider.fetchQuote(symbol, request);
         if (quote) return quote;
       } catch (error: any) {
-        logger.warn(`Alpha Vantage failed for ${symbol}:`, error.message);
+        if (error instanceof RequestDeadlineError) deadlineError = error;
+        logger.warn(`${provider.name} failed for ${symbol}:`, error.message);
       }
     }
 
-    // Try Finnhub (Secondary)
-    if (env.FINNHUB_API_KEY) {
-      try {
-        quote = await finnhubQueue.add(() => this.fetchFromFinnhub(symbol));
-        if (quote) return quote;
-      } catch (error: any) {
-        logger.warn(`Finnhub failed for ${symbol}:`, error.message);
-      }
-    }
+    // Let the caller fall back to a cached price instead of reporting an outage
+    if (deadlineError) throw deadlineError;
 
     // If all APIs failed, throw error
     throw new AppError(`Unable to fetch quote for ${symbol} from any API`, 503);
@@ -392,38 +1025,40 @@ export class MarketDataService {
 
   /**
    * Fetch quotes for multiple symbols from API (batch operation)
-   * Priority: Alpha Vantage -> Finnhub parallel
+   *
+   * Tries available providers fastest-first (see rankProviders). Providers
+   * without a batch endpoint are skipped once the batch would take a minute
+   * or more of their rate limit, unless no other provider is left (e.g., Alpha
+   * Vantage at 5 req/min is only used for fewer than 5 symbols when Finnhub
+   * is configured).
    */
-  private async fetchQuoteBatchFromAPI(symbols: string[]): Promise<Map<string, MarketQuote>> {
-    let quotes = new Map<string, MarketQuote>();
+  private async fetchQuoteBatchFromAPI(
+    symbols: string[],
+    request: RequestOptions = {}
+  ): Promise<Map<string, MarketQuote>> {
+    if (symbols.length === 0) {
+      return new Map();
+    }
 
-    // Try Alpha Vantage ONLY for small batches (< 5 symbols)
-    // With 12-second rate limit, larger batches would be impractically slow
-    // (e.g., 10 symbols = 2 minutes, 20 symbols = 4 minutes)
-    if (env.ALPHA_VANTAGE_API_KEY && symbols.length > 0 && symbols.length < 5) {
-      try {
-        quotes = await this.fetchBatchFromAlphaVantage(symbols);
-        if (quotes.size > 0) {
-          logger.info(`Alpha Vantage batch: Successfully fetched ${quotes.size}/${symbols.length} symbols`);
-          return quotes;
-        }
-      } catch (error: any) {
-        logger.warn(`Alpha Vantage batch failed:`, error.message);
+    const providers = rankProviders(this.providers, symbols.length);
+    for (const [index, provider] of providers.entries()) {
+      const isLastProvider = index === providers.length - 1;
+      if (!provider.capabilities.batch && !isLastProvider && symbols.length >= provider.rateLimit.requestsPerMinute) {
+        logger.info(
+          `Skipping ${provider.name} for batch of ${symbols.length} symbols ` +
+          `(would take ~${Math.round(symbols.length * 60 / provider.rateLimit.requestsPerMinute)}s). Using faster providers.`
+        );
+        continue;
       }
-    } else if (env.ALPHA_VANTAGE_API_KEY && symbols.length >= 5) {
-      logger.info(`Skipping Alpha Vantage for batch of ${symbols.length} symbols (would take ~${symbols.length * 12}s). Using faster providers.`);
-    }
 
-    // Try Finnhub parallel fetches (Tertiary - faster than sequential)
-    if (env.FINNHUB_API_KEY && symbols.length > 0) {
       try {
-        quotes = await this.fetchBatchFromFinnhub(symbols);
+        const quotes = await provider.fetchQuotes(symbols, request);
         if (quotes.size > 0) {
-          logger.info(`Finnhub batch: Successfully fetched ${quotes.size}/${symbols.length} symbols`);
+          logger.info(`${provider.name} batch: Successfully fetched ${quotes.size}/${symbols.length} symbols`);
           return quotes;
         }
       } catch (error: any) {
-        logger.warn(`Finnhub batch failed:`, error.message);
+        logger.warn(`${provider.name} batch failed:`, error.message);
       }
     }
 
@@ -431,218 +1066,236 @@ export class MarketDataService {
   }
 
   /**
-   * Fetch Quote from Alpha Vantage API
+   * Update Market Data Cache in Database (Batch)
    *
-   * Fetches real-time stock quote using Alpha Vantage GLOBAL_QUOTE endpoint.
-   * API provides high-quality data including volume and accurate change percentages.
+   * Upserts many quotes with a single multi-row
+   * INSERT ... ON CONFLICT ("symbol") DO UPDATE, instead of one upsert per symbol.
+   * If a symbol appears more than once, the last quote wins.
    *
-   * @param {string} symbol - Stock symbol
-   * @returns {Promise<MarketQuote>} Formatted quote data
-   * @throws {AppError} 404 if symbol not found
+   * @param {MarketQuote[]} quotes - Quote data to cache
    * @private
    */
-  private async fetchFromAlphaVantage(symbol: string): Promise<MarketQuote> {
-    const url = `https://www.alphavantage.co/query`;
-    const response = await axios.get(url, {
-      params: {
-        function: 'GLOBAL_QUOTE',
-        symbol,
-        apikey: env.ALPHA_VANTAGE_API_KEY,
-      },
-      timeout: 5000,
-    });
-
-    const quote = response.data['Global Quote'];
-
-    if (!quote || !quote['05. price']) {
-      throw new AppError('Symbol not found in Alpha Vantage', 404);
-    }
-
-    const currentPrice = parseFloat(quote['05. price']);
-    const change = parseFloat(quote['09. change']);
-    const changePercent = parseFloat(quote['10. change percent'].replace('%', ''));
+  private async updateMarketDataCacheBatch(quotes: MarketQuote[]): Promise<void> {
+    const bySymbol = new Map(quotes.map((quote) => [quote.symbol, quote]));
+    if (bySymbol.size === 0) return;
 
-    return {
-      symbol: symbol.toUpperCase(),
-      assetType: 'STOCK',
-      currentPrice,
-      change24h: change,
-      changePercentage: changePercent,
-      volume: parseInt(quote['06. volume']) || undefined,
-      lastUpdated: new Date(),
-    };
+    const now = new Date();
+    const rows = [...bySymbol.values()].map((quote) => Prisma.sql`(
+      ${randomUUID()},
+      ${quote.symbol},
+      ${quote.assetType}::"asset_type",
+      ${quote.currentPrice}::decimal,
+      ${quote.change24h}::decimal,
+      ${quote.volume ? BigInt(quote.volume) : null}::bigint,
+      ${quote.marketCap ? BigInt(quote.marketCap) : null}::bigint,
+      ${now}
+    )`);
+
+    await prisma.$executeRaw`
+      INSERT INTO "market_data_cache"
+        ("id", "symbol", "asset_type", "current_price", "change_24h", "volume", "market_cap", "last_updated")
+      VALUES ${Prisma.join(rows)}
+      ON CONFLICT ("symbol") DO UPDATE SET
+        "current_price" = EXCLUDED."current_price",
+        "change_24h" = EXCLUDED."change_24h",
+        "volume" = EXCLUDED."volume",
+        "market_cap" = EXCLUDED."market_cap",
+        "last_updated" = EXCLUDED."last_updated"
+    `;
   }
 
-
   /**
-   * Fetch Quote from Finnhub API
+   * Get Cache Statistics
    *
-   * Fetches real-time stock quote using Finnhub quote endpoint.
-   * Faster than Alpha Vantage but provides less detailed data (no volume).
+   * Exposes in-process cache, coalescing and revalidation counters for health
+   * checks and monitoring. `coalescing.deduplicated` counts callers that shared
+   * another request's fetch; `revalidation.staleServed` counts reads answered
+   * with a stale quote while a background refresh ran; `coverage.ratio` is the
+   * fraction of quote reads served without waiting on a provider;
+   * `queues` shows pending requests per lane for each provider, `budgets` the remaining shared
+   * (cross-instance) rate limit per provider, and `deadlineFallbacks` counts reads
+   * answered with the last known price after a missed deadline;
+   * `writeBehind` shows database writes buffered by background refreshes;
+   * `providers` shows each provider's circuit state, latency and error rate.
    *
-   * @param {string} symbol - Stock symbol
-   * @returns {Promise<MarketQuote>} Formatted quote data
-   * @throws {AppError} 404 if symbol not found
-   * @private
+   * @returns {object} Level 0 cache, request coalescing, revalidation, coverage and provider queue statistics
    */
-  private async fetchFromFinnhub(symbol: string): Promise<MarketQuote> {
-    const url = `https://finnhub.io/api/v1/quote`;
-    const response = await axios.get(url, {
-      params: {
-        symbol: symbol.toUpperCase(),
-        token: env.FINNHUB_API_KEY,
-      },
-      timeout: 5000,
-    });
-
-    const data = response.data;
-
-    if (!data || !data.c) {
-      throw new AppError('Symbol not found in Finnhub', 404);
-    }
+  getCacheStats(): {
+    memory: LRUCacheStats;
+    coalescing: SingleFlightStats;
+    revalidation: SingleFlightStats & { staleServed: number };
+    coverage: { warmReads: number; coldReads: number; ratio: number };
+    queues: {
+      providers: Record<string, RequestQueueStats>;
+      budgets: Record<string, DistributedTokenBucketStats | null>;
+      deadlineFallbacks: number;
+    };
+    writeBehind: WriteBehindBufferStats;
+    providers: Record<string, ProviderHealthStats>;
+  } {
+    const totalReads = this.warmReads + this.coldReads;
 
     return {
-      symbol: symbol.toUpperCase(),
-      assetType: 'STOCK',
-      currentPrice: data.c,
-      change24h: data.d,
-      changePercentage: data.dp,
-      volume: undefined,
-      marketCap: undefined,
-      lastUpdated: new Date(),
+      memory: quoteMemoryCache.getStats(),
+      coalescing: quoteFlight.getStats(),
+      revalidation: {
+        ...refreshFlight.getStats(),
+        staleServed: this.staleServed,
+      },
+      coverage: {
+        warmReads: this.warmReads,
+        coldReads: this.coldReads,
+        ratio: totalReads > 0 ? this.warmReads / totalReads : 0,
+      },
+      queues: {
+        providers: Object.fromEntries(
+          this.providers.map((provider) => [provider.name, provider.getQueueStats()])
+        ),
+        budgets: Object.fromEntries(
+          this.providers.map((provider) => [provider.name, provider.getBudgetStats()])
+        ),
+        deadlineFallbacks: this.deadlineFallbacks,
+      },
+      writeBehind: this.marketDataWriteBehind.getStats(),
+      providers: Object.fromEntries(
+        this.providers.map((provider) => [provider.name, provider.health.getStats()])
+      ),
     };
   }
 
   /**
-   * Fetch batch quotes from Alpha Vantage
+   * Set Quote in Redis Cache
    *
-   * PERFORMANCE WARNING: Alpha Vantage free tier only supports individual requests
-   * with a rate limit of 5 requests/minute (12 seconds between requests).
-   * Batch operations will be EXTREMELY SLOW:
-   * - 5 symbols = 60 seconds
-   * - 10 symbols = 120 seconds (2 minutes)
-   * - 20 symbols = 240 seconds (4 minutes)
+   * Stores quote data in Redis until the quote's hard TTL, so it can still be
+   * served stale while revalidating after the soft TTL. The in-process entry for the same key is replaced first, so a fresh quote
+   * written here is immediately visible to subsequent reads in this process.
+   * Errors are logged but don't fail the operation (cache is optional).
    *
-   * This method should only be used for small batches (< 5 symbols) or when
-   * other providers are unavailable.
+   * @param {string} key - Cache key (format: "quote:SYMBOL")
+   * @param {MarketQuote} quote - Quote data to cache
+   * @private
    */
-  private async fetchBatchFromAlphaVantage(symbols: string[]): Promise<Map<string, MarketQuote>> {
-    const quotes = new Map<string, MarketQuote>();
-    const failedSymbols: string[] = [];
-
-    // Alpha Vantage free API only supports individual GLOBAL_QUOTE requests.
-    // With rate limiting (5 req/min), large batches will be very slow.
-    // Use alphaVantageQueue to respect rate limits (12 sec between requests)
-    const promises = symbols.map((symbol) =>
-      alphaVantageQueue.add(() => this.fetchFromAlphaVantage(symbol))
-        .then((quote) => quotes.set(symbol, quote))
-        .catch((error) => {
-          failedSymbols.push(symbol);
-          logger.warn(`Alpha Vantage failed for ${symbol}:`, error.message);
-        })
-    );
+  private async setCacheQuote(key: string, quote: MarketQuote): Promise<void> {
+    this.setMemoryQuote(key, quote);
+    this.indexSymbols([quote]);
 
-    await Promise.all(promises);
+    const ttlSeconds = Math.ceil(this.getRemainingTtlMs(quote.lastUpdated) / 1000);
+    if (ttlSeconds <= 0) return;
 
-    // Log summary of batch results
-    if (failedSymbols.length > 0) {
-      logger.warn(`Alpha Vantage batch: ${failedSymbols.length}/${symbols.length} symbols failed: ${failedSymbols.join(', ')}`);
+    try {
+      await cacheSet(key, JSON.stringify(quote), ttlSeconds);
+    } catch (error) {
+      logger.warn('Cache write error:', error);
     }
-
-    return quotes;
   }
 
   /**
-   * Fetch batch quotes from Finnhub
-   * Makes parallel requests with rate limiting (60 req/min)
+   * Set Quotes in Redis Cache (Batch)
+   *
+   * Same as setCacheQuote for many quotes, written to Redis in a single
+   * pipelined round trip. Quotes already past their hard TTL are skipped.
+   *
+   * @param {MarketQuote[]} quotes - Quotes to cache (keyed "quote:SYMBOL")
+   * @private
    */
-  private async fetchBatchFromFinnhub(symbols: string[]): Promise<Map<string, MarketQuote>> {
-    const quotes = new Map<string, MarketQuote>();
-    const failedSymbols: string[] = [];
-
-    // Fetch in parallel but respect rate limit
-    const promises = symbols.map((symbol) =>
-      finnhubQueue.add(() => this.fetchFromFinnhub(symbol))
-        .then((quote) => quotes.set(symbol, quote))
-        .catch((error) => {
-          failedSymbols.push(symbol);
-          logger.warn(`Finnhub failed for ${symbol}:`, error.message);
-        })
-    );
+  private async setCacheQuotes(quotes: MarketQuote[]): Promise<void> {
+    const entries: Array<{ key: string; value: string; ttlSeconds: number }> = [];
+    this.indexSymbols(quotes);
 
-    await Promise.all(promises);
+    for (const quote of quotes) {
+      const key = `quote:${quote.symbol}`;
+      this.setMemoryQuote(key, quote);
 
-    // Log summary of batch results
-    if (failedSymbols.length > 0) {
-      logger.warn(`Finnhub batch: ${failedSymbols.length}/${symbols.length} symbols failed: ${failedSymbols.join(', ')}`);
+      const ttlSeconds = Math.ceil(this.getRemainingTtlMs(quote.lastUpdated) / 1000);
+      if (ttlSeconds > 0) {
+        entries.push({ key, value: JSON.stringify(quote), ttlSeconds });
+      }
     }
 
-    return quotes;
+    try {
+      await cacheMSet(entries);
+    } catch (error) {
+      logger.warn('Batch cache write error:', error);
+    }
   }
 
   /**
-   * Update Market Data Cache in Database
+   * Add Quoted Symbols to the Search Index
    *
-   * Upserts (insert or update) quote data in the database cache.
-   * This acts as Level 2 cache, backing up Redis cache.
+   * Symbols missing from the bundled listing become searchable by ticker once
+   * they have been quoted. Known symbols are left unchanged.
    *
-   * @param {string} symbol - Stock symbol
-   * @param {MarketQuote} quote - Quote data to cache
+   * @param {MarketQuote[]} quotes - Quotes being cached
    * @private
    */
-  private async updateMarketDataCache(symbol: string, quote: MarketQuote): Promise<void> {
-    await prisma.marketDataCache.upsert({
-      where: { symbol },
-      create: {
-        symbol,
-        assetType: quote.assetType as 'STOCK' | 'CRYPTO',
-        currentPrice: quote.currentPrice,
-        change24h: quote.change24h,
-        volume: quote.volume ? BigInt(quote.volume) : null,
-        marketCap: quote.marketCap ? BigInt(quote.marketCap) : null,
-        lastUpdated: new Date(),
-      },
-      update: {
-        currentPrice: quote.currentPrice,
-        change24h: quote.change24h,
-        volume: quote.volume ? BigInt(quote.volume) : null,
-        marketCap: quote.marketCap ? BigInt(quote.marketCap) : null,
-        lastUpdated: new Date(),
-      },
-    });
+  private indexSymbols(quotes: MarketQuote[]): void {
+    for (const quote of quotes) {
+      if (!symbolIndex.has(quote.symbol)) {
+        symbolIndex.upsert({
+          symbol: quote.symbol,
+          name: quote.symbol,
+          assetType: quote.assetType as 'STOCK' | 'CRYPTO',
+        });
+      }
+    }
   }
 
   /**
-   * Set Quote in Redis Cache
+   * Set Quote in In-Process Cache
    *
-   * Stores quote data in Redis with TTL (time-to-live).
-   * Errors are logged but don't fail the operation (cache is optional).
+   * Caches the quote only until its hard TTL, based on when the quote was
+   * originally fetched (not when it was read).
    *
    * @param {string} key - Cache key (format: "quote:SYMBOL")
    * @param {MarketQuote} quote - Quote data to cache
    * @private
    */
-  private async setCacheQuote(key: string, quote: MarketQuote): Promise<void> {
-    try {
-      await cacheSet(key, JSON.stringify(quote), CACHE_TTL);
-    } catch (error) {
-      logger.warn('Cache write error:', error);
+  private setMemoryQuote(key: string, quote: MarketQuote): void {
+    const remainingMs = this.getRemainingTtlMs(quote.lastUpdated);
+
+    if (remainingMs > 0) {
+      quoteMemoryCache.set(key, quote, remainingMs);
+    } else {
+      quoteMemoryCache.delete(key);
     }
   }
 
   /**
-   * Check if Cache is Still Valid
+   * Get Quote Freshness
    *
-   * Compares the lastUpdated timestamp with current time against CACHE_TTL.
+   * Compares the quote age against the soft TTL (CACHE_TTL) and hard TTL (STALE_TTL):
+   * - fresh: younger than the soft TTL, serve as-is
+   * - stale: between soft and hard TTL, serve and revalidate in background
+   * - expired: older than the hard TTL, must be reloaded before serving
    *
-   * @param {Date} lastUpdated - When the cache entry was last updated
-   * @returns {boolean} true if cache is still fresh, false if expired
+   * Without allowStale, anything past the soft TTL is expired (TRADE reads).
+   *
+   * @param {Date | string} lastUpdated - When the quote was fetched (string when read from Redis)
+   * @param {boolean} [allowStale=true] - Whether the caller may be served a stale quote
+   * @returns {QuoteFreshness} Freshness classification
    * @private
    */
-  private isCacheValid(lastUpdated: Date): boolean {
-    const now = new Date();
-    const diffSeconds = (now.getTime() - lastUpdated.getTime()) / 1000;
-    return diffSeconds < CACHE_TTL;
+  private getFreshness(lastUpdated: Date | string, allowStale: boolean = true): QuoteFreshness {
+    const fetchedAt = new Date(lastUpdated).getTime();
+    if (Number.isNaN(fetchedAt)) return 'expired';
+
+    const ageSeconds = (Date.now() - fetchedAt) / 1000;
+    if (ageSeconds < CACHE_TTL) return 'fresh';
+    if (allowStale && ageSeconds < STALE_TTL) return 'stale';
+    return 'expired';
+  }
+
+  /**
+   * Get Remaining Cache Lifetime
+   *
+   * @param {Date | string} lastUpdated - When the quote was fetched
+   * @returns {number} Milliseconds until the quote passes its hard TTL (<= 0 if expired)
+   * @private
+   */
+  private getRemainingTtlMs(lastUpdated: Date | string): number {
+    const fetchedAt = new Date(lastUpdated).getTime();
+    if (Number.isNaN(fetchedAt)) return 0;
+    return STALE_TTL * 1000 - (Date.now() - fetchedAt);
   }
 
   /**
@@ -0,0 +1,484 @@
+/**
+ * Order Service
+ *
+ * Resting limit, stop and stop-limit orders, and the matcher that fills them
+ * when an observed price crosses their trigger.
+ *
+ * ORDER TYPES:
+ * - LIMIT BUY fills when price <= limitPrice; LIMIT SELL when price >= limitPrice
+ * - STOP BUY fills at market when price >= stopPrice; STOP SELL when price <= stopPrice
+ * - STOP_LIMIT: once the stop is crossed, rests as a LIMIT order at limitPrice
+ * Fills execute at the observed price.
+ *
+ * MATCHING:
+ * - Open orders are kept in a TriggerIndex (per-symbol heaps ordered by trigger
+ *   price), so a new price only touches the orders whose trigger it crossed
+ * - Prices come from every quote MarketDataService fetches or receives from
+ *   other instances (onPrices); symbols with open orders are kept warm by the
+ *   quote warmer
+ * - Fills run one at a time through TradeService.fillOrder, which claims the
+ *   order in the database, so each order fills at most once across instances
+ *   and a cancel racing a fill is safe
+ * - Funds and holdings are checked at fill time; an order they no longer
+ *   cover is REJECTED
+ *
+ * CROSS-INSTANCE SYNC:
+ * - Each instance loads the open orders at startup and indexes those placed
+ *   through it
+ * - Placements and closes (fills, rejects, cancels) are published on the
+ *   quote bus; peers index placed orders and drop closed ones (applyPeerEvent)
+ * - Pub/sub drops messages while Redis is unreachable, so syncOpenOrders also
+ *   polls for recently created OPEN orders every SYNC_INTERVAL_MS. A closed
+ *   order a peer missed is harmless: its fill claim finds it closed
+ */
+
+import { AssetType, Order, OrderStatus, OrderType, Prisma } from '@prisma/client';
+import getPrismaClient from '../config/database';
+import { AppError } from '../middleware/errorHandler';
+import logger from '../config/logger';
+import { MarketQuote } from '../types';
+import { RequestPriority } from '../utils/requestQueue';
+import { TriggerEntry, TriggerIndex } from '../utils/triggerIndex';
+import marketDataService from './marketDataService';
+import quoteBus, { OrderBusEvent } from './quoteBus';
+import tradeService, { OrderFill } from './tradeService';
+
+const prisma = getPrismaClient();
+
+const LOAD_PAGE_SIZE = 5000; // Open orders read per query at startup
+const SYNC_INTERVAL_MS = 60 * 1000; // Catch-up poll for orders placed on other instances
+const SYNC_OVERLAP_MS = 60 * 1000;  // Re-read window covering clock skew and slow commits
+
+interface RestingOrder extends OrderFill {
+  orderType: OrderType;
+  limitPrice: number | null;
+  stopPrice: number | null;
+  triggered: boolean; // STOP_LIMIT whose stop was crossed (now a limit order)
+}
+
+export interface PlaceOrderInput {
+  portfolioId: string;
+  symbol: string;
+  assetType: 'STOCK' | 'CRYPTO';
+  tradeType: 'BUY' | 'SELL';
+  orderType: OrderType;
+  quantity: number;
+  limitPrice?: number;
+  stopPrice?: number;
+}
+
+export interface OrderMatcherStats {
+  resting: number;  // Open orders in the index
+  symbols: number;  // Symbols with open orders
+  crossed: number;  // Orders whose trigger was crossed
+  filled: number;
+  rejected: number;
+  closed: number;   // Crossed orders already filled or cancelled elsewhere
+  errors: number;   // Fills that failed and went back into the index
+  synced: number;   // Orders placed elsewhere and added by a peer event or the catch-up poll
+}
+
+export class OrderService {
+  private index = new TriggerIndex<RestingOrder>();
+  private matching: Promise<void> = Promise.resolve();
+  private inFlight = new Set<string>(); // Crossed orders taken out of the index and not yet processed
+  private syncTimer: NodeJS.Timeout | null = null;
+  private syncedSince = new Date();
+
+  private crossed = 0;
+  private filled = 0;
+  private rejected = 0;
+  private closed = 0;
+  private errors = 0;
+  private synced = 0;
+
+  /**
+   * Load Open Orders into the Matcher
+   *
+   * Reads open orders in pages (by id), so startup memory is the index itself.
+   *
+   * @returns {Promise<number>} Number of orders loaded
+   */
+  async loadOpenOrders(): Promise<number> {
+    let cursor: string | undefined;
+    let loaded = 0;
+    this.syncedSince = new Date();
+
+    for (;;) {
+      const page = await prisma.order.findMany({
+        where: { status: OrderStatus.OPEN },
+        include: { portfolio: { select: { userId: true } } },
+        orderBy: { id: 'asc' },
+        take: LOAD_PAGE_SIZE,
+        ...(cursor ? { cursor: { id: cursor }, skip: 1 } : {}),
+      });
+      if (page.length === 0) break;
+
+      for (const order of page) {
+        this.index.add(this.toEntry(this.toRestingOrder(order, order.portfolio.userId)));
+      }
+      loaded += page.length;
+      cursor = page[page.length - 1].id;
+    }
+
+    logger.info(`Order matcher loaded ${loaded} open orders`);
+    return loaded;
+  }
+
+  /**
+   * Place a Resting Order
+   *
+   * @param {string} userId - User ID (for ownership verification)
+   * @param {PlaceOrderInput} input - Order details
+   * @returns {Promise<Order>} Created order
+   * @throws {AppError} If the portfolio isn't found or a required price is missing
+   */
+  async placeOrder(userId: string, input: PlaceOrderInput): Promise<Order> {
+    const { orderType, limitPrice, stopPrice } = input;
+
+    if (orderType !== 'STOP' && limitPrice === undefined) {
+      throw new AppError('limitPrice is required for LIMIT and STOP_LIMIT orders', 400);
+    }
+    if (orderType !== 'LIMIT' && stopPrice === undefined) {
+      throw new AppError('stopPrice is required for STOP and STOP_LIMIT orders', 400);
+    }
+
+    const portfolio = await prisma.portfolio.findFirst({
+      where: { id: input.portfolioId, userId },
+      select: { id: true },
+    });
+
+    if (!portfolio) {
+      throw new AppError('Portfolio not found', 404);
+    }
+
+    const order = await prisma.order.create({
+      data: {
+        portfolioId: input.portfolioId,
+        symbol: input.symbol.trim().toUpperCase(),
+        assetType: input.assetType as AssetType,
+        tradeType: input.tradeType,
+        orderType,
+        quantity: input.quantity,
+        limitPrice: orderType === 'STOP' ? null : limitPrice,
+        stopPrice: orderType === 'LIMIT' ? null : stopPrice,
+      },
+    });
+
+    this.index.add(this.toEntry(this.toRestingOrder(order, userId)));
+    quoteBus.publishOrderEvent({ type: 'placed', orderId: order.id });
+    logger.info(`Order placed: ${order.orderType} ${order.tradeType} ${order.quantity} ${order.symbol} (order ${order.id})`);
+
+    // Match against the current price right away. TRADE priority: a fill must
+    // never use a stale quote, so an old cached price is refetched first
+    marketDataService
+      .getQuote(order.symbol, { priority: RequestPriority.TRADE })
+      .then((quote) => this.onPrices([quote]))
+      .catch((error) => logger.warn(`Initial price check failed for order ${order.id}:`, error));
+
+    return order;
+  }
+
+  /**
+   * Cancel an Open Order
+   *
+   * @param {string} orderId - Order ID
+   * @param {string} userId - User ID (for ownership verification)
+   * @returns {Promise<Order>} Cancelled order
+   * @throws {AppError} 404 if not found, 409 if it's no longer open
+   */
+  async cancelOrder(orderId: string, userId: string): Promise<Order> {
+    const { count } = await prisma.order.updateMany({
+      where: { id: orderId, status: OrderStatus.OPEN, portfolio: { userId } },
+      data: { status: OrderStatus.CANCELLED },
+    });
+
+    const order = await prisma.order.findFirst({
+      where: { id: orderId, portfolio: { userId } },
+    });
+
+    if (!order) {
+      throw new AppError('Order not found', 404);
+    }
+    if (count === 0) {
+      throw new AppError(`Order is already ${order.status.toLowerCase()}`, 409);
+    }
+
+    this.index.remove(orderId);
+    quoteBus.publishOrderEvent({ type: 'closed', orderId });
+    logger.info(`Order cancelled: ${orderId}`);
+
+    return order;
+  }
+
+  /**
+   * Get a User's Orders
+   *
+   * @param {string} userId - User ID
+   * @param {object} [options] - Portfolio/status filters and pagination
+   * @returns {Promise<{ orders: Order[]; total: number }>} Orders (newest first) and total count
+   */
+  async getOrders(
+    userId: string,
+    options: { portfolioId?: string; status?: OrderStatus; limit?: number; offset?: number } = {}
+  ): Promise<{ orders: Order[]; total: number }> {
+    const where: Prisma.OrderWhereInput = {
+      portfolio: { userId },
+      ...(options.portfolioId ? { portfolioId: options.portfolioId } : {}),
+      ...(options.status ? { status: options.status } : {}),
+    };
+
+    const [orders, total] = await Promise.all([
+      prisma.order.findMany({
+        where,
+        orderBy: { createdAt: 'desc' },
+        take: Math.min(options.limit ?? 50, 200),
+        skip: options.offset ?? 0,
+      }),
+      prisma.order.count({ where }),
+    ]);
+
+    return { orders, total };
+  }
+
+  /**
+   * Match Observed Prices
+   *
+   * Takes the orders each price crossed out of the index and queues their
+   * fills. Orders whose trigger wasn't crossed aren't touched.
+   *
+   * @param {MarketQuote[]} quotes - Newly observed quotes
+   */
+  onPrices(quotes: MarketQuote[]): void {
+    for (const quote of quotes) {
+      const crossed = this.index.takeCrossed(quote.symbol, quote.currentPrice);
+      if (crossed.length === 0) continue;
+
+      crossed.forEach((entry) => this.inFlight.add(entry.id));
+      this.crossed += crossed.length;
+      this.matching = this.matching.then(() => this.processCrossed(crossed, quote.currentPrice));
+    }
+  }
+
+  /**
+   * Apply an Order Change Published by Another Instance
+   *
+   * Placed orders are read from the database (still OPEN only) and indexed;
+   * closed orders are dropped from the index.
+   *
+   * @param {OrderBusEvent} event - Remote order event
+   * @returns {Promise<void>}
+   */
+  async applyPeerEvent(event: OrderBusEvent): Promise<void> {
+    if (event.type === 'closed') {
+      this.index.remove(event.orderId);
+      return;
+    }
+    if (this.isKnown(event.orderId)) return;
+
+    const order = await prisma.order.findFirst({
+      where: { id: event.orderId, status: OrderStatus.OPEN },
+      include: { portfolio: { select: { userId: true } } },
+    });
+    if (order && !this.isKnown(order.id)) {
+      this.index.add(this.toEntry(this.toRestingOrder(order, order.portfolio.userId)));
+      this.synced++;
+    }
+  }
+
+  /**
+   * Index OPEN Orders Created Since the Last Sync
+   *
+   * Catches placements whose bus message this instance missed. Re-reads an
+   * overlap window, skipping orders already indexed or being filled.
+   *
+   * @returns {Promise<number>} Number of orders added
+   */
+  async syncOpenOrders(): Promise<number> {
+    const startedAt = new Date();
+    const orders = await prisma.order.findMany({
+      where: {
+        status: OrderStatus.OPEN,
+        createdAt: { gte: new Date(this.syncedSince.getTime() - SYNC_OVERLAP_MS) },
+      },
+      include: { portfolio: { select: { userId: true } } },
+    });
+
+    let added = 0;
+    for (const order of orders) {
+      if (this.isKnown(order.id)) continue;
+      this.index.add(this.toEntry(this.toRestingOrder(order, order.portfolio.userId)));
+      added++;
+    }
+
+    this.syncedSince = startedAt;
+    this.synced += added;
+    if (added > 0) logger.info(`Order matcher synced ${added} orders placed on other instances`);
+    return added;
+  }
+
+  /**
+   * Start the Catch-up Poll
+   *
+   * Idempotent; the timer doesn't keep the process alive.
+   */
+  startSync(): void {
+    if (this.syncTimer) return;
+    this.syncTimer = setInterval(() => {
+      this.syncOpenOrders().catch((error) => logger.warn('Order matcher sync failed:', error));
+    }, SYNC_INTERVAL_MS);
+    this.syncTimer.unref();
+  }
+
+  stopSync(): void {
+    if (this.syncTimer) {
+      clearInterval(this.syncTimer);
+      this.syncTimer = null;
+    }
+  }
+
+  /**
+   * Symbols with Open Orders
+   *
+   * @returns {string[]} Symbols the matcher needs prices for
+   */
+  getWatchedSymbols(): string[] {
+    return this.index.symbols();
+  }
+
+  /**
+   * Get Matcher Statistics
+   *
+   * @returns {OrderMatcherStats} Resting orders and match counters
+   */
+  getStats(): OrderMatcherStats {
+    return {
+      resting: this.index.size,
+      symbols: this.index.symbols().length,
+      crossed: this.crossed,
+      filled: this.filled,
+      rejected: this.rejected,
+      closed: this.closed,
+      errors: this.errors,
+      synced: this.synced,
+    };
+  }
+
+  /**
+   * Fill (or Trigger) Crossed Orders
+   *
+   * @param {TriggerEntry<RestingOrder>[]} entries - Orders crossed by `price`
+   * @param {number} price - Observed price
+   * @private
+   */
+  private async processCrossed(entries: TriggerEntry<RestingOrder>[], price: number): Promise<void> {
+    for (const entry of entries) {
+      const order = entry.payload;
+
+      try {
+        if (order.orderType === 'STOP_LIMIT' && !order.triggered) {
+          const stillOpen = await this.triggerStopLimit(order);
+          if (!stillOpen) {
+            this.closed++;
+            this.inFlight.delete(order.orderId);
+            continue;
+          }
+
+          // The stop price may already satisfy the limit
+          const limitEntry = this.toEntry(order);
+          const limitCrossed =
+            limitEntry.direction === 'AT_OR_BELOW' ? price <= limitEntry.trigger : price >= limitEntry.trigger;
+          if (!limitCrossed) {
+            this.index.add(limitEntry);
+            this.inFlight.delete(order.orderId);
+            continue;
+          }
+        }
+
+        const outcome = await tradeService.fillOrder(order, price);
+        if (outcome.status === 'FILLED') {
+          this.filled++;
+        } else if (outcome.status === 'REJECTED') {
+          this.rejected++;
+          logger.info(`Order rejected: ${order.orderId} (${outcome.reason})`);
+        } else {
+          this.closed++;
+        }
+        // Peers still index the order; let them drop it
+        quoteBus.publishOrderEvent({ type: 'closed', orderId: order.orderId });
+      } catch (error) {
+        // Keep the order resting; it is retried the next time its trigger is crossed
+        this.errors++;
+        this.index.add(this.toEntry(order));
+        logger.error(`Order fill failed for ${order.orderId}:`, error);
+      }
+      this.inFlight.delete(order.orderId);
+    }
+  }
+
+  private isKnown(orderId: string): boolean {
+    return this.index.get(orderId) !== undefined || this.inFlight.has(orderId);
+  }
+
+  /**
+   * Convert a STOP_LIMIT Order to a Resting Limit Order
+   *
+   * @returns {Promise<boolean>} False if the order is no longer open
+   * @private
+   */
+  private async triggerStopLimit(order: RestingOrder): Promise<boolean> {
+    const { count } = await prisma.order.updateMany({
+      where: { id: order.orderId, status: OrderStatus.OPEN, triggeredAt: null },
+      data: { triggeredAt: new Date() },
+    });
+
+    order.triggered = true;
+    if (count > 0) return true;
+
+    // Already triggered by another instance, or closed
+    const current = await prisma.order.findUnique({
+      where: { id: order.orderId },
+      select: { status: true },
+    });
+    return current?.status === OrderStatus.OPEN;
+  }
+
+  /**
+   * Build the Index Entry for an Order's Active Trigger
+   *
+   * Limit orders (and triggered stop-limits) wait for a better price; stop
+   * orders wait for the price to move against the position.
+   *
+   * @private
+   */
+  private toEntry(order: RestingOrder): TriggerEntry<RestingOrder> {
+    const isLimit = order.orderType === 'LIMIT' || (order.orderType === 'STOP_LIMIT' && order.triggered);
+    const isBuy = order.tradeType === 'BUY';
+
+    return {
+      id: order.orderId,
+      symbol: order.symbol,
+      trigger: isLimit ? order.limitPrice! : order.stopPrice!,
+      direction: isLimit === isBuy ? 'AT_OR_BELOW' : 'AT_OR_ABOVE',
+      payload: order,
+    };
+  }
+
+  private toRestingOrder(order: Order, userId: string): RestingOrder {
+    return {
+      orderId: order.id,
+      portfolioId: order.portfolioId,
+      userId,
+      symbol: order.symbol,
+      assetType: order.assetType,
+      tradeType: order.tradeType,
+      quantity: order.quantity.toNumber(),
+      orderType: order.orderType,
+      limitPrice: order.limitPrice?.toNumber() ?? null,
+      stopPrice: order.stopPrice?.toNumber() ?? null,
+      triggered: order.triggeredAt !== null,
+    };
+  }
+}
+
+export default new OrderService();
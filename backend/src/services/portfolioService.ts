@@ -1,12 +1,33 @@
-import { Portfolio } from '@prisma/client';
+import { Portfolio, Prisma } from '@prisma/client';
 import getPrismaClient from '../config/database';
 import { AppError } from '../middleware/errorHandler';
-import { PortfolioWithHoldings } from '../types';
+import { MarketQuote, PortfolioWithHoldings } from '../types';
 import logger from '../config/logger';
 import marketDataService from './marketDataService';
+import { RequestPriority, RequestPriorityLane } from '../utils/requestQueue';
+import { enqueueRevaluation } from '../jobs/backgroundJobs';
+import leaderboardService from './leaderboardService';
+import { addDays, toDateString } from '../utils/dates';
 
 const prisma = getPrismaClient();
 
+const REVALUE_BATCH_SIZE = 200;    // Portfolios revalued per batch
+const MAX_BATCH_SYMBOLS = 100;     // getQuoteBatch limit per call
+const MAX_HISTORY_DAYS = 365;      // Longest value history served per request
+
+// Row returned by the revaluation UPDATE (see revaluePortfolios)
+interface RevaluedPortfolioRow {
+  id: string;
+  total_value: Prisma.Decimal;
+  is_active: boolean;
+  starting_balance: Prisma.Decimal;
+}
+
+export interface PortfolioValuePoint {
+  date: string; // YYYY-MM-DD
+  totalValue: number;
+}
+
 export class PortfolioService {
   /**
    * Get all portfolios for a user
@@ -122,11 +143,24 @@ export class PortfolioService {
 
     logger.info(`Portfolio created: ${portfolio.id} for user ${userId}`);
 
+    leaderboardService
+      .updateScores([
+        {
+          portfolioId: portfolio.id,
+          totalValue: balance,
+          startingBalance: user.startingBalance.toNumber(),
+          isActive: true,
+        },
+      ])
+      .catch((error) => logger.warn(`Failed to add portfolio ${portfolio.id} to leaderboards:`, error));
+
     return portfolio;
   }
 
   /**
    * Calculate current portfolio value
+   *
+   * Marks the portfolio to market now and stores the new totalValue.
    */
   async calculatePortfolioValue(portfolioId: string, userId: string): Promise<number> {
     const portfolio = await prisma.portfolio.findFirst({
@@ -134,41 +168,224 @@ export class PortfolioService {
         id: portfolioId,
         userId,
       },
-      include: {
-        holdings: true,
-      },
+      select: { id: true },
     });
 
     if (!portfolio) {
       throw new AppError('Portfolio not found', 404);
     }
 
-    let totalHoldingsValue = 0;
-
-    // Calculate value of all holdings using batch API
-    const symbols = portfolio.holdings.map((h) => h.symbol);
-    const marketDataMap = await marketDataService.getQuoteBatch(symbols);
+    const values = await this.revaluePortfolios([portfolioId], RequestPriority.READ);
+    return values.get(portfolioId) ?? 0;
+  }
 
-    for (const holding of portfolio.holdings) {
-      const marketData = marketDataMap.get(holding.symbol);
+  /**
+   * Schedule a Background Revaluation
+   *
+   * Trades adjust totalValue by their own cash/position delta at the trade
+   * price; the rest of the portfolio is marked to market by a worker a few
+   * seconds later, batched with other portfolios that traded in the meantime.
+   *
+   * @param {string} portfolioId - Portfolio to revalue
+   */
+  scheduleRevaluation(portfolioId: string): void {
+    enqueueRevaluation(portfolioId).catch((error) => {
+      logger.warn(`Failed to queue revaluation of portfolio ${portfolioId}:`, error);
+    });
+  }
 
-      if (marketData) {
-        totalHoldingsValue += marketData.currentPrice * holding.quantity.toNumber();
-      } else {
-        logger.warn(`Failed to get price for ${holding.symbol}, using average cost`);
-        totalHoldingsValue += holding.averageCost.toNumber() * holding.quantity.toNumber();
+  /**
+   * Revalue Every Portfolio
+   *
+   * Walks all portfolios in id order, one batch at a time, so memory use
+   * doesn't grow with the number of portfolios.
+   *
+   * @param {Function} [onBatch] - Called with each batch's new values before the next batch
+   * @returns {Promise<number>} Number of portfolios revalued
+   */
+  async revalueAllPortfolios(onBatch?: (values: Map<string, number>) => Promise<void>): Promise<number> {
+    let cursor: string | undefined;
+    let revalued = 0;
+
+    for (;;) {
+      const page = await prisma.portfolio.findMany({
+        select: { id: true },
+        orderBy: { id: 'asc' },
+        take: REVALUE_BATCH_SIZE,
+        ...(cursor ? { cursor: { id: cursor }, skip: 1 } : {}),
+      });
+      if (page.length === 0) break;
+
+      const ids = page.map((portfolio) => portfolio.id);
+      const values = await this.revaluePortfolios(ids);
+      if (onBatch) {
+        await onBatch(values);
       }
+      revalued += ids.length;
+      cursor = ids[ids.length - 1];
+    }
+
+    logger.info(`Revalued ${revalued} portfolios`);
+    return revalued;
+  }
+
+  /**
+   * Mark Portfolios to Market
+   *
+   * One query for the held symbols, one quote batch per 100 symbols, then a
+   * short transaction that locks the portfolio rows and runs one UPDATE.
+   *
+   * The UPDATE values holdings itself: it joins `holdings` against the fetched
+   * prices. Holding the portfolio row locks keeps cash and holdings in step,
+   * because every trade locks its portfolio row before changing holdings (see
+   * LOCK ORDER in TradeService). A trade that lands during the quote fetch is
+   * therefore fully counted or fully excluded. A symbol bought in the
+   * meantime, which wasn't quoted, is valued at its average cost.
+   *
+   * @param {string[]} portfolioIds - Portfolios to revalue
+   * @param {RequestPriorityLane} [priority] - Provider queue lane for quote cache misses
+   * @returns {Promise<Map<string, number>>} Map of portfolio id → new total value
+   */
+  async revaluePortfolios(
+    portfolioIds: string[],
+    priority: RequestPriorityLane = RequestPriority.BACKGROUND
+  ): Promise<Map<string, number>> {
+    if (portfolioIds.length === 0) {
+      return new Map();
     }
 
-    const totalValue = portfolio.cashBalance.toNumber() + totalHoldingsValue;
+    const held = await prisma.holding.findMany({
+      where: { portfolioId: { in: portfolioIds } },
+      select: { symbol: true },
+      distinct: ['symbol'],
+    });
+
+    const symbols = held.map((h) => h.symbol);
+    const marketDataMap = new Map<string, MarketQuote>();
+    for (let i = 0; i < symbols.length; i += MAX_BATCH_SYMBOLS) {
+      const quotes = await marketDataService.getQuoteBatch(symbols.slice(i, i + MAX_BATCH_SYMBOLS), { priority });
+      quotes.forEach((quote, symbol) => marketDataMap.set(symbol, quote));
+    }
+
+    const unpriced = symbols.filter((symbol) => !marketDataMap.has(symbol));
+    if (unpriced.length > 0) {
+      logger.warn(`Failed to get prices for ${unpriced.join(', ')}, using average cost`);
+    }
 
-    // Update portfolio total value
-    await prisma.portfolio.update({
-      where: { id: portfolioId },
-      data: { totalValue },
+    const prices =
+      marketDataMap.size > 0
+        ? Prisma.sql`VALUES ${Prisma.join(
+            [...marketDataMap.entries()].map(
+              ([symbol, quote]) => Prisma.sql`(${symbol}, ${quote.currentPrice}::decimal)`
+            )
+          )}`
+        : Prisma.sql`SELECT NULL::text, NULL::decimal WHERE FALSE`;
+
+    const updated = await prisma.$transaction(async (tx) => {
+      // Wait out trades in flight and hold off new ones (id order, so concurrent revaluations can't deadlock)
+      await tx.$queryRaw`
+        SELECT "id" FROM "portfolios"
+        WHERE "id" IN (${Prisma.join(portfolioIds)})
+        ORDER BY "id"
+        FOR UPDATE
+      `;
+
+      return tx.$queryRaw<RevaluedPortfolioRow[]>`
+        UPDATE "portfolios" AS p
+        SET "total_value" = p."cash_balance" + COALESCE((
+          SELECT SUM(h."quantity" * COALESCE(q."price", h."average_cost"))
+          FROM "holdings" AS h
+          LEFT JOIN (${prices}) AS q("symbol", "price") ON q."symbol" = h."symbol"
+          WHERE h."portfolio_id" = p."id"
+        ), 0)
+        FROM "users" AS u
+        WHERE p."id" IN (${Prisma.join(portfolioIds)}) AND u."id" = p."user_id"
+        RETURNING p."id", p."total_value", p."is_active", u."starting_balance"
+      `;
     });
 
-    return totalValue;
+    // Re-rank the revalued portfolios on the live leaderboards
+    try {
+      await leaderboardService.updateScores(
+        updated.map((row) => ({
+          portfolioId: row.id,
+          totalValue: Number(row.total_value),
+          startingBalance: Number(row.starting_balance),
+          isActive: row.is_active,
+        }))
+      );
+    } catch (error) {
+      logger.warn(`Failed to update leaderboard scores for ${updated.length} portfolios:`, error);
+    }
+
+    return new Map(updated.map((row) => [row.id, Number(row.total_value)]));
+  }
+
+  /**
+   * Save Today's Portfolio Values
+   * This should be run as a scheduled job after the market closes
+   *
+   * HOW IT WORKS:
+   * 1. Marks every portfolio to market, one batch at a time
+   * 2. Upserts each batch into `portfolio_value_snapshots`, keyed by
+   *    (portfolio_id, date), so a rerun on the same day replaces that day's values
+   *
+   * Period returns (leaderboards, achievements) and value charts read these
+   * snapshots.
+   *
+   * @param {Date} [date] - Snapshot day (default today)
+   * @returns {Promise<number>} Number of portfolios snapshotted
+   */
+  async snapshotPortfolioValues(date: Date = new Date()): Promise<number> {
+    const day = toDateString(date);
+
+    const snapshotted = await this.revalueAllPortfolios(async (values) => {
+      if (values.size === 0) return;
+
+      const rows = [...values.entries()].map(
+        ([id, value]) => Prisma.sql`(${id}, ${day}::date, ${value}::decimal)`
+      );
+      await prisma.$executeRaw`
+        INSERT INTO "portfolio_value_snapshots" ("portfolio_id", "date", "total_value")
+        VALUES ${Prisma.join(rows)}
+        ON CONFLICT ("portfolio_id", "date") DO UPDATE SET "total_value" = EXCLUDED."total_value"
+      `;
+    });
+
+    logger.info(`Saved ${snapshotted} portfolio value snapshots for ${day}`);
+    return snapshotted;
+  }
+
+  /**
+   * Get a Portfolio's Daily Value History
+   *
+   * @param {string} portfolioId - Portfolio ID
+   * @param {string} userId - Owner (ownership is checked)
+   * @param {number} [days] - How many days back (capped at MAX_HISTORY_DAYS)
+   * @returns {Promise<PortfolioValuePoint[]>} Daily closing values, oldest first
+   */
+  async getValueHistory(portfolioId: string, userId: string, days: number = 90): Promise<PortfolioValuePoint[]> {
+    const portfolio = await prisma.portfolio.findFirst({
+      where: {
+        id: portfolioId,
+        userId,
+      },
+      select: { id: true },
+    });
+
+    if (!portfolio) {
+      throw new AppError('Portfolio not found', 404);
+    }
+
+    const from = toDateString(addDays(new Date(), -Math.min(Math.max(days, 1), MAX_HISTORY_DAYS)));
+    const rows = await prisma.$queryRaw<{ date: string; total_value: Prisma.Decimal }[]>`
+      SELECT to_char(s."date", 'YYYY-MM-DD') AS "date", s."total_value"
+      FROM "portfolio_value_snapshots" s
+      WHERE s."portfolio_id" = ${portfolioId} AND s."date" >= ${from}::date
+      ORDER BY s."date" ASC
+    `;
+
+    return rows.map((row) => ({ date: row.date, totalValue: Number(row.total_value) }));
   }
 
   /**
@@ -0,0 +1,526 @@
+/**
+ * Price History Service
+ *
+ * Aggregates every quote fetched by MarketDataService into OHLCV bars and
+ * serves historical ranges for charts and performance calculations.
+ *
+ * KEY FEATURES:
+ * - Bar sizes: 1 minute, 5 minutes and 1 day (UTC days)
+ * - Ingestion: the current bar per symbol and size is kept in memory and
+ *   updated in place; snapshots are written with bulk upserts (write-behind)
+ * - Storage: "price_bars", list-partitioned by bar size, primary key
+ *   (symbol, interval, bucket_start), so a range query is one index range scan
+ *   inside a single partition. The 1m and 5m partitions are range-partitioned
+ *   by bucket_start (daily and weekly); ensurePartitions creates them ahead
+ * - Retention: 1m bars are kept 7 days and 5m bars 90 days; pruneBars drops
+ *   whole expired partitions. Daily bars are kept forever
+ * - Range queries: downsampled to at most `points` bars and returned in a
+ *   columnar layout (one array per field) to keep responses compact
+ *
+ * VOLUME:
+ * - Providers report cumulative session volume, so intraday bars store the
+ *   volume traded between observations and daily bars the last session total
+ * - The baseline for a delta is the latest volume seen by any instance (peer
+ *   quotes arrive over the quote bus), so instances count disjoint deltas and
+ *   each flush adds only the volume not yet persisted to the stored bar
+ * - Bars are null-volume when the provider doesn't report volume (Finnhub)
+ */
+
+import { Prisma } from '@prisma/client';
+import getPrismaClient from '../config/database';
+import logger from '../config/logger';
+import { MarketQuote } from '../types';
+import { WriteBehindBuffer, WriteBehindBufferStats } from '../utils/writeBehindBuffer';
+
+const prisma = getPrismaClient();
+
+const MINUTE_MS = 60 * 1000;
+const DAY_MS = 24 * 60 * MINUTE_MS;
+
+const BAR_FLUSH_MS = 5000;       // Max delay before a bar update is persisted
+const BAR_FLUSH_MAX_BATCH = 500; // Flush buffered bar updates at this many bars
+const DEFAULT_POINTS = 500;      // Default max bars per history response
+const PARTITIONS_AHEAD = 2;      // Future time partitions kept ready per intraday interval
+const PERSISTED_VOLUME_GRACE_MS = 10 * MINUTE_MS; // How long a closed bar's flushed volume is remembered
+
+export type BarIntervalName = '1m' | '5m' | '1d';
+
+interface IntervalConfig {
+  enumValue: 'ONE_MINUTE' | 'FIVE_MINUTES' | 'ONE_DAY'; // Prisma enum member
+  durationMs: number;
+  defaultRangeMs: number;      // Range served when the caller gives no start
+  retentionMs: number | null;  // null = kept forever
+  partitionMs: number | null;  // Time span of one range partition; null = not time-partitioned
+}
+
+const INTERVALS: Record<BarIntervalName, IntervalConfig> = {
+  '1m': {
+    enumValue: 'ONE_MINUTE',
+    durationMs: MINUTE_MS,
+    defaultRangeMs: DAY_MS,
+    retentionMs: 7 * DAY_MS,
+    partitionMs: DAY_MS,
+  },
+  '5m': {
+    enumValue: 'FIVE_MINUTES',
+    durationMs: 5 * MINUTE_MS,
+    defaultRangeMs: 7 * DAY_MS,
+    retentionMs: 90 * DAY_MS,
+    partitionMs: 7 * DAY_MS,
+  },
+  '1d': { enumValue: 'ONE_DAY', durationMs: DAY_MS, defaultRangeMs: 365 * DAY_MS, retentionMs: null, partitionMs: null },
+};
+
+// Range partitions are named <parent>_pYYYYMMDD after their first day (UTC)
+const PARTITION_NAME = /_p(\d{4})(\d{2})(\d{2})$/;
+
+const INTERVAL_NAMES = Object.keys(INTERVALS) as BarIntervalName[];
+
+interface Bar {
+  symbol: string;
+  interval: BarIntervalName;
+  bucketStart: number; // epoch ms
+  open: number;
+  high: number;
+  low: number;
+  close: number;
+  volume: number | null;
+}
+
+export interface HistoryOptions {
+  interval?: BarIntervalName;
+  from?: Date;
+  to?: Date;
+  points?: number; // Max bars returned; consecutive bars are merged beyond this
+}
+
+/**
+ * Price History (columnar)
+ *
+ * Bar i is (t[i], o[i], h[i], l[i], c[i], v[i]); t is the bar start in epoch ms.
+ * `interval` is the stored bar size; `barMs` is the size after downsampling.
+ */
+export interface PriceHistory {
+  symbol: string;
+  interval: BarIntervalName;
+  barMs: number;
+  from: string;
+  to: string;
+  t: number[];
+  o: number[];
+  h: number[];
+  l: number[];
+  c: number[];
+  v: Array<number | null>;
+}
+
+export interface PriceHistoryStats {
+  openBars: number;
+  writeBehind: WriteBehindBufferStats;
+}
+
+export interface PruneResult {
+  partitionsDropped: number;
+  barsDeleted: number; // Expired bars deleted from the default partitions
+}
+
+export class PriceHistoryService {
+  private openBars = new Map<string, Bar>();           // "SYMBOL:interval" → current bar
+  private lastSessionVolume = new Map<string, number>(); // symbol → last cumulative volume seen
+  // "SYMBOL:interval:bucketStart" → intraday bar volume already added to the stored bar
+  private persistedVolume = new Map<string, { volume: number; forgetAt: number }>();
+
+  // Latest snapshot per bar, persisted in bulk upserts
+  private barWriteBehind = new WriteBehindBuffer<Bar>(
+    (bars) => this.upsertBars(bars),
+    { maxBatchSize: BAR_FLUSH_MAX_BATCH, flushIntervalMs: BAR_FLUSH_MS }
+  );
+
+  /**
+   * Ingest Observed Quotes
+   *
+   * Updates the current 1m, 5m and 1d bar of each quoted symbol. A quote in a
+   * later bucket starts a new bar; quotes older than the current bar are ignored.
+   *
+   * @param {MarketQuote[]} quotes - Freshly fetched quotes
+   */
+  ingest(quotes: MarketQuote[]): void {
+    for (const quote of quotes) {
+      const price = Number(quote.currentPrice);
+      const observedAt = new Date(quote.lastUpdated).getTime();
+      if (!(price > 0) || Number.isNaN(observedAt)) continue;
+
+      const volumeDelta = this.takeVolumeDelta(quote);
+
+      for (const interval of INTERVAL_NAMES) {
+        const bar = this.updateBar(quote.symbol, interval, observedAt, price, volumeDelta, quote.volume);
+        if (bar) {
+          this.barWriteBehind.add(`${bar.symbol}:${bar.interval}:${bar.bucketStart}`, { ...bar });
+        }
+      }
+    }
+  }
+
+  /**
+   * Track Session Volume Seen by Other Instances
+   *
+   * Moves the volume baseline forward without touching bars (the fetching
+   * instance writes those), so this instance's next delta doesn't recount
+   * volume a peer already counted.
+   *
+   * @param {MarketQuote[]} quotes - Quotes fetched by other instances
+   */
+  observePeerQuotes(quotes: MarketQuote[]): void {
+    for (const quote of quotes) {
+      if (quote.volume === undefined) continue;
+      const previous = this.lastSessionVolume.get(quote.symbol);
+      if (previous === undefined || quote.volume > previous) {
+        this.lastSessionVolume.set(quote.symbol, quote.volume);
+      }
+    }
+  }
+
+  /**
+   * Get Price History for a Symbol
+   *
+   * Reads stored bars in [from, to) with one index range scan, overlays the
+   * in-memory current bar (which may not be flushed yet) and downsamples the
+   * result to at most `points` bars.
+   *
+   * @param {string} symbol - Stock symbol
+   * @param {HistoryOptions} [options] - Bar size (default 1d), range and max points
+   * @returns {Promise<PriceHistory>} Bars in columnar layout, oldest first
+   */
+  async getHistory(symbol: string, options: HistoryOptions = {}): Promise<PriceHistory> {
+    const interval = options.interval ?? '1d';
+    const config = INTERVALS[interval];
+    const to = options.to ?? new Date();
+    const from = options.from ?? new Date(to.getTime() - config.defaultRangeMs);
+    const points = Math.max(1, options.points ?? DEFAULT_POINTS);
+
+    const rows = await prisma.priceBar.findMany({
+      where: {
+        symbol,
+        interval: config.enumValue,
+        bucketStart: { gte: from, lt: to },
+      },
+      orderBy: { bucketStart: 'asc' },
+    });
+
+    const bars: Bar[] = rows.map((row) => ({
+      symbol,
+      interval,
+      bucketStart: row.bucketStart.getTime(),
+      open: row.open.toNumber(),
+      high: row.high.toNumber(),
+      low: row.low.toNumber(),
+      close: row.close.toNumber(),
+      volume: row.volume !== null ? Number(row.volume) : null,
+    }));
+
+    const current = this.openBars.get(`${symbol}:${interval}`);
+    if (current && current.bucketStart >= from.getTime() && current.bucketStart < to.getTime()) {
+      const last = bars[bars.length - 1];
+      if (last && last.bucketStart === current.bucketStart) {
+        bars[bars.length - 1] = this.mergeBars(last, current, this.unpersistedVolume(current));
+      } else if (!last || last.bucketStart < current.bucketStart) {
+        bars.push({ ...current });
+      }
+    }
+
+    const groupSize = Math.ceil(bars.length / points) || 1;
+    const history: PriceHistory = {
+      symbol,
+      interval,
+      barMs: config.durationMs * groupSize,
+      from: from.toISOString(),
+      to: to.toISOString(),
+      t: [],
+      o: [],
+      h: [],
+      l: [],
+      c: [],
+      v: [],
+    };
+
+    for (let i = 0; i < bars.length; i += groupSize) {
+      const group = bars.slice(i, i + groupSize);
+      let volume: number | null = null;
+      for (const bar of group) {
+        if (bar.volume !== null) volume = (volume ?? 0) + bar.volume;
+      }
+
+      history.t.push(group[0].bucketStart);
+      history.o.push(group[0].open);
+      history.h.push(Math.max(...group.map((bar) => bar.high)));
+      history.l.push(Math.min(...group.map((bar) => bar.low)));
+      history.c.push(group[group.length - 1].close);
+      history.v.push(volume);
+    }
+
+    return history;
+  }
+
+  /**
+   * Create Upcoming Intraday Partitions
+   *
+   * Creates the current and next PARTITIONS_AHEAD range partitions of each
+   * intraday interval. Safe to run from every instance; a partition that
+   * can't be created (e.g., the default partition already holds bars in its
+   * range) is logged and its bars keep landing in the default partition.
+   *
+   * @returns {Promise<void>}
+   */
+  async ensurePartitions(): Promise<void> {
+    for (const name of INTERVAL_NAMES) {
+      const { partitionMs } = INTERVALS[name];
+      if (partitionMs === null) continue;
+
+      const current = Math.floor(Date.now() / partitionMs) * partitionMs;
+      for (let i = 0; i <= PARTITIONS_AHEAD; i++) {
+        const from = new Date(current + i * partitionMs);
+        const to = new Date(from.getTime() + partitionMs);
+        const table = `price_bars_${name}_p${from.toISOString().slice(0, 10).replace(/-/g, '')}`;
+
+        try {
+          // Identifiers can't be bound; the names and bounds are built from constants and dates
+          await prisma.$executeRawUnsafe(
+            `CREATE TABLE IF NOT EXISTS "${table}" PARTITION OF "price_bars_${name}" ` +
+              `FOR VALUES FROM ('${from.toISOString()}') TO ('${to.toISOString()}')`
+          );
+        } catch (error) {
+          logger.warn(`Could not create price bar partition ${table}:`, error);
+        }
+      }
+    }
+  }
+
+  /**
+   * Prune Expired Intraday Bars
+   *
+   * Drops 1m and 5m range partitions that lie entirely past their retention,
+   * and deletes expired bars from the default partitions. Daily bars are
+   * never pruned. Also creates upcoming partitions, so the daily job keeps
+   * them ready.
+   *
+   * @returns {Promise<PruneResult>} Partitions dropped and default-partition bars deleted
+   */
+  async pruneBars(): Promise<PruneResult> {
+    const result: PruneResult = { partitionsDropped: 0, barsDeleted: 0 };
+
+    for (const name of INTERVAL_NAMES) {
+      const { retentionMs, partitionMs } = INTERVALS[name];
+      if (retentionMs === null || partitionMs === null) continue;
+
+      const cutoff = new Date(Date.now() - retentionMs);
+      const parent = `price_bars_${name}`;
+      const partitions = await prisma.$queryRaw<{ name: string }[]>`
+        SELECT c."relname" AS "name"
+        FROM "pg_inherits" i
+        JOIN "pg_class" c ON c."oid" = i."inhrelid"
+        JOIN "pg_class" p ON p."oid" = i."inhparent"
+        WHERE p."relname" = ${parent}
+      `;
+
+      for (const { name: table } of partitions) {
+        const match = PARTITION_NAME.exec(table);
+        if (!match) continue;
+
+        const end = Date.UTC(Number(match[1]), Number(match[2]) - 1, Number(match[3])) + partitionMs;
+        if (end > cutoff.getTime()) continue;
+
+        await prisma.$executeRawUnsafe(`DROP TABLE IF EXISTS "${table}"`);
+        result.partitionsDropped++;
+      }
+
+      result.barsDeleted += await prisma.$executeRawUnsafe(
+        `DELETE FROM "${parent}_default" WHERE "bucket_start" < $1`,
+        cutoff
+      );
+    }
+
+    await this.ensurePartitions();
+
+    logger.info(
+      `Pruned price bars: ${result.partitionsDropped} partitions dropped, ${result.barsDeleted} default-partition bars deleted`
+    );
+    return result;
+  }
+
+  /**
+   * Flush Buffered Bar Updates
+   *
+   * Call during graceful shutdown, before disconnecting the database.
+   *
+   * @returns {Promise<void>}
+   */
+  async flushPendingWrites(): Promise<void> {
+    await this.barWriteBehind.flush();
+  }
+
+  /**
+   * Get Ingestion Statistics
+   *
+   * @returns {PriceHistoryStats} Bars held in memory and write-behind counters
+   */
+  getStats(): PriceHistoryStats {
+    return {
+      openBars: this.openBars.size,
+      writeBehind: this.barWriteBehind.getStats(),
+    };
+  }
+
+  /**
+   * Apply One Observation to the Current Bar
+   *
+   * @returns {Bar | null} The updated bar, or null if the observation is older than it
+   * @private
+   */
+  private updateBar(
+    symbol: string,
+    interval: BarIntervalName,
+    observedAt: number,
+    price: number,
+    volumeDelta: number | null,
+    sessionVolume: number | undefined
+  ): Bar | null {
+    const key = `${symbol}:${interval}`;
+    const durationMs = INTERVALS[interval].durationMs;
+    const bucketStart = Math.floor(observedAt / durationMs) * durationMs;
+    const volume = interval === '1d' ? sessionVolume ?? null : volumeDelta;
+
+    const bar = this.openBars.get(key);
+    if (bar && bucketStart < bar.bucketStart) return null;
+
+    if (!bar || bucketStart > bar.bucketStart) {
+      const opened: Bar = { symbol, interval, bucketStart, open: price, high: price, low: price, close: price, volume };
+      this.openBars.set(key, opened);
+      return opened;
+    }
+
+    bar.high = Math.max(bar.high, price);
+    bar.low = Math.min(bar.low, price);
+    bar.close = price;
+    if (volume !== null) {
+      bar.volume = interval === '1d' ? Math.max(bar.volume ?? 0, volume) : (bar.volume ?? 0) + volume;
+    }
+    return bar;
+  }
+
+  /**
+   * Volume Traded Since the Previous Observation
+   *
+   * A drop in cumulative volume means a new session started, so the whole
+   * reported volume counts. The first observation of a symbol has no baseline.
+   *
+   * @returns {number | null} Volume delta, or null if the quote has no volume
+   * @private
+   */
+  private takeVolumeDelta(quote: MarketQuote): number | null {
+    if (quote.volume === undefined) return null;
+
+    const previous = this.lastSessionVolume.get(quote.symbol);
+    this.lastSessionVolume.set(quote.symbol, quote.volume);
+
+    if (previous === undefined) return 0;
+    return quote.volume >= previous ? quote.volume - previous : quote.volume;
+  }
+
+  /**
+   * Merge a Stored Bar with the In-Memory Bar for the Same Bucket
+   *
+   * Intraday volume is the stored total plus what this instance hasn't
+   * flushed yet; daily volume is a session total, so the larger one wins.
+   *
+   * @private
+   */
+  private mergeBars(stored: Bar, current: Bar, unpersisted: number | null): Bar {
+    let volume = stored.volume ?? current.volume;
+    if (stored.volume !== null && current.volume !== null) {
+      volume = current.interval === '1d' ? Math.max(stored.volume, current.volume) : stored.volume + (unpersisted ?? 0);
+    }
+
+    return {
+      ...stored,
+      high: Math.max(stored.high, current.high),
+      low: Math.min(stored.low, current.low),
+      close: current.close,
+      volume,
+    };
+  }
+
+  /**
+   * Intraday Bar Volume Not Yet Added to the Stored Bar
+   *
+   * @returns {number | null} Unflushed volume; null for daily or null-volume bars
+   * @private
+   */
+  private unpersistedVolume(bar: Bar): number | null {
+    if (bar.interval === '1d' || bar.volume === null) return null;
+    const persisted = this.persistedVolume.get(`${bar.symbol}:${bar.interval}:${bar.bucketStart}`);
+    return bar.volume - (persisted?.volume ?? 0);
+  }
+
+  /**
+   * Upsert Bars (Batch)
+   *
+   * One multi-row INSERT ... ON CONFLICT per flush. Existing bars are widened
+   * rather than overwritten (the open is kept, high/low only grow), so a
+   * restarted process or a second instance never shrinks a stored bar.
+   * Intraday bars send only the volume added since their last flush, which
+   * is summed into the stored volume; daily bars keep the larger session total.
+   *
+   * Flushes run one at a time (WriteBehindBuffer), so the persisted volume
+   * read here is never stale. A failed batch leaves it unchanged and the
+   * next snapshot of the bar resends the difference.
+   *
+   * @param {Bar[]} bars - Bar snapshots to persist
+   * @private
+   */
+  private async upsertBars(bars: Bar[]): Promise<void> {
+    if (bars.length === 0) return;
+
+    const rows = bars.map((bar) => {
+      const volume = bar.interval === '1d' ? bar.volume : this.unpersistedVolume(bar);
+      return Prisma.sql`(
+        ${bar.symbol},
+        ${bar.interval}::"bar_interval",
+        ${new Date(bar.bucketStart)},
+        ${bar.open}::decimal,
+        ${bar.high}::decimal,
+        ${bar.low}::decimal,
+        ${bar.close}::decimal,
+        ${volume !== null ? BigInt(Math.round(volume)) : null}::bigint
+      )`;
+    });
+
+    await prisma.$executeRaw`
+      INSERT INTO "price_bars"
+        ("symbol", "interval", "bucket_start", "open", "high", "low", "close", "volume")
+      VALUES ${Prisma.join(rows)}
+      ON CONFLICT ("symbol", "interval", "bucket_start") DO UPDATE SET
+        "high" = GREATEST("price_bars"."high", EXCLUDED."high"),
+        "low" = LEAST("price_bars"."low", EXCLUDED."low"),
+        "close" = EXCLUDED."close",
+        "volume" = CASE
+          WHEN EXCLUDED."volume" IS NULL THEN "price_bars"."volume"
+          WHEN EXCLUDED."interval" = '1d' THEN GREATEST("price_bars"."volume", EXCLUDED."volume")
+          ELSE COALESCE("price_bars"."volume", 0) + EXCLUDED."volume"
+        END
+    `;
+
+    const now = Date.now();
+    for (const bar of bars) {
+      if (bar.interval === '1d' || bar.volume === null) continue;
+      this.persistedVolume.set(`${bar.symbol}:${bar.interval}:${bar.bucketStart}`, {
+        volume: bar.volume,
+        forgetAt: bar.bucketStart + INTERVALS[bar.interval].durationMs + PERSISTED_VOLUME_GRACE_MS,
+      });
+    }
+    for (const [key, entry] of this.persistedVolume) {
+      if (entry.forgetAt < now) this.persistedVolume.delete(key);
+    }
+  }
+}
+
+export default new PriceHistoryService();
@@ -0,0 +1,106 @@
+/**
+ * Alpha Vantage Provider
+ *
+ * Real-time quotes from the Alpha Vantage GLOBAL_QUOTE endpoint.
+ * High-quality data including volume and accurate change percentages.
+ *
+ * RATE LIMIT: 5 requests/minute on the free tier, one request at a time.
+ * Alpha Vantage reports throttling with HTTP 200 and a "Note" (per-minute limit)
+ * or "Information" (daily limit) payload instead of an error status; both are
+ * raised as ProviderThrottledError so the provider is skipped until the limit resets.
+ * No batch endpoint, so a batch of N symbols costs N requests
+ * (10 symbols = 2 minutes); MarketDataService skips it for large batches.
+ */
+
+import axios from 'axios';
+import { env } from '../../config/env';
+import { AppError } from '../../middleware/errorHandler';
+import { MarketQuote } from '../../types';
+import { BaseMarketDataProvider, ProviderThrottledError } from './baseProvider';
+
+const MINUTE_LIMIT_RETRY_MS = 60 * 1000;
+
+export class AlphaVantageProvider extends BaseMarketDataProvider {
+  readonly name = 'alphavantage';
+
+  constructor() {
+    super(
+      { requestsPerMinute: 5, burst: 1, maxConcurrency: 1 },
+      { batch: false, maxBatchSize: 1 }
+    );
+  }
+
+  isEnabled(): boolean {
+    return Boolean(env.ALPHA_VANTAGE_API_KEY);
+  }
+
+  /**
+   * Fetch Quote from Alpha Vantage API
+   *
+   * @param {string} symbol - Stock symbol
+   * @returns {Promise<MarketQuote>} Formatted quote data
+   * @throws {ProviderThrottledError} If the response is a throttle notice
+   * @throws {AppError} 404 if symbol not found
+   */
+  protected async requestQuote(symbol: string): Promise<MarketQuote> {
+    const url = `https://www.alphavantage.co/query`;
+    const response = await axios.get(url, {
+      params: {
+        function: 'GLOBAL_QUOTE',
+        symbol,
+        apikey: env.ALPHA_VANTAGE_API_KEY,
+      },
+      timeout: 5000,
+    });
+
+    this.checkThrottle(response.data);
+
+    const quote = response.data['Global Quote'];
+
+    if (!quote || !quote['05. price']) {
+      throw new AppError('Symbol not found in Alpha Vantage', 404);
+    }
+
+    const currentPrice = parseFloat(quote['05. price']);
+    const change = parseFloat(quote['09. change']);
+    const changePercent = parseFloat(quote['10. change percent'].replace('%', ''));
+
+    return {
+      symbol: symbol.toUpperCase(),
+      assetType: 'STOCK',
+      currentPrice,
+      change24h: change,
+      changePercentage: changePercent,
+      volume: parseInt(quote['06. volume']) || undefined,
+      lastUpdated: new Date(),
+    };
+  }
+
+  /**
+   * Detect Throttle Payloads
+   *
+   * "Note" means the per-minute limit was hit; "Information" usually means the
+   * daily limit was hit (retry after the next UTC midnight) but is also used for
+   * the per-minute message on newer keys, so its text decides.
+   *
+   * @param {any} data - Response body
+   * @throws {ProviderThrottledError} If the body is a throttle notice
+   * @private
+   */
+  private checkThrottle(data: any): void {
+    const notice: string | undefined = data?.Note ?? data?.Information;
+    if (!notice) return;
+
+    const now = Date.now();
+    let retryAt = now + MINUTE_LIMIT_RETRY_MS;
+    if (data.Information && /per day|daily/i.test(notice)) {
+      const nextMidnight = new Date(now);
+      nextMidnight.setUTCHours(24, 0, 0, 0);
+      retryAt = nextMidnight.getTime();
+    }
+
+    throw new ProviderThrottledError(this.name, retryAt);
+  }
+}
+
+export default AlphaVantageProvider;
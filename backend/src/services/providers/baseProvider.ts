@@ -0,0 +1,249 @@
+/**
+ * Base Market Data Provider
+ *
+ * Shared plumbing for providers: owns a RequestQueue built from the provider's
+ * rate limit and routes every upstream call through it. Subclasses implement
+ * requestQuote() (one upstream call, no queuing) and may override
+ * requestQuotes() when the upstream supports real batch requests.
+ *
+ * HEALTH:
+ * - Every upstream call is timed and recorded in the provider's ProviderHealth
+ * - While the circuit breaker is open, calls fail immediately with
+ *   ProviderUnavailableError, including calls already waiting in the queue
+ * - ProviderThrottledError (quota signals) opens the breaker until the quota resets
+ *
+ * SHARED RATE LIMIT:
+ * - The RequestQueue limits this process; with DISTRIBUTED_RATE_LIMIT enabled each
+ *   upstream call also takes a token from a Redis bucket ("ratelimit:<provider>")
+ *   shared by all instances, so replicas split the provider's budget
+ * - The shared token is taken before the request enters the local queue, so a
+ *   request waiting on other instances' usage never holds a local concurrency
+ *   slot (a BACKGROUND wait can't block TRADE requests behind it)
+ * - Waiting for the shared bucket respects the request's deadline and the
+ *   BACKGROUND lane's reserve token; BACKGROUND requests without a deadline
+ *   wait at most BACKGROUND_BUDGET_WAIT_MS
+ *
+ * BATCHING:
+ * - batch providers: symbols are split into chunks of maxBatchSize,
+ *   each chunk takes one queue slot
+ * - non-batch providers: one queue slot per symbol, requests run in parallel
+ *   as far as the rate limit allows
+ */
+
+import { AppError } from '../../middleware/errorHandler';
+import { MarketQuote } from '../../types';
+import { env } from '../../config/env';
+import logger from '../../config/logger';
+import { DistributedTokenBucket, DistributedTokenBucketStats } from '../../utils/distributedTokenBucket';
+import {
+  RequestOptions,
+  RequestPriority,
+  RequestQueue,
+  RequestQueueOptions,
+  RequestQueueStats,
+} from '../../utils/requestQueue';
+import { ProviderHealth } from './providerHealth';
+import { MarketDataProvider, ProviderCapabilities } from './types';
+
+const BACKGROUND_BUDGET_WAIT_MS = 30000; // Max wait for a shared token without a deadline (BACKGROUND)
+
+/**
+ * Provider Throttled Error
+ *
+ * Thrown by a provider when the upstream reports that its rate limit or quota
+ * is exhausted (HTTP 429, Alpha Vantage "Note"/"Information" payloads).
+ */
+export class ProviderThrottledError extends AppError {
+  constructor(provider: string, public readonly retryAt: number) {
+    super(`${provider} rate limit reached`, 429);
+  }
+}
+
+/**
+ * Provider Unavailable Error
+ *
+ * Thrown without calling the upstream while the provider's circuit breaker is open.
+ */
+export class ProviderUnavailableError extends AppError {
+  constructor(provider: string) {
+    super(`${provider} is temporarily unavailable`, 503);
+  }
+}
+
+export abstract class BaseMarketDataProvider implements MarketDataProvider {
+  abstract readonly name: string;
+  readonly rateLimit: RequestQueueOptions;
+  readonly capabilities: ProviderCapabilities;
+  readonly health = new ProviderHealth();
+
+  private readonly queue: RequestQueue;
+  private sharedBudget: DistributedTokenBucket | null = null;
+
+  /**
+   * @param {RequestQueueOptions} rateLimit - Upstream rate limit
+   * @param {ProviderCapabilities} capabilities - Batching support
+   */
+  constructor(rateLimit: RequestQueueOptions, capabilities: ProviderCapabilities) {
+    this.rateLimit = rateLimit;
+    this.capabilities = capabilities;
+    this.queue = new RequestQueue(rateLimit);
+  }
+
+  abstract isEnabled(): boolean;
+
+  /**
+   * Perform one upstream quote request (called from the queue)
+   */
+  protected abstract requestQuote(symbol: string): Promise<MarketQuote>;
+
+  /**
+   * Perform one upstream batch request (called from the queue)
+   * Only used when capabilities.batch is true.
+   */
+  protected async requestQuotes(symbols: string[]): Promise<Map<string, MarketQuote>> {
+    const quotes = new Map<string, MarketQuote>();
+    for (const symbol of symbols) {
+      quotes.set(symbol, await this.requestQuote(symbol));
+    }
+    return quotes;
+  }
+
+  async fetchQuote(symbol: string, request: RequestOptions = {}): Promise<MarketQuote> {
+    if (!this.health.isAvailable()) {
+      throw new ProviderUnavailableError(this.name);
+    }
+    return this.schedule(() => this.requestQuote(symbol), request);
+  }
+
+  async fetchQuotes(symbols: string[], request: RequestOptions = {}): Promise<Map<string, MarketQuote>> {
+    const quotes = new Map<string, MarketQuote>();
+    const failedSymbols: string[] = [];
+
+    if (!this.health.isAvailable()) {
+      throw new ProviderUnavailableError(this.name);
+    }
+
+    if (this.capabilities.batch) {
+      const chunks: string[][] = [];
+      for (let i = 0; i < symbols.length; i += this.capabilities.maxBatchSize) {
+        chunks.push(symbols.slice(i, i + this.capabilities.maxBatchSize));
+      }
+
+      await Promise.all(
+        chunks.map((chunk) =>
+          this.schedule(() => this.requestQuotes(chunk), request)
+            .then((chunkQuotes) => {
+              chunk.forEach((symbol) => {
+                const quote = chunkQuotes.get(symbol);
+                if (quote) quotes.set(symbol, quote);
+                else failedSymbols.push(symbol);
+              });
+            })
+            .catch((error) => {
+              failedSymbols.push(...chunk);
+              logger.warn(`${this.name} batch of ${chunk.length} failed:`, error.message);
+            })
+        )
+      );
+    } else {
+      // One queued request per symbol, in parallel within the rate limit
+      await Promise.all(
+        symbols.map((symbol) =>
+          this.fetchQuote(symbol, request)
+            .then((quote) => quotes.set(symbol, quote))
+            .catch((error) => {
+              failedSymbols.push(symbol);
+              logger.warn(`${this.name} failed for ${symbol}:`, error.message);
+            })
+        )
+      );
+    }
+
+    // Log summary of batch results
+    if (failedSymbols.length > 0) {
+      logger.warn(`${this.name} batch: ${failedSymbols.length}/${symbols.length} symbols failed: ${failedSymbols.join(', ')}`);
+    }
+
+    return quotes;
+  }
+
+  getQueueStats(): RequestQueueStats {
+    return this.queue.getStats();
+  }
+
+  getBudgetStats(): DistributedTokenBucketStats | null {
+    return this.sharedBudget?.getStats() ?? null;
+  }
+
+  /**
+   * Take a Token from the Shared (Cross-Instance) Budget
+   *
+   * Created on first use because `name` is set by the subclass after this
+   * constructor runs.
+   *
+   * @private
+   */
+  private async takeSharedBudget(request: RequestOptions): Promise<void> {
+    if (env.DISTRIBUTED_RATE_LIMIT !== 'true') return;
+
+    if (!this.sharedBudget) {
+      this.sharedBudget = new DistributedTokenBucket(`ratelimit:${this.name}`, {
+        requestsPerMinute: this.rateLimit.requestsPerMinute,
+        burst: this.rateLimit.burst,
+      });
+    }
+
+    const background = request.priority === RequestPriority.BACKGROUND;
+    await this.sharedBudget.take({
+      reserve: background && this.rateLimit.burst > 1 ? 1 : 0,
+      deadline: request.deadline ?? (background ? Date.now() + BACKGROUND_BUDGET_WAIT_MS : undefined),
+    });
+  }
+
+  /**
+   * Schedule One Upstream Call
+   *
+   * Takes the shared token first, then a local queue slot, so the slot is
+   * only held while the upstream call runs.
+   *
+   * @private
+   */
+  private async schedule<T>(call: () => Promise<T>, request: RequestOptions): Promise<T> {
+    await this.takeSharedBudget(request);
+    return this.queue.add(() => this.track(call), request);
+  }
+
+  /**
+   * Run One Upstream Call with Health Tracking
+   *
+   * Runs when the request leaves the queue, so requests queued before the
+   * breaker opened are rejected instead of hitting a failing upstream.
+   *
+   * @private
+   */
+  private async track<T>(call: () => Promise<T>): Promise<T> {
+    if (!this.health.allowRequest()) {
+      throw new ProviderUnavailableError(this.name);
+    }
+
+    const startedAt = Date.now();
+    try {
+      const result = await call();
+      this.health.recordSuccess(Date.now() - startedAt);
+      return result;
+    } catch (error) {
+      const latencyMs = Date.now() - startedAt;
+      if (error instanceof ProviderThrottledError) {
+        logger.warn(`${this.name} throttled until ${new Date(error.retryAt).toISOString()}`);
+        this.health.recordThrottle(error.retryAt);
+      } else if (error instanceof AppError && error.statusCode === 404) {
+        this.health.recordSuccess(latencyMs); // Upstream answered; the symbol is unknown
+      } else {
+        this.health.recordFailure(latencyMs);
+      }
+      throw error;
+    }
+  }
+}
+
+export default BaseMarketDataProvider;
@@ -0,0 +1,82 @@
+/**
+ * Finnhub Provider
+ *
+ * Real-time quotes from the Finnhub quote endpoint.
+ * Faster than Alpha Vantage but provides less detailed data (no volume).
+ *
+ * RATE LIMIT: 60 requests/minute on the free tier. No batch endpoint,
+ * so batches are fetched as parallel single requests (burst of 5, up to 5 in flight).
+ * HTTP 429 responses are raised as ProviderThrottledError, retrying at the
+ * X-Ratelimit-Reset time when present.
+ */
+
+import axios, { AxiosResponse } from 'axios';
+import { env } from '../../config/env';
+import { AppError } from '../../middleware/errorHandler';
+import { MarketQuote } from '../../types';
+import { BaseMarketDataProvider, ProviderThrottledError } from './baseProvider';
+
+const DEFAULT_RETRY_MS = 60 * 1000;
+
+export class FinnhubProvider extends BaseMarketDataProvider {
+  readonly name = 'finnhub';
+
+  constructor() {
+    super(
+      { requestsPerMinute: 60, burst: 5, maxConcurrency: 5 },
+      { batch: false, maxBatchSize: 1 }
+    );
+  }
+
+  isEnabled(): boolean {
+    return Boolean(env.FINNHUB_API_KEY);
+  }
+
+  /**
+   * Fetch Quote from Finnhub API
+   *
+   * @param {string} symbol - Stock symbol
+   * @returns {Promise<MarketQuote>} Formatted quote data
+   * @throws {ProviderThrottledError} On HTTP 429
+   * @throws {AppError} 404 if symbol not found
+   */
+  protected async requestQuote(symbol: string): Promise<MarketQuote> {
+    const url = `https://finnhub.io/api/v1/quote`;
+    let response: AxiosResponse;
+    try {
+      response = await axios.get(url, {
+        params: {
+          symbol: symbol.toUpperCase(),
+          token: env.FINNHUB_API_KEY,
+        },
+        timeout: 5000,
+      });
+    } catch (error: any) {
+      if (error.response?.status === 429) {
+        const resetSeconds = Number(error.response.headers?.['x-ratelimit-reset']);
+        const retryAt = resetSeconds > 0 ? resetSeconds * 1000 : Date.now() + DEFAULT_RETRY_MS;
+        throw new ProviderThrottledError(this.name, retryAt);
+      }
+      throw error;
+    }
+
+    const data = response.data;
+
+    if (!data || !data.c) {
+      throw new AppError('Symbol not found in Finnhub', 404);
+    }
+
+    return {
+      symbol: symbol.toUpperCase(),
+      assetType: 'STOCK',
+      currentPrice: data.c,
+      change24h: data.d,
+      changePercentage: data.dp,
+      volume: undefined,
+      marketCap: undefined,
+      lastUpdated: new Date(),
+    };
+  }
+}
+
+export default FinnhubProvider;
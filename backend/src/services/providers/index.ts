@@ -0,0 +1,62 @@
+/**
+ * Market Data Provider Registry
+ *
+ * Builds the provider fallback chain from MARKET_DATA_PROVIDERS
+ * (comma-separated, in priority order). Providers that aren't configured
+ * (e.g., missing API key) are left out of the chain.
+ *
+ * EXAMPLES:
+ * - "alphavantage,finnhub": real APIs, Alpha Vantage first (default)
+ * - "simulated": offline random-walk feed for load tests and benchmarks
+ */
+
+import { env } from '../../config/env';
+import logger from '../../config/logger';
+import { AlphaVantageProvider } from './alphaVantageProvider';
+import { FinnhubProvider } from './finnhubProvider';
+import { SimulatedProvider } from './simulatedProvider';
+import { MarketDataProvider } from './types';
+
+const PROVIDER_FACTORIES: Record<string, () => MarketDataProvider> = {
+  alphavantage: () => new AlphaVantageProvider(),
+  finnhub: () => new FinnhubProvider(),
+  simulated: () => new SimulatedProvider(),
+};
+
+/**
+ * Create Providers
+ *
+ * @param {string} [names] - Comma-separated provider names (default: MARKET_DATA_PROVIDERS)
+ * @returns {MarketDataProvider[]} Enabled providers in fallback order
+ */
+export function createProviders(names: string = env.MARKET_DATA_PROVIDERS): MarketDataProvider[] {
+  const providers: MarketDataProvider[] = [];
+
+  for (const name of names.split(',').map((n) => n.trim().toLowerCase()).filter(Boolean)) {
+    const factory = PROVIDER_FACTORIES[name];
+    if (!factory) {
+      logger.warn(`Unknown market data provider "${name}", skipping`);
+      continue;
+    }
+
+    const provider = factory();
+    if (provider.isEnabled()) {
+      providers.push(provider);
+    } else {
+      logger.info(`Market data provider "${name}" is not configured, skipping`);
+    }
+  }
+
+  if (providers.length === 0) {
+    logger.warn('No market data providers enabled; quotes will only be served from cache');
+  }
+
+  return providers;
+}
+
+export { AlphaVantageProvider, FinnhubProvider, SimulatedProvider };
+export { ProviderThrottledError, ProviderUnavailableError } from './baseProvider';
+export { ProviderHealthStats } from './providerHealth';
+export { rankProviders } from './providerRouter';
+export * from './types';
+export default createProviders;
@@ -0,0 +1,136 @@
+/**
+ * Provider Health Tracking
+ *
+ * Per-provider circuit breaker plus a rolling window of recent upstream calls,
+ * used by the provider router to skip tripped providers and prefer the one
+ * most likely to answer fast.
+ *
+ * SIGNALS:
+ * - Latency: p50/p95 over the last WINDOW_SIZE calls
+ * - Errors: error rate over the same window; consecutive failures trip the breaker
+ * - Quota: throttle responses (e.g., Alpha Vantage "Note") open the breaker until the quota resets
+ *
+ * Outcomes that say nothing about provider health (unknown symbol, missed
+ * deadline) are not counted as failures.
+ */
+
+import { CircuitBreaker, CircuitBreakerStats } from '../../utils/circuitBreaker';
+
+const WINDOW_SIZE = 50;             // Recent calls kept per provider
+const DEFAULT_LATENCY_MS = 1000;    // Assumed latency before any call has completed
+
+export interface ProviderHealthStats extends CircuitBreakerStats {
+  samples: number;
+  p50LatencyMs: number | null;
+  p95LatencyMs: number | null;
+  errorRate: number;
+  throttles: number;
+}
+
+interface CallSample {
+  latencyMs: number;
+  ok: boolean;
+}
+
+export class ProviderHealth {
+  private readonly breaker = new CircuitBreaker({
+    failureThreshold: 3,
+    cooldownMs: 30000,
+    maxCooldownMs: 5 * 60 * 1000,
+  });
+
+  private samples: CallSample[] = []; // Ring buffer of the last WINDOW_SIZE calls
+  private next = 0;
+  private throttles = 0;
+
+  /**
+   * Whether the provider may be tried (breaker closed, or ready for a probe)
+   */
+  isAvailable(): boolean {
+    return this.breaker.isAvailable();
+  }
+
+  /**
+   * Reserve permission for one upstream call (see CircuitBreaker.allowRequest)
+   */
+  allowRequest(): boolean {
+    return this.breaker.allowRequest();
+  }
+
+  recordSuccess(latencyMs: number): void {
+    this.addSample({ latencyMs, ok: true });
+    this.breaker.recordSuccess();
+  }
+
+  recordFailure(latencyMs: number): void {
+    this.addSample({ latencyMs, ok: false });
+    this.breaker.recordFailure();
+  }
+
+  /**
+   * Record a throttle/quota response and stop using the provider until it resets
+   *
+   * @param {number} retryAt - Epoch ms when the quota is expected to reset
+   */
+  recordThrottle(retryAt: number): void {
+    this.throttles++;
+    this.breaker.trip(retryAt);
+  }
+
+  /**
+   * Expected Call Latency
+   *
+   * Median latency inflated by the error rate (a call that fails half the time
+   * costs about twice as much before an answer is found).
+   *
+   * @returns {number} Expected milliseconds until a successful answer
+   */
+  expectedLatencyMs(): number {
+    const p50 = this.percentile(50) ?? DEFAULT_LATENCY_MS;
+    return p50 / Math.max(0.1, 1 - this.errorRate());
+  }
+
+  getStats(): ProviderHealthStats {
+    return {
+      ...this.breaker.getStats(),
+      samples: this.samples.length,
+      p50LatencyMs: this.percentile(50),
+      p95LatencyMs: this.percentile(95),
+      errorRate: this.errorRate(),
+      throttles: this.throttles,
+    };
+  }
+
+  /**
+   * @private
+   */
+  private addSample(sample: CallSample): void {
+    if (this.samples.length < WINDOW_SIZE) {
+      this.samples.push(sample);
+    } else {
+      this.samples[this.next] = sample;
+    }
+    this.next = (this.next + 1) % WINDOW_SIZE;
+  }
+
+  /**
+   * @private
+   */
+  private errorRate(): number {
+    if (this.samples.length === 0) return 0;
+    return this.samples.filter((s) => !s.ok).length / this.samples.length;
+  }
+
+  /**
+   * Latency percentile of successful calls in the window
+   *
+   * @private
+   */
+  private percentile(p: number): number | null {
+    const latencies = this.samples.filter((s) => s.ok).map((s) => s.latencyMs).sort((a, b) => a - b);
+    if (latencies.length === 0) return null;
+    return latencies[Math.min(latencies.length - 1, Math.floor((p / 100) * latencies.length))];
+  }
+}
+
+export default ProviderHealth;
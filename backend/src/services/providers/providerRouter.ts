@@ -0,0 +1,60 @@
+/**
+ * Adaptive Provider Router
+ *
+ * Orders providers for a request by how soon each is likely to return a quote,
+ * instead of always trying them in the configured order.
+ *
+ * SCORE (lower is better) = expected queue wait + expected call latency
+ * - Queue wait: requests ahead in the provider's queue (plus this request's
+ *   symbols) beyond the tokens available, divided by the refill rate. Tokens
+ *   are capped by the shared budget when other instances are using it
+ * - Call latency: rolling p50, inflated by the rolling error rate
+ *
+ * Providers whose circuit breaker is open (failing, or throttled until their
+ * quota resets) are left out entirely. Ties keep the configured order, so with
+ * no history yet the MARKET_DATA_PROVIDERS order is used.
+ */
+
+import { MarketDataProvider } from './types';
+
+/**
+ * Estimate Time to an Answer
+ *
+ * @param {MarketDataProvider} provider - Candidate provider
+ * @param {number} requests - Upstream requests this call needs
+ * @returns {number} Estimated milliseconds until the provider answers
+ */
+export function estimateResponseMs(provider: MarketDataProvider, requests: number): number {
+  const queue = provider.getQueueStats();
+  const pending = queue.pending.TRADE + queue.pending.READ + queue.pending.BACKGROUND;
+  const budget = provider.getBudgetStats();
+  const availableTokens = budget && budget.remaining !== null
+    ? Math.min(queue.availableTokens, budget.remaining)
+    : queue.availableTokens;
+  const tokensShort = Math.max(0, pending + requests - availableTokens);
+  const waitMs = (tokensShort * 60000) / provider.rateLimit.requestsPerMinute;
+
+  return waitMs + provider.health.expectedLatencyMs();
+}
+
+/**
+ * Rank Providers for a Request
+ *
+ * @param {MarketDataProvider[]} providers - Configured providers, in fallback order
+ * @param {number} [symbols=1] - Symbols requested (batch size)
+ * @returns {MarketDataProvider[]} Available providers, most likely to answer fast first
+ */
+export function rankProviders(providers: MarketDataProvider[], symbols: number = 1): MarketDataProvider[] {
+  return providers
+    .filter((provider) => provider.health.isAvailable())
+    .map((provider, index) => {
+      const requests = provider.capabilities.batch
+        ? Math.ceil(symbols / provider.capabilities.maxBatchSize)
+        : symbols;
+      return { provider, index, score: estimateResponseMs(provider, requests) };
+    })
+    .sort((a, b) => a.score - b.score || a.index - b.index)
+    .map(({ provider }) => provider);
+}
+
+export default rankProviders;
@@ -0,0 +1,194 @@
+/**
+ * Simulated Feed Provider
+ *
+ * Local, deterministic quote source for load tests, benchmarks and offline
+ * development. Generates a realistic random-walk price for any symbol without
+ * calling an external API, so the full cache hierarchy (L0 → Redis → database
+ * → provider queue) can be exercised offline.
+ *
+ * PRICE MODEL:
+ * - Each symbol gets a stable base price (10–500) derived from SIMULATED_FEED_SEED
+ * - The day opens at the base price shifted by a daily move of ~2%
+ * - Every TICK_MS the price takes a Gaussian log-return step (~2.6% daily volatility)
+ * - Steps are a pure function of (seed, symbol, day, tick): the same seed and
+ *   wall-clock time always give the same price, across processes and restarts
+ * - change24h is measured against the day's open
+ *
+ * CONFIGURATION:
+ * - SIMULATED_FEED_LATENCY_MS: artificial latency per upstream call
+ * - SIMULATED_FEED_REQUESTS_PER_MINUTE: rate limit, to reproduce provider throttling
+ * - SIMULATED_FEED_SEED: seed for the price model
+ *
+ * Enable by listing "simulated" in MARKET_DATA_PROVIDERS.
+ */
+
+import { env } from '../../config/env';
+import { AppError } from '../../middleware/errorHandler';
+import { MarketQuote } from '../../types';
+import { BaseMarketDataProvider } from './baseProvider';
+
+const TICK_MS = 5000;                         // Price changes every 5 seconds
+const DAY_MS = 24 * 60 * 60 * 1000;
+const TICKS_PER_DAY = DAY_MS / TICK_MS;
+const TICK_VOLATILITY = 0.0002;               // Std dev of the log-return per tick
+const DAILY_OPEN_VOLATILITY = 0.02;           // Std dev of the open vs base price
+const MAX_TRACKED_SYMBOLS = 10000;            // Walk state cache bound (state is recomputable)
+const SYMBOL_PATTERN = /^[A-Z0-9.\-]{1,10}$/;
+
+interface WalkState {
+  day: number;
+  tick: number;
+  openPrice: number;
+  logPrice: number;
+}
+
+/**
+ * FNV-1a 32-bit hash
+ */
+function hashString(value: string): number {
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < value.length; i++) {
+    hash ^= value.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return hash >>> 0;
+}
+
+export class SimulatedProvider extends BaseMarketDataProvider {
+  readonly name = 'simulated';
+
+  private readonly seed: string;
+  private readonly latencyMs: number;
+  private walks = new Map<string, WalkState>(); // symbol → last computed tick
+
+  constructor() {
+    super(
+      {
+        requestsPerMinute: parseInt(env.SIMULATED_FEED_REQUESTS_PER_MINUTE),
+        burst: 100,
+        maxConcurrency: 50,
+      },
+      { batch: true, maxBatchSize: 100 }
+    );
+    this.seed = env.SIMULATED_FEED_SEED;
+    this.latencyMs = parseInt(env.SIMULATED_FEED_LATENCY_MS);
+  }
+
+  isEnabled(): boolean {
+    return true;
+  }
+
+  protected async requestQuote(symbol: string): Promise<MarketQuote> {
+    await this.delay();
+    return this.generateQuote(symbol, Date.now());
+  }
+
+  protected async requestQuotes(symbols: string[]): Promise<Map<string, MarketQuote>> {
+    await this.delay();
+
+    const now = Date.now();
+    const quotes = new Map<string, MarketQuote>();
+    for (const symbol of symbols) {
+      try {
+        quotes.set(symbol, this.generateQuote(symbol, now));
+      } catch {
+        // Invalid symbols are omitted, like an upstream batch endpoint would
+      }
+    }
+    return quotes;
+  }
+
+  /**
+   * Generate Quote at a Point in Time
+   *
+   * @param {string} symbol - Stock symbol
+   * @param {number} now - Epoch ms
+   * @returns {MarketQuote} Simulated quote
+   * @throws {AppError} 404 if the symbol isn't a plausible ticker
+   * @private
+   */
+  private generateQuote(symbol: string, now: number): MarketQuote {
+    const upper = symbol.toUpperCase();
+    if (!SYMBOL_PATTERN.test(upper)) {
+      throw new AppError('Symbol not found in simulated feed', 404);
+    }
+
+    const state = this.advance(upper, now);
+    const currentPrice = Math.round(Math.exp(state.logPrice) * 100) / 100;
+    const change24h = Math.round((currentPrice - state.openPrice) * 100) / 100;
+    const baseVolume = 100000 + this.random(upper, 'volume') * 50000000;
+
+    return {
+      symbol: upper,
+      assetType: 'STOCK',
+      currentPrice,
+      change24h,
+      changePercentage: (change24h / state.openPrice) * 100,
+      volume: Math.floor(baseVolume * (state.tick + 1) / TICKS_PER_DAY),
+      lastUpdated: new Date(now),
+    };
+  }
+
+  /**
+   * Advance a Symbol's Random Walk to the Current Tick
+   *
+   * Continues from the cached state when possible; otherwise replays the
+   * day from its open (at most TICKS_PER_DAY cheap hash steps).
+   *
+   * @private
+   */
+  private advance(symbol: string, now: number): WalkState {
+    const day = Math.floor(now / DAY_MS);
+    const tick = Math.floor((now % DAY_MS) / TICK_MS);
+
+    let state = this.walks.get(symbol);
+    if (!state || state.day !== day || state.tick > tick) {
+      const basePrice = 10 + this.random(symbol, 'base') * 490;
+      const openPrice = basePrice * Math.exp(this.gaussian(symbol, `open:${day}`) * DAILY_OPEN_VOLATILITY);
+      state = { day, tick: 0, openPrice, logPrice: Math.log(openPrice) };
+    }
+
+    while (state.tick < tick) {
+      state.tick++;
+      state.logPrice += this.gaussian(symbol, `${day}:${state.tick}`) * TICK_VOLATILITY;
+    }
+
+    if (this.walks.size >= MAX_TRACKED_SYMBOLS && !this.walks.has(symbol)) {
+      this.walks.clear();
+    }
+    this.walks.set(symbol, state);
+    return state;
+  }
+
+  /**
+   * Deterministic uniform random number in [0, 1)
+   *
+   * @private
+   */
+  private random(symbol: string, key: string): number {
+    return hashString(`${this.seed}:${symbol}:${key}`) / 0x100000000;
+  }
+
+  /**
+   * Deterministic standard normal random number (Box-Muller)
+   *
+   * @private
+   */
+  private gaussian(symbol: string, key: string): number {
+    const u1 = Math.max(this.random(symbol, `${key}:u1`), Number.EPSILON);
+    const u2 = this.random(symbol, `${key}:u2`);
+    return Math.sqrt(-2 * Math.log(u1)) * Math.cos(2 * Math.PI * u2);
+  }
+
+  /**
+   * Simulate upstream latency
+   *
+   * @private
+   */
+  private delay(): Promise<void> {
+    if (this.latencyMs <= 0) return Promise.resolve();
+    return new Promise((resolve) => setTimeout(resolve, this.latencyMs));
+  }
+}
+
+export default SimulatedProvider;
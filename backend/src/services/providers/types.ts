@@ -0,0 +1,60 @@
+/**
+ * Market Data Provider Types
+ *
+ * Common interface implemented by every quote source (Alpha Vantage, Finnhub,
+ * the local simulated feed). MarketDataService only talks to providers through
+ * this interface, so sources can be added, reordered or swapped via
+ * MARKET_DATA_PROVIDERS without touching the cache hierarchy.
+ */
+
+import { MarketQuote } from '../../types';
+import { DistributedTokenBucketStats } from '../../utils/distributedTokenBucket';
+import { RequestOptions, RequestQueueOptions, RequestQueueStats } from '../../utils/requestQueue';
+import { ProviderHealth } from './providerHealth';
+
+/**
+ * Provider Capabilities
+ *
+ * batch: provider can return many symbols from one upstream call
+ * maxBatchSize: max symbols per upstream call (1 if batch is false)
+ */
+export interface ProviderCapabilities {
+  batch: boolean;
+  maxBatchSize: number;
+}
+
+export interface MarketDataProvider {
+  readonly name: string;                         // Identifier used in MARKET_DATA_PROVIDERS and logs
+  readonly rateLimit: RequestQueueOptions;       // Upstream rate limit (drives the provider's request queue)
+  readonly capabilities: ProviderCapabilities;
+  readonly health: ProviderHealth;               // Circuit breaker, latency and error window
+
+  /**
+   * Whether the provider is configured (e.g., has an API key)
+   */
+  isEnabled(): boolean;
+
+  /**
+   * Fetch a single quote through the provider's request queue
+   *
+   * @throws {RequestDeadlineError} If the request can't start before its deadline
+   * @throws {AppError} If the symbol is unknown or the upstream call fails
+   */
+  fetchQuote(symbol: string, request?: RequestOptions): Promise<MarketQuote>;
+
+  /**
+   * Fetch many quotes through the provider's request queue
+   * Symbols that fail are omitted from the result.
+   */
+  fetchQuotes(symbols: string[], request?: RequestOptions): Promise<Map<string, MarketQuote>>;
+
+  /**
+   * Request queue statistics for monitoring
+   */
+  getQueueStats(): RequestQueueStats;
+
+  /**
+   * Shared (cross-instance) rate limit budget, null if not used yet or disabled
+   */
+  getBudgetStats(): DistributedTokenBucketStats | null;
+}
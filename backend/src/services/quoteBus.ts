@@ -0,0 +1,238 @@
+/**
+ * Quote Bus
+ *
+ * Distributes freshly fetched quotes between server instances over Redis
+ * pub/sub, so a quote fetched by one instance updates every instance's
+ * in-process cache and live stream clients without another provider call.
+ * Order placements and closes travel the same way, so every instance's order
+ * matcher sees orders placed or cancelled on the others.
+ *
+ * KEY FEATURES:
+ * - "quotes:fresh" channel carrying { origin, quotes } messages
+ * - "orders:changed" channel carrying { origin, event } messages
+ * - Each instance ignores its own messages (origin = instance id)
+ * - Publishing is fire-and-forget: a Redis outage only costs cross-instance
+ *   freshness, never a request
+ *
+ * Redis itself is already shared by all instances; the bus is what keeps the
+ * per-process L0 caches and SSE streams in sync with it.
+ */
+
+import { randomUUID } from 'crypto';
+import { getRedisClient, getRedisSubscriber } from '../config/redis';
+import logger from '../config/logger';
+import { MarketQuote } from '../types';
+
+const CHANNEL = 'quotes:fresh';
+const ORDER_CHANNEL = 'orders:changed';
+
+interface QuoteBusMessage {
+  origin: string;
+  quotes: MarketQuote[];
+}
+
+// 'placed': a new OPEN order to index; 'closed': filled, rejected or cancelled
+export interface OrderBusEvent {
+  type: 'placed' | 'closed';
+  orderId: string;
+}
+
+interface OrderBusMessage {
+  origin: string;
+  event: OrderBusEvent;
+}
+
+export type QuoteBusHandler = (quotes: MarketQuote[]) => void;
+export type OrderBusHandler = (event: OrderBusEvent) => void;
+
+export interface QuoteBusStats {
+  instanceId: string;
+  subscribed: boolean;
+  published: number; // Quotes sent to other instances
+  received: number;  // Quotes received from other instances
+  orderEventsPublished: number;
+  orderEventsReceived: number;
+  errors: number;
+}
+
+export class QuoteBus {
+  readonly instanceId = randomUUID();
+
+  private handlers: QuoteBusHandler[] = [];
+  private orderHandlers: OrderBusHandler[] = [];
+  private subscribed = false;
+
+  private published = 0;
+  private received = 0;
+  private orderEventsPublished = 0;
+  private orderEventsReceived = 0;
+  private errors = 0;
+
+  /**
+   * Start Receiving Quotes from Other Instances
+   *
+   * Subscribes once; later calls are no-ops.
+   *
+   * @returns {Promise<void>}
+   */
+  async start(): Promise<void> {
+    if (this.subscribed) return;
+    this.subscribed = true;
+
+    const subscriber = getRedisSubscriber();
+    subscriber.on('message', (channel: string, message: string) => {
+      if (channel === CHANNEL) this.receive(message);
+      else if (channel === ORDER_CHANNEL) this.receiveOrderEvent(message);
+    });
+
+    try {
+      await subscriber.subscribe(CHANNEL, ORDER_CHANNEL);
+      logger.info(`Quote bus subscribed (instance ${this.instanceId})`);
+    } catch (error) {
+      this.subscribed = false;
+      this.errors++;
+      logger.error('Quote bus subscribe failed:', error);
+    }
+  }
+
+  /**
+   * Publish Fetched Quotes to Other Instances
+   *
+   * @param {MarketQuote[]} quotes - Quotes fetched from a provider by this instance
+   */
+  publish(quotes: MarketQuote[]): void {
+    if (quotes.length === 0) return;
+
+    const message: QuoteBusMessage = { origin: this.instanceId, quotes };
+    getRedisClient()
+      .publish(CHANNEL, JSON.stringify(message))
+      .then(() => {
+        this.published += quotes.length;
+      })
+      .catch((error) => {
+        this.errors++;
+        logger.warn('Quote bus publish failed:', error);
+      });
+  }
+
+  /**
+   * Publish an Order Change to Other Instances
+   *
+   * @param {OrderBusEvent} event - Order placed or closed through this instance
+   */
+  publishOrderEvent(event: OrderBusEvent): void {
+    const message: OrderBusMessage = { origin: this.instanceId, event };
+    getRedisClient()
+      .publish(ORDER_CHANNEL, JSON.stringify(message))
+      .then(() => {
+        this.orderEventsPublished++;
+      })
+      .catch((error) => {
+        this.errors++;
+        logger.warn('Order event publish failed:', error);
+      });
+  }
+
+  /**
+   * Subscribe to Quotes from Other Instances
+   *
+   * @param {QuoteBusHandler} handler - Called with each batch of remote quotes
+   * @returns {() => void} Unsubscribe function
+   */
+  onQuotes(handler: QuoteBusHandler): () => void {
+    this.handlers.push(handler);
+    return () => {
+      this.handlers = this.handlers.filter((h) => h !== handler);
+    };
+  }
+
+  /**
+   * Subscribe to Order Changes from Other Instances
+   *
+   * @param {OrderBusHandler} handler - Called with each remote order event
+   * @returns {() => void} Unsubscribe function
+   */
+  onOrderEvents(handler: OrderBusHandler): () => void {
+    this.orderHandlers.push(handler);
+    return () => {
+      this.orderHandlers = this.orderHandlers.filter((h) => h !== handler);
+    };
+  }
+
+  /**
+   * Get Bus Statistics
+   *
+   * @returns {QuoteBusStats} Instance id and message counters
+   */
+  getStats(): QuoteBusStats {
+    return {
+      instanceId: this.instanceId,
+      subscribed: this.subscribed,
+      published: this.published,
+      received: this.received,
+      orderEventsPublished: this.orderEventsPublished,
+      orderEventsReceived: this.orderEventsReceived,
+      errors: this.errors,
+    };
+  }
+
+  /**
+   * Handle One Bus Message
+   *
+   * @param {string} message - Raw JSON message
+   * @private
+   */
+  private receive(message: string): void {
+    let parsed: QuoteBusMessage;
+    try {
+      parsed = JSON.parse(message);
+    } catch (error) {
+      this.errors++;
+      logger.warn('Quote bus received invalid message:', error);
+      return;
+    }
+
+    if (parsed.origin === this.instanceId || !Array.isArray(parsed.quotes)) return;
+
+    // Dates arrive as ISO strings
+    const quotes = parsed.quotes.map((quote) => ({ ...quote, lastUpdated: new Date(quote.lastUpdated) }));
+    this.received += quotes.length;
+
+    for (const handler of this.handlers) {
+      try {
+        handler(quotes);
+      } catch (error) {
+        logger.error('Quote bus handler failed:', error);
+      }
+    }
+  }
+  /**
+   * Handle One Order Event Message
+   *
+   * @param {string} message - Raw JSON message
+   * @private
+   */
+  private receiveOrderEvent(message: string): void {
+    let parsed: OrderBusMessage;
+    try {
+      parsed = JSON.parse(message);
+    } catch (error) {
+      this.errors++;
+      logger.warn('Quote bus received invalid order event:', error);
+      return;
+    }
+
+    if (parsed.origin === this.instanceId || !parsed.event?.orderId) return;
+    this.orderEventsReceived++;
+
+    for (const handler of this.orderHandlers) {
+      try {
+        handler(parsed.event);
+      } catch (error) {
+        logger.error('Order event handler failed:', error);
+      }
+    }
+  }
+}
+
+export default new QuoteBus();
@@ -0,0 +1,305 @@
+/**
+ * Quote Stream Service
+ *
+ * Pushes live quotes to browsers over Server-Sent Events (SSE), replacing
+ * per-tab polling of watchlist and portfolio endpoints.
+ *
+ * KEY FEATURES:
+ * - Shared refresh: one timer refreshes the union of all subscribed symbols
+ *   with batch reads, so backend load grows with distinct symbols, not clients
+ * - Push on fetch: quotes fetched for any other request (onQuotes) are pushed
+ *   immediately instead of waiting for the next refresh
+ * - Deltas only: a symbol is sent only when its price or change differs from
+ *   the last value broadcast; each quote is serialized once per fan-out
+ * - Heartbeats keep idle connections open through proxies
+ *
+ * PROTOCOL:
+ * - GET /api/market/stream?symbols=AAPL,MSFT
+ * - `event: quotes` with a JSON array of StreamQuote, first a snapshot of
+ *   every subscribed symbol, then only changed symbols
+ * - To change symbols, the client reconnects with the new list
+ */
+
+import { Request, Response } from 'express';
+import { env } from '../config/env';
+import logger from '../config/logger';
+import { MarketQuote } from '../types';
+import { RequestPriority } from '../utils/requestQueue';
+import marketDataService from './marketDataService';
+
+const REFRESH_INTERVAL_MS = parseInt(env.QUOTE_STREAM_INTERVAL_MS);
+const HEARTBEAT_MS = 25000;     // Comment line sent to idle connections
+const MAX_BATCH_SYMBOLS = 100;  // getQuoteBatch limit per call
+export const MAX_STREAM_SYMBOLS = 100; // Symbols per client connection
+
+/**
+ * Quote fields pushed to clients
+ */
+export interface StreamQuote {
+  symbol: string;
+  currentPrice: number;
+  change24h: number;
+  changePercentage: number;
+  lastUpdated: Date | string;
+}
+
+interface StreamClient {
+  res: Response;
+  symbols: string[];
+}
+
+export interface QuoteStreamStats {
+  clients: number;
+  symbols: number;
+  refreshes: number;
+  pushed: number;       // Quotes written to client connections
+  suppressed: number;   // Quotes not sent because nothing changed
+}
+
+export class QuoteStreamService {
+  private clients = new Map<number, StreamClient>();
+  private subscribers = new Map<string, Set<number>>(); // symbol → client ids
+  private lastSent = new Map<string, StreamQuote>();    // symbol → last quote broadcast
+  private nextClientId = 1;
+
+  private refreshTimer: NodeJS.Timeout | null = null;
+  private heartbeatTimer: NodeJS.Timeout | null = null;
+  private refreshing = false;
+
+  private refreshes = 0;
+  private pushed = 0;
+  private suppressed = 0;
+
+  /**
+   * Open a Quote Stream
+   *
+   * Sends SSE headers, loads a snapshot of the requested symbols (cache first),
+   * then keeps the connection registered until the client disconnects.
+   *
+   * @param {Request} req - Incoming request (closed when the client disconnects)
+   * @param {Response} res - Response kept open as the event stream
+   * @param {string[]} symbols - Symbols to subscribe to (upper-cased, deduplicated)
+   */
+  async subscribe(req: Request, res: Response, symbols: string[]): Promise<void> {
+    const unique = [...new Set(symbols)].slice(0, MAX_STREAM_SYMBOLS);
+
+    res.writeHead(200, {
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache',
+      Connection: 'keep-alive',
+      'X-Accel-Buffering': 'no', // Disable proxy buffering (nginx)
+    });
+    res.write(`retry: ${REFRESH_INTERVAL_MS}\n\n`);
+
+    let closed = false;
+    req.on('close', () => {
+      closed = true;
+    });
+
+    // Load symbols nobody is streaming yet; others are already in lastSent
+    const loaded = new Map<string, StreamQuote>();
+    const unknown = unique.filter((symbol) => !this.lastSent.has(symbol));
+    if (unknown.length > 0) {
+      try {
+        const quotes = await marketDataService.getQuoteBatch(unknown, {
+          priority: RequestPriority.READ,
+          deadlineMs: REFRESH_INTERVAL_MS,
+        });
+        this.publish([...quotes.values()]);
+        quotes.forEach((quote) => loaded.set(quote.symbol, this.toStreamQuote(quote)));
+      } catch (error) {
+        logger.warn('Quote stream snapshot failed:', error);
+      }
+    }
+
+    if (closed) return;
+
+    const id = this.nextClientId++;
+    this.clients.set(id, { res, symbols: unique });
+    for (const symbol of unique) {
+      let ids = this.subscribers.get(symbol);
+      if (!ids) {
+        ids = new Set();
+        this.subscribers.set(symbol, ids);
+      }
+      ids.add(id);
+    }
+    req.on('close', () => this.unsubscribe(id));
+
+    const snapshot: StreamQuote[] = [];
+    for (const symbol of unique) {
+      const quote = this.lastSent.get(symbol) ?? loaded.get(symbol);
+      if (!quote) continue;
+      this.lastSent.set(symbol, quote);
+      snapshot.push(quote);
+    }
+    this.send(res, snapshot.map((quote) => JSON.stringify(quote)));
+
+    this.startTimers();
+  }
+
+  /**
+   * Publish Fresh Quotes
+   *
+   * Fans out quotes that changed since the last broadcast to every client
+   * subscribed to them. Quotes for symbols without subscribers are ignored.
+   *
+   * @param {MarketQuote[]} quotes - Fresh or refreshed quotes
+   */
+  publish(quotes: MarketQuote[]): void {
+    if (this.clients.size === 0) return;
+
+    const changed = new Map<string, string>(); // symbol → serialized quote
+    for (const quote of quotes) {
+      if (!this.subscribers.has(quote.symbol)) continue;
+
+      const next = this.toStreamQuote(quote);
+      const previous = this.lastSent.get(quote.symbol);
+      if (
+        previous &&
+        previous.currentPrice === next.currentPrice &&
+        previous.change24h === next.change24h
+      ) {
+        this.suppressed++;
+        continue;
+      }
+
+      this.lastSent.set(quote.symbol, next);
+      changed.set(quote.symbol, JSON.stringify(next));
+    }
+
+    if (changed.size === 0) return;
+
+    // Group per client so each gets one event with all its changed symbols
+    const batches = new Map<number, string[]>();
+    for (const [symbol, payload] of changed.entries()) {
+      for (const id of this.subscribers.get(symbol) ?? []) {
+        const batch = batches.get(id) ?? [];
+        batch.push(payload);
+        batches.set(id, batch);
+      }
+    }
+
+    for (const [id, batch] of batches.entries()) {
+      const client = this.clients.get(id);
+      if (client) this.send(client.res, batch);
+    }
+  }
+
+  /**
+   * Get Stream Statistics
+   *
+   * @returns {QuoteStreamStats} Connected clients, subscribed symbols and push counters
+   */
+  getStats(): QuoteStreamStats {
+    return {
+      clients: this.clients.size,
+      symbols: this.subscribers.size,
+      refreshes: this.refreshes,
+      pushed: this.pushed,
+      suppressed: this.suppressed,
+    };
+  }
+
+  /**
+   * Remove a Disconnected Client
+   *
+   * @private
+   */
+  private unsubscribe(id: number): void {
+    const client = this.clients.get(id);
+    if (!client) return;
+
+    this.clients.delete(id);
+    for (const symbol of client.symbols) {
+      const ids = this.subscribers.get(symbol);
+      if (!ids) continue;
+      ids.delete(id);
+      if (ids.size === 0) {
+        this.subscribers.delete(symbol);
+        this.lastSent.delete(symbol);
+      }
+    }
+
+    if (this.clients.size === 0) {
+      this.stopTimers();
+    }
+  }
+
+  /**
+   * Refresh All Subscribed Symbols
+   *
+   * One batch read per 100 symbols, in the BACKGROUND lane so trade execution
+   * is never queued behind streaming. Stale quotes are revalidated by
+   * MarketDataService and pushed through onQuotes when they arrive.
+   *
+   * @private
+   */
+  private async refresh(): Promise<void> {
+    if (this.refreshing || this.subscribers.size === 0) return;
+    this.refreshing = true;
+
+    try {
+      const symbols = [...this.subscribers.keys()];
+      for (let i = 0; i < symbols.length; i += MAX_BATCH_SYMBOLS) {
+        const quotes = await marketDataService.getQuoteBatch(symbols.slice(i, i + MAX_BATCH_SYMBOLS), {
+          priority: RequestPriority.BACKGROUND,
+          deadlineMs: REFRESH_INTERVAL_MS,
+        });
+        this.publish([...quotes.values()]);
+      }
+      this.refreshes++;
+    } catch (error) {
+      logger.warn('Quote stream refresh failed:', error);
+    } finally {
+      this.refreshing = false;
+    }
+  }
+
+  /**
+   * Write One SSE Event
+   *
+   * @param {Response} res - Client stream
+   * @param {string[]} payloads - Serialized StreamQuote objects
+   * @private
+   */
+  private send(res: Response, payloads: string[]): void {
+    if (payloads.length === 0) return;
+    res.write(`event: quotes\ndata: [${payloads.join(',')}]\n\n`);
+    this.pushed += payloads.length;
+  }
+
+  private startTimers(): void {
+    if (!this.refreshTimer) {
+      this.refreshTimer = setInterval(() => void this.refresh(), REFRESH_INTERVAL_MS);
+    }
+    if (!this.heartbeatTimer) {
+      this.heartbeatTimer = setInterval(() => {
+        this.clients.forEach((client) => client.res.write(': ping\n\n'));
+      }, HEARTBEAT_MS);
+    }
+  }
+
+  private stopTimers(): void {
+    if (this.refreshTimer) {
+      clearInterval(this.refreshTimer);
+      this.refreshTimer = null;
+    }
+    if (this.heartbeatTimer) {
+      clearInterval(this.heartbeatTimer);
+      this.heartbeatTimer = null;
+    }
+  }
+
+  private toStreamQuote(quote: MarketQuote): StreamQuote {
+    return {
+      symbol: quote.symbol,
+      currentPrice: quote.currentPrice,
+      change24h: quote.change24h,
+      changePercentage: quote.changePercentage,
+      lastUpdated: quote.lastUpdated,
+    };
+  }
+}
+
+export default new QuoteStreamService();
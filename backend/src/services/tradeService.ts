@@ -11,37 +11,146 @@
  * - Trigger achievement checks after trades
  *
  * TRADE EXECUTION FLOW:
- * 1. Verify portfolio ownership
- * 2. Fetch current market price
- * 3. Validate trade (funds/holdings check)
- * 4. Execute in database transaction:
+ * 1. Fetch current market price
+ * 2. Execute as one conditional SQL statement:
+ *    - Verify portfolio ownership
+ *    - Check and update cash balance / holdings (create/update/delete)
  *    - Create trade record
- *    - Update cash balance
- *    - Update holdings (create/update/delete)
- * 5. Recalculate portfolio value
- * 6. Check for new achievements
+ *    - Adjust total value by the trade's cash/position delta
+ * 3. Schedule a background mark-to-market of the portfolio
+ * 4. Check for new achievements
  *
- * IMPORTANT: All trade operations use database transactions to ensure
- * atomicity and prevent data inconsistencies.
+ * IMPORTANT: Cash and holdings are only changed relative to their current
+ * values and behind funds/holdings guards, in a single atomic statement, so
+ * concurrent trades on the same portfolio stay consistent.
+ *
+ * LOCK ORDER: every path that changes holdings (applyBuy, applySell,
+ * executeBasket) locks the portfolio row first and its holdings second.
+ * Taking them the other way round in one path lets it deadlock with another
+ * path on the same portfolio. Revaluation relies on this order too: holding
+ * the portfolio row lock keeps its holdings still (see
+ * PortfolioService.revaluePortfolios).
  */
 
-import { Trade } from '@prisma/client';
+import { randomUUID } from 'crypto';
+import { Prisma, Trade } from '@prisma/client';
 import getPrismaClient from '../config/database';
 import { AppError } from '../middleware/errorHandler';
-import { TradeResult } from '../types';
+import { BasketLeg, BasketResult, TradeResult } from '../types';
 import logger from '../config/logger';
 import marketDataService from './marketDataService';
 import portfolioService from './portfolioService';
-import achievementService from './achievementService';
+import achievementService, { TradeEvent } from './achievementService';
+import { enqueueAchievementCheck } from '../jobs/backgroundJobs';
+import { RequestPriority } from '../utils/requestQueue';
 
 const prisma = getPrismaClient();
+const TRADE_QUOTE_DEADLINE_MS = 3000; // Max wait for a provider slot before failing the trade
+
+interface AppliedTrade {
+  portfolioId: string;
+  userId: string;
+  symbol: string;
+  assetType: 'STOCK' | 'CRYPTO';
+  quantity: number;
+  price: number;
+  totalValue: number;
+  tradeId?: string; // Generated if not given
+}
+
+interface PricedLeg extends BasketLeg {
+  price: number;
+  totalValue: number;
+}
+
+// Row returned by the basket's trade insert and cash update
+interface BasketTradeRow {
+  trade_id: string;
+  symbol: string;
+  total_value: Prisma.Decimal;
+  executed_at: Date;
+  cash_balance: Prisma.Decimal;
+  portfolio_value: Prisma.Decimal;
+  trade_seq: bigint;
+}
+
+// Adds a bought quantity to an existing holding at the weighted average cost
+const MERGE_BOUGHT_HOLDING = Prisma.sql`
+  ON CONFLICT ("portfolio_id", "symbol") DO UPDATE SET
+    "average_cost" = ("holdings"."average_cost" * "holdings"."quantity" + EXCLUDED."average_cost" * EXCLUDED."quantity")
+      / ("holdings"."quantity" + EXCLUDED."quantity"),
+    "quantity" = "holdings"."quantity" + EXCLUDED."quantity",
+    "updated_at" = NOW()
+`;
+
+/**
+ * Resting order to fill at an observed price (see OrderService)
+ */
+export interface OrderFill {
+  orderId: string;
+  portfolioId: string;
+  userId: string;
+  symbol: string;
+  assetType: 'STOCK' | 'CRYPTO';
+  tradeType: 'BUY' | 'SELL';
+  quantity: number;
+}
+
+export type OrderFillOutcome =
+  | { status: 'FILLED'; result: TradeResult }
+  | { status: 'REJECTED'; reason: string }
+  | { status: 'CLOSED' }; // Already filled, cancelled or rejected elsewhere
+
+interface HoldingQuantityRow {
+  symbol: string;
+  quantity: Prisma.Decimal;
+}
+
+const QUANTITY_EPSILON = 1e-8; // Holding quantity scale (DECIMAL(18,8))
+
+/**
+ * Effect of a Trade on Its Holding
+ *
+ * @param {'BUY' | 'SELL'} tradeType - Trade direction
+ * @param {number} quantity - Traded quantity
+ * @param {number} remaining - Holding quantity after the trade
+ * @returns {TradeEvent['position']} Whether the trade opened, closed or changed the position
+ */
+const positionChange = (tradeType: 'BUY' | 'SELL', quantity: number, remaining: number): TradeEvent['position'] => {
+  if (tradeType === 'SELL') {
+    return remaining <= 0 ? 'closed' : 'changed';
+  }
+  return remaining - quantity < QUANTITY_EPSILON ? 'opened' : 'changed';
+};
+
+// Row returned by the single-statement trade (see applyBuy/applySell)
+interface AppliedTradeRow {
+  trade_id: string;
+  total_value: Prisma.Decimal;
+  executed_at: Date;
+  cash_balance: Prisma.Decimal;
+  portfolio_value: Prisma.Decimal;
+  holding_quantity: Prisma.Decimal;
+  trade_seq: bigint;
+}
 
 export class TradeService {
   /**
    * Execute a Trade (BUY or SELL)
    *
    * Executes a complete trading operation with validation and portfolio updates.
-   * Uses database transaction to ensure atomicity.
+   * The funds/holdings check, cash movement, holding change and trade record
+   * are one SQL statement (see applyBuy/applySell), so the trade is atomic
+   * without an interactive transaction or a row read beforehand.
+   *
+   * CONCURRENCY:
+   * Cash and quantity are changed relative to their current values, guarded by
+   * `cash_balance >= total` / `quantity >= sold`. Postgres re-checks the guard
+   * after waiting for a concurrent trade's row lock, so simultaneous trades on
+   * one portfolio can never overdraw cash or oversell a holding.
+   *
+   * ROUND TRIPS: quote (usually cached) → trade statement, regardless of
+   * portfolio size. A rejected trade costs one more read to report why.
    *
    * @param {string} portfolioId - Portfolio ID to trade in
    * @param {string} userId - User ID (for ownership verification)
@@ -60,95 +169,485 @@ export class TradeService {
     tradeType: 'BUY' | 'SELL',
     quantity: number
   ): Promise<TradeResult> {
-    // Verify portfolio ownership
-    const portfolio = await prisma.portfolio.findFirst({
-      where: {
-        id: portfolioId,
-        userId,
-      },
-      include: {
-        holdings: true,
-      },
-    });
-
-    if (!portfolio) {
-      throw new AppError('Portfolio not found', 404);
+    if (quantity <= 0) {
+      throw new AppError('Quantity must be positive', 400);
     }
 
     // Get current market price
-    const marketData = await marketDataService.getQuote(symbol);
+    // Trade quotes jump ahead of page reads and warmers in the provider queues
+    // and are never stale; if no provider slot frees up in time, the trade fails (503)
+    const marketData = await marketDataService.getQuote(symbol, {
+      priority: RequestPriority.TRADE,
+      deadlineMs: TRADE_QUOTE_DEADLINE_MS,
+    });
     const price = marketData.currentPrice;
     const totalValue = price * quantity;
 
-    // Validate trade
-    await this.validateTrade(portfolio, tradeType, symbol, quantity, totalValue);
-
-    // Execute trade in transaction
-    const result = await prisma.$transaction(async (tx) => {
-      // Create trade record
-      const trade = await tx.trade.create({
-        data: {
-          portfolioId,
-          symbol,
-          assetType,
-          tradeType,
-          quantity,
-          price,
-          totalValue,
-          executedAt: new Date(),
-        },
-      });
-
-      // Update portfolio cash balance
-      const newCashBalance =
-        tradeType === 'BUY'
-          ? portfolio.cashBalance.toNumber() - totalValue
-          : portfolio.cashBalance.toNumber() + totalValue;
-
-      await tx.portfolio.update({
-        where: { id: portfolioId },
-        data: {
-          cashBalance: newCashBalance,
-        },
-      });
-
-      // Update holdings
-      await portfolioService.updateHolding(portfolioId, symbol, assetType, quantity, price, tradeType);
-
-      return trade;
-    });
+    const trade: AppliedTrade = { portfolioId, userId, symbol, assetType, quantity, price, totalValue };
+    const rows = tradeType === 'BUY' ? await this.applyBuy(trade) : await this.applySell(trade);
+
+    if (rows.length === 0) {
+      await this.explainRejectedTrade(trade, tradeType);
+    }
+    const applied = rows[0];
 
-    // Calculate new portfolio value
-    const newPortfolioValue = await portfolioService.calculatePortfolioValue(portfolioId, userId);
+    // The trade already moved totalValue by its own cash/position delta;
+    // marking the other holdings to market happens in the background
+    portfolioService.scheduleRevaluation(portfolioId);
 
     logger.info(
       `Trade executed: ${tradeType} ${quantity} ${symbol} @ ${price} for portfolio ${portfolioId}`
     );
 
-    // Get updated portfolio
-    const updatedPortfolio = await prisma.portfolio.findUnique({
-      where: { id: portfolioId },
+    // Check for achievements (async, don't wait)
+    this.recordAchievementProgress(userId, [this.toTradeEvent(trade, tradeType, applied)]);
+
+    return this.toTradeResult(trade, tradeType, applied);
+  }
+
+  /**
+   * Execute a Basket of Trades
+   *
+   * Buys and sells several symbols as one all-or-nothing order, e.g. to
+   * rebalance a portfolio. Sells in the basket fund its buys.
+   *
+   * PROCESS:
+   * 1. Price every leg with one quote batch
+   * 2. In one transaction:
+   *    - Lock the portfolio row, then the holdings being sold
+   *    - Check holdings per sell and cash for the basket's net amount
+   *    - Upsert all bought holdings, reduce all sold holdings (bulk statements)
+   *    - Insert all trades and move cash/totalValue in one statement
+   * 3. Schedule one revaluation and one achievement check
+   *
+   * The number of statements doesn't depend on the number of legs.
+   *
+   * @param {string} portfolioId - Portfolio ID to trade in
+   * @param {string} userId - User ID (for ownership verification)
+   * @param {BasketLeg[]} legs - Trades to execute, at most one per symbol
+   * @returns {Promise<BasketResult>} Executed trades (in leg order) and updated portfolio info
+   * @throws {AppError} If a symbol repeats or can't be priced, the portfolio isn't found,
+   *   or funds/holdings are insufficient
+   */
+  async executeBasket(portfolioId: string, userId: string, legs: BasketLeg[]): Promise<BasketResult> {
+    const normalized = legs.map((leg) => ({ ...leg, symbol: leg.symbol.trim().toUpperCase() }));
+    const symbols = normalized.map((leg) => leg.symbol);
+
+    const duplicate = symbols.find((symbol, index) => symbols.indexOf(symbol) !== index);
+    if (duplicate) {
+      throw new AppError(`Duplicate symbol in basket: ${duplicate}`, 400);
+    }
+    if (normalized.some((leg) => leg.quantity <= 0)) {
+      throw new AppError('Quantity must be positive', 400);
+    }
+
+    const quotes = await marketDataService.getQuoteBatch(symbols, {
+      priority: RequestPriority.TRADE,
+      deadlineMs: TRADE_QUOTE_DEADLINE_MS,
     });
+    const unpriced = symbols.filter((symbol) => !quotes.has(symbol));
+    if (unpriced.length > 0) {
+      throw new AppError(`Unable to fetch quote for ${unpriced.join(', ')} from any API`, 503);
+    }
 
-    // Check for achievements (async, don't wait)
-    achievementService.checkAndAwardAchievements(userId).catch((error) => {
-      logger.error('Achievement check failed after trade:', error);
+    const priced: PricedLeg[] = normalized.map((leg) => {
+      const price = quotes.get(leg.symbol)!.currentPrice;
+      return { ...leg, price, totalValue: price * leg.quantity };
+    });
+    const buys = priced.filter((leg) => leg.tradeType === 'BUY');
+    const sells = priced.filter((leg) => leg.tradeType === 'SELL');
+
+    const remaining = new Map<string, number>(); // symbol → holding quantity after the basket
+    const rows = await prisma.$transaction(async (tx) => {
+      const [portfolio] = await tx.$queryRaw<{ cash_balance: Prisma.Decimal }[]>`
+        SELECT "cash_balance" FROM "portfolios"
+        WHERE "id" = ${portfolioId} AND "user_id" = ${userId}
+        FOR UPDATE
+      `;
+      if (!portfolio) {
+        throw new AppError('Portfolio not found', 404);
+      }
+
+      if (sells.length > 0) {
+        const held = await tx.$queryRaw<{ symbol: string; quantity: Prisma.Decimal }[]>`
+          SELECT "symbol", "quantity" FROM "holdings"
+          WHERE "portfolio_id" = ${portfolioId}
+            AND "symbol" IN (${Prisma.join(sells.map((leg) => leg.symbol))})
+          FOR UPDATE
+        `;
+        const available = new Map(held.map((holding) => [holding.symbol, Number(holding.quantity)]));
+
+        for (const leg of sells) {
+          const quantity = available.get(leg.symbol);
+          if (quantity === undefined) {
+            throw new AppError(`No holdings found for ${leg.symbol}`, 400);
+          }
+          if (quantity < leg.quantity) {
+            throw new AppError(`Insufficient holdings for ${leg.symbol}. Available: ${quantity}`, 400);
+          }
+        }
+      }
+
+      const netCash =
+        sells.reduce((sum, leg) => sum + leg.totalValue, 0) -
+        buys.reduce((sum, leg) => sum + leg.totalValue, 0);
+      if (Number(portfolio.cash_balance) + netCash < 0) {
+        throw new AppError('Insufficient funds', 400);
+      }
+
+      if (buys.length > 0) {
+        const values = buys.map(
+          (leg) => Prisma.sql`(${randomUUID()}, ${portfolioId}, ${leg.symbol}, ${leg.assetType}::"asset_type",
+            ${leg.quantity}::decimal, ${leg.price}::decimal, NOW())`
+        );
+        const bought = await tx.$queryRaw<HoldingQuantityRow[]>`
+          INSERT INTO "holdings" ("id", "portfolio_id", "symbol", "asset_type", "quantity", "average_cost", "updated_at")
+          VALUES ${Prisma.join(values)}
+          ${MERGE_BOUGHT_HOLDING}
+          RETURNING "symbol", "quantity"
+        `;
+        bought.forEach((row) => remaining.set(row.symbol, Number(row.quantity)));
+      }
+
+      if (sells.length > 0) {
+        const values = sells.map((leg) => Prisma.sql`(${leg.symbol}, ${leg.quantity}::decimal)`);
+        const sold = await tx.$queryRaw<HoldingQuantityRow[]>`
+          UPDATE "holdings" AS h
+          SET "quantity" = h."quantity" - v."quantity", "updated_at" = NOW()
+          FROM (VALUES ${Prisma.join(values)}) AS v("symbol", "quantity")
+          WHERE h."portfolio_id" = ${portfolioId} AND h."symbol" = v."symbol"
+          RETURNING h."symbol", h."quantity"
+        `;
+        sold.forEach((row) => remaining.set(row.symbol, Number(row.quantity)));
+        await tx.$executeRaw`
+          DELETE FROM "holdings"
+          WHERE "portfolio_id" = ${portfolioId}
+            AND "symbol" IN (${Prisma.join(sells.map((leg) => leg.symbol))})
+            AND "quantity" <= 0
+        `;
+      }
+
+      // Cash moves by the sum of the rounded trade values, so trades and balance always agree
+      const trades = priced.map(
+        (leg) => Prisma.sql`(${randomUUID()}, ${portfolioId}, ${leg.symbol}, ${leg.assetType}::"asset_type",
+          ${leg.tradeType}::"trade_type", ${leg.quantity}::decimal, ${leg.price}::decimal,
+          ${leg.totalValue}::decimal(15, 2), NOW())`
+      );
+      const applied = await tx.$queryRaw<BasketTradeRow[]>`
+        WITH inserted AS (
+          INSERT INTO "trades" ("id", "portfolio_id", "symbol", "asset_type", "trade_type", "quantity", "price", "total_value", "executed_at")
+          VALUES ${Prisma.join(trades)}
+          RETURNING "id", "symbol", "trade_type", "quantity", "price", "total_value", "executed_at"
+        ), net AS (
+          SELECT
+            SUM(CASE WHEN "trade_type" = 'SELL' THEN "total_value" ELSE -"total_value" END) AS "cash",
+            SUM(CASE WHEN "trade_type" = 'SELL' THEN -"quantity" * "price" ELSE "quantity" * "price" END) AS "positions"
+          FROM inserted
+        ), moved AS (
+          UPDATE "portfolios"
+          SET "cash_balance" = "cash_balance" + net."cash",
+            "total_value" = COALESCE("total_value", "cash_balance") + net."cash" + net."positions",
+            "trade_seq" = "trade_seq" + 1
+          FROM net
+          WHERE "id" = ${portfolioId} AND "cash_balance" + net."cash" >= 0
+          RETURNING "cash_balance", "total_value" AS "portfolio_value", "trade_seq"
+        )
+        SELECT inserted."id" AS trade_id, inserted."symbol", inserted."total_value", inserted."executed_at",
+          moved."cash_balance", moved."portfolio_value", moved."trade_seq"
+        FROM inserted, moved
+      `;
+      if (applied.length === 0) {
+        throw new AppError('Insufficient funds', 400);
+      }
+
+      return applied;
+    });
+
+    portfolioService.scheduleRevaluation(portfolioId);
+
+    logger.info(
+      `Basket executed: ${buys.length} buys, ${sells.length} sells for portfolio ${portfolioId}`
+    );
+
+    const rowsBySymbol = new Map(rows.map((row) => [row.symbol, row]));
+
+    // Check for achievements once for the whole basket (async, don't wait)
+    this.recordAchievementProgress(
+      userId,
+      priced.map((leg) => ({
+        portfolioId,
+        symbol: leg.symbol,
+        executedAt: rowsBySymbol.get(leg.symbol)!.executed_at,
+        position: positionChange(leg.tradeType, leg.quantity, remaining.get(leg.symbol) ?? 0),
+        seq: Number(rows[0].trade_seq),
+      }))
+    );
+
+    return {
+      trades: priced.map((leg) => {
+        const row = rowsBySymbol.get(leg.symbol)!;
+        return {
+          id: row.trade_id,
+          symbol: leg.symbol,
+          assetType: leg.assetType,
+          tradeType: leg.tradeType,
+          quantity: leg.quantity,
+          price: leg.price,
+          totalValue: Number(row.total_value),
+          executedAt: row.executed_at,
+        };
+      }),
+      portfolio: {
+        cashBalance: Number(rows[0].cash_balance),
+        totalValue: Number(rows[0].portfolio_value),
+      },
+    };
+  }
+
+  /**
+   * Fill a Resting Order
+   *
+   * Claims the order (OPEN → FILLED) and applies the trade in one
+   * transaction. The claim is conditional on the order still being open, so
+   * an order is filled at most once even when several instances match it or
+   * the user cancels it at the same moment. If funds/holdings no longer cover
+   * it, the order is rejected instead.
+   *
+   * @param {OrderFill} order - Order to fill
+   * @param {number} price - Price that crossed the order's trigger
+   * @returns {Promise<OrderFillOutcome>} Filled trade, rejection reason, or CLOSED
+   */
+  async fillOrder(order: OrderFill, price: number): Promise<OrderFillOutcome> {
+    const { orderId, portfolioId, userId, symbol, assetType, tradeType, quantity } = order;
+    const trade: AppliedTrade = {
+      portfolioId,
+      userId,
+      symbol,
+      assetType,
+      quantity,
+      price,
+      totalValue: price * quantity,
+      tradeId: randomUUID(),
+    };
+
+    const outcome = await prisma.$transaction(async (tx) => {
+      const claimed = await tx.$executeRaw`
+        UPDATE "orders"
+        SET "status" = 'FILLED', "filled_at" = NOW(), "trade_id" = ${trade.tradeId}, "updated_at" = NOW()
+        WHERE "id" = ${orderId} AND "status" = 'OPEN'
+      `;
+      if (claimed === 0) {
+        return { status: 'CLOSED' as const };
+      }
+
+      const rows = tradeType === 'BUY' ? await this.applyBuy(trade, tx) : await this.applySell(trade, tx);
+      if (rows.length === 0) {
+        const reason = tradeType === 'BUY' ? 'Insufficient funds' : 'Insufficient holdings';
+        await tx.$executeRaw`
+          UPDATE "orders"
+          SET "status" = 'REJECTED', "filled_at" = NULL, "trade_id" = NULL, "reject_reason" = ${reason}, "updated_at" = NOW()
+          WHERE "id" = ${orderId}
+        `;
+        return { status: 'REJECTED' as const, reason };
+      }
+
+      return { status: 'FILLED' as const, row: rows[0] };
     });
 
+    if (outcome.status !== 'FILLED') {
+      return outcome;
+    }
+
+    portfolioService.scheduleRevaluation(portfolioId);
+
+    logger.info(
+      `Order filled: ${tradeType} ${quantity} ${symbol} @ ${price} for portfolio ${portfolioId} (order ${orderId})`
+    );
+
+    this.recordAchievementProgress(userId, [this.toTradeEvent(trade, tradeType, outcome.row)]);
+
+    return { status: 'FILLED', result: this.toTradeResult(trade, tradeType, outcome.row) };
+  }
+
+  /**
+   * Apply a BUY in One Statement
+   *
+   * Debits cash only if the balance covers the trade, then upserts the holding
+   * (weighted average cost) and records the trade, all from the debited row.
+   * Returns no row if the portfolio doesn't belong to the user or cash is short.
+   *
+   * @param {AppliedTrade} trade - Trade to apply
+   * @param {Prisma.TransactionClient} [db] - Transaction to run in
+   * @returns {Promise<AppliedTradeRow[]>} One row if applied, none if rejected
+   * @private
+   */
+  private async applyBuy(trade: AppliedTrade, db: Prisma.TransactionClient = prisma): Promise<AppliedTradeRow[]> {
+    const { portfolioId, userId, symbol, assetType, quantity, price, totalValue } = trade;
+    const tradeId = trade.tradeId ?? randomUUID();
+
+    return db.$queryRaw<AppliedTradeRow[]>`
+      WITH cash AS (
+        UPDATE "portfolios"
+        SET "cash_balance" = "cash_balance" - ${totalValue}::decimal(15, 2),
+          "total_value" = COALESCE("total_value", "cash_balance")
+            - ${totalValue}::decimal(15, 2) + ${price}::decimal * ${quantity}::decimal,
+          "trade_seq" = "trade_seq" + 1
+        WHERE "id" = ${portfolioId}
+          AND "user_id" = ${userId}
+          AND "cash_balance" >= ${totalValue}::decimal(15, 2)
+        RETURNING "id", "cash_balance", "total_value" AS "portfolio_value", "trade_seq"
+      ), holding AS (
+        INSERT INTO "holdings" ("id", "portfolio_id", "symbol", "asset_type", "quantity", "average_cost", "updated_at")
+        SELECT ${randomUUID()}, cash."id", ${symbol}, ${assetType}::"asset_type", ${quantity}::decimal, ${price}::decimal, NOW()
+        FROM cash
+        ${MERGE_BOUGHT_HOLDING}
+        RETURNING "quantity"
+      ), trade AS (
+        INSERT INTO "trades" ("id", "portfolio_id", "symbol", "asset_type", "trade_type", "quantity", "price", "total_value", "executed_at")
+        SELECT ${tradeId}, cash."id", ${symbol}, ${assetType}::"asset_type", 'BUY'::"trade_type",
+          ${quantity}::decimal, ${price}::decimal, ${totalValue}::decimal(15, 2), NOW()
+        FROM cash
+        RETURNING "id", "total_value", "executed_at"
+      )
+      SELECT trade."id" AS trade_id, trade."total_value", trade."executed_at", cash."cash_balance", cash."portfolio_value",
+        holding."quantity" AS holding_quantity, cash."trade_seq"
+      FROM cash, holding, trade
+    `;
+  }
+
+  /**
+   * Apply a SELL in One Statement
+   *
+   * Reduces the holding only if it covers the sale (deleting it when sold
+   * out), then credits cash and records the trade from the changed row.
+   * Returns no row if the portfolio doesn't belong to the user or the holding is short.
+   *
+   * The portfolio row is locked before the holding is touched, in the same
+   * order as every other trade path (see LOCK ORDER in the file header).
+   *
+   * @param {AppliedTrade} trade - Trade to apply
+   * @param {Prisma.TransactionClient} [db] - Transaction to run in
+   * @returns {Promise<AppliedTradeRow[]>} One row if applied, none if rejected
+   * @private
+   */
+  private async applySell(trade: AppliedTrade, db: Prisma.TransactionClient = prisma): Promise<AppliedTradeRow[]> {
+    const { portfolioId, userId, symbol, assetType, quantity, price, totalValue } = trade;
+    const tradeId = trade.tradeId ?? randomUUID();
+
+    return db.$queryRaw<AppliedTradeRow[]>`
+      WITH owner AS (
+        SELECT "id" FROM "portfolios" WHERE "id" = ${portfolioId} AND "user_id" = ${userId}
+        FOR UPDATE
+      ), sold_out AS (
+        DELETE FROM "holdings"
+        WHERE "portfolio_id" = (SELECT "id" FROM owner)
+          AND "symbol" = ${symbol}
+          AND "quantity" = ${quantity}::decimal
+        RETURNING 0::decimal AS "quantity"
+      ), reduced AS (
+        UPDATE "holdings"
+        SET "quantity" = "quantity" - ${quantity}::decimal, "updated_at" = NOW()
+        WHERE "portfolio_id" = (SELECT "id" FROM owner)
+          AND "symbol" = ${symbol}
+          AND "quantity" > ${quantity}::decimal
+        RETURNING "quantity"
+      ), holding AS (
+        SELECT "quantity" FROM sold_out
+        UNION ALL
+        SELECT "quantity" FROM reduced
+      ), cash AS (
+        UPDATE "portfolios"
+        SET "cash_balance" = "cash_balance" + ${totalValue}::decimal(15, 2),
+          "total_value" = COALESCE("total_value", "cash_balance")
+            + ${totalValue}::decimal(15, 2) - ${price}::decimal * ${quantity}::decimal,
+          "trade_seq" = "trade_seq" + 1
+        WHERE "id" = ${portfolioId} AND EXISTS (SELECT 1 FROM holding)
+        RETURNING "id", "cash_balance", "total_value" AS "portfolio_value", "trade_seq"
+      ), trade AS (
+        INSERT INTO "trades" ("id", "portfolio_id", "symbol", "asset_type", "trade_type", "quantity", "price", "total_value", "executed_at")
+        SELECT ${tradeId}, cash."id", ${symbol}, ${assetType}::"asset_type", 'SELL'::"trade_type",
+          ${quantity}::decimal, ${price}::decimal, ${totalValue}::decimal(15, 2), NOW()
+        FROM cash
+        RETURNING "id", "total_value", "executed_at"
+      )
+      SELECT trade."id" AS trade_id, trade."total_value", trade."executed_at", cash."cash_balance", cash."portfolio_value",
+        holding."quantity" AS holding_quantity, cash."trade_seq"
+      FROM cash, holding, trade
+    `;
+  }
+
+  /**
+   * Report Why a Trade Was Rejected
+   *
+   * Only runs when the trade statement changed nothing. Reads the current
+   * portfolio and reuses validateTrade for the error message.
+   *
+   * @throws {AppError} 404 if the portfolio isn't the user's, 400 for funds/holdings,
+   *   409 if the conflicting state was resolved in the meantime
+   * @private
+   */
+  private async explainRejectedTrade(trade: AppliedTrade, tradeType: 'BUY' | 'SELL'): Promise<never> {
+    const portfolio = await prisma.portfolio.findFirst({
+      where: { id: trade.portfolioId, userId: trade.userId },
+      select: {
+        cashBalance: true,
+        holdings: { where: { symbol: trade.symbol }, select: { symbol: true, quantity: true } },
+      },
+    });
+
+    if (!portfolio) {
+      throw new AppError('Portfolio not found', 404);
+    }
+
+    await this.validateTrade(portfolio, tradeType, trade.symbol, trade.quantity, trade.totalValue);
+    throw new AppError('Portfolio changed during the trade, please retry', 409);
+  }
+
+  /**
+   * Update Achievement Counters, then Queue an Achievement Check (async, don't wait)
+   *
+   * The check runs in a worker; a user's trades within a few seconds share one check.
+   *
+   * @private
+   */
+  private recordAchievementProgress(userId: string, events: TradeEvent[]): void {
+    achievementService
+      .recordTrades(userId, events)
+      .catch((error) => logger.warn(`Failed to record trades in achievement counters for user ${userId}:`, error))
+      .then(() => enqueueAchievementCheck(userId))
+      .catch((error) => logger.error(`Failed to queue achievement check for user ${userId}:`, error));
+  }
+
+  private toTradeEvent(trade: AppliedTrade, tradeType: 'BUY' | 'SELL', row: AppliedTradeRow): TradeEvent {
+    return {
+      portfolioId: trade.portfolioId,
+      symbol: trade.symbol,
+      executedAt: row.executed_at,
+      position: positionChange(tradeType, trade.quantity, Number(row.holding_quantity)),
+      seq: Number(row.trade_seq),
+    };
+  }
+
+  /**
+   * Map an Applied Trade Row to the API Result
+   *
+   * @private
+   */
+  private toTradeResult(trade: AppliedTrade, tradeType: 'BUY' | 'SELL', row: AppliedTradeRow): TradeResult {
     return {
       trade: {
-        id: result.id,
-        symbol: result.symbol,
-        assetType: result.assetType,
-        tradeType: result.tradeType,
-        quantity: result.quantity.toNumber(),
-        price: result.price.toNumber(),
-        totalValue: result.totalValue.toNumber(),
-        executedAt: result.executedAt,
+        id: row.trade_id,
+        symbol: trade.symbol,
+        assetType: trade.assetType,
+        tradeType,
+        quantity: trade.quantity,
+        price: trade.price,
+        totalValue: Number(row.total_value),
+        executedAt: row.executed_at,
       },
       portfolio: {
-        cashBalance: updatedPortfolio!.cashBalance.toNumber(),
-        totalValue: newPortfolioValue,
+        cashBalance: Number(row.cash_balance),
+        totalValue: Number(row.portfolio_value),
       },
     };
   }
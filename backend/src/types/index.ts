@@ -45,6 +45,15 @@ export const createPortfolioSchema = z.object({
   }),
 });
 
+export const getPortfolioHistorySchema = z.object({
+  params: z.object({
+    id: z.string().uuid('Invalid portfolio ID'),
+  }),
+  query: z.object({
+    days: z.string().regex(/^\d+$/, 'days must be a positive integer').optional(),
+  }),
+});
+
 // Trade schemas
 export const executeTradeSchema = z.object({
   body: z.object({
@@ -56,6 +65,23 @@ export const executeTradeSchema = z.object({
   }),
 });
 
+export const executeBasketSchema = z.object({
+  body: z.object({
+    portfolioId: z.string().uuid('Invalid portfolio ID'),
+    legs: z
+      .array(
+        z.object({
+          symbol: z.string().min(1, 'Symbol is required').max(20),
+          assetType: z.enum(['STOCK', 'CRYPTO']),
+          tradeType: z.enum(['BUY', 'SELL']),
+          quantity: z.number().positive('Quantity must be positive'),
+        })
+      )
+      .min(1, 'At least one leg is required')
+      .max(50, 'At most 50 legs per basket'),
+  }),
+});
+
 export const validateTradeSchema = z.object({
   body: z.object({
     portfolioId: z.string().uuid(),
@@ -66,6 +92,44 @@ export const validateTradeSchema = z.object({
   }),
 });
 
+// Order schemas
+export const placeOrderSchema = z.object({
+  body: z
+    .object({
+      portfolioId: z.string().uuid('Invalid portfolio ID'),
+      symbol: z.string().min(1, 'Symbol is required').max(20),
+      assetType: z.enum(['STOCK', 'CRYPTO']),
+      tradeType: z.enum(['BUY', 'SELL']),
+      orderType: z.enum(['LIMIT', 'STOP', 'STOP_LIMIT']),
+      quantity: z.number().positive('Quantity must be positive'),
+      limitPrice: z.number().positive('Limit price must be positive').optional(),
+      stopPrice: z.number().positive('Stop price must be positive').optional(),
+    })
+    .refine((order) => order.orderType === 'STOP' || order.limitPrice !== undefined, {
+      message: 'limitPrice is required for LIMIT and STOP_LIMIT orders',
+      path: ['limitPrice'],
+    })
+    .refine((order) => order.orderType === 'LIMIT' || order.stopPrice !== undefined, {
+      message: 'stopPrice is required for STOP and STOP_LIMIT orders',
+      path: ['stopPrice'],
+    }),
+});
+
+export const getOrdersSchema = z.object({
+  query: z.object({
+    portfolioId: z.string().uuid().optional(),
+    status: z.enum(['OPEN', 'FILLED', 'CANCELLED', 'REJECTED']).optional(),
+    limit: z.string().regex(/^\d+$/, 'limit must be a positive integer').optional(),
+    offset: z.string().regex(/^\d+$/, 'offset must be a non-negative integer').optional(),
+  }),
+});
+
+export const cancelOrderSchema = z.object({
+  params: z.object({
+    id: z.string().uuid(),
+  }),
+});
+
 // Market data schemas
 export const getQuoteSchema = z.object({
   params: z.object({
@@ -77,6 +141,28 @@ export const searchMarketSchema = z.object({
   query: z.object({
     q: z.string().min(1, 'Search query is required'),
     type: z.enum(['stock', 'crypto', 'all']).optional().default('all'),
+    typeahead: z.enum(['true', 'false']).optional(),
+  }),
+});
+
+export const streamQuotesSchema = z.object({
+  query: z.object({
+    symbols: z
+      .string()
+      .min(1, 'At least one symbol is required')
+      .regex(/^[A-Za-z0-9.\-]{1,20}(,[A-Za-z0-9.\-]{1,20})*$/, 'symbols must be a comma-separated list'),
+  }),
+});
+
+export const getPriceHistorySchema = z.object({
+  params: z.object({
+    symbol: z.string().min(1).max(20),
+  }),
+  query: z.object({
+    interval: z.enum(['1m', '5m', '1d']).optional().default('1d'),
+    from: z.string().datetime().optional(),
+    to: z.string().datetime().optional(),
+    points: z.string().regex(/^\d+$/, 'points must be a positive integer').optional(),
   }),
 });
 
@@ -142,6 +228,21 @@ export interface TradeResult {
   };
 }
 
+export interface BasketLeg {
+  symbol: string;
+  assetType: 'STOCK' | 'CRYPTO';
+  tradeType: 'BUY' | 'SELL';
+  quantity: number;
+}
+
+export interface BasketResult {
+  trades: TradeResult['trade'][];
+  portfolio: {
+    cashBalance: number;
+    totalValue: number;
+  };
+}
+
 export interface MarketQuote {
   symbol: string;
   assetType: string;
@@ -0,0 +1,101 @@
+import { randomUUID } from 'crypto';
+import { Job, JobQueue } from '../jobQueue';
+import { disconnectRedis, getRedisClient } from '../../config/redis';
+
+jest.mock('../../config/logger', () => ({
+  __esModule: true,
+  default: { info: jest.fn(), warn: jest.fn(), error: jest.fn(), debug: jest.fn() },
+}));
+
+// Runs the queue's Lua scripts against a real Redis; skipped unless REDIS_TEST_URL is set
+const REDIS_TEST_URL = process.env.REDIS_TEST_URL;
+const describeWithRedis = REDIS_TEST_URL ? describe : describe.skip;
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// What a worker sees right after claiming (it then crashes or runs the batch)
+const claim = <T>(queue: JobQueue<T>, limit: number): Promise<Job<T>[]> =>
+  (queue as any).claim(limit);
+
+describeWithRedis('JobQueue (Redis)', () => {
+  let name: string;
+
+  beforeAll(() => {
+    process.env.REDIS_URL = REDIS_TEST_URL;
+  });
+
+  beforeEach(() => {
+    name = `test-${randomUUID()}`;
+  });
+
+  afterEach(async () => {
+    const suffixes = ['ready', 'active', 'data', 'attempts', 'dead'];
+    await getRedisClient().del(...suffixes.map((suffix) => `jobs:${name}:${suffix}`));
+  });
+
+  afterAll(async () => {
+    await disconnectRedis();
+  });
+
+  it('collapses enqueues of a waiting job into one', async () => {
+    const queue = new JobQueue<{ userId: string }>(name);
+
+    await expect(queue.enqueue('u1', { userId: 'u1' })).resolves.toBe(true);
+    await expect(queue.enqueue('u1', { userId: 'u1' })).resolves.toBe(false);
+
+    expect(await claim(queue, 10)).toEqual([{ id: 'u1', data: { userId: 'u1' }, attempt: 1 }]);
+  });
+
+  it('reclaims a job whose lease expired', async () => {
+    const queue = new JobQueue<{ userId: string }>(name, { leaseMs: 100 });
+    await queue.enqueue('u1', { userId: 'u1' });
+
+    expect(await claim(queue, 1)).toHaveLength(1);
+    expect(await claim(queue, 1)).toEqual([]); // leased to the first worker
+
+    await sleep(150);
+    expect(await claim(queue, 1)).toEqual([{ id: 'u1', data: { userId: 'u1' }, attempt: 2 }]);
+  });
+
+  it('does not run a job re-enqueued while it is running until the lease ends', async () => {
+    const queue = new JobQueue<{ userId: string }>(name, { leaseMs: 100 });
+    await queue.enqueue('u1', { userId: 'u1' });
+    await claim(queue, 1);
+
+    await expect(queue.enqueue('u1', { userId: 'u1' })).resolves.toBe(true);
+    expect(await claim(queue, 1)).toEqual([]);
+  });
+
+  it('dead-letters a job whose lease expired on its last attempt', async () => {
+    const queue = new JobQueue<{ userId: string }>(name, { leaseMs: 50, maxAttempts: 1 });
+    await queue.enqueue('u1', { userId: 'u1' });
+    await claim(queue, 1);
+
+    await sleep(100);
+    expect(await claim(queue, 1)).toEqual([]);
+
+    const stats = await queue.getStats();
+    expect(stats).toMatchObject({ ready: 0, active: 0, dead: 1 });
+    const [dead] = await getRedisClient().lrange(`jobs:${name}:dead`, 0, 0);
+    expect(JSON.parse(dead)).toMatchObject({ id: 'u1', attempts: 1, error: 'Lease expired' });
+  });
+
+  it('retries a failed job with backoff, then dead-letters it', async () => {
+    const queue = new JobQueue<{ userId: string }>(name, { maxAttempts: 2, retryDelayMs: 50 });
+    const attempts: number[] = [];
+    await queue.enqueue('u1', { userId: 'u1' });
+
+    queue.process(
+      async ([job]) => {
+        attempts.push(job.attempt);
+        throw new Error('boom');
+      },
+      { concurrency: 1, batchSize: 1, pollIntervalMs: 10 }
+    );
+    await sleep(300);
+    await queue.stop();
+
+    expect(attempts).toEqual([1, 2]);
+    expect(await queue.getStats()).toMatchObject({ ready: 0, active: 0, dead: 1, retried: 1, deadLettered: 1 });
+  });
+});
@@ -0,0 +1,208 @@
+import { createHash } from 'crypto';
+import { JobQueue } from '../jobQueue';
+
+jest.mock('../../config/logger', () => ({
+  __esModule: true,
+  default: { info: jest.fn(), warn: jest.fn(), error: jest.fn(), debug: jest.fn() },
+}));
+
+// Fake Redis client: scripts are recognized by their source on the first EVAL
+// (EVALSHA answers NOSCRIPT until then) and answered from the test's replies
+type ScriptName = 'enqueue' | 'claim' | 'extend' | 'complete' | 'fail';
+
+const redis = {
+  scripts: new Map<string, ScriptName>(),
+  calls: [] as { script: ScriptName; keys: string[]; args: (string | number)[] }[],
+  evals: 0,
+  enqueueReplies: [] as number[],
+  claimReplies: [] as (string | number)[][],
+  failReply: null as number | null,
+};
+
+const scriptName = (source: string): ScriptName => {
+  if (source.includes('ZRANGEBYSCORE')) return 'claim';
+  if (source.includes('base_delay')) return 'fail';
+  if (source.includes("'XX'")) return 'extend';
+  if (source.includes("'NX'")) return 'enqueue';
+  return 'complete';
+};
+
+const answer = (script: ScriptName, numKeys: number, rest: (string | number)[]): unknown => {
+  const keys = rest.slice(0, numKeys).map(String);
+  const args = rest.slice(numKeys);
+  redis.calls.push({ script, keys, args });
+
+  switch (script) {
+    case 'enqueue':
+      return redis.enqueueReplies.shift() ?? 1;
+    case 'claim':
+      return redis.claimReplies.shift() ?? [];
+    case 'fail':
+      return redis.failReply ?? args.length - 5;
+    default:
+      return args.length;
+  }
+};
+
+const mockClient = {
+  evalsha: jest.fn(async (sha: string, numKeys: number, ...rest: (string | number)[]) => {
+    const script = redis.scripts.get(sha);
+    if (!script) throw new Error('NOSCRIPT No matching script');
+    return answer(script, numKeys, rest);
+  }),
+  eval: jest.fn(async (source: string, numKeys: number, ...rest: (string | number)[]) => {
+    redis.evals++;
+    const script = scriptName(source);
+    redis.scripts.set(createHash('sha1').update(source).digest('hex'), script);
+    return answer(script, numKeys, rest);
+  }),
+  pipeline: jest.fn(() => {
+    const pipeline = {
+      zcard: () => pipeline,
+      zcount: () => pipeline,
+      llen: () => pipeline,
+      exec: async () => [[null, 3], [null, 2], [null, 1], [null, 0]],
+    };
+    return pipeline;
+  }),
+};
+
+jest.mock('../../config/redis', () => ({
+  getRedisClient: () => mockClient,
+}));
+
+const callsTo = (script: ScriptName) => redis.calls.filter((call) => call.script === script);
+
+const until = async (condition: () => boolean, timeoutMs: number = 1000): Promise<void> => {
+  const start = Date.now();
+  while (!condition()) {
+    if (Date.now() - start > timeoutMs) throw new Error('Timed out waiting for condition');
+    await new Promise((resolve) => setTimeout(resolve, 5));
+  }
+};
+
+const deferred = () => {
+  let resolve!: () => void;
+  const promise = new Promise<void>((res) => {
+    resolve = res;
+  });
+  return { promise, resolve };
+};
+
+const claimed = (...jobs: [string, object, number][]) =>
+  jobs.flatMap(([id, data, attempt]) => [id, JSON.stringify(data), attempt]);
+
+describe('JobQueue', () => {
+  let queue: JobQueue<{ userId: string }>;
+
+  beforeEach(() => {
+    redis.scripts.clear();
+    redis.calls = [];
+    redis.evals = 0;
+    redis.enqueueReplies = [];
+    redis.claimReplies = [];
+    redis.failReply = null;
+    queue = new JobQueue('test', { maxAttempts: 3, retryDelayMs: 100, leaseMs: 30 });
+  });
+
+  afterEach(async () => {
+    await queue.stop();
+  });
+
+  it('reports deduplicated enqueues and loads each script once', async () => {
+    redis.enqueueReplies = [1, 0];
+
+    await expect(queue.enqueue('u1', { userId: 'u1' }, { delayMs: 2000 })).resolves.toBe(true);
+    await expect(queue.enqueue('u1', { userId: 'u1' })).resolves.toBe(false);
+
+    expect(redis.evals).toBe(1);
+    expect(callsTo('enqueue')[0]).toEqual({
+      script: 'enqueue',
+      keys: ['jobs:test:ready', 'jobs:test:data'],
+      args: ['u1', JSON.stringify({ userId: 'u1' }), 2000],
+    });
+    expect(await queue.getStats()).toMatchObject({
+      ready: 3,
+      due: 2,
+      active: 1,
+      dead: 0,
+      enqueued: 1,
+      deduplicated: 1,
+    });
+  });
+
+  it('hands claimed jobs to the handler in batches and completes them', async () => {
+    redis.claimReplies = [
+      claimed(['u1', { userId: 'u1' }, 1], ['u2', { userId: 'u2' }, 2], ['u3', { userId: 'u3' }, 1]),
+    ];
+    const handler = jest.fn(async () => undefined);
+
+    queue.process(handler, { concurrency: 2, batchSize: 2, pollIntervalMs: 10 });
+    await until(() => callsTo('complete').length === 2);
+
+    expect(callsTo('claim')[0].args).toEqual([4, 30, 3, 1000]);
+    expect(handler).toHaveBeenCalledWith([
+      { id: 'u1', data: { userId: 'u1' }, attempt: 1 },
+      { id: 'u2', data: { userId: 'u2' }, attempt: 2 },
+    ]);
+    expect(handler).toHaveBeenCalledWith([{ id: 'u3', data: { userId: 'u3' }, attempt: 1 }]);
+    expect(callsTo('complete').map((call) => call.args)).toEqual([['u1', 'u2'], ['u3']]);
+    expect((await queue.getStats()).completed).toBe(3);
+  });
+
+  it('retries a failed batch, dead-lettering jobs on their last attempt', async () => {
+    redis.claimReplies = [claimed(['u1', { userId: 'u1' }, 1], ['u2', { userId: 'u2' }, 3])];
+    redis.failReply = 1; // u1 is retried, u2 is out of attempts
+
+    queue.process(
+      async () => {
+        throw new Error('boom');
+      },
+      { concurrency: 1, batchSize: 2, pollIntervalMs: 10 }
+    );
+    await until(() => callsTo('fail').length === 1);
+
+    expect(callsTo('fail')[0]).toEqual({
+      script: 'fail',
+      keys: ['jobs:test:ready', 'jobs:test:active', 'jobs:test:data', 'jobs:test:attempts', 'jobs:test:dead'],
+      args: [3, 100, 300000, 1000, 'boom', 'u1', 'u2'],
+    });
+    expect(callsTo('complete')).toHaveLength(0);
+    expect(await queue.getStats()).toMatchObject({ completed: 0, retried: 1, deadLettered: 1 });
+  });
+
+  it('renews the lease while a batch runs and stops renewing once it settles', async () => {
+    redis.claimReplies = [claimed(['u1', { userId: 'u1' }, 1])];
+    const running = deferred();
+
+    queue.process(() => running.promise, { concurrency: 1, batchSize: 1, pollIntervalMs: 10 });
+    await until(() => callsTo('extend').length >= 2);
+
+    expect(callsTo('extend')[0]).toMatchObject({ keys: ['jobs:test:active'], args: [30, 'u1'] });
+
+    running.resolve();
+    await until(() => callsTo('complete').length === 1);
+    const renewals = callsTo('extend').length;
+    await new Promise((resolve) => setTimeout(resolve, 50));
+    expect(callsTo('extend')).toHaveLength(renewals);
+  });
+
+  it('waits for running batches when stopped', async () => {
+    redis.claimReplies = [claimed(['u1', { userId: 'u1' }, 1])];
+    const running = deferred();
+    let stopped = false;
+
+    queue.process(() => running.promise, { concurrency: 1, batchSize: 1, pollIntervalMs: 10 });
+    await until(() => callsTo('claim').length >= 1);
+
+    const stopping = queue.stop().then(() => {
+      stopped = true;
+    });
+    await new Promise((resolve) => setTimeout(resolve, 20));
+    expect(stopped).toBe(false);
+
+    running.resolve();
+    await stopping;
+    expect(callsTo('complete')).toHaveLength(1);
+  });
+});
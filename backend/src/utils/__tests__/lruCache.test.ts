@@ -0,0 +1,74 @@
+import { LRUCache } from '../lruCache';
+
+const sizeOf = () => 10;
+
+describe('LRUCache', () => {
+  afterEach(() => {
+    jest.useRealTimers();
+  });
+
+  it('evicts the least recently used entry when over maxEntries', () => {
+    const cache = new LRUCache<number>({ maxEntries: 2, maxBytes: 1000, ttlMs: 60000, sizeOf });
+    cache.set('a', 1);
+    cache.set('b', 2);
+    cache.get('a'); // a is now most recently used
+    cache.set('c', 3);
+
+    expect(cache.get('b')).toBeUndefined();
+    expect(cache.get('a')).toBe(1);
+    expect(cache.get('c')).toBe(3);
+    expect(cache.getStats().evictions).toBe(1);
+  });
+
+  it('does not bump recency on peek', () => {
+    const cache = new LRUCache<number>({ maxEntries: 2, maxBytes: 1000, ttlMs: 60000, sizeOf });
+    cache.set('a', 1);
+    cache.set('b', 2);
+    expect(cache.peek('a')).toBe(1);
+    cache.set('c', 3);
+
+    expect(cache.peek('a')).toBeUndefined();
+    expect(cache.peek('b')).toBe(2);
+  });
+
+  it('evicts until the byte budget is met and skips values larger than the budget', () => {
+    const cache = new LRUCache<string>({
+      maxEntries: 10,
+      maxBytes: 25,
+      ttlMs: 60000,
+      sizeOf: (value) => value.length,
+    });
+    cache.set('a', 'x'.repeat(10));
+    cache.set('b', 'x'.repeat(10));
+    cache.set('c', 'x'.repeat(10));
+
+    expect(cache.get('a')).toBeUndefined();
+    expect(cache.getStats().bytes).toBe(20);
+
+    cache.set('huge', 'x'.repeat(26));
+    expect(cache.get('huge')).toBeUndefined();
+    expect(cache.getStats().entries).toBe(2);
+  });
+
+  it('expires entries after their TTL', () => {
+    jest.useFakeTimers();
+    const cache = new LRUCache<number>({ maxEntries: 10, maxBytes: 1000, ttlMs: 1000, sizeOf });
+    cache.set('a', 1);
+    cache.set('b', 2, 5000);
+
+    jest.advanceTimersByTime(1000);
+
+    expect(cache.get('a')).toBeUndefined();
+    expect(cache.get('b')).toBe(2);
+    expect(cache.getStats()).toMatchObject({ entries: 1, bytes: 10, expirations: 1 });
+  });
+
+  it('replaces an existing key without double counting its size', () => {
+    const cache = new LRUCache<number>({ maxEntries: 10, maxBytes: 1000, ttlMs: 60000, sizeOf });
+    cache.set('a', 1);
+    cache.set('a', 2);
+
+    expect(cache.get('a')).toBe(2);
+    expect(cache.getStats()).toMatchObject({ entries: 1, bytes: 10 });
+  });
+});
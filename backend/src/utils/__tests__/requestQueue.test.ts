@@ -0,0 +1,136 @@
+import { RequestDeadlineError, RequestPriority, RequestQueue } from '../requestQueue';
+
+jest.mock('../../config/logger', () => ({
+  __esModule: true,
+  default: { info: jest.fn(), warn: jest.fn(), error: jest.fn(), debug: jest.fn() },
+}));
+
+// Runs every pending promise callback (setImmediate isn't faked)
+const flush = () => new Promise<void>((resolve) => setImmediate(resolve));
+
+const deferred = () => {
+  let resolve!: () => void;
+  const promise = new Promise<void>((res) => {
+    resolve = res;
+  });
+  return { promise, resolve };
+};
+
+describe('RequestQueue', () => {
+  beforeEach(() => {
+    jest.useFakeTimers({ doNotFake: ['setImmediate'] });
+  });
+
+  afterEach(() => {
+    jest.useRealTimers();
+  });
+
+  it('dispatches waiting requests TRADE first, then READ, then BACKGROUND', async () => {
+    const queue = new RequestQueue({ requestsPerMinute: 60, burst: 1, maxConcurrency: 1 });
+    const order: string[] = [];
+    const run = (name: string) => async () => {
+      order.push(name);
+    };
+
+    const requests = [
+      queue.add(run('first')), // takes the only token
+      queue.add(run('background'), { priority: RequestPriority.BACKGROUND }),
+      queue.add(run('read'), { priority: RequestPriority.READ }),
+      queue.add(run('trade'), { priority: RequestPriority.TRADE }),
+    ];
+
+    await flush();
+    for (let i = 0; i < 3; i++) {
+      jest.advanceTimersByTime(1000); // one token per second
+      await flush();
+    }
+    await Promise.all(requests);
+
+    expect(order).toEqual(['first', 'trade', 'read', 'background']);
+  });
+
+  it('never runs more than maxConcurrency requests at once', async () => {
+    const queue = new RequestQueue({ requestsPerMinute: 6000, burst: 10, maxConcurrency: 2 });
+    const calls = [deferred(), deferred(), deferred()];
+    const started: number[] = [];
+
+    const requests = calls.map((call, i) =>
+      queue.add(async () => {
+        started.push(i);
+        await call.promise;
+      })
+    );
+
+    await flush();
+    expect(started).toEqual([0, 1]);
+    expect(queue.getStats().inFlight).toBe(2);
+
+    calls[0].resolve();
+    await flush();
+    expect(started).toEqual([0, 1, 2]);
+
+    calls[1].resolve();
+    calls[2].resolve();
+    await Promise.all(requests);
+    expect(queue.getStats().inFlight).toBe(0);
+  });
+
+  it('rejects immediately when the request cannot start before its deadline', async () => {
+    const queue = new RequestQueue({ requestsPerMinute: 60, burst: 1, maxConcurrency: 1 });
+    await queue.add(async () => undefined); // empties the bucket
+
+    const fn = jest.fn(async () => undefined);
+    await expect(queue.add(fn, { deadline: Date.now() + 100 })).rejects.toBeInstanceOf(RequestDeadlineError);
+
+    expect(fn).not.toHaveBeenCalled();
+    expect(queue.getStats().deadlineRejections).toBe(1);
+  });
+
+  it('removes a queued request when its deadline passes', async () => {
+    const queue = new RequestQueue({ requestsPerMinute: 60, burst: 1, maxConcurrency: 1 });
+    const blocker = deferred();
+    const blocking = queue.add(() => blocker.promise);
+
+    const fn = jest.fn(async () => undefined);
+    const late = queue.add(fn, { priority: RequestPriority.TRADE, deadline: Date.now() + 1500 });
+    const rejected = expect(late).rejects.toBeInstanceOf(RequestDeadlineError);
+
+    jest.advanceTimersByTime(1500);
+    await rejected;
+    expect(queue.getStats().pending.TRADE).toBe(0);
+
+    blocker.resolve();
+    await blocking;
+    jest.advanceTimersByTime(2000);
+    await flush();
+    expect(fn).not.toHaveBeenCalled();
+  });
+
+  it('keeps one token in reserve from BACKGROUND requests', async () => {
+    const queue = new RequestQueue({ requestsPerMinute: 60, burst: 2, maxConcurrency: 5 });
+    const started: string[] = [];
+    const run = (name: string) => async () => {
+      started.push(name);
+    };
+
+    const background = [
+      queue.add(run('bg1'), { priority: RequestPriority.BACKGROUND }),
+      queue.add(run('bg2'), { priority: RequestPriority.BACKGROUND }),
+    ];
+    await flush();
+    expect(started).toEqual(['bg1']);
+
+    // The reserved token is free for an interactive request
+    await queue.add(run('read'));
+    expect(started).toEqual(['bg1', 'read']);
+
+    // bg2 waits until the bucket holds its token plus the reserve
+    jest.advanceTimersByTime(1000);
+    await flush();
+    expect(started).toEqual(['bg1', 'read']);
+    jest.advanceTimersByTime(1000);
+    await flush();
+    await Promise.all(background);
+    expect(started).toEqual(['bg1', 'read', 'bg2']);
+  });
+});
@@ -0,0 +1,67 @@
+import { SingleFlight } from '../singleFlight';
+
+const deferred = <T>() => {
+  let resolve!: (value: T) => void;
+  let reject!: (error: unknown) => void;
+  const promise = new Promise<T>((res, rej) => {
+    resolve = res;
+    reject = rej;
+  });
+  return { promise, resolve, reject };
+};
+
+describe('SingleFlight', () => {
+  it('coalesces concurrent calls for the same key into one execution', async () => {
+    const flight = new SingleFlight<number>();
+    const load = deferred<number>();
+    const fn = jest.fn(() => load.promise);
+
+    const calls = [flight.do('AAPL', fn), flight.do('AAPL', fn), flight.do('AAPL', fn)];
+    load.resolve(42);
+
+    await expect(Promise.all(calls)).resolves.toEqual([42, 42, 42]);
+    expect(fn).toHaveBeenCalledTimes(1);
+    expect(flight.getStats()).toEqual({ inFlight: 0, executions: 1, deduplicated: 2 });
+  });
+
+  it('shares a rejection with every caller and releases the key', async () => {
+    const flight = new SingleFlight<number>();
+    const load = deferred<number>();
+
+    const first = flight.do('AAPL', () => load.promise);
+    const second = flight.do('AAPL', () => Promise.resolve(1));
+    load.reject(new Error('provider down'));
+
+    await expect(first).rejects.toThrow('provider down');
+    await expect(second).rejects.toThrow('provider down');
+
+    // The next call starts a new flight
+    await expect(flight.do('AAPL', () => Promise.resolve(7))).resolves.toBe(7);
+  });
+
+  it('joins keys already in flight and loads the rest in one batch', async () => {
+    const flight = new SingleFlight<number>();
+    const single = deferred<number>();
+    flight.do('AAPL', () => single.promise);
+
+    const batch = jest.fn(async (keys: string[]) => new Map(keys.map((key) => [key, key.length])));
+    const result = flight.doMany(['AAPL', 'MSFT', 'GOOGL'], batch);
+    single.resolve(1);
+
+    await expect(result).resolves.toEqual(new Map([['AAPL', 1], ['MSFT', 4], ['GOOGL', 5]]));
+    expect(batch).toHaveBeenCalledWith(['MSFT', 'GOOGL']);
+  });
+
+  it('rejects joiners of keys a batch left out, and omits them from its result', async () => {
+    const flight = new SingleFlight<number>();
+    const load = deferred<Map<string, number>>();
+
+    const batch = flight.doMany(['AAPL', 'MSFT'], () => load.promise, (key) => new Error(`missing ${key}`));
+    const joiner = flight.do('MSFT', () => Promise.resolve(0));
+    load.resolve(new Map([['AAPL', 1]]));
+
+    await expect(batch).resolves.toEqual(new Map([['AAPL', 1]]));
+    await expect(joiner).rejects.toThrow('missing MSFT');
+    expect(flight.getStats().inFlight).toBe(0);
+  });
+});
@@ -0,0 +1,85 @@
+import { TriggerDirection, TriggerIndex } from '../triggerIndex';
+
+const entry = (id: string, trigger: number, direction: TriggerDirection, symbol: string = 'AAPL') => ({
+  id,
+  symbol,
+  trigger,
+  direction,
+  payload: id,
+});
+
+const ids = (entries: { id: string }[]) => entries.map((e) => e.id);
+
+describe('TriggerIndex', () => {
+  it('returns only crossed triggers, nearest to their trigger price first', () => {
+    const index = new TriggerIndex<string>();
+    index.add(entry('buy-150', 150, 'AT_OR_BELOW'));
+    index.add(entry('buy-140', 140, 'AT_OR_BELOW'));
+    index.add(entry('buy-155', 155, 'AT_OR_BELOW'));
+    index.add(entry('stop-160', 160, 'AT_OR_ABOVE'));
+    index.add(entry('buy-149', 149, 'AT_OR_BELOW', 'MSFT'));
+
+    expect(ids(index.takeCrossed('AAPL', 150))).toEqual(['buy-155', 'buy-150']);
+    expect(index.size).toBe(3);
+
+    // Crossed triggers are gone; the rest stay until the price reaches them
+    expect(index.takeCrossed('AAPL', 150)).toEqual([]);
+    expect(ids(index.takeCrossed('AAPL', 165))).toEqual(['stop-160']);
+    expect(index.symbols().sort()).toEqual(['AAPL', 'MSFT']);
+  });
+
+  it('returns AT_OR_BELOW triggers before AT_OR_ABOVE triggers at the same price', () => {
+    const index = new TriggerIndex<string>();
+    index.add(entry('stop-100', 100, 'AT_OR_ABOVE'));
+    index.add(entry('stop-95', 95, 'AT_OR_ABOVE'));
+    index.add(entry('buy-100', 100, 'AT_OR_BELOW'));
+
+    expect(ids(index.takeCrossed('AAPL', 100))).toEqual(['buy-100', 'stop-95', 'stop-100']);
+    expect(index.size).toBe(0);
+    expect(index.symbols()).toEqual([]);
+  });
+
+  it('skips removed triggers', () => {
+    const index = new TriggerIndex<string>();
+    index.add(entry('buy-150', 150, 'AT_OR_BELOW'));
+    index.add(entry('buy-145', 145, 'AT_OR_BELOW'));
+
+    expect(index.remove('buy-150')).toBe(true);
+    expect(index.remove('buy-150')).toBe(false);
+    expect(index.get('buy-150')).toBeUndefined();
+
+    expect(ids(index.takeCrossed('AAPL', 140))).toEqual(['buy-145']);
+    expect(index.symbols()).toEqual([]);
+  });
+
+  it('replaces a trigger added again with the same id', () => {
+    const index = new TriggerIndex<string>();
+    index.add(entry('order-1', 150, 'AT_OR_BELOW'));
+    index.add(entry('order-1', 120, 'AT_OR_BELOW'));
+
+    expect(index.size).toBe(1);
+    expect(index.takeCrossed('AAPL', 140)).toEqual([]);
+    expect(index.takeCrossed('AAPL', 120)).toEqual([entry('order-1', 120, 'AT_OR_BELOW')]);
+
+    // Replacing can move a trigger to another symbol
+    index.add(entry('order-2', 150, 'AT_OR_BELOW'));
+    index.add(entry('order-2', 150, 'AT_OR_BELOW', 'MSFT'));
+    expect(index.takeCrossed('AAPL', 100)).toEqual([]);
+    expect(ids(index.takeCrossed('MSFT', 100))).toEqual(['order-2']);
+  });
+
+  it('compacts heaps that are mostly removed triggers', () => {
+    const index = new TriggerIndex<string>();
+    for (let i = 0; i < 100; i++) {
+      index.add(entry(`buy-${i}`, 100 + i, 'AT_OR_BELOW'));
+    }
+    for (let i = 0; i < 90; i++) {
+      index.remove(`buy-${i}`);
+    }
+
+    expect(index.size).toBe(10);
+    expect(ids(index.takeCrossed('AAPL', 0))).toEqual(
+      Array.from({ length: 10 }, (_, i) => `buy-${99 - i}`)
+    );
+  });
+});
@@ -0,0 +1,114 @@
+/**
+ * Binary Heap
+ *
+ * Array-backed priority queue. `compare(a, b) < 0` means `a` comes out first,
+ * so the same class serves as a min-heap or max-heap.
+ *
+ * push/pop are O(log n), peek is O(1) and building from an array is O(n).
+ *
+ * EXAMPLE:
+ * ```typescript
+ * const heap = new BinaryHeap<number>((a, b) => a - b); // min-heap
+ * heap.push(5);
+ * heap.push(2);
+ * heap.pop(); // 2
+ * ```
+ */
+
+export class BinaryHeap<T> {
+  private items: T[] = [];
+
+  /**
+   * @param {(a: T, b: T) => number} compare - Negative if `a` should come out before `b`
+   */
+  constructor(private readonly compare: (a: T, b: T) => number) {}
+
+  get size(): number {
+    return this.items.length;
+  }
+
+  /**
+   * Add an Item
+   *
+   * @param {T} item - Item to add
+   */
+  push(item: T): void {
+    this.items.push(item);
+    this.siftUp(this.items.length - 1);
+  }
+
+  /**
+   * Look at the First Item Without Removing It
+   *
+   * @returns {T | undefined} First item, or undefined if empty
+   */
+  peek(): T | undefined {
+    return this.items[0];
+  }
+
+  /**
+   * Remove and Return the First Item
+   *
+   * @returns {T | undefined} First item, or undefined if empty
+   */
+  pop(): T | undefined {
+    const items = this.items;
+    if (items.length === 0) return undefined;
+
+    const first = items[0];
+    const last = items.pop()!;
+    if (items.length > 0) {
+      items[0] = last;
+      this.siftDown(0);
+    }
+    return first;
+  }
+
+  /**
+   * Keep Only Matching Items
+   *
+   * Rebuilds the heap in O(n); used to drop lazily deleted entries.
+   *
+   * @param {(item: T) => boolean} keep - Items to keep
+   */
+  retain(keep: (item: T) => boolean): void {
+    this.items = this.items.filter(keep);
+    for (let i = (this.items.length >> 1) - 1; i >= 0; i--) {
+      this.siftDown(i);
+    }
+  }
+
+  private siftUp(index: number): void {
+    const items = this.items;
+    const item = items[index];
+
+    while (index > 0) {
+      const parent = (index - 1) >> 1;
+      if (this.compare(item, items[parent]) >= 0) break;
+      items[index] = items[parent];
+      index = parent;
+    }
+    items[index] = item;
+  }
+
+  private siftDown(index: number): void {
+    const items = this.items;
+    const length = items.length;
+    const item = items[index];
+
+    for (;;) {
+      const left = 2 * index + 1;
+      if (left >= length) break;
+
+      const right = left + 1;
+      const child = right < length && this.compare(items[right], items[left]) < 0 ? right : left;
+      if (this.compare(items[child], item) >= 0) break;
+
+      items[index] = items[child];
+      index = child;
+    }
+    items[index] = item;
+  }
+}
+
+export default BinaryHeap;
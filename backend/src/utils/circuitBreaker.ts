@@ -0,0 +1,148 @@
+/**
+ * Circuit Breaker
+ *
+ * Stops calling a dependency that keeps failing, so callers fail fast (or move
+ * on to an alternative) instead of paying its timeout on every request.
+ *
+ * STATES:
+ * - CLOSED: requests flow; consecutive failures are counted
+ * - OPEN: requests are rejected until the cooldown ends
+ * - HALF_OPEN: after the cooldown one probe request is let through;
+ *   success closes the circuit, failure re-opens it with a doubled cooldown
+ *
+ * The circuit can also be opened explicitly until a known time (trip()),
+ * e.g. when a provider reports its quota is exhausted.
+ *
+ * EXAMPLE:
+ * ```typescript
+ * const breaker = new CircuitBreaker({ failureThreshold: 3, cooldownMs: 30000, maxCooldownMs: 300000 });
+ * if (breaker.allowRequest()) {
+ *   try { await call(); breaker.recordSuccess(); } catch (e) { breaker.recordFailure(); }
+ * }
+ * ```
+ */
+
+export type CircuitState = 'CLOSED' | 'OPEN' | 'HALF_OPEN';
+
+export interface CircuitBreakerOptions {
+  failureThreshold: number; // Consecutive failures that open the circuit
+  cooldownMs: number;       // Initial time the circuit stays open
+  maxCooldownMs: number;    // Cap for the doubling cooldown after failed probes
+}
+
+export interface CircuitBreakerStats {
+  state: CircuitState;
+  consecutiveFailures: number;
+  openUntil: number | null; // Epoch ms when a probe will be allowed (null if closed)
+  trips: number;            // Times the circuit has opened
+}
+
+export class CircuitBreaker {
+  private state: CircuitState = 'CLOSED';
+  private consecutiveFailures = 0;
+  private openUntil = 0;
+  private currentCooldownMs: number;
+  private probeInFlight = false;
+  private trips = 0;
+
+  /**
+   * @param {CircuitBreakerOptions} options - Failure threshold and cooldowns
+   */
+  constructor(private readonly options: CircuitBreakerOptions) {
+    this.currentCooldownMs = options.cooldownMs;
+  }
+
+  /**
+   * Whether a request could be attempted now (doesn't reserve the probe)
+   */
+  isAvailable(): boolean {
+    if (this.state === 'CLOSED') return true;
+    if (this.state === 'OPEN') return Date.now() >= this.openUntil;
+    return !this.probeInFlight;
+  }
+
+  /**
+   * Reserve Permission for a Request
+   *
+   * In OPEN state past the cooldown, moves to HALF_OPEN and lets exactly one probe through.
+   *
+   * @returns {boolean} true if the request may proceed
+   */
+  allowRequest(): boolean {
+    if (this.state === 'CLOSED') return true;
+
+    if (this.state === 'OPEN') {
+      if (Date.now() < this.openUntil) return false;
+      this.state = 'HALF_OPEN';
+      this.probeInFlight = false;
+    }
+
+    if (this.probeInFlight) return false;
+    this.probeInFlight = true;
+    return true;
+  }
+
+  /**
+   * Record a Successful Request (closes a half-open circuit)
+   */
+  recordSuccess(): void {
+    this.consecutiveFailures = 0;
+    if (this.state !== 'CLOSED') {
+      this.state = 'CLOSED';
+      this.probeInFlight = false;
+      this.currentCooldownMs = this.options.cooldownMs;
+    }
+  }
+
+  /**
+   * Record a Failed Request
+   *
+   * Opens the circuit once failures reach the threshold; a failed probe
+   * re-opens it with a doubled cooldown.
+   */
+  recordFailure(): void {
+    this.consecutiveFailures++;
+
+    if (this.state === 'HALF_OPEN') {
+      this.currentCooldownMs = Math.min(this.currentCooldownMs * 2, this.options.maxCooldownMs);
+      this.open(Date.now() + this.currentCooldownMs);
+    } else if (this.state === 'CLOSED' && this.consecutiveFailures >= this.options.failureThreshold) {
+      this.open(Date.now() + this.currentCooldownMs);
+    }
+  }
+
+  /**
+   * Open the Circuit Until a Given Time
+   *
+   * @param {number} until - Epoch ms when a probe may be attempted again
+   */
+  trip(until: number): void {
+    this.open(Math.max(until, this.state === 'OPEN' ? this.openUntil : 0));
+  }
+
+  /**
+   * Get Circuit Statistics
+   *
+   * @returns {CircuitBreakerStats} Current state and counters
+   */
+  getStats(): CircuitBreakerStats {
+    return {
+      state: this.state,
+      consecutiveFailures: this.consecutiveFailures,
+      openUntil: this.state === 'CLOSED' ? null : this.openUntil,
+      trips: this.trips,
+    };
+  }
+
+  /**
+   * @private
+   */
+  private open(until: number): void {
+    if (this.state !== 'OPEN') this.trips++;
+    this.state = 'OPEN';
+    this.openUntil = until;
+    this.probeInFlight = false;
+  }
+}
+
+export default CircuitBreaker;
@@ -0,0 +1,42 @@
+/**
+ * Date Helpers
+ *
+ * Calendar-day helpers in the server's local time zone, the same days the
+ * scheduled jobs run on (e.g., daily portfolio value snapshots).
+ */
+
+/**
+ * Midnight at the Start of a Day
+ *
+ * @param {Date} date - Any time during the day
+ * @returns {Date} Local midnight of that day
+ */
+export const startOfDay = (date: Date): Date => {
+  const day = new Date(date);
+  day.setHours(0, 0, 0, 0);
+  return day;
+};
+
+/**
+ * Shift a Date by Whole Days
+ *
+ * @param {Date} date - Start date
+ * @param {number} days - Days to add (negative to go back)
+ * @returns {Date} New date (the input isn't modified)
+ */
+export const addDays = (date: Date, days: number): Date => {
+  const shifted = new Date(date);
+  shifted.setDate(shifted.getDate() + days);
+  return shifted;
+};
+
+/**
+ * Format a Date as a SQL DATE Literal
+ *
+ * @param {Date} date - Any time during the day
+ * @returns {string} Local calendar day as YYYY-MM-DD
+ */
+export const toDateString = (date: Date): string => {
+  const pad = (value: number) => String(value).padStart(2, '0');
+  return `${date.getFullYear()}-${pad(date.getMonth() + 1)}-${pad(date.getDate())}`;
+};
@@ -0,0 +1,199 @@
+/**
+ * Distributed Token Bucket
+ *
+ * A token bucket stored in Redis and updated by an atomic Lua script, so all
+ * server instances share one provider rate limit instead of each spending
+ * the full budget on its own.
+ *
+ * HOW IT WORKS:
+ * - The bucket is a Redis hash { tokens, ts } under a per-provider key
+ * - The script refills by elapsed time (Redis server clock, so instance
+ *   clock skew doesn't matter), then takes a token if enough are left
+ * - When no token is available it returns how long until one is, and take()
+ *   sleeps that long and retries, until the request's deadline
+ * - A `reserve` keeps tokens back for interactive requests (BACKGROUND lane)
+ *
+ * FAILURE MODE:
+ * If Redis is unreachable, take() allows the request (each instance still
+ * has its local RequestQueue limit), so a Redis outage can't stop quotes.
+ *
+ * EXAMPLE:
+ * ```typescript
+ * const bucket = new DistributedTokenBucket('ratelimit:finnhub', { requestsPerMinute: 60, burst: 5 });
+ * await bucket.take({ deadline: Date.now() + 3000 });
+ * ```
+ */
+
+import { createHash } from 'crypto';
+import { getRedisClient } from '../config/redis';
+import logger from '../config/logger';
+import { RequestDeadlineError } from './requestQueue';
+
+// KEYS[1] = bucket; ARGV = refill per ms, burst, reserve
+// Returns { allowed (0/1), remaining tokens (string), wait ms until a token }
+const TAKE_SCRIPT = `
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local reserve = tonumber(ARGV[3])
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local wait = 0
+if tokens >= 1 + reserve then
+  tokens = tokens - 1
+  allowed = 1
+else
+  wait = math.ceil((1 + reserve - tokens) / rate)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate) + 1000)
+return { allowed, tostring(tokens), wait }
+`;
+const TAKE_SCRIPT_SHA = createHash('sha1').update(TAKE_SCRIPT).digest('hex');
+
+const ERROR_LOG_INTERVAL_MS = 60000; // Log Redis failures at most once a minute
+
+export interface DistributedTokenBucketOptions {
+  requestsPerMinute: number; // Shared refill rate across all instances
+  burst: number;             // Shared bucket capacity
+}
+
+export interface TakeOptions {
+  reserve?: number;  // Tokens that must remain after this take (default 0)
+  deadline?: number; // Absolute deadline (epoch ms); wait no longer than this
+}
+
+export interface DistributedTokenBucketStats {
+  remaining: number | null; // Tokens left at the last check (null before the first)
+  checkedAt: string | null;
+  granted: number;
+  waits: number;            // Takes that had to wait for another instance's usage to refill
+  deadlineRejections: number;
+  errors: number;           // Takes allowed without Redis (fail open)
+}
+
+export class DistributedTokenBucket {
+  private readonly refillPerMs: number;
+
+  private remaining: number | null = null;
+  private checkedAt: number | null = null;
+  private granted = 0;
+  private waits = 0;
+  private deadlineRejections = 0;
+  private errors = 0;
+  private lastErrorLog = 0;
+
+  /**
+   * @param {string} key - Redis key of the shared bucket (e.g., "ratelimit:finnhub")
+   * @param {DistributedTokenBucketOptions} options - Shared rate and capacity
+   */
+  constructor(
+    private readonly key: string,
+    private readonly options: DistributedTokenBucketOptions
+  ) {
+    this.refillPerMs = options.requestsPerMinute / 60000;
+  }
+
+  /**
+   * Take a Token, Waiting if Needed
+   *
+   * @param {TakeOptions} [options] - Reserve and deadline
+   * @returns {Promise<void>} Resolves once a token was taken (or Redis is unavailable)
+   * @throws {RequestDeadlineError} If no token frees up before the deadline
+   */
+  async take(options: TakeOptions = {}): Promise<void> {
+    const reserve = options.reserve ?? 0;
+    let waited = false;
+
+    for (;;) {
+      let result: { allowed: boolean; waitMs: number };
+      try {
+        result = await this.tryTake(reserve);
+      } catch (error) {
+        this.errors++;
+        if (Date.now() - this.lastErrorLog >= ERROR_LOG_INTERVAL_MS) {
+          this.lastErrorLog = Date.now();
+          logger.warn(`Distributed rate limit unavailable for ${this.key}, using local limit only:`, error);
+        }
+        return;
+      }
+
+      if (result.allowed) {
+        this.granted++;
+        if (waited) this.waits++;
+        return;
+      }
+
+      if (options.deadline !== undefined && Date.now() + result.waitMs > options.deadline) {
+        this.deadlineRejections++;
+        throw new RequestDeadlineError('Request deadline exceeded while waiting for shared rate limit');
+      }
+
+      waited = true;
+      await new Promise((resolve) => setTimeout(resolve, result.waitMs));
+    }
+  }
+
+  /**
+   * Get Budget Statistics
+   *
+   * `remaining` is the shared budget as of the last take by this instance,
+   * refilled locally to now.
+   *
+   * @returns {DistributedTokenBucketStats} Remaining tokens and take counters
+   */
+  getStats(): DistributedTokenBucketStats {
+    let remaining = this.remaining;
+    if (remaining !== null && this.checkedAt !== null) {
+      remaining = Math.min(
+        this.options.burst,
+        remaining + (Date.now() - this.checkedAt) * this.refillPerMs
+      );
+    }
+
+    return {
+      remaining: remaining !== null ? Math.floor(remaining) : null,
+      checkedAt: this.checkedAt !== null ? new Date(this.checkedAt).toISOString() : null,
+      granted: this.granted,
+      waits: this.waits,
+      deadlineRejections: this.deadlineRejections,
+      errors: this.errors,
+    };
+  }
+
+  /**
+   * Run the Take Script Once
+   *
+   * Uses EVALSHA, loading the script with EVAL on the first call (or after a
+   * Redis restart flushed the script cache).
+   *
+   * @private
+   */
+  private async tryTake(reserve: number): Promise<{ allowed: boolean; waitMs: number }> {
+    const client = getRedisClient();
+    const args = [this.refillPerMs, this.options.burst, reserve];
+
+    let reply: [number, string, number];
+    try {
+      reply = (await client.evalsha(TAKE_SCRIPT_SHA, 1, this.key, ...args)) as [number, string, number];
+    } catch (error: any) {
+      if (!String(error?.message).includes('NOSCRIPT')) throw error;
+      reply = (await client.eval(TAKE_SCRIPT, 1, this.key, ...args)) as [number, string, number];
+    }
+
+    const [allowed, tokens, waitMs] = reply;
+    this.remaining = parseFloat(tokens);
+    this.checkedAt = Date.now();
+
+    return { allowed: allowed === 1, waitMs: Math.max(1, waitMs) };
+  }
+}
+
+export default DistributedTokenBucket;
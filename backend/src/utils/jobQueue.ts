@@ -0,0 +1,478 @@
+/**
+ * Job Queue
+ *
+ * Durable background job queue stored in Redis. Jobs survive restarts, are
+ * retried with backoff, and each queue runs with its own concurrency limit
+ * in whichever processes call process() (the worker role, see src/index.ts).
+ *
+ * HOW IT WORKS:
+ * - Each job has an id chosen by the caller (e.g., the user id); enqueueing
+ *   an id that is already waiting is a no-op, so a burst of requests for the
+ *   same user collapses into one job
+ * - Keys per queue:
+ *   - `jobs:<name>:ready`: sorted set of job ids scored by when they're due
+ *   - `jobs:<name>:active`: sorted set of claimed job ids scored by lease expiry
+ *   - `jobs:<name>:data` / `jobs:<name>:attempts`: hashes of payload and attempt count
+ *   - `jobs:<name>:dead`: list of jobs that failed every attempt (capped)
+ * - Workers claim due jobs with one Lua script (Redis server clock), skipping
+ *   ids that are already running, and renew their lease while a batch runs
+ * - A job whose lease expired (worker crashed) goes back to ready and is
+ *   claimed again; a job re-enqueued while running runs once more afterwards
+ *
+ * EXAMPLE:
+ * ```typescript
+ * const queue = new JobQueue<{ userId: string }>('achievements', { maxAttempts: 5 });
+ * await queue.enqueue(userId, { userId }, { delayMs: 2000 });
+ * queue.process(async ([job]) => check(job.data.userId), { concurrency: 4, batchSize: 1 });
+ * ```
+ */
+
+import { createHash } from 'crypto';
+import { getRedisClient } from '../config/redis';
+import logger from '../config/logger';
+
+// Current Redis server time in ms (shared by all scripts)
+const NOW = `
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+`;
+
+// KEYS = ready, data; ARGV = id, payload, delay ms
+// Returns 1 if queued, 0 if the id was already waiting
+const ENQUEUE_SCRIPT = `${NOW}
+local added = redis.call('ZADD', KEYS[1], 'NX', now + tonumber(ARGV[3]), ARGV[1])
+if added == 1 then
+  redis.call('HSET', KEYS[2], ARGV[1], ARGV[2])
+end
+return added
+`;
+
+// KEYS = ready, active, data, attempts, dead; ARGV = limit, lease ms, max attempts, dead letter cap
+// Returns { id, payload, attempt, ... } for each claimed job
+const CLAIM_SCRIPT = `${NOW}
+local limit = tonumber(ARGV[1])
+local lease = tonumber(ARGV[2])
+local max_attempts = tonumber(ARGV[3])
+
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now, 'LIMIT', 0, 100)
+for _, id in ipairs(expired) do
+  redis.call('ZREM', KEYS[2], id)
+  redis.call('ZADD', KEYS[1], 'NX', now, id)
+end
+
+local scan = limit + redis.call('ZCARD', KEYS[2])
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now, 'LIMIT', 0, scan)
+local claimed = {}
+local count = 0
+for _, id in ipairs(due) do
+  if count >= limit then break end
+  if not redis.call('ZSCORE', KEYS[2], id) then
+    redis.call('ZREM', KEYS[1], id)
+    local payload = redis.call('HGET', KEYS[3], id)
+    local attempt = redis.call('HINCRBY', KEYS[4], id, 1)
+    if not payload then
+      redis.call('HDEL', KEYS[4], id)
+    elseif attempt > max_attempts then
+      redis.call('LPUSH', KEYS[5], cjson.encode({ id = id, payload = payload, attempts = attempt - 1, error = 'Lease expired', failedAt = now }))
+      redis.call('LTRIM', KEYS[5], 0, tonumber(ARGV[4]) - 1)
+      redis.call('HDEL', KEYS[3], id)
+      redis.call('HDEL', KEYS[4], id)
+    else
+      redis.call('ZADD', KEYS[2], now + lease, id)
+      table.insert(claimed, id)
+      table.insert(claimed, payload)
+      table.insert(claimed, attempt)
+      count = count + 1
+    end
+  end
+end
+return claimed
+`;
+
+// KEYS = active; ARGV = lease ms, ids...
+const EXTEND_SCRIPT = `${NOW}
+for i = 2, #ARGV do
+  redis.call('ZADD', KEYS[1], 'XX', now + tonumber(ARGV[1]), ARGV[i])
+end
+return #ARGV - 1
+`;
+
+// KEYS = ready, active, data, attempts; ARGV = ids...
+const COMPLETE_SCRIPT = `
+for _, id in ipairs(ARGV) do
+  redis.call('ZREM', KEYS[2], id)
+  redis.call('HDEL', KEYS[4], id)
+  if not redis.call('ZSCORE', KEYS[1], id) then
+    redis.call('HDEL', KEYS[3], id)
+  end
+end
+return #ARGV
+`;
+
+// KEYS = ready, active, data, attempts, dead
+// ARGV = max attempts, base delay ms, max delay ms, dead letter cap, error, ids...
+// Returns the number of jobs scheduled for retry
+const FAIL_SCRIPT = `${NOW}
+local max_attempts = tonumber(ARGV[1])
+local base_delay = tonumber(ARGV[2])
+local max_delay = tonumber(ARGV[3])
+local retried = 0
+
+for i = 6, #ARGV do
+  local id = ARGV[i]
+  redis.call('ZREM', KEYS[2], id)
+  local attempt = tonumber(redis.call('HGET', KEYS[4], id)) or max_attempts
+  if attempt < max_attempts then
+    local delay = math.min(max_delay, base_delay * 2 ^ (attempt - 1))
+    redis.call('ZADD', KEYS[1], 'NX', now + delay, id)
+    retried = retried + 1
+  else
+    local payload = redis.call('HGET', KEYS[3], id)
+    redis.call('LPUSH', KEYS[5], cjson.encode({ id = id, payload = payload, attempts = attempt, error = ARGV[5], failedAt = now }))
+    redis.call('LTRIM', KEYS[5], 0, tonumber(ARGV[4]) - 1)
+    redis.call('HDEL', KEYS[4], id)
+    if not redis.call('ZSCORE', KEYS[1], id) then
+      redis.call('HDEL', KEYS[3], id)
+    end
+  end
+end
+return retried
+`;
+
+const sha = (script: string) => createHash('sha1').update(script).digest('hex');
+const SCRIPTS = {
+  enqueue: { source: ENQUEUE_SCRIPT, sha: sha(ENQUEUE_SCRIPT) },
+  claim: { source: CLAIM_SCRIPT, sha: sha(CLAIM_SCRIPT) },
+  extend: { source: EXTEND_SCRIPT, sha: sha(EXTEND_SCRIPT) },
+  complete: { source: COMPLETE_SCRIPT, sha: sha(COMPLETE_SCRIPT) },
+  fail: { source: FAIL_SCRIPT, sha: sha(FAIL_SCRIPT) },
+};
+
+const ERROR_LOG_INTERVAL_MS = 60000; // Log Redis failures at most once a minute
+const DEAD_LETTER_LIMIT = 1000;      // Failed jobs kept for inspection
+
+export interface JobQueueOptions {
+  maxAttempts?: number;   // Attempts before a job is dead-lettered (default 5)
+  retryDelayMs?: number;  // First retry delay, doubled per attempt (default 1000)
+  maxRetryDelayMs?: number; // Retry delay cap (default 5 minutes)
+  leaseMs?: number;       // A claimed job is reclaimed if its lease isn't renewed (default 60s)
+}
+
+export interface ProcessOptions {
+  concurrency: number;      // Batches running at once in this process
+  batchSize: number;        // Jobs handed to the handler per call
+  pollIntervalMs?: number;  // Wait between claims when the queue is idle (default 500)
+}
+
+export interface Job<T> {
+  id: string;
+  data: T;
+  attempt: number; // 1 on the first run
+}
+
+export interface JobQueueStats {
+  ready: number | null;   // Waiting jobs (due or delayed); null if Redis is unavailable
+  due: number | null;     // Waiting jobs that are already due
+  active: number | null;  // Claimed by a worker (any instance)
+  dead: number | null;    // Dead-lettered jobs
+  enqueued: number;       // Jobs queued by this process
+  deduplicated: number;   // Enqueues that collapsed into a waiting job
+  running: number;        // Batches running in this process
+  completed: number;
+  retried: number;
+  deadLettered: number;
+  errors: number;         // Redis failures in this process
+}
+
+export class JobQueue<T> {
+  private readonly keys: { ready: string; active: string; data: string; attempts: string; dead: string };
+  private readonly options: Required<JobQueueOptions>;
+
+  private handler: ((jobs: Job<T>[]) => Promise<void>) | null = null;
+  private processOptions: Required<ProcessOptions> | null = null;
+  private inFlight = new Set<Promise<void>>();
+  private wake: (() => void) | null = null;
+  private running = false;
+  private polling: Promise<void> | null = null;
+
+  private enqueued = 0;
+  private deduplicated = 0;
+  private completed = 0;
+  private retried = 0;
+  private deadLettered = 0;
+  private errors = 0;
+  private lastErrorLog = 0;
+
+  /**
+   * @param {string} name - Queue name (Redis keys are prefixed `jobs:<name>:`)
+   * @param {JobQueueOptions} [options] - Retry and lease settings
+   */
+  constructor(readonly name: string, options: JobQueueOptions = {}) {
+    const prefix = `jobs:${name}`;
+    this.keys = {
+      ready: `${prefix}:ready`,
+      active: `${prefix}:active`,
+      data: `${prefix}:data`,
+      attempts: `${prefix}:attempts`,
+      dead: `${prefix}:dead`,
+    };
+    this.options = {
+      maxAttempts: options.maxAttempts ?? 5,
+      retryDelayMs: options.retryDelayMs ?? 1000,
+      maxRetryDelayMs: options.maxRetryDelayMs ?? 300000,
+      leaseMs: options.leaseMs ?? 60000,
+    };
+  }
+
+  /**
+   * Enqueue a Job
+   *
+   * @param {string} id - Job id; a job with this id that is still waiting absorbs the enqueue
+   * @param {T} data - Job payload (JSON-serializable)
+   * @param {object} [options] - `delayMs`: run no earlier than this from now
+   * @returns {Promise<boolean>} False if the job was deduplicated
+   * @throws {Error} If Redis is unavailable
+   */
+  async enqueue(id: string, data: T, options: { delayMs?: number } = {}): Promise<boolean> {
+    const added = await this.run<number>(
+      SCRIPTS.enqueue,
+      [this.keys.ready, this.keys.data],
+      [id, JSON.stringify(data), options.delayMs ?? 0]
+    );
+
+    if (added === 1) {
+      this.enqueued++;
+      return true;
+    }
+    this.deduplicated++;
+    return false;
+  }
+
+  /**
+   * Start Processing Jobs in This Process
+   *
+   * The handler gets up to `batchSize` jobs at a time. If it throws, every
+   * job in the batch is retried (or dead-lettered after maxAttempts).
+   *
+   * @param {(jobs: Job<T>[]) => Promise<void>} handler - Runs a batch of jobs
+   * @param {ProcessOptions} options - Concurrency and batch size
+   */
+  process(handler: (jobs: Job<T>[]) => Promise<void>, options: ProcessOptions): void {
+    if (this.polling) {
+      throw new Error(`Job queue ${this.name} is already being processed`);
+    }
+
+    this.handler = handler;
+    this.processOptions = { pollIntervalMs: 500, ...options };
+    this.running = true;
+    this.polling = this.poll();
+    logger.info(`Processing job queue ${this.name} (concurrency ${options.concurrency})`);
+  }
+
+  /**
+   * Stop Processing
+   *
+   * Stops claiming jobs and waits for running batches to finish.
+   *
+   * @returns {Promise<void>}
+   */
+  async stop(): Promise<void> {
+    if (!this.polling) return;
+
+    this.running = false;
+    this.wake?.();
+    await this.polling;
+    await Promise.all(this.inFlight);
+    this.polling = null;
+  }
+
+  /**
+   * Get Queue Statistics
+   *
+   * Queue depths are read from Redis (shared by all instances); the other
+   * counters are for this process.
+   *
+   * @returns {Promise<JobQueueStats>} Queue depths and job counters
+   */
+  async getStats(): Promise<JobQueueStats> {
+    let depths: (number | null)[] = [null, null, null, null];
+    try {
+      const results = await getRedisClient()
+        .pipeline()
+        .zcard(this.keys.ready)
+        .zcount(this.keys.ready, '-inf', Date.now())
+        .zcard(this.keys.active)
+        .llen(this.keys.dead)
+        .exec();
+      depths = (results ?? []).map(([error, reply]) => (error ? null : Number(reply)));
+    } catch (error) {
+      this.recordError('read queue depth', error);
+    }
+
+    const [ready, due, active, dead] = depths;
+    return {
+      ready,
+      due,
+      active,
+      dead,
+      enqueued: this.enqueued,
+      deduplicated: this.deduplicated,
+      running: this.inFlight.size,
+      completed: this.completed,
+      retried: this.retried,
+      deadLettered: this.deadLettered,
+      errors: this.errors,
+    };
+  }
+
+  /**
+   * Claim and Start Batches Until Stopped
+   *
+   * @private
+   */
+  private async poll(): Promise<void> {
+    const { concurrency, batchSize, pollIntervalMs } = this.processOptions!;
+
+    while (this.running) {
+      const free = concurrency - this.inFlight.size;
+      let claimedAll = false;
+
+      if (free > 0) {
+        const limit = free * batchSize;
+        const jobs = await this.claim(limit);
+
+        for (let i = 0; i < jobs.length; i += batchSize) {
+          this.startBatch(jobs.slice(i, i + batchSize));
+        }
+        claimedAll = jobs.length === limit;
+      }
+
+      // More jobs are probably due; otherwise wait for the next poll or a free slot
+      if (claimedAll && this.inFlight.size < concurrency) continue;
+      await new Promise<void>((resolve) => {
+        const timer = setTimeout(resolve, pollIntervalMs);
+        this.wake = () => {
+          clearTimeout(timer);
+          resolve();
+        };
+      });
+      this.wake = null;
+    }
+  }
+
+  private async claim(limit: number): Promise<Job<T>[]> {
+    let reply: (string | number)[];
+    try {
+      reply = await this.run<(string | number)[]>(
+        SCRIPTS.claim,
+        [this.keys.ready, this.keys.active, this.keys.data, this.keys.attempts, this.keys.dead],
+        [limit, this.options.leaseMs, this.options.maxAttempts, DEAD_LETTER_LIMIT]
+      );
+    } catch (error) {
+      this.recordError('claim jobs', error);
+      return [];
+    }
+
+    const jobs: Job<T>[] = [];
+    for (let i = 0; i < reply.length; i += 3) {
+      jobs.push({ id: String(reply[i]), data: JSON.parse(String(reply[i + 1])), attempt: Number(reply[i + 2]) });
+    }
+    return jobs;
+  }
+
+  /**
+   * Run One Batch, Renewing Its Lease Until It Settles
+   *
+   * @private
+   */
+  private startBatch(jobs: Job<T>[]): void {
+    const ids = jobs.map((job) => job.id);
+    const heartbeat = setInterval(() => {
+      this.run(SCRIPTS.extend, [this.keys.active], [this.options.leaseMs, ...ids]).catch((error) =>
+        this.recordError('renew job lease', error)
+      );
+    }, Math.floor(this.options.leaseMs / 3));
+
+    const batch = this.execute(jobs, ids).finally(() => {
+      clearInterval(heartbeat);
+      this.inFlight.delete(batch);
+      this.wake?.();
+    });
+    this.inFlight.add(batch);
+  }
+
+  private async execute(jobs: Job<T>[], ids: string[]): Promise<void> {
+    const keys = [this.keys.ready, this.keys.active, this.keys.data, this.keys.attempts];
+
+    try {
+      await this.handler!(jobs);
+    } catch (error: any) {
+      const message = String(error?.message ?? error);
+      logger.warn(`Job ${this.name}:${ids.join(',')} failed (attempt ${jobs[0].attempt}): ${message}`);
+
+      try {
+        const retried = await this.run<number>(
+          SCRIPTS.fail,
+          [...keys, this.keys.dead],
+          [
+            this.options.maxAttempts,
+            this.options.retryDelayMs,
+            this.options.maxRetryDelayMs,
+            DEAD_LETTER_LIMIT,
+            message,
+            ...ids,
+          ]
+        );
+        this.retried += retried;
+        this.deadLettered += ids.length - retried;
+        if (retried < ids.length) {
+          logger.error(`${ids.length - retried} ${this.name} job(s) failed ${this.options.maxAttempts} times and were dead-lettered`);
+        }
+      } catch (redisError) {
+        // The lease expires and the jobs are claimed again
+        this.recordError('record job failure', redisError);
+      }
+      return;
+    }
+
+    try {
+      await this.run(SCRIPTS.complete, keys, ids);
+      this.completed += ids.length;
+    } catch (error) {
+      // The lease expires and the jobs run again
+      this.recordError('complete jobs', error);
+    }
+  }
+
+  /**
+   * Run a Script with EVALSHA
+   *
+   * Loads the script with EVAL on the first call (or after a Redis restart
+   * flushed the script cache).
+   *
+   * @private
+   */
+  private async run<R>(
+    script: { source: string; sha: string },
+    keys: string[],
+    args: (string | number)[]
+  ): Promise<R> {
+    const client = getRedisClient();
+    try {
+      return (await client.evalsha(script.sha, keys.length, ...keys, ...args)) as R;
+    } catch (error: any) {
+      if (!String(error?.message).includes('NOSCRIPT')) throw error;
+      return (await client.eval(script.source, keys.length, ...keys, ...args)) as R;
+    }
+  }
+
+  private recordError(action: string, error: unknown): void {
+    this.errors++;
+    if (Date.now() - this.lastErrorLog >= ERROR_LOG_INTERVAL_MS) {
+      this.lastErrorLog = Date.now();
+      logger.warn(`Job queue ${this.name} failed to ${action}:`, error);
+    }
+  }
+}
+
+export default JobQueue;
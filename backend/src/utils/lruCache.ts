@@ -0,0 +1,203 @@
+/**
+ * In-Memory LRU Cache with TTL
+ *
+ * Bounded least-recently-used cache used as an in-process tier in front of Redis.
+ * Entries expire after a per-entry TTL and the cache is bounded both by entry count
+ * and by an approximate byte budget, evicting the least recently used entries first.
+ *
+ * FEATURES:
+ * - O(1) get/set/delete (Map preserves insertion order, re-inserting marks as recent)
+ * - Per-entry TTL with lazy expiry on read
+ * - Entry count and byte size limits
+ * - Hit/miss/eviction counters for monitoring
+ *
+ * EXAMPLE:
+ * ```typescript
+ * const cache = new LRUCache<MarketQuote>({ maxEntries: 1000, maxBytes: 5 * 1024 * 1024, ttlMs: 300000 });
+ * cache.set('AAPL', quote);
+ * const hit = cache.get('AAPL'); // quote or undefined
+ * ```
+ */
+
+export interface LRUCacheOptions<V> {
+  maxEntries: number;                // Maximum number of entries kept in memory
+  maxBytes: number;                  // Approximate memory budget in bytes
+  ttlMs: number;                     // Default time-to-live for entries
+  sizeOf?: (value: V) => number;     // Byte size estimator (defaults to JSON length)
+}
+
+export interface LRUCacheStats {
+  entries: number;
+  bytes: number;
+  hits: number;
+  misses: number;
+  evictions: number;
+  expirations: number;
+  hitRate: number;
+}
+
+interface CacheEntry<V> {
+  value: V;
+  size: number;
+  expiresAt: number;
+}
+
+export class LRUCache<V> {
+  // Map iteration order is insertion order: first key is least recently used
+  private entries = new Map<string, CacheEntry<V>>();
+  private bytes = 0;
+
+  private hits = 0;
+  private misses = 0;
+  private evictions = 0;
+  private expirations = 0;
+
+  private readonly maxEntries: number;
+  private readonly maxBytes: number;
+  private readonly ttlMs: number;
+  private readonly sizeOf: (value: V) => number;
+
+  /**
+   * Create an LRU Cache
+   *
+   * @param {LRUCacheOptions<V>} options - Size limits, default TTL and size estimator
+   */
+  constructor(options: LRUCacheOptions<V>) {
+    this.maxEntries = options.maxEntries;
+    this.maxBytes = options.maxBytes;
+    this.ttlMs = options.ttlMs;
+    // UTF-16 strings take ~2 bytes per character in V8
+    this.sizeOf = options.sizeOf || ((value: V) => JSON.stringify(value).length * 2);
+  }
+
+  /**
+   * Get Cached Value
+   *
+   * Returns the value if present and not expired, and marks it as most recently used.
+   *
+   * @param {string} key - Cache key
+   * @returns {V | undefined} Cached value or undefined on miss/expiry
+   */
+  get(key: string): V | undefined {
+    const entry = this.entries.get(key);
+
+    if (!entry) {
+      this.misses++;
+      return undefined;
+    }
+
+    if (entry.expiresAt <= Date.now()) {
+      this.remove(key, entry);
+      this.expirations++;
+      this.misses++;
+      return undefined;
+    }
+
+    // Re-insert to move the key to the most recently used position
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.hits++;
+    return entry.value;
+  }
+
+  /**
+   * Peek at Cached Value
+   *
+   * Like get(), but doesn't mark the entry as recently used or count a hit/miss.
+   * For opportunistic reads (e.g., decorating search results with prices).
+   *
+   * @param {string} key - Cache key
+   * @returns {V | undefined} Cached value or undefined if missing/expired
+   */
+  peek(key: string): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry || entry.expiresAt <= Date.now()) {
+      return undefined;
+    }
+    return entry.value;
+  }
+
+  /**
+   * Set Cached Value
+   *
+   * Inserts or replaces a value, then evicts least recently used entries
+   * until both the entry count and byte budget are satisfied.
+   * Values larger than the whole byte budget are not cached.
+   *
+   * @param {string} key - Cache key
+   * @param {V} value - Value to cache
+   * @param {number} [ttlMs] - Optional TTL override in milliseconds
+   */
+  set(key: string, value: V, ttlMs: number = this.ttlMs): void {
+    const existing = this.entries.get(key);
+    if (existing) {
+      this.remove(key, existing);
+    }
+
+    const size = this.sizeOf(value);
+    if (size > this.maxBytes || ttlMs <= 0) {
+      return;
+    }
+
+    this.entries.set(key, { value, size, expiresAt: Date.now() + ttlMs });
+    this.bytes += size;
+
+    // Evict from the least recently used end
+    while (this.entries.size > this.maxEntries || this.bytes > this.maxBytes) {
+      const oldestKey = this.entries.keys().next().value as string;
+      this.remove(oldestKey, this.entries.get(oldestKey)!);
+      this.evictions++;
+    }
+  }
+
+  /**
+   * Delete Cached Value
+   *
+   * @param {string} key - Cache key to invalidate
+   * @returns {boolean} true if an entry was removed
+   */
+  delete(key: string): boolean {
+    const entry = this.entries.get(key);
+    if (!entry) return false;
+    this.remove(key, entry);
+    return true;
+  }
+
+  /**
+   * Clear all entries (counters are preserved)
+   */
+  clear(): void {
+    this.entries.clear();
+    this.bytes = 0;
+  }
+
+  /**
+   * Get Cache Statistics
+   *
+   * @returns {LRUCacheStats} Current size and hit/miss counters
+   */
+  getStats(): LRUCacheStats {
+    const lookups = this.hits + this.misses;
+    return {
+      entries: this.entries.size,
+      bytes: this.bytes,
+      hits: this.hits,
+      misses: this.misses,
+      evictions: this.evictions,
+      expirations: this.expirations,
+      hitRate: lookups > 0 ? this.hits / lookups : 0,
+    };
+  }
+
+  /**
+   * Remove an entry and release its byte accounting
+   *
+   * @private
+   */
+  private remove(key: string, entry: CacheEntry<V>): void {
+    this.entries.delete(key);
+    this.bytes -= entry.size;
+  }
+}
+
+export default LRUCache;
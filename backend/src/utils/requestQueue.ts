@@ -1,38 +1,129 @@
 /**
  * Request Queue for API Rate Limiting
  *
- * Implements a FIFO queue with configurable delays between requests
- * to prevent API rate limit violations.
+ * Implements a token-bucket rate limiter with bounded concurrency,
+ * priority lanes and per-request deadlines to prevent API rate limit
+ * violations while still using the provider's full request budget.
  *
- * USAGE:
- * - Enqueue async functions that make API requests
- * - Queue automatically processes requests one at a time
- * - Configurable delay enforced between consecutive requests
+ * HOW IT WORKS:
+ * - The bucket holds up to `burst` tokens and refills at `requestsPerMinute`
+ * - Each request consumes one token when it starts
+ * - At most `maxConcurrency` requests are in flight at once
+ * - Waiting requests are kept in FIFO lanes: TRADE > READ > BACKGROUND
+ * - BACKGROUND requests never take the last token, so an interactive
+ *   request arriving right after a warmer burst doesn't wait a full refill
+ *
+ * DEADLINES:
+ * - A request may carry an absolute deadline (epoch ms)
+ * - If the estimated start time is already past the deadline, add() rejects
+ *   immediately with RequestDeadlineError (fail fast)
+ * - A queued request still waiting at its deadline is removed and rejected
+ *
+ * Unlike a fixed delay after each request, slow responses don't waste budget:
+ * a 500ms call no longer pushes the next call back by 500ms + delay.
+ *
+ * Each market data provider owns one queue built from its rate limit
+ * (see services/providers).
  *
  * EXAMPLE:
  * ```typescript
- * const queue = new RequestQueue(1000); // 1 second delay
+ * const queue = new RequestQueue({ requestsPerMinute: 60, burst: 5, maxConcurrency: 5 });
  * const result = await queue.add(() => fetchDataFromAPI());
+ * const urgent = await queue.add(() => fetchDataFromAPI(), {
+ *   priority: RequestPriority.TRADE,
+ *   deadline: Date.now() + 3000,
+ * });
  * ```
  */
+import { AppError } from '../middleware/errorHandler';
+
+/**
+ * Request Priority Lanes
+ *
+ * Trade execution quotes jump ahead of page reads, which jump ahead of background warmers.
+ */
+export const RequestPriority = {
+  TRADE: 'TRADE',           // Interactive trade execution
+  READ: 'READ',             // Interactive page reads
+  BACKGROUND: 'BACKGROUND', // Warmers and stale revalidation
+} as const;
+
+export type RequestPriorityLane = typeof RequestPriority[keyof typeof RequestPriority];
+
+// Lanes in dispatch order
+const LANES: RequestPriorityLane[] = [
+  RequestPriority.TRADE,
+  RequestPriority.READ,
+  RequestPriority.BACKGROUND,
+];
+
+export interface RequestQueueOptions {
+  requestsPerMinute: number; // Token refill rate
+  burst: number;             // Bucket capacity (max requests started back-to-back)
+  maxConcurrency: number;    // Max requests in flight at once
+}
+
+export interface RequestOptions {
+  priority?: RequestPriorityLane; // Lane (default: READ)
+  deadline?: number;              // Absolute deadline (epoch ms) for the request to start
+}
+
+export interface RequestQueueStats {
+  pending: Record<RequestPriorityLane, number>;
+  inFlight: number;
+  availableTokens: number;
+  deadlineRejections: number;
+}
+
+/**
+ * Request Deadline Error
+ *
+ * Thrown when a request cannot start before its deadline.
+ */
+export class RequestDeadlineError extends AppError {
+  constructor(message: string = 'Request deadline exceeded while waiting for rate limit') {
+    super(message, 504);
+  }
+}
+
+interface QueueItem {
+  fn: () => Promise<any>;        // The async function to execute
+  resolve: (value: any) => void; // Promise resolve callback
+  reject: (error: any) => void;  // Promise reject callback
+  lane: RequestPriorityLane;
+  deadlineTimer?: NodeJS.Timeout;
+}
+
 export class RequestQueue {
-  // Queue storing pending API requests with their promise handlers
-  private queue: Array<{
-    fn: () => Promise<any>;        // The async function to execute
-    resolve: (value: any) => void; // Promise resolve callback
-    reject: (error: any) => void;  // Promise reject callback
-  }> = [];
+  // One FIFO per priority lane
+  private lanes: Record<RequestPriorityLane, QueueItem[]> = {
+    TRADE: [],
+    READ: [],
+    BACKGROUND: [],
+  };
 
-  private processing = false;  // Flag to prevent concurrent processing
-  private delayMs: number;     // Delay in milliseconds between requests
+  private readonly options: RequestQueueOptions;
+  private readonly refillPerMs: number;
+  private tokens: number;
+  private lastRefill = Date.now();
+  private inFlight = 0;
+  private timer: NodeJS.Timeout | null = null;
+  private deadlineRejections = 0;
 
   /**
    * Create a Request Queue
    *
-   * @param {number} delayMs - Delay in milliseconds between consecutive requests
+   * Accepts either token-bucket options or, for backward compatibility, a delay in
+   * milliseconds between requests (equivalent to burst 1, concurrency 1).
+   *
+   * @param {RequestQueueOptions | number} options - Rate limit settings or delay in ms
    */
-  constructor(delayMs: number = 1000) {
-    this.delayMs = delayMs;
+  constructor(options: RequestQueueOptions | number = 1000) {
+    this.options = typeof options === 'number'
+      ? { requestsPerMinute: 60000 / options, burst: 1, maxConcurrency: 1 }
+      : options;
+    this.refillPerMs = this.options.requestsPerMinute / 60000;
+    this.tokens = this.options.burst;
   }
 
   /**
@@ -42,71 +133,172 @@ export class RequestQueue {
    * when the function is executed.
    *
    * @param {() => Promise<T>} fn - Async function to execute (e.g., API call)
+   * @param {RequestOptions} [options] - Priority lane and deadline
    * @returns {Promise<T>} Promise that resolves with function result
+   * @throws {RequestDeadlineError} If the request cannot start before its deadline
    */
-  async add<T>(fn: () => Promise<T>): Promise<T> {
+  async add<T>(fn: () => Promise<T>, options: RequestOptions = {}): Promise<T> {
+    const lane = options.priority ?? RequestPriority.READ;
+    const { deadline } = options;
+
+    // Fail fast if the request can't possibly start in time
+    if (deadline !== undefined && this.estimateStartTime(lane) > deadline) {
+      this.deadlineRejections++;
+      throw new RequestDeadlineError();
+    }
+
     return new Promise((resolve, reject) => {
-      this.queue.push({ fn, resolve, reject });
-      this.processQueue(); // Start processing if not already running
+      const item: QueueItem = { fn, resolve, reject, lane };
+
+      if (deadline !== undefined) {
+        item.deadlineTimer = setTimeout(() => {
+          const queue = this.lanes[lane];
+          const index = queue.indexOf(item);
+          if (index !== -1) {
+            queue.splice(index, 1);
+            this.deadlineRejections++;
+            reject(new RequestDeadlineError());
+          }
+        }, Math.max(0, deadline - Date.now()));
+      }
+
+      this.lanes[lane].push(item);
+      this.processQueue(); // Start processing if capacity is available
     });
   }
 
+  /**
+   * Get Queue Statistics
+   *
+   * @returns {RequestQueueStats} Pending per lane, in-flight, available tokens and deadline rejections
+   */
+  getStats(): RequestQueueStats {
+    this.refill();
+    return {
+      pending: {
+        TRADE: this.lanes.TRADE.length,
+        READ: this.lanes.READ.length,
+        BACKGROUND: this.lanes.BACKGROUND.length,
+      },
+      inFlight: this.inFlight,
+      availableTokens: Math.floor(this.tokens),
+      deadlineRejections: this.deadlineRejections,
+    };
+  }
+
+  /**
+   * Estimate Start Time
+   *
+   * Approximates when a new request in the given lane would start, assuming
+   * every request already queued in the same or a higher lane goes first.
+   * Concurrency is ignored, so this is an optimistic (earliest) estimate.
+   *
+   * @param {RequestPriorityLane} lane - Lane of the new request
+   * @returns {number} Estimated start time (epoch ms)
+   * @private
+   */
+  private estimateStartTime(lane: RequestPriorityLane): number {
+    this.refill();
+
+    let ahead = 0;
+    for (const l of LANES) {
+      ahead += this.lanes[l].length;
+      if (l === lane) break;
+    }
+
+    const tokensNeeded = ahead + 1 - this.tokens;
+    if (tokensNeeded <= 0) {
+      return Date.now();
+    }
+    return Date.now() + tokensNeeded / this.refillPerMs;
+  }
+
   /**
    * Process Queue
    *
-   * Processes queued requests one at a time with configured delay.
-   * Uses iterative approach (while loop) instead of recursion to handle
-   * requests added during processing without stack overflow.
+   * Starts as many queued requests as tokens and concurrency allow, draining
+   * lanes in priority order. If requests are waiting only for tokens, schedules
+   * a wake-up for when the next token becomes available.
    *
    * @private
    */
-  private async processQueue() {
-    // Prevent concurrent processing
-    if (this.processing || this.queue.length === 0) return;
-
-    this.processing = true;
-
-    // Continue processing as long as there are items in the queue
-    // This handles items added during processing without recursion
-    while (this.queue.length > 0) {
-      const item = this.queue.shift()!; // Get next request (FIFO)
-
-      try {
-        const result = await item.fn(); // Execute the API call
-        item.resolve(result);           // Resolve the promise with result
-      } catch (error) {
-        item.reject(error);             // Reject the promise on error
-      }
+  private processQueue(): void {
+    this.refill();
+
+    while (this.inFlight < this.options.maxConcurrency) {
+      const item = this.nextItem();
+      if (!item) break;
 
-      // Wait before processing next request (if queue not empty)
-      if (this.queue.length > 0) {
-        await this.delay(this.delayMs);
+      if (item.deadlineTimer) clearTimeout(item.deadlineTimer);
+      this.tokens -= 1;
+      this.inFlight++;
+
+      const { fn, resolve, reject } = item;
+      Promise.resolve()
+        .then(fn)                 // Execute the API call
+        .then(resolve, reject)
+        .finally(() => {
+          this.inFlight--;
+          this.processQueue();    // A concurrency slot was freed
+        });
+    }
+
+    // Waiting for tokens (not concurrency): wake up when the next token is available
+    const pending = LANES.some((lane) => this.lanes[lane].length > 0);
+    if (pending && this.inFlight < this.options.maxConcurrency && !this.timer) {
+      const reserve = this.lanes.TRADE.length + this.lanes.READ.length > 0 ? 0 : this.backgroundReserve();
+      const waitMs = Math.max(1, Math.ceil((1 + reserve - this.tokens) / this.refillPerMs));
+      this.timer = setTimeout(() => {
+        this.timer = null;
+        this.processQueue();
+      }, waitMs);
+    }
+  }
+
+  /**
+   * Take the Next Dispatchable Request
+   *
+   * Interactive lanes may use any available token; the BACKGROUND lane
+   * leaves a reserve token for interactive requests.
+   *
+   * @returns {QueueItem | undefined} Next request to start, if one may start now
+   * @private
+   */
+  private nextItem(): QueueItem | undefined {
+    for (const lane of LANES) {
+      if (this.lanes[lane].length === 0) continue;
+
+      const reserve = lane === RequestPriority.BACKGROUND ? this.backgroundReserve() : 0;
+      if (this.tokens >= 1 + reserve) {
+        return this.lanes[lane].shift();
       }
+      return undefined; // Higher lane is waiting for tokens; lower lanes wait too
     }
+    return undefined;
+  }
 
-    this.processing = false;
+  /**
+   * Tokens the BACKGROUND lane must leave untouched (none when burst is 1)
+   *
+   * @private
+   */
+  private backgroundReserve(): number {
+    return this.options.burst > 1 ? 1 : 0;
   }
 
   /**
-   * Delay Helper
+   * Refill Tokens
    *
-   * Creates a promise that resolves after specified milliseconds.
+   * Adds tokens for the time elapsed since the last refill, capped at burst size.
    *
-   * @param {number} ms - Milliseconds to delay
-   * @returns {Promise<void>} Promise that resolves after delay
    * @private
    */
-  private delay(ms: number): Promise<void> {
-    return new Promise(resolve => setTimeout(resolve, ms));
+  private refill(): void {
+    const now = Date.now();
+    this.tokens = Math.min(
+      this.options.burst,
+      this.tokens + (now - this.lastRefill) * this.refillPerMs
+    );
+    this.lastRefill = now;
   }
 }
-
-/**
- * Singleton Request Queue Instances
- *
- * Pre-configured queues for different external APIs:
- * - alphaVantageQueue: 12-second delay (5 requests/minute free tier limit)
- * - finnhubQueue: 1-second delay (60 requests/minute free tier limit)
- */
-export const alphaVantageQueue = new RequestQueue(12000); // 12 sec (5 req/min)
-export const finnhubQueue = new RequestQueue(1000);       // 1 sec (60 req/min)
@@ -0,0 +1,136 @@
+/**
+ * Single-Flight Request Coalescing
+ *
+ * Ensures that concurrent callers asking for the same key share one in-flight
+ * execution instead of each starting their own. The first caller (the "leader")
+ * runs the work; callers arriving while it is still pending receive the same promise.
+ * Once the promise settles the key is released, so later calls start a new flight.
+ *
+ * USAGE:
+ * - do(): coalesce a single keyed operation
+ * - doMany(): coalesce a batch operation; keys already in flight are joined,
+ *   the remaining keys are loaded together in one call
+ *
+ * EXAMPLE:
+ * ```typescript
+ * const flights = new SingleFlight<MarketQuote>();
+ * // 50 concurrent calls → 1 provider request
+ * const quote = await flights.do('AAPL', () => fetchQuote('AAPL'));
+ * ```
+ */
+
+export interface SingleFlightStats {
+  inFlight: number;      // Keys currently being loaded
+  executions: number;    // Keys loaded by a leader
+  deduplicated: number;  // Callers that joined an existing flight instead of loading
+}
+
+export class SingleFlight<T> {
+  private inFlight = new Map<string, Promise<T>>();
+  private executions = 0;
+  private deduplicated = 0;
+
+  /**
+   * Run or Join a Keyed Operation
+   *
+   * @param {string} key - Coalescing key (e.g., symbol)
+   * @param {() => Promise<T>} fn - Work to run if no flight exists for the key
+   * @returns {Promise<T>} Shared result of the in-flight operation
+   */
+  do(key: string, fn: () => Promise<T>): Promise<T> {
+    const existing = this.inFlight.get(key);
+    if (existing) {
+      this.deduplicated++;
+      return existing;
+    }
+
+    this.executions++;
+    const promise = Promise.resolve()
+      .then(fn)
+      .finally(() => {
+        this.inFlight.delete(key);
+      });
+
+    this.inFlight.set(key, promise);
+    return promise;
+  }
+
+  /**
+   * Run or Join a Batch Operation
+   *
+   * Keys already in flight are joined. All other keys are registered as in flight
+   * and loaded together with a single call to fn. Keys that fail or are missing
+   * from the batch result are omitted from the returned map.
+   *
+   * @param {string[]} keys - Keys to load
+   * @param {(keys: string[]) => Promise<Map<string, T>>} fn - Batch loader for keys not in flight
+   * @param {(key: string) => Error} [missingError] - Error given to joiners when the batch omits a key
+   * @returns {Promise<Map<string, T>>} Map of key → result for keys that loaded successfully
+   */
+  async doMany(
+    keys: string[],
+    fn: (keys: string[]) => Promise<Map<string, T>>,
+    missingError: (key: string) => Error = (key) => new Error(`No result for ${key}`)
+  ): Promise<Map<string, T>> {
+    const pending = new Map<string, Promise<T>>();
+    const toLoad: string[] = [];
+
+    for (const key of keys) {
+      const existing = this.inFlight.get(key);
+      if (existing) {
+        this.deduplicated++;
+        pending.set(key, existing);
+      } else {
+        toLoad.push(key);
+      }
+    }
+
+    if (toLoad.length > 0) {
+      this.executions += toLoad.length;
+      const batch = Promise.resolve().then(() => fn(toLoad));
+
+      for (const key of toLoad) {
+        const promise = batch
+          .then((results) => {
+            if (!results.has(key)) {
+              throw missingError(key);
+            }
+            return results.get(key)!;
+          })
+          .finally(() => {
+            this.inFlight.delete(key);
+          });
+
+        this.inFlight.set(key, promise);
+        pending.set(key, promise);
+      }
+    }
+
+    const settled = await Promise.allSettled(
+      [...pending.entries()].map(async ([key, promise]) => [key, await promise] as const)
+    );
+
+    const results = new Map<string, T>();
+    for (const outcome of settled) {
+      if (outcome.status === 'fulfilled') {
+        results.set(outcome.value[0], outcome.value[1]);
+      }
+    }
+    return results;
+  }
+
+  /**
+   * Get Coalescing Statistics
+   *
+   * @returns {SingleFlightStats} In-flight count and deduplication counters
+   */
+  getStats(): SingleFlightStats {
+    return {
+      inFlight: this.inFlight.size,
+      executions: this.executions,
+      deduplicated: this.deduplicated,
+    };
+  }
+}
+
+export default SingleFlight;
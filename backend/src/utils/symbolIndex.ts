@@ -0,0 +1,260 @@
+/**
+ * In-Memory Symbol Search Index
+ *
+ * Ranked typeahead search over tickers and company names, answered entirely
+ * from memory (no database round trip).
+ *
+ * INDEXES:
+ * - Sorted tickers: binary search for ticker prefixes ("AA" → AAPL, AAL)
+ * - Sorted name words: binary search for word prefixes ("micro" → Microsoft, Micron)
+ * - Trigram postings: fuzzy candidates for typos ("nvidai" → NVIDIA)
+ *
+ * RANKING (highest first):
+ * 1. Exact ticker
+ * 2. Ticker prefix (shorter tickers first)
+ * 3. Name starts with the query
+ * 4. A name word starts with the query
+ * 5. Name contains the query
+ * 6. Trigram similarity to the ticker or a name word (fuzzy)
+ *
+ * Entries can be added or replaced at any time (upsert), so the index grows
+ * incrementally as new symbols are quoted.
+ */
+
+export interface SymbolListing {
+  symbol: string;
+  name: string;
+  assetType: 'STOCK' | 'CRYPTO';
+}
+
+export interface SymbolMatch extends SymbolListing {
+  score: number;
+}
+
+interface IndexedListing extends SymbolListing {
+  nameLower: string;
+  tickerGrams: Set<string>;
+  wordGrams: Set<string>[]; // Trigrams per name word
+}
+
+const MIN_FUZZY_SIMILARITY = 0.3;
+
+/**
+ * Character trigrams of a string, padded so short strings still produce some
+ */
+function trigramsOf(value: string): Set<string> {
+  const padded = `  ${value.toLowerCase()} `;
+  const grams = new Set<string>();
+  for (let i = 0; i < padded.length - 2; i++) {
+    grams.add(padded.slice(i, i + 3));
+  }
+  return grams;
+}
+
+/**
+ * Words of a company name, lowercased, without punctuation
+ */
+function wordsOf(name: string): string[] {
+  return name.toLowerCase().split(/[^a-z0-9]+/).filter(Boolean);
+}
+
+/**
+ * First index in a sorted array whose key is >= prefix
+ */
+function lowerBound<T>(sorted: T[], prefix: string, key: (item: T) => string): number {
+  let lo = 0;
+  let hi = sorted.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (key(sorted[mid]) < prefix) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+/**
+ * Insert into a sorted array, keeping it sorted
+ */
+function insertSorted<T>(sorted: T[], item: T, key: (item: T) => string): void {
+  sorted.splice(lowerBound(sorted, key(item), key), 0, item);
+}
+
+export class SymbolIndex {
+  private listings = new Map<string, IndexedListing>();
+  private tickers: string[] = [];                            // Sorted tickers
+  private words: Array<[word: string, symbol: string]> = []; // Sorted (name word, ticker) pairs
+  private postings = new Map<string, Set<string>>();         // Trigram → tickers
+
+  /**
+   * @param {SymbolListing[]} [listings] - Initial symbol universe
+   */
+  constructor(listings: SymbolListing[] = []) {
+    listings.forEach((listing) => this.upsert(listing));
+  }
+
+  get size(): number {
+    return this.listings.size;
+  }
+
+  has(symbol: string): boolean {
+    return this.listings.has(symbol.toUpperCase());
+  }
+
+  get(symbol: string): SymbolListing | undefined {
+    const listing = this.listings.get(symbol.toUpperCase());
+    return listing && { symbol: listing.symbol, name: listing.name, assetType: listing.assetType };
+  }
+
+  /**
+   * Add or Replace a Listing
+   *
+   * @param {SymbolListing} listing - Ticker, company name and asset type
+   */
+  upsert(listing: SymbolListing): void {
+    const symbol = listing.symbol.toUpperCase();
+    if (this.listings.has(symbol)) {
+      this.remove(symbol);
+    }
+
+    const indexed: IndexedListing = {
+      symbol,
+      name: listing.name,
+      assetType: listing.assetType,
+      nameLower: listing.name.toLowerCase(),
+      tickerGrams: trigramsOf(symbol),
+      wordGrams: wordsOf(listing.name).map(trigramsOf),
+    };
+    this.listings.set(symbol, indexed);
+
+    insertSorted(this.tickers, symbol, (ticker) => ticker);
+    for (const word of new Set(wordsOf(listing.name))) {
+      insertSorted(this.words, [word, symbol], ([w]) => w);
+    }
+    for (const gram of this.gramsOf(indexed)) {
+      let tickers = this.postings.get(gram);
+      if (!tickers) {
+        tickers = new Set();
+        this.postings.set(gram, tickers);
+      }
+      tickers.add(symbol);
+    }
+  }
+
+  /**
+   * Remove a Listing
+   *
+   * @param {string} symbol - Ticker to remove
+   * @returns {boolean} true if the ticker was indexed
+   */
+  remove(symbol: string): boolean {
+    const listing = this.listings.get(symbol.toUpperCase());
+    if (!listing) return false;
+
+    this.listings.delete(listing.symbol);
+    this.tickers.splice(this.tickers.indexOf(listing.symbol), 1);
+    this.words = this.words.filter(([, ticker]) => ticker !== listing.symbol);
+    for (const gram of this.gramsOf(listing)) {
+      const tickers = this.postings.get(gram);
+      tickers?.delete(listing.symbol);
+      if (tickers && tickers.size === 0) this.postings.delete(gram);
+    }
+    return true;
+  }
+
+  /**
+   * Search Listings
+   *
+   * @param {string} query - Ticker, ticker prefix, company name fragment or misspelling
+   * @param {object} [options] - Result limit and asset type filter
+   * @returns {SymbolMatch[]} Best matches, highest score first
+   */
+  search(
+    query: string,
+    options: { limit?: number; assetType?: 'STOCK' | 'CRYPTO' } = {}
+  ): SymbolMatch[] {
+    const limit = options.limit ?? 10;
+    const q = query.trim().toLowerCase();
+    if (!q) return [];
+
+    const upper = q.toUpperCase();
+    const scores = new Map<string, number>();
+    const score = (symbol: string, value: number) => {
+      if (value > (scores.get(symbol) ?? 0)) scores.set(symbol, value);
+    };
+
+    // Ticker prefix
+    for (let i = lowerBound(this.tickers, upper, (t) => t); i < this.tickers.length; i++) {
+      const ticker = this.tickers[i];
+      if (!ticker.startsWith(upper)) break;
+      score(ticker, ticker === upper ? 1000 : 900 - Math.min(ticker.length - upper.length, 50));
+    }
+
+    // Name word prefix (whole-name prefix ranks higher)
+    for (let i = lowerBound(this.words, q, ([w]) => w); i < this.words.length; i++) {
+      const [word, ticker] = this.words[i];
+      if (!word.startsWith(q)) break;
+      score(ticker, this.listings.get(ticker)!.nameLower.startsWith(q) ? 800 : 700);
+    }
+
+    // Name substring and fuzzy candidates share the trigram postings
+    const queryGrams = trigramsOf(q);
+    const candidates = new Set<string>();
+    for (const gram of queryGrams) {
+      this.postings.get(gram)?.forEach((ticker) => candidates.add(ticker));
+    }
+
+    for (const ticker of candidates) {
+      const listing = this.listings.get(ticker)!;
+      if (q.length >= 3 && listing.nameLower.includes(q)) {
+        score(ticker, 600);
+        continue;
+      }
+
+      // Similarity against the ticker or the closest name word
+      const similarity = Math.max(
+        this.similarity(queryGrams, listing.tickerGrams),
+        ...listing.wordGrams.map((grams) => this.similarity(queryGrams, grams))
+      );
+      if (similarity >= MIN_FUZZY_SIMILARITY) {
+        score(ticker, Math.round(500 * similarity));
+      }
+    }
+
+    const matches: SymbolMatch[] = [];
+    for (const [ticker, value] of scores.entries()) {
+      const listing = this.listings.get(ticker)!;
+      if (options.assetType && listing.assetType !== options.assetType) continue;
+      matches.push({ symbol: ticker, name: listing.name, assetType: listing.assetType, score: value });
+    }
+
+    return matches
+      .sort((a, b) => b.score - a.score || a.symbol.localeCompare(b.symbol))
+      .slice(0, limit);
+  }
+
+  /**
+   * All trigrams of a listing (ticker and name words)
+   *
+   * @private
+   */
+  private gramsOf(listing: IndexedListing): Set<string> {
+    const grams = new Set(listing.tickerGrams);
+    listing.wordGrams.forEach((word) => word.forEach((gram) => grams.add(gram)));
+    return grams;
+  }
+
+  /**
+   * Jaccard similarity of two trigram sets
+   *
+   * @private
+   */
+  private similarity(a: Set<string>, b: Set<string>): number {
+    let common = 0;
+    for (const gram of a) {
+      if (b.has(gram)) common++;
+    }
+    return common / (a.size + b.size - common);
+  }
+}
+
+export default SymbolIndex;
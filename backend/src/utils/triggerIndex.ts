@@ -0,0 +1,181 @@
+/**
+ * Trigger Index
+ *
+ * Per-symbol index of price triggers (resting limit/stop orders) that returns
+ * only the triggers a new price crosses, without looking at the others.
+ *
+ * HOW IT WORKS:
+ * - Each symbol has two heaps:
+ *   - AT_OR_BELOW triggers (fire when price <= trigger): max-heap, highest trigger first
+ *   - AT_OR_ABOVE triggers (fire when price >= trigger): min-heap, lowest trigger first
+ * - takeCrossed(symbol, price) pops from each heap until the top is no longer
+ *   crossed, so a price update costs O((k + 1) log n) for k crossed triggers
+ * - remove() is lazy: the entry is forgotten and skipped when it reaches the
+ *   top; a heap is compacted once most of its entries are stale
+ *
+ * EXAMPLE:
+ * ```typescript
+ * const index = new TriggerIndex<Order>();
+ * index.add({ id: order.id, symbol: 'AAPL', trigger: 150, direction: 'AT_OR_BELOW', payload: order });
+ * index.takeCrossed('AAPL', 149.5); // [entry]
+ * ```
+ */
+
+import { BinaryHeap } from './binaryHeap';
+
+export type TriggerDirection = 'AT_OR_BELOW' | 'AT_OR_ABOVE';
+
+export interface TriggerEntry<T> {
+  id: string;
+  symbol: string;
+  trigger: number;
+  direction: TriggerDirection;
+  payload: T;
+}
+
+interface SymbolBook<T> {
+  below: BinaryHeap<TriggerEntry<T>>;
+  above: BinaryHeap<TriggerEntry<T>>;
+  live: number; // Entries in the heaps that haven't been removed
+}
+
+const COMPACT_MIN_SIZE = 64; // Don't bother compacting small heaps
+
+export class TriggerIndex<T> {
+  private books = new Map<string, SymbolBook<T>>();
+  private entries = new Map<string, TriggerEntry<T>>(); // id → live entry
+
+  /**
+   * Number of live triggers
+   */
+  get size(): number {
+    return this.entries.size;
+  }
+
+  /**
+   * Add (or Replace) a Trigger
+   *
+   * @param {TriggerEntry<T>} entry - Trigger to add; replaces any entry with the same id
+   */
+  add(entry: TriggerEntry<T>): void {
+    this.remove(entry.id);
+
+    let book = this.books.get(entry.symbol);
+    if (!book) {
+      book = {
+        below: new BinaryHeap<TriggerEntry<T>>((a, b) => b.trigger - a.trigger),
+        above: new BinaryHeap<TriggerEntry<T>>((a, b) => a.trigger - b.trigger),
+        live: 0,
+      };
+      this.books.set(entry.symbol, book);
+    }
+
+    (entry.direction === 'AT_OR_BELOW' ? book.below : book.above).push(entry);
+    book.live++;
+    this.entries.set(entry.id, entry);
+  }
+
+  /**
+   * Remove a Trigger
+   *
+   * @param {string} id - Trigger id
+   * @returns {boolean} True if the trigger was in the index
+   */
+  remove(id: string): boolean {
+    const entry = this.entries.get(id);
+    if (!entry) return false;
+
+    this.entries.delete(id);
+    const book = this.books.get(entry.symbol);
+    if (book) {
+      book.live--;
+      this.compact(entry.symbol, book);
+    }
+    return true;
+  }
+
+  /**
+   * Get a Trigger
+   *
+   * @param {string} id - Trigger id
+   * @returns {TriggerEntry<T> | undefined} Live entry, if any
+   */
+  get(id: string): TriggerEntry<T> | undefined {
+    return this.entries.get(id);
+  }
+
+  /**
+   * Remove and Return Every Trigger Crossed by a Price
+   *
+   * @param {string} symbol - Symbol the price is for
+   * @param {number} price - Observed price
+   * @returns {TriggerEntry<T>[]} Crossed triggers, nearest to their trigger price first
+   */
+  takeCrossed(symbol: string, price: number): TriggerEntry<T>[] {
+    const book = this.books.get(symbol);
+    if (!book || book.live === 0) return [];
+
+    const crossed = [
+      ...this.popWhile(book.below, (entry) => price <= entry.trigger),
+      ...this.popWhile(book.above, (entry) => price >= entry.trigger),
+    ];
+
+    book.live -= crossed.length;
+    if (book.live === 0) {
+      this.books.delete(symbol);
+    }
+    return crossed;
+  }
+
+  /**
+   * Symbols with at Least One Live Trigger
+   *
+   * @returns {string[]} Symbols
+   */
+  symbols(): string[] {
+    return [...this.books.entries()]
+      .filter(([, book]) => book.live > 0)
+      .map(([symbol]) => symbol);
+  }
+
+  private popWhile(
+    heap: BinaryHeap<TriggerEntry<T>>,
+    isCrossed: (entry: TriggerEntry<T>) => boolean
+  ): TriggerEntry<T>[] {
+    const crossed: TriggerEntry<T>[] = [];
+
+    for (;;) {
+      const top = heap.peek();
+      if (!top) break;
+
+      // Skip entries that were removed or replaced
+      if (this.entries.get(top.id) !== top) {
+        heap.pop();
+        continue;
+      }
+      if (!isCrossed(top)) break;
+
+      heap.pop();
+      this.entries.delete(top.id);
+      crossed.push(top);
+    }
+
+    return crossed;
+  }
+
+  private compact(symbol: string, book: SymbolBook<T>): void {
+    if (book.live === 0) {
+      this.books.delete(symbol);
+      return;
+    }
+
+    const isLive = (entry: TriggerEntry<T>) => this.entries.get(entry.id) === entry;
+    for (const heap of [book.below, book.above]) {
+      if (heap.size >= COMPACT_MIN_SIZE && heap.size > 2 * book.live) {
+        heap.retain(isLive);
+      }
+    }
+  }
+}
+
+export default TriggerIndex;
@@ -0,0 +1,129 @@
+/**
+ * Write-Behind Buffer
+ *
+ * Collects keyed writes in memory and persists them in batches, either when
+ * the buffer reaches `maxBatchSize` or `flushIntervalMs` after the first
+ * buffered write. A newer write for a key replaces the pending one, so a
+ * symbol refreshed twice before a flush is written once.
+ *
+ * Used where the caller doesn't need to wait for durability (e.g., background
+ * quote refreshes, which are already visible through the cache tiers).
+ * Writes that fail are logged and dropped; call flush() on shutdown.
+ *
+ * EXAMPLE:
+ * ```typescript
+ * const buffer = new WriteBehindBuffer<MarketQuote>(
+ *   (quotes) => bulkUpsert(quotes),
+ *   { maxBatchSize: 200, flushIntervalMs: 1000 }
+ * );
+ * buffer.add(quote.symbol, quote);
+ * ```
+ */
+
+import logger from '../config/logger';
+
+export interface WriteBehindBufferOptions {
+  maxBatchSize: number;     // Flush as soon as this many writes are pending
+  flushIntervalMs: number;  // Max time a write waits in the buffer
+}
+
+export interface WriteBehindBufferStats {
+  pending: number;
+  flushes: number;
+  written: number;
+  coalesced: number;  // Writes replaced by a newer write for the same key before flushing
+  failed: number;     // Writes dropped because their batch failed
+}
+
+export class WriteBehindBuffer<T> {
+  private pending = new Map<string, T>();
+  private timer: NodeJS.Timeout | null = null;
+  private flushing: Promise<void> = Promise.resolve();
+
+  private flushes = 0;
+  private written = 0;
+  private coalesced = 0;
+  private failed = 0;
+
+  /**
+   * @param {(items: T[]) => Promise<void>} writer - Persists one batch
+   * @param {WriteBehindBufferOptions} options - Batch size and flush interval
+   */
+  constructor(
+    private readonly writer: (items: T[]) => Promise<void>,
+    private readonly options: WriteBehindBufferOptions
+  ) {}
+
+  /**
+   * Buffer a Write
+   *
+   * @param {string} key - Deduplication key (latest write wins)
+   * @param {T} item - Item to persist
+   */
+  add(key: string, item: T): void {
+    if (this.pending.has(key)) {
+      this.coalesced++;
+    }
+    this.pending.set(key, item);
+
+    if (this.pending.size >= this.options.maxBatchSize) {
+      void this.flush();
+    } else if (!this.timer) {
+      this.timer = setTimeout(() => {
+        this.timer = null;
+        void this.flush();
+      }, this.options.flushIntervalMs);
+    }
+  }
+
+  /**
+   * Flush Pending Writes
+   *
+   * Batches are written one at a time, in order.
+   *
+   * @returns {Promise<void>} Resolves once everything buffered so far is written (or dropped)
+   */
+  flush(): Promise<void> {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+
+    if (this.pending.size === 0) {
+      return this.flushing;
+    }
+
+    const items = [...this.pending.values()];
+    this.pending.clear();
+
+    this.flushing = this.flushing.then(async () => {
+      try {
+        await this.writer(items);
+        this.flushes++;
+        this.written += items.length;
+      } catch (error) {
+        this.failed += items.length;
+        logger.error(`Write-behind flush of ${items.length} items failed:`, error);
+      }
+    });
+
+    return this.flushing;
+  }
+
+  /**
+   * Get Buffer Statistics
+   *
+   * @returns {WriteBehindBufferStats} Pending count and write counters
+   */
+  getStats(): WriteBehindBufferStats {
+    return {
+      pending: this.pending.size,
+      flushes: this.flushes,
+      written: this.written,
+      coalesced: this.coalesced,
+      failed: this.failed,
+    };
+  }
+}
+
+export default WriteBehindBuffer;
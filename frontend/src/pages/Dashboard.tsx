@@ -1,11 +1,37 @@
 import { useEffect, useState } from 'react';
 import portfolioService from '../services/portfolioService';
 import tradeService from '../services/tradeService';
-import type { PortfolioWithHoldings, Trade } from '../types/index.js';
+import marketService from '../services/marketService';
+import type { PortfolioWithHoldings, StreamQuote, Trade } from '../types/index.js';
 import TradingModal from '../components/TradingModal';
 import Navigation from '../components/Navigation';
 import toast from 'react-hot-toast';
 
+/**
+ * Apply streamed quotes to holdings and recompute values and P/L
+ */
+function applyQuotes(portfolio: PortfolioWithHoldings, quotes: StreamQuote[]): PortfolioWithHoldings {
+  const updates = new Map(quotes.map((quote) => [quote.symbol, quote]));
+
+  const holdings = portfolio.holdings.map((holding) => {
+    const quote = updates.get(holding.symbol);
+    if (!quote) return holding;
+
+    const currentValue = holding.quantity * quote.currentPrice;
+    const costBasis = holding.quantity * holding.averageCost;
+    return {
+      ...holding,
+      currentPrice: quote.currentPrice,
+      currentValue,
+      profitLoss: currentValue - costBasis,
+      profitLossPercentage: costBasis > 0 ? ((currentValue - costBasis) / costBasis) * 100 : 0,
+    };
+  });
+
+  const holdingsValue = holdings.reduce((sum, holding) => sum + (holding.currentValue ?? 0), 0);
+  return { ...portfolio, holdings, totalValue: Number(portfolio.cashBalance) + holdingsValue };
+}
+
 export default function Dashboard() {
   const [portfolio, setPortfolio] = useState<PortfolioWithHoldings | null>(null);
   const [loading, setLoading] = useState(true);
@@ -19,6 +45,17 @@ export default function Dashboard() {
     loadPortfolio();
   }, []);
 
+  // Live prices: revalue holdings as the server pushes quote changes
+  const heldSymbols = portfolio?.holdings.map((holding) => holding.symbol).join(',') || '';
+
+  useEffect(() => {
+    if (!heldSymbols) return;
+
+    return marketService.streamQuotes(heldSymbols.split(','), (quotes) => {
+      setPortfolio((prev) => (prev ? applyQuotes(prev, quotes) : prev));
+    });
+  }, [heldSymbols]);
+
   const loadPortfolio = async () => {
     try {
       const portfolios = await portfolioService.getPortfolios();
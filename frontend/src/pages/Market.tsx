@@ -24,6 +24,32 @@ export default function Market() {
     loadPortfolioData();
   }, []);
 
+  // Typeahead: search as the user types (debounced, answered from the server's symbol index)
+  useEffect(() => {
+    const query = searchQuery.trim();
+    if (!query) {
+      setSearchResults([]);
+      return;
+    }
+
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const results = await marketService.search(query, 'all', true);
+        if (cancelled) return;
+        setSearchResults(results);
+        await loadWatchlistStatus(trending, results);
+      } catch (error) {
+        console.error('Typeahead search failed:', error);
+      }
+    }, 200);
+
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchQuery]);
+
   const loadMarketData = async () => {
     try {
       const trendingData = await marketService.getTrending();
@@ -231,7 +257,7 @@ export default function Market() {
               onChange={(e) => setSearchQuery(e.target.value)}
               onKeyPress={(e) => e.key === 'Enter' && handleSearch()}
               className="input flex-1"
-              placeholder="Search by symbol (e.g., AAPL, BTC, TSLA)..."
+              placeholder="Search by symbol or company (e.g., AAPL, Tesla, Microsoft)..."
             />
             <button
               onClick={handleSearch}
@@ -294,7 +320,7 @@ export default function Market() {
                         <div>
                           <div className="font-bold text-lg">{result.symbol}</div>
                           <div className="text-sm text-gray-600 dark:text-gray-400">
-                            {result.assetType}
+                            {result.name || result.assetType}
                           </div>
                         </div>
                         {result.currentPrice && (
@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import watchlistService, { type WatchlistItem } from '../services/watchlistService';
+import marketService from '../services/marketService';
 import Navigation from '../components/Navigation';
 import { toast } from 'react-hot-toast';
 
@@ -32,15 +33,35 @@ export default function Watchlist() {
 
     fetchWatchlist();
 
-    // Auto-refresh every 30 seconds
-    const interval = setInterval(fetchWatchlist, 30000);
-
     return () => {
       mounted = false;
-      clearInterval(interval);
     };
   }, []);
 
+  // Live prices: the server pushes quote changes for the watched symbols
+  const watchedSymbols = watchlist.map((item) => item.symbol).join(',');
+
+  useEffect(() => {
+    if (!watchedSymbols) return;
+
+    return marketService.streamQuotes(watchedSymbols.split(','), (quotes) => {
+      const updates = new Map(quotes.map((quote) => [quote.symbol, quote]));
+      setWatchlist((prev) =>
+        prev.map((item) => {
+          const quote = updates.get(item.symbol);
+          return quote
+            ? {
+                ...item,
+                currentPrice: quote.currentPrice,
+                change24h: quote.change24h,
+                changePercentage: quote.changePercentage,
+              }
+            : item;
+        })
+      );
+    });
+  }, [watchedSymbols]);
+
   const handleRemove = async (id: string, symbol: string) => {
     try {
       await watchlistService.removeFromWatchlist(id);
@@ -25,7 +25,7 @@ import axios, { AxiosError } from 'axios';
 import type { AxiosInstance } from 'axios';
 
 // API base URL from environment variable, fallback to localhost
-const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:3001/api';
+export const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:3001/api';
 
 /**
  * API Client Class
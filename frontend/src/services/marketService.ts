@@ -8,6 +8,7 @@
  * - Get real-time quote for a specific symbol
  * - Fetch trending stocks (popular tech giants)
  * - Get most traded stocks on the platform
+ * - Stream live quotes for a set of symbols (Server-Sent Events)
  *
  * DATA CACHING:
  * The backend implements 3-tier caching (Redis → Database → API),
@@ -22,23 +23,24 @@
  * ```
  */
 
-import apiClient from './api';
-import type { MarketQuote } from '../types/index.js';
+import apiClient, { API_URL } from './api';
+import type { MarketQuote, StreamQuote } from '../types/index.js';
 
 export const marketService = {
   /**
    * Search Stocks/Crypto
    *
-   * Searches for assets by symbol or partial symbol.
-   * Returns up to 10 matching results from cache or API.
+   * Searches for assets by ticker, ticker prefix or company name (typo tolerant).
+   * Returns up to 10 ranked results from the server's in-memory symbol index.
    *
    * @param {string} query - Search term (e.g., "AAPL", "APP", "Tesla")
    * @param {'stock' | 'crypto' | 'all'} [type='all'] - Asset type filter
+   * @param {boolean} [typeahead=false] - Index-only lookup for search-as-you-type
    * @returns {Promise<any[]>} Array of matching assets
    */
-  async search(query: string, type?: 'stock' | 'crypto' | 'all'): Promise<any[]> {
+  async search(query: string, type?: 'stock' | 'crypto' | 'all', typeahead?: boolean): Promise<any[]> {
     const response = await apiClient.get<{ data: any[] }>('/market/search', {
-      params: { q: query, type },
+      params: { q: query, type, typeahead: typeahead ? 'true' : undefined },
     });
     return response.data.data;
   },
@@ -82,6 +84,32 @@ export const marketService = {
     const response = await apiClient.get<{ data: MarketQuote[] }>('/market/popular');
     return response.data.data;
   },
+
+  /**
+   * Stream Live Quotes
+   *
+   * Opens a Server-Sent Events connection that first delivers the current
+   * quote of every symbol, then only quotes whose price changed.
+   * The browser reconnects automatically if the connection drops.
+   *
+   * @param {string[]} symbols - Symbols to subscribe to (max 100)
+   * @param {(quotes: StreamQuote[]) => void} onQuotes - Called with each batch of updates
+   * @returns {() => void} Closes the stream
+   */
+  streamQuotes(symbols: string[], onQuotes: (quotes: StreamQuote[]) => void): () => void {
+    if (symbols.length === 0) {
+      return () => {};
+    }
+
+    const params = new URLSearchParams({ symbols: symbols.join(',') });
+    const source = new EventSource(`${API_URL}/market/stream?${params.toString()}`);
+
+    source.addEventListener('quotes', (event) => {
+      onQuotes(JSON.parse((event as MessageEvent<string>).data));
+    });
+
+    return () => source.close();
+  },
 };
 
 export default marketService;
@@ -9,6 +9,8 @@
  * - Fetch trade history with pagination and filtering
  * - Automatic portfolio value updates after trades
  * - Achievement checks after successful trades
+ * - Safe retries: each order is sent with an Idempotency-Key, and retries after
+ *   a timeout or gateway error reuse it, so the backend executes it only once
  *
  * TRADE EXECUTION FLOW:
  * 1. Frontend validates trade request
@@ -30,9 +32,49 @@
  * });
  * ```
  */
+import axios from 'axios';
 import apiClient from './api';
 import type { TradeRequest, TradeResult, Trade } from '../types/index.js';
 
+const TRADE_TIMEOUT_MS = 10000;
+const MAX_ATTEMPTS = 3;
+const RETRY_DELAY_MS = 500;
+
+/**
+ * Submit an Order Exactly Once
+ *
+ * Sends the request with a fresh Idempotency-Key and retries with the same
+ * key when the response was lost (timeout, network error, 502-504) or the
+ * first attempt is still in flight (409). The backend replays the stored
+ * result instead of executing the trade again.
+ *
+ * @param {string} url - Endpoint to POST to
+ * @param {unknown} body - Request body
+ * @returns {Promise<T>} Response data
+ */
+async function postIdempotent<T>(url: string, body: unknown): Promise<T> {
+  const headers = { 'Idempotency-Key': crypto.randomUUID() };
+
+  for (let attempt = 1; ; attempt++) {
+    try {
+      const response = await apiClient.post<{ data: T }>(url, body, {
+        headers,
+        timeout: TRADE_TIMEOUT_MS,
+      });
+      return response.data.data;
+    } catch (error) {
+      const status = axios.isAxiosError(error) ? error.response?.status : undefined;
+      const retryable =
+        axios.isAxiosError(error) && (status === undefined || status === 409 || status >= 502);
+
+      if (!retryable || attempt >= MAX_ATTEMPTS) {
+        throw error;
+      }
+      await new Promise((resolve) => setTimeout(resolve, RETRY_DELAY_MS * attempt));
+    }
+  }
+}
+
 export const tradeService = {
   /**
    * Execute Buy Order
@@ -48,8 +90,7 @@ export const tradeService = {
    * @throws {Error} If insufficient funds or invalid symbol
    */
   async executeBuy(trade: TradeRequest): Promise<TradeResult> {
-    const response = await apiClient.post<{ data: TradeResult }>('/trades/buy', trade);
-    return response.data.data;
+    return postIdempotent<TradeResult>('/trades/buy', trade);
   },
 
   /**
@@ -66,8 +107,7 @@ export const tradeService = {
    * @throws {Error} If insufficient holdings or invalid symbol
    */
   async executeSell(trade: TradeRequest): Promise<TradeResult> {
-    const response = await apiClient.post<{ data: TradeResult }>('/trades/sell', trade);
-    return response.data.data;
+    return postIdempotent<TradeResult>('/trades/sell', trade);
   },
 
   /**
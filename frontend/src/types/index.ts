@@ -118,6 +118,15 @@ export interface MarketQuote {
   lastUpdated: string;
 }
 
+// Quote update pushed by the live quote stream (/market/stream)
+export interface StreamQuote {
+  symbol: string;
+  currentPrice: number;
+  change24h: number;
+  changePercentage: number;
+  lastUpdated: string;
+}
+
 /**
  * Leaderboard Types
  */